@@ -4,21 +4,44 @@ Vercel Cron에서 1분마다 호출하여 알림 발송
 """
 import sys
 import os
+import hmac
 
 # lib 모듈 경로 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Depends, HTTPException
 from fastapi.responses import JSONResponse
 
 from lib.redis_db import get_pending_reminders, mark_reminder_sent, get_memo_by_id
-from lib.datetime_parser import format_reminder_time
+from lib.jobs import (
+    refresh_stale_metadata, backfill_metadata_refresh, backfill_simhash_index,
+    reclassify_backlog, get_reclassify_progress, train_local_classifier, rebuild_pending_indexes
+)
+from lib.datetime_parser import format_reminder_time, format_recurrence
+from lib.http_client import http_client_lifespan, get_http_metrics
+from lib.ai_cache import get_ai_cache_metrics
 from datetime import datetime
 
-app = FastAPI()
+app = FastAPI(lifespan=http_client_lifespan)
 
+CRON_SECRET = os.environ.get("CRON_SECRET", "")
 
-@app.get("/api/cron/reminders")
+
+def require_cron_secret(request: Request):
+    """Vercel Cron 호출 확인 (Authorization: Bearer $CRON_SECRET, 미설정이면 모두 거부)
+
+    백필/재분류는 전체 키 SCAN과 OpenAI 호출을 일으키므로 공개 호출을 막는다.
+    """
+    expected = f"Bearer {CRON_SECRET}"
+    provided = request.headers.get("authorization", "")
+    if not CRON_SECRET or not hmac.compare_digest(provided.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+cron_auth = [Depends(require_cron_secret)]
+
+
+@app.get("/api/cron/reminders", dependencies=cron_auth)
 async def check_reminders(request: Request):
     """
     리마인더 체크 - Vercel Cron에서 호출
@@ -42,19 +65,22 @@ async def check_reminders(request: Request):
             user_id = item["user_id"]
             memo_id = item["memo_id"]
             memo = item["memo"]
+            reminder = item["reminder"]
 
             try:
                 # 카카오톡 알림 발송 (나에게 보내기)
                 # TODO: 실제 카카오 알림 API 연동
-                reminder_time = memo.get("reminder_at", "")
-                summary = memo.get("summary", memo.get("content", "")[:50])
+                reminder_time = reminder.get("at", "")
+                summary = reminder.get("text") or memo.get("content", "")[:50]
 
                 notification_text = f"⏰ 리마인더\n\n{summary}\n\n예정: {reminder_time[:16] if reminder_time else '시간 미지정'}"
+                if reminder.get("recurrence"):
+                    notification_text += f"\n반복: {format_recurrence(reminder['recurrence'])}"
 
                 print(f"[REMINDER] Sending to {user_id}: {summary}")
 
-                # 발송 완료 처리
-                await mark_reminder_sent(user_id, memo_id)
+                # 발송 완료 처리 (반복 리마인더는 다음 회차로 재등록)
+                await mark_reminder_sent(user_id, memo_id, item["index"])
                 sent_count += 1
 
             except Exception as e:
@@ -79,13 +105,146 @@ async def check_reminders(request: Request):
         }, status_code=500)
 
 
+@app.get("/api/cron/metadata", dependencies=cron_auth)
+async def refresh_metadata(request: Request):
+    """
+    링크 메타데이터 갱신 - Vercel Cron에서 호출
+    폴백/오프라인/오래된 메타데이터를 배치로 재추출
+    """
+    try:
+        result = await refresh_stale_metadata()
+        return JSONResponse({"ok": True, **result})
+
+    except Exception as e:
+        import traceback
+        error_detail = traceback.format_exc()
+        print(f"[CRON ERROR] {e}\n{error_detail}")
+        return JSONResponse({
+            "ok": False,
+            "error": str(e)
+        }, status_code=500)
+
+
+@app.get("/api/cron/metadata/backfill", dependencies=cron_auth)
+async def backfill_metadata(request: Request):
+    """
+    기존 링크 메모를 메타데이터 갱신 인덱스에 등록 (1회성, 실행마다 이어서 처리)
+    ?restart=1 처음부터 다시
+    """
+    try:
+        restart = request.query_params.get("restart") in ("1", "true")
+        result = await backfill_metadata_refresh(restart=restart)
+        return JSONResponse({"ok": True, **result})
+
+    except Exception as e:
+        import traceback
+        error_detail = traceback.format_exc()
+        print(f"[CRON ERROR] {e}\n{error_detail}")
+        return JSONResponse({
+            "ok": False,
+            "error": str(e)
+        }, status_code=500)
+
+
+@app.get("/api/cron/simhash/backfill", dependencies=cron_auth)
+async def backfill_simhash(request: Request):
+    """
+    기존 메모를 비슷한 메모(SimHash) 밴드 인덱스에 등록 (1회성, 실행마다 이어서 처리)
+    ?restart=1 처음부터 다시
+    """
+    try:
+        restart = request.query_params.get("restart") in ("1", "true")
+        result = await backfill_simhash_index(restart=restart)
+        return JSONResponse({"ok": True, **result})
+
+    except Exception as e:
+        import traceback
+        error_detail = traceback.format_exc()
+        print(f"[CRON ERROR] {e}\n{error_detail}")
+        return JSONResponse({
+            "ok": False,
+            "error": str(e)
+        }, status_code=500)
+
+
+@app.get("/api/cron/indexes", dependencies=cron_auth)
+async def rebuild_indexes(request: Request):
+    """
+    인덱스 재계산 - Vercel Cron에서 호출
+    조회 때 대기열에 등록된 유저(인덱스 도입 전 메모 보유)의 일/월 집계/태그 인덱스 재계산
+    """
+    try:
+        result = await rebuild_pending_indexes()
+        return JSONResponse({"ok": True, **result})
+
+    except Exception as e:
+        import traceback
+        error_detail = traceback.format_exc()
+        print(f"[CRON ERROR] {e}\n{error_detail}")
+        return JSONResponse({
+            "ok": False,
+            "error": str(e)
+        }, status_code=500)
+
+
+@app.get("/api/cron/classifier", dependencies=cron_auth)
+async def train_classifier(request: Request):
+    """
+    로컬 카테고리 분류기 학습 - Vercel Cron에서 호출
+    저장/카테고리 변경 때 쌓인 학습 대기열을 모아서 반영 (상한 넘은 모델 정리)
+    """
+    try:
+        result = await train_local_classifier()
+        return JSONResponse({"ok": True, **result})
+
+    except Exception as e:
+        import traceback
+        error_detail = traceback.format_exc()
+        print(f"[CRON ERROR] {e}\n{error_detail}")
+        return JSONResponse({
+            "ok": False,
+            "error": str(e)
+        }, status_code=500)
+
+
+@app.get("/api/cron/reclassify", dependencies=cron_auth)
+async def reclassify(request: Request):
+    """
+    메모 백로그 일괄 AI 분류 - Vercel Cron에서 호출 (실행마다 이어서 처리)
+    ?user_id=... 특정 사용자만, ?restart=1 처음부터 다시
+    """
+    try:
+        user_id = request.query_params.get("user_id") or None
+        restart = request.query_params.get("restart") in ("1", "true")
+        result = await reclassify_backlog(user_id=user_id, restart=restart)
+        return JSONResponse({"ok": True, **result})
+
+    except Exception as e:
+        import traceback
+        error_detail = traceback.format_exc()
+        print(f"[CRON ERROR] {e}\n{error_detail}")
+        return JSONResponse({
+            "ok": False,
+            "error": str(e)
+        }, status_code=500)
+
+
+@app.get("/api/cron/reclassify/status", dependencies=cron_auth)
+async def reclassify_status(request: Request):
+    """백로그 재분류 진행 상태 (?user_id=... 특정 사용자)"""
+    progress = await get_reclassify_progress(request.query_params.get("user_id") or None)
+    return JSONResponse({"ok": True, "progress": progress or None})
+
+
 @app.get("/api/cron/health")
 async def health_check():
     """헬스 체크"""
     return JSONResponse({
         "ok": True,
         "service": "reminder-cron",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now().isoformat(),
+        "http": get_http_metrics(),
+        "ai_cache": get_ai_cache_metrics()
     })
 
 
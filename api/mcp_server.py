@@ -14,7 +14,6 @@ from typing import Optional
 import json
 
 from lib.redis_db import (
-    search_memos,
     get_memos_by_category,
     get_memos_by_period,
     get_recent_memos,
@@ -26,10 +25,17 @@ from lib.redis_db import (
     get_user_stats
 )
 from lib.classifier import get_category_emoji
-from lib.metadata import extract_metadata, extract_urls
+from lib.metadata import enrich_urls, extract_urls, merge_link_metadata
+from lib.http_client import http_client_lifespan, get_http_metrics
+from lib.ai_cache import get_ai_cache_metrics
+from lib.local_classifier import learn_category, is_learned
+from lib.deadline import request_deadline
+from lib.periods import period_label
+from lib.query_planner import format_explain
+from lib.memo_service import service_search, service_list_by_tag, service_get_tags
 
 # FastAPI 앱
-app = FastAPI(title="챗노트 MCP Server")
+app = FastAPI(title="챗노트 MCP Server", lifespan=http_client_lifespan)
 
 # MCP 서버 정보 (2025-11-25 스펙 준수)
 SERVER_INFO = {
@@ -47,14 +53,17 @@ USER_ID_PROP = {"type": "string", "description": "사용자 고유 ID (PlayMCP
 TOOLS = [
     {
         "name": "search_memo",
-        "description": "저장된 메모를 검색합니다. 키워드, 카테고리로 검색할 수 있습니다.",
+        "description": "저장된 메모를 검색합니다. 키워드, 카테고리, 기간, 태그를 조합해 검색할 수 있습니다 (예: '지난주 맛집 강남').",
         "inputSchema": {
             "type": "object",
             "properties": {
                 "user_id": USER_ID_PROP,
                 "query": {"type": "string", "description": "검색어 (예: 맛집, 유튜브, 개발)"},
                 "category": {"type": "string", "description": "카테고리 필터 (영상/맛집/쇼핑/할일/아이디어/읽을거리/기타)"},
-                "limit": {"type": "integer", "description": "결과 개수 (기본: 5)", "default": 5}
+                "period": {"type": "string", "description": "기간 필터 (today/week/month 또는 '지난주', '3월', '2주 전')"},
+                "tag": {"type": "string", "description": "태그 필터 (# 없이)"},
+                "limit": {"type": "integer", "description": "결과 개수 (기본: 5)", "default": 5},
+                "explain": {"type": "boolean", "description": "쿼리 실행 계획 표시 (느린 검색 디버깅용)", "default": False}
             },
             "required": ["query"]
         }
@@ -72,6 +81,19 @@ TOOLS = [
             "required": ["category"]
         }
     },
+    {
+        "name": "list_by_tag",
+        "description": "특정 태그가 붙은 메모 목록을 최신순으로 조회합니다. 태그를 생략하면 자주 쓴 태그 목록을 보여줍니다.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "user_id": USER_ID_PROP,
+                "tag": {"type": "string", "description": "조회할 태그 (# 없이, 예: 강남). 생략 시 태그 목록"},
+                "limit": {"type": "integer", "description": "결과 개수 (기본: 10)", "default": 10},
+                "offset": {"type": "integer", "description": "건너뛸 개수 - 다음 페이지 조회용 (기본: 0)", "default": 0}
+            }
+        }
+    },
     {
         "name": "get_summary",
         "description": "특정 기간 또는 카테고리의 메모를 요약합니다.",
@@ -79,7 +101,7 @@ TOOLS = [
             "type": "object",
             "properties": {
                 "user_id": USER_ID_PROP,
-                "period": {"type": "string", "description": "요약 기간 (today/yesterday/week/last_week/month/last_month/all)", "default": "today"},
+                "period": {"type": "string", "description": "요약 기간 (today/yesterday/week/last_week/month/last_month/all 또는 '3월', '지난 금요일', '2주 전' 같은 표현)", "default": "today"},
                 "category": {"type": "string", "description": "특정 카테고리만 조회 (영상/음악/맛집/쇼핑/여행/할일/아이디어/학습/건강/읽을거리/기타)"}
             }
         }
@@ -159,10 +181,16 @@ async def tool_search_memo(args: dict) -> str:
     category = args.get("category")
     limit = args.get("limit", 5)
 
-    memos = await search_memos(user_id, query, category, limit)
+    result = await service_search(
+        user_id, query, category, limit,
+        period=args.get("period"), tag=args.get("tag"), explain=args.get("explain", False),
+    )
+    memos = result["memos"]
+    explain = format_explain(result.get("explain"))
 
     if not memos:
-        return f"📭 '{query}' 관련 메모가 없습니다.\n\n💡 다른 키워드로 검색해보세요!"
+        empty = f"📭 '{query}' 관련 메모가 없습니다.\n\n💡 다른 키워드로 검색해보세요!"
+        return f"{empty}\n\n🔎 실행 계획\n{explain}" if explain else empty
 
     lines = [f"━━━━━━━━━━━━━━━━━━━━━━━━━━"]
     lines.append(f"🔍 검색: '{query}' | {len(memos)}건 발견")
@@ -187,9 +215,15 @@ async def tool_search_memo(args: dict) -> str:
             lines.append(f"│  🔗 {memo['url']}")
 
         lines.append(f"│  📅 {created}")
+        if memo.get("similar_count"):
+            lines.append(f"│  🗂 비슷한 메모 {memo['similar_count']}개 더")
         lines.append(f"└─ 🆔 {memo_id}")
         lines.append("")
 
+    if explain:
+        lines.append("🔎 실행 계획")
+        lines.append(explain)
+
     return "\n".join(lines)
 
 
@@ -225,6 +259,53 @@ async def tool_list_by_category(args: dict) -> str:
     return "\n".join(lines)
 
 
+async def tool_list_by_tag(args: dict) -> str:
+    """태그별 메모 조회 (offset 페이지네이션, 태그 없으면 태그 목록)"""
+    user_id = args.get("user_id", "anonymous")
+    tag = args.get("tag")
+    limit = args.get("limit", 10)
+    offset = args.get("offset", 0)
+
+    if not tag:
+        result = await service_get_tags(user_id, limit=max(limit, 20))
+        if not result["tags"]:
+            return "📭 태그가 붙은 메모가 없습니다.\n\n💡 add_memo의 tags로 태그를 붙여보세요!"
+        lines = [f"━━━━━━━━━━━━━━━━━━━━━━━━━━"]
+        lines.append(f"🏷 자주 쓴 태그 | {result['count']}개")
+        lines.append(f"━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        for item in result["tags"]:
+            lines.append(f"  #{item['tag']} ({item['count']})")
+        return "\n".join(lines)
+
+    result = await service_list_by_tag(user_id, tag, limit, offset)
+    memos, total = result["memos"], result["total"]
+
+    if not memos:
+        if total:
+            return f"📭 #{result['tag']} 메모는 총 {total}건입니다. (offset {offset} 이후 없음)"
+        return f"📭 #{result['tag']} 태그가 붙은 메모가 없습니다."
+
+    lines = [f"━━━━━━━━━━━━━━━━━━━━━━━━━━"]
+    lines.append(f"🏷 #{result['tag']} | 총 {total}건 중 {offset + 1}–{offset + len(memos)}")
+    lines.append(f"━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+
+    for i, memo in enumerate(memos, offset + 1):
+        emoji = get_category_emoji(memo.get("category", "기타"))
+        summary = memo.get('summary', '')
+        created = memo.get("created_at", "")[:10] if memo.get("created_at") else ""
+
+        lines.append(f"  {i}. {emoji} {summary}")
+        if created:
+            lines.append(f"     📅 {created}")
+        lines.append(f"     🆔 {memo.get('id', '')}")
+        lines.append("")
+
+    if offset + len(memos) < total:
+        lines.append(f"💡 다음 페이지: offset={offset + len(memos)}")
+
+    return "\n".join(lines)
+
+
 async def tool_get_summary(args: dict) -> str:
     """기간별/카테고리별 요약"""
     user_id = args.get("user_id", "anonymous")
@@ -237,16 +318,7 @@ async def tool_get_summary(args: dict) -> str:
         label = f"{category} 카테고리"
     else:
         memos = await get_memos_by_period(user_id, period)
-        period_names = {
-            "today": "오늘",
-            "yesterday": "어제",
-            "week": "이번 주",
-            "last_week": "지난 주",
-            "month": "이번 달",
-            "last_month": "지난 달",
-            "all": "전체"
-        }
-        label = period_names.get(period, period)
+        label = period_label(period)
 
     if not memos:
         return f"📭 {label} 저장된 메모가 없습니다.\n\n💡 메모를 저장해보세요!"
@@ -363,9 +435,9 @@ async def tool_add_memo(args: dict) -> str:
     metadata = {}
 
     if urls:
-        url = urls[0]
-        metadata = await extract_metadata(url)
-        metadata["url"] = url
+        # 모든 링크 동시 추출 (대표 링크 + links 배열)
+        enriched = await enrich_urls(urls)
+        metadata = merge_link_metadata(enriched)
         # 메타데이터에서 더 좋은 제목이 있으면 사용
         if metadata.get("title") and len(metadata["title"]) > len(summary):
             summary = metadata["title"][:80]
@@ -377,9 +449,14 @@ async def tool_add_memo(args: dict) -> str:
         category=category,
         tags=tags,
         summary=summary,
-        metadata=metadata
+        metadata=metadata,
+        category_source="explicit" if "category" in args else "rule"
     )
 
+    # 클라이언트가 지정한 카테고리는 로컬 분류기 학습에 사용
+    if is_learned(category, "explicit" if "category" in args else None):
+        await learn_category(user_id, content, category)
+
     emoji = get_category_emoji(category)
     lines = [
         "━━━━━━━━━━━━━━━━━━━━━━━━━━",
@@ -399,6 +476,8 @@ async def tool_add_memo(args: dict) -> str:
         lines.append(f"│  🔗 {metadata.get('url', content)}")
         if metadata.get("image"):
             lines.append(f"│  🖼 썸네일 저장됨")
+        for link in metadata.get("links", [])[1:]:
+            lines.append(f"│  🔗 {link.get('title', '')} - {link.get('url', '')}")
     lines.append("└─")
     lines.append("")
     lines.append("💡 '최근 메모', '메모 검색' 등으로 확인하세요!")
@@ -463,6 +542,15 @@ async def tool_update_memo(args: dict) -> str:
     # 수정 실행
     updated_memo = await update_memo(user_id, memo_id, new_summary, new_category, new_tags)
 
+    # 카테고리 수정 = 사용자 교정 → 이전 카테고리 학습 취소 + 새 카테고리 학습
+    old_category = old_memo.get("category")
+    if updated_memo and new_category and new_category != old_category:
+        content = old_memo.get("content", "")
+        if is_learned(old_category, old_memo.get("category_source")):
+            await learn_category(user_id, content, old_category, weight=-1)
+        if is_learned(new_category, "explicit"):
+            await learn_category(user_id, content, new_category)
+
     if updated_memo:
         emoji = get_category_emoji(updated_memo.get("category", "기타"))
         lines = [
@@ -494,6 +582,7 @@ async def tool_update_memo(args: dict) -> str:
 TOOL_HANDLERS = {
     "search_memo": tool_search_memo,
     "list_by_category": tool_list_by_category,
+    "list_by_tag": tool_list_by_tag,
     "get_summary": tool_get_summary,
     "get_stats": tool_get_stats,
     "get_recent": tool_get_recent,
@@ -505,6 +594,9 @@ TOOL_HANDLERS = {
 
 # ============ MCP JSON-RPC 핸들러 ============
 
+# 도구 실행 마감 (Vercel 함수 제한 10초 - 응답 여유)
+MCP_TOOL_DEADLINE = 9.0
+
 @app.post("/")
 @app.post("/mcp")
 async def mcp_handler(request: Request):
@@ -565,7 +657,8 @@ async def mcp_handler(request: Request):
             })
 
         try:
-            result = await handler(tool_args)
+            with request_deadline(MCP_TOOL_DEADLINE):
+                result = await handler(tool_args)
             return JSONResponse({
                 "jsonrpc": "2.0",
                 "result": {
@@ -590,8 +683,13 @@ async def mcp_handler(request: Request):
 
 @app.get("/")
 async def health():
-    """헬스 체크"""
-    return {"status": "ok", "server": SERVER_INFO}
+    """헬스 체크 (+ 외부 HTTP 커넥션 풀 사용률, AI 캐시 적중률)"""
+    return {
+        "status": "ok",
+        "server": SERVER_INFO,
+        "http": get_http_metrics(),
+        "ai_cache": get_ai_cache_metrics(),
+    }
 
 
 @app.get("/seed")
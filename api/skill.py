@@ -8,30 +8,45 @@ AI 의도 분류 + memo_service 연동
 import sys
 import os
 import json
+import time
 
 # lib 모듈 경로 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, BackgroundTasks
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from lib.memo_service import (
     service_search,
+    service_list_by_tag,
+    service_get_tags,
     service_get_summary,
+    service_get_insights,
     service_get_stats,
     service_save_memo,
     service_delete_memo,
     service_get_reminders,
     service_classify_intent,
     get_user_top_categories,
-    service_get_or_create_user
+    service_get_or_create_user,
+    service_refine_metadata,
+    service_find_similar,
+    service_get_similar_groups,
+    service_merge_similar,
+    service_set_timezone
 )
 from lib.redis_db import get_memo_by_id, get_memo_by_short_id
-from lib.datetime_parser import format_reminder_time
+from lib.datetime_parser import format_reminder_time, format_recurrence
 from lib.kakao import send_to_me
+from lib.http_client import http_client_lifespan, get_http_client, get_http_metrics
+from lib.ai_cache import get_ai_cache_metrics
+from lib.latency import latency_key, record_latency, choose_response_mode, get_latency_stats, KAKAO_SKILL_TIMEOUT
+from lib.deadline import start_deadline, reset_deadline, request_deadline, has_time
+from lib.localtime import DEFAULT_TIMEZONE, user_timezone
+from lib.periods import PERIOD_NAMES, parse_period
 
-app = FastAPI()
+app = FastAPI(lifespan=http_client_lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -58,6 +73,29 @@ def create_simple_response(text: str, quick_replies: list = None) -> dict:
     return response
 
 
+# 콜백 모드 대기 메시지 (최종 응답은 callbackUrl로 전송)
+CALLBACK_WAIT_MESSAGES = {
+    "save": "링크 정보를 가져오는 중이에요. 잠시만 기다려주세요!",
+    "save_with_ai": "AI가 메모를 분석하는 중이에요. 잠시만 기다려주세요!",
+    "ai_summary": "AI가 메모를 요약하는 중이에요. 잠시만 기다려주세요!",
+    "delete": "메모를 삭제하는 중이에요. 잠시만 기다려주세요!",
+}
+
+# 요청 마감 (초): 동기 응답은 카카오 5초 제한 - 전송 여유, 콜백은 1분 제한 - 여유
+SKILL_DEADLINE = KAKAO_SKILL_TIMEOUT - 0.5
+CALLBACK_DEADLINE = 55.0
+OPTIONAL_WORK_BUDGET = 1.5     # 이보다 적게 남으면 개인화 버튼/나에게 보내기 등 선택 작업 생략
+
+
+def create_callback_response(text: str) -> dict:
+    """콜백 대기 응답 (useCallback) - 최종 응답은 callbackUrl로 1분 이내 전송"""
+    return {
+        "version": "2.0",
+        "useCallback": True,
+        "data": {"text": text}
+    }
+
+
 def create_list_card(header_title: str, items: list, buttons: list = None, quick_replies: list = None) -> dict:
     """ListCard 응답"""
     list_card = {
@@ -139,9 +177,16 @@ def create_carousel(cards: list, quick_replies: list = None) -> dict:
 
 
 async def get_personalized_quick_replies(user_id: str) -> list:
-    """개인화된 QuickReplies - 사용자 상위 2개 카테고리 동적 반영 (← 홈 포함)"""
+    """개인화된 QuickReplies - 사용자 상위 2개 카테고리 동적 반영 (← 홈 포함)
+
+    요청 마감이 임박하면 개인화 생략 (기본 버튼만)
+    """
     # 사용자 상위 2개 카테고리 가져오기
-    top_cats = await get_user_top_categories(user_id, limit=2)
+    top_cats = []
+    if has_time(OPTIONAL_WORK_BUDGET):
+        top_cats = await get_user_top_categories(user_id, limit=2)
+    else:
+        print("[Skill] Skip personalized quick replies (deadline)")
 
     # 동적 카테고리 버튼 생성 (이모지 없이 깔끔하게)
     dynamic_buttons = []
@@ -251,9 +296,23 @@ def format_relative_time(iso_time: str) -> str:
 
 # ============ 스킬 핸들러 ============
 
+@app.get("/skill")
+async def skill_health():
+    """헬스 체크 (+ 외부 HTTP 풀 사용률, AI 캐시 적중률, 의도별 처리 시간)"""
+    return JSONResponse({
+        "ok": True,
+        "http": get_http_metrics(),
+        "ai_cache": get_ai_cache_metrics(),
+        "latency_ms": get_latency_stats(),
+    })
+
+
 @app.post("/skill")
-async def skill_handler(request: Request):
+async def skill_handler(request: Request, background_tasks: BackgroundTasks):
     """카카오 챗봇 스킬 핸들러 (AI 주도 의도 분류)"""
+    started = time.monotonic()
+    # 요청 마감: 하위 호출(Redis/메타데이터/OpenAI)이 남은 시간에 맞춰 타임아웃 축소
+    deadline_token = start_deadline(SKILL_DEADLINE)
     step = "init"
     try:
         step = "json_parse"
@@ -304,74 +363,148 @@ async def skill_handler(request: Request):
                 ]
             ))
 
-        # 의도에 따라 처리
-        if intent == "summary":
-            step = "handle_summary"
-            period = intent_result.get("period", "today")
-            category = intent_result.get("category")
-            show_all = intent_result.get("show_all", False)
-            return await handle_summary(user["id"], period, category, show_all)
-
-        elif intent == "ai_summary":
-            step = "handle_ai_summary"
-            period = intent_result.get("period", "today")
-            return await handle_ai_summary(user["id"], period)
-
-        elif intent == "stats":
-            step = "handle_stats"
-            return await handle_stats(user["id"])
-
-        elif intent == "search":
-            step = "handle_search"
-            keyword = intent_result.get("keyword", "")
-            return await handle_search(user["id"], keyword)
-
-        elif intent == "delete":
-            step = "handle_delete"
-            keyword = intent_result.get("keyword", "")
-            memo_id = intent_result.get("memo_id", "")
-            return await handle_delete(user["id"], keyword, memo_id)
-
-        elif intent == "reminder":
-            step = "handle_reminders"
-            return await handle_reminders(user["id"])
-
-        elif intent == "detail":
-            step = "handle_detail"
-            memo_id = intent_result.get("memo_id", "")
-            short_id = intent_result.get("short_id", "")
-            return await handle_detail(user["id"], memo_id, short_id)
-
-        elif intent == "help" or utterance in ["도움말", "사용법", "?"]:
-            step = "handle_help"
-            return handle_help()
-
-        elif intent == "save_with_ai":
-            # AI 분류 저장 ("AI: 내용" 형식)
-            step = "handle_save_with_ai"
-            content = intent_result.get("content", utterance)
-            return await handle_save(user["id"], user.get("access_token"), content, use_ai=True)
+        # 응답 방식 결정: 카카오 5초 제한을 넘길 것 같으면 콜백 (콜백 설정된 블록만)
+        step = "choose_mode"
+        callback_url = user_request.get("callbackUrl")
+        key = latency_key(intent, intent_result, utterance)
+        mode = await choose_response_mode(
+            key, intent_result.get("content", utterance),
+            time.monotonic() - started, callback_available=bool(callback_url)
+        )
+
+        if mode == "callback":
+            print(f"[Skill] callback mode: {key}")
+            background_tasks.add_task(run_callback, callback_url, user, utterance, intent_result, key)
+            wait_message = CALLBACK_WAIT_MESSAGES.get(intent, "처리 중이에요. 잠시만 기다려주세요!")
+            return JSONResponse(create_callback_response(wait_message))
 
-        else:
-            # 기본: 메모 저장 (원본 그대로, AI 없음)
-            step = "handle_save"
-            return await handle_save(user["id"], user.get("access_token"), utterance)
+        # 의도에 따라 처리
+        step = f"dispatch_{intent}"
+        dispatch_started = time.monotonic()
+        response = await dispatch_intent(user, utterance, intent_result, background_tasks)
+        record_latency(key, (time.monotonic() - dispatch_started) * 1000)
+        return response
 
     except Exception as e:
         import traceback
         error_detail = traceback.format_exc()
         print(f"[Skill Error] at {step}: {e}\n{error_detail}")
         return JSONResponse(create_simple_response("오류가 발생했습니다. 다시 시도해주세요."))
+    finally:
+        # 응답 후 실행되는 백그라운드 작업은 마감 없음
+        reset_deadline(deadline_token)
+
+
+async def dispatch_intent(user: dict, utterance: str, intent_result: dict,
+                          background_tasks: BackgroundTasks = None) -> JSONResponse:
+    """의도별 핸들러 실행 (동기 응답/콜백 공통)
+
+    background_tasks=None이면 응답 후 보강 없이 한 번에 처리 (콜백 모드)
+    날짜 파싱/기간 경계/리마인더 시각은 유저 시간대 기준 (기본 Asia/Seoul)
+    """
+    with user_timezone(user.get("timezone")):
+        return await _dispatch_intent(user, utterance, intent_result, background_tasks)
+
+
+async def _dispatch_intent(user: dict, utterance: str, intent_result: dict,
+                           background_tasks: BackgroundTasks = None) -> JSONResponse:
+    intent = intent_result.get("intent", "save")
+
+    if intent == "summary":
+        category = intent_result.get("category")
+        # 카테고리만 지정된 경우 기간 없음 (카테고리 전체)
+        period = intent_result.get("period", None if category else "today")
+        show_all = intent_result.get("show_all", False)
+        return await handle_summary(user["id"], period, category, show_all)
+
+    elif intent == "ai_summary":
+        period = intent_result.get("period", "today")
+        return await handle_ai_summary(user["id"], period)
+
+    elif intent == "stats":
+        return await handle_stats(user["id"])
+
+    elif intent == "search":
+        keyword = intent_result.get("keyword", "")
+        return await handle_search(user["id"], keyword)
+
+    elif intent == "tag":
+        return await handle_tag(user["id"], intent_result.get("tag", ""), intent_result.get("page", 1))
+
+    elif intent == "delete":
+        keyword = intent_result.get("keyword", "")
+        memo_id = intent_result.get("memo_id", "")
+        return await handle_delete(user["id"], keyword, memo_id)
+
+    elif intent == "reminder":
+        return await handle_reminders(user["id"])
+
+    elif intent == "detail":
+        memo_id = intent_result.get("memo_id", "")
+        short_id = intent_result.get("short_id", "")
+        return await handle_detail(user["id"], memo_id, short_id)
+
+    elif intent == "similar":
+        memo_id = intent_result.get("memo_id", "")
+        short_id = intent_result.get("short_id", "")
+        return await handle_similar(user["id"], memo_id, short_id)
+
+    elif intent == "merge_similar":
+        memo_id = intent_result.get("memo_id", "")
+        short_id = intent_result.get("short_id", "")
+        return await handle_merge_similar(user["id"], memo_id, short_id)
+
+    elif intent == "timezone":
+        return await handle_timezone(user, intent_result.get("timezone", ""))
+
+    elif intent == "help" or utterance in ["도움말", "사용법", "?"]:
+        return handle_help()
+
+    elif intent == "save_with_ai":
+        # AI 분류 저장 ("AI: 내용" 형식)
+        content = intent_result.get("content", utterance)
+        return await handle_save(user["id"], user.get("access_token"), content, use_ai=True,
+                                 background_tasks=background_tasks)
+
+    else:
+        # 기본: 메모 저장 (원본 그대로, AI 없음)
+        return await handle_save(user["id"], user.get("access_token"), utterance,
+                                 background_tasks=background_tasks)
+
+
+async def run_callback(callback_url: str, user: dict, utterance: str, intent_result: dict, key: str):
+    """콜백 모드: 처리 완료 후 최종 응답을 카카오 callbackUrl로 전송 (1분 이내, 1회)"""
+    started = time.monotonic()
+    try:
+        with request_deadline(CALLBACK_DEADLINE):
+            response = await dispatch_intent(user, utterance, intent_result)
+        body = response.body
+    except Exception as e:
+        import traceback
+        print(f"[Skill Callback Error] {e}\n{traceback.format_exc()}")
+        body = json.dumps(create_simple_response("오류가 발생했습니다. 다시 시도해주세요."), ensure_ascii=False).encode("utf-8")
+    record_latency(key, (time.monotonic() - started) * 1000)
+
+    try:
+        client = get_http_client("kakao")
+        result = await client.post(callback_url, content=body, headers={"Content-Type": "application/json"})
+        if result.status_code != 200:
+            print(f"[Skill Callback] post failed: {result.status_code} {result.text[:200]}")
+    except Exception as e:
+        print(f"[Skill Callback] post error: {e}")
 
 
 # ============ 의도별 핸들러 ============
 
 async def handle_summary(user_id: str, period: str, category: str = None, show_all: bool = False):
     """정리/요약 처리 - 모든 메모를 카드 형식으로 모던하게 표시"""
-    result = await service_get_summary(user_id, period, category)
+    # 기간만 지정 시 첫 화면 10개는 Redis에서 잘라 옴 (전체 개수는 ZCOUNT)
+    # 목록은 카드(표시 필드)만 - 본문은 상세 보기에서
+    limit = None if show_all or category else 10
+    result = await service_get_summary(user_id, period, category, limit=limit, cards=True)
     memos = result.get("memos", [])
     period_name = result.get("period_name", "오늘")
-    total_count = len(memos)
+    total_count = result.get("count", len(memos))
 
     # QuickReplies 선택
     if category:
@@ -380,7 +513,9 @@ async def handle_summary(user_id: str, period: str, category: str = None, show_a
         quick_replies = get_period_quick_replies()
 
     if not memos:
-        if category:
+        if category and period:
+            msg = f"{period_name} 메모가 없습니다."
+        elif category:
             msg = f"{category} 카테고리에 저장된 메모가 없습니다."
         else:
             msg = f"{period_name} 저장된 메모가 없습니다."
@@ -391,7 +526,9 @@ async def handle_summary(user_id: str, period: str, category: str = None, show_a
 
     # 10개 이상이고 전체보기 아닐 때 → "전체보기" 버튼 추가
     if total_count > 10 and not show_all:
-        if category:
+        if category and period:
+            view_all_btn = {"label": f"전체 {total_count}건 보기", "action": "message", "messageText": f"전체보기 {period} {category}"}
+        elif category:
             view_all_btn = {"label": f"전체 {total_count}건 보기", "action": "message", "messageText": f"전체보기 {category}"}
         else:
             view_all_btn = {"label": f"전체 {total_count}건 보기", "action": "message", "messageText": f"전체보기 {period}"}
@@ -407,9 +544,8 @@ async def handle_summary(user_id: str, period: str, category: str = None, show_a
     if url_memos:
         carousel_items = []
         for memo in url_memos[:10]:
-            metadata = memo.get("metadata", {}) or {}
-            thumbnail = metadata.get("image") or metadata.get("thumbnail")
-            title = metadata.get("title") or memo.get("summary", "")[:40]
+            thumbnail = memo.get("thumbnail")
+            title = memo.get("title") or memo.get("summary", "")[:40]
             url = memo.get("url", "")
             cat = memo.get("category", "기타")
             time_str = format_relative_time(memo.get("created_at", ""))
@@ -433,7 +569,9 @@ async def handle_summary(user_id: str, period: str, category: str = None, show_a
     # 텍스트 메모 → ListCard (깔끔한 리스트)
     if text_memos:
         # 헤더 타이틀
-        if category:
+        if category and period:
+            header_title = f"{period_name} | {len(text_memos)}건"
+        elif category:
             header_title = f"{category} | {len(text_memos)}건"
         else:
             header_title = f"{period_name} 메모 | {len(text_memos)}건"
@@ -478,32 +616,22 @@ async def handle_summary(user_id: str, period: str, category: str = None, show_a
 
 
 async def handle_ai_summary(user_id: str, period: str):
-    """AI 요약 처리 - 메모들을 분석해서 자연어 인사이트 제공"""
-    result = await service_get_summary(user_id, period)
-    memos = result.get("memos", [])
+    """AI 요약 처리 - 일/월 집계로 자연어 인사이트 제공 (메모 본문 조회 없음)"""
+    result = await service_get_insights(user_id, period)
     period_name = result.get("period_name", "오늘")
-    total_count = len(memos)
+    total_count = result.get("total", 0)
 
     sub_qr = get_sub_page_quick_replies()
 
-    if not memos:
+    if not total_count:
         return JSONResponse(create_simple_response(
             f"{period_name} 저장된 메모가 없습니다.\n\n메모를 저장하면 요약해드릴게요!",
             quick_replies=sub_qr
         ))
 
-    # 카테고리별 집계
-    category_counts = {}
-    url_count = 0
-    text_count = 0
-
-    for memo in memos:
-        cat = memo.get("category", "기타")
-        category_counts[cat] = category_counts.get(cat, 0) + 1
-        if memo.get("url"):
-            url_count += 1
-        else:
-            text_count += 1
+    category_counts = result.get("categories", {})
+    url_count = result.get("url", 0)
+    text_count = result.get("text", 0)
 
     # 상위 카테고리 정렬
     sorted_cats = sorted(category_counts.items(), key=lambda x: x[1], reverse=True)
@@ -535,12 +663,17 @@ async def handle_ai_summary(user_id: str, period: str):
         if percentage >= 50:
             summary_lines.append(f"\n{top_cat} 관련 메모가 {percentage}%를 차지해요")
 
+    # 자주 쓴 태그
+    top_tags = list(result.get("tags", {}))[:3]
+    if top_tags:
+        summary_lines.append("자주 쓴 태그: " + " ".join(f"#{tag}" for tag in top_tags))
+
     summary_text = "\n".join(summary_lines)
 
     # QuickReplies에 상세 보기 옵션 추가
     detail_qr = [
         {"label": "← 홈", "action": "message", "messageText": "홈"},
-        {"label": f"{period_name} 정리", "action": "message", "messageText": f"{period_name.replace(' ', '')} 정리"},
+        {"label": f"{period_name} 정리", "action": "message", "messageText": f"{PERIOD_NAMES.get(period, period).replace(' ', '')} 정리"},
         {"label": "통계", "action": "message", "messageText": "통계"},
     ]
     # 상위 카테고리 버튼 추가
@@ -561,12 +694,12 @@ async def handle_search(user_id: str, keyword: str):
             quick_replies=sub_qr
         ))
 
-    # 날짜 키워드 처리
-    date_keywords = {"오늘": "today", "어제": "yesterday", "이번주": "week", "이번 주": "week", "이번달": "month"}
-    if keyword in date_keywords:
-        return await handle_summary(user_id, date_keywords[keyword])
+    # 기간 키워드 처리 ("검색 오늘", "검색 3월", "검색 지난 금요일")
+    period = parse_period(keyword)
+    if period:
+        return await handle_summary(user_id, period["key"])
 
-    result = await service_search(user_id, keyword)
+    result = await service_search(user_id, keyword, cards=True)
     memos = result.get("memos", [])
 
     if not memos:
@@ -585,9 +718,8 @@ async def handle_search(user_id: str, keyword: str):
     if url_memos:
         carousel_items = []
         for memo in url_memos[:10]:
-            metadata = memo.get("metadata", {}) or {}
-            thumbnail = metadata.get("image") or metadata.get("thumbnail")
-            title = metadata.get("title") or memo.get("summary", "")[:40]
+            thumbnail = memo.get("thumbnail")
+            title = memo.get("title") or memo.get("summary", "")[:40]
             url = memo.get("url", "")
             cat = memo.get("category", "기타")
             time_str = format_relative_time(memo.get("created_at", ""))
@@ -617,6 +749,8 @@ async def handle_search(user_id: str, keyword: str):
             time_str = format_relative_time(memo.get("created_at", ""))
             memo_id = memo.get("id", "")
             short_id = memo_id[:8] if memo_id else ""
+            if memo.get("similar_count"):
+                time_str = f"{time_str} · 비슷한 메모 {memo['similar_count']}개".lstrip(" ·")
 
             list_items.append({
                 "title": f"[{cat}] {summary}",
@@ -645,6 +779,70 @@ async def handle_search(user_id: str, keyword: str):
     return JSONResponse(response)
 
 
+async def handle_tag(user_id: str, tag: str = "", page: int = 1):
+    """태그별 메모 ("#강남", "#강남 2") - 태그가 없으면 자주 쓴 태그 목록"""
+    sub_qr = get_sub_page_quick_replies()
+    # 태그 페이지의 바로가기 버튼은 빈도 해시만 (재구축 전 유저도 페이지마다 메모 스캔 없이)
+    tags = (await service_get_tags(user_id, limit=9, scan=not tag))["tags"]
+    tag_qr = [{"label": f"#{t['tag']}", "action": "message", "messageText": f"#{t['tag']}"} for t in tags]
+
+    if not tag:
+        if not tags:
+            return JSONResponse(create_simple_response(
+                "아직 태그가 붙은 메모가 없어요.\n\n메모에 #태그를 넣어 저장해 보세요.\n예: 파스타 맛집 #강남",
+                quick_replies=sub_qr
+            ))
+        lines = [f"#{t['tag']} ({t['count']})" for t in tags]
+        return JSONResponse(create_simple_response(
+            "🏷️ 자주 쓴 태그\n\n" + "\n".join(lines),
+            quick_replies=[sub_qr[0]] + tag_qr
+        ))
+
+    page_size = 10
+    result = await service_list_by_tag(user_id, tag, limit=page_size, offset=(page - 1) * page_size)
+    tag, memos, total = result["tag"], result["memos"], result["total"]
+
+    if not memos:
+        message = f"#{tag} 태그가 붙은 메모가 없습니다." if page == 1 else f"#{tag} 메모는 총 {total}건이에요."
+        return JSONResponse(create_simple_response(message, quick_replies=[sub_qr[0]] + tag_qr))
+
+    list_items = []
+    for memo in memos[:5]:
+        cat = memo.get("category", "기타")
+        summary = memo.get("summary", "")[:35]
+        time_str = format_relative_time(memo.get("created_at", ""))
+        memo_id = memo.get("id", "")
+        list_items.append({
+            "title": f"[{cat}] {summary}",
+            "description": time_str if time_str else "",
+            "action": "message",
+            "messageText": f"#{memo_id[:8]}"
+        })
+
+    start = result["offset"] + 1
+    end = result["offset"] + len(memos)
+    outputs = [{
+        "listCard": {
+            "header": {"title": f"#{tag} | 총 {total}건"},
+            "items": list_items
+        }
+    }]
+    if len(memos) > 5:
+        lines = [f"• [{m.get('category', '기타')}] {m.get('summary', '')[:30]}" for m in memos[5:]]
+        outputs.append({"simpleText": {"text": "\n".join(lines)}})
+    outputs.append({"simpleText": {"text": f"{start}–{end} / {total}건"}})
+
+    quick_replies = [sub_qr[0]]
+    if end < total:
+        quick_replies.append({"label": "다음 →", "action": "message", "messageText": f"#{tag} {page + 1}"})
+    quick_replies += [qr for qr in tag_qr if qr["messageText"] != f"#{tag}"]
+
+    return JSONResponse({
+        "version": "2.0",
+        "template": {"outputs": outputs, "quickReplies": quick_replies[:10]}
+    })
+
+
 async def handle_delete(user_id: str, keyword: str = "", memo_id: str = ""):
     """삭제 처리 - 기간별/카테고리별/키워드별 지원"""
     sub_qr = get_sub_page_quick_replies()
@@ -729,6 +927,8 @@ async def handle_reminders(user_id: str):
                 time_str = "시간 미지정"
         except Exception:
             time_str = "시간 미지정"
+        if memo.get("recurrence"):
+            time_str = f"{time_str} · {format_recurrence(memo['recurrence'])}"
 
         short_id = memo_id[:8] if memo_id else ""
         list_items.append({
@@ -813,6 +1013,11 @@ async def handle_detail(user_id: str, memo_id: str = "", short_id: str = ""):
             desc_lines.append(f"리마인더: {format_reminder_time(r_dt)}")
         except Exception:
             pass
+    if memo.get("recurrence"):
+        desc_lines.append(f"반복: {format_recurrence(memo['recurrence'])}")
+    if len(memo.get("reminders") or []) > 1:
+        remaining = sum(1 for entry in memo["reminders"] if not entry.get("sent"))
+        desc_lines.append(f"일정 {remaining}/{len(memo['reminders'])}건 남음")
 
     description = " | ".join(desc_lines)
 
@@ -821,6 +1026,7 @@ async def handle_detail(user_id: str, memo_id: str = "", short_id: str = ""):
     if url:
         buttons.append({"action": "webLink", "label": "바로가기", "webLinkUrl": url})
     buttons.append({"action": "message", "label": "삭제", "messageText": f"삭제 {memo_id}"})
+    buttons.append({"action": "message", "label": "비슷한 메모", "messageText": f"비슷한 {memo_id}"})
 
     return JSONResponse(create_basic_card(
         title=summary[:40] if summary else content[:40],
@@ -831,6 +1037,27 @@ async def handle_detail(user_id: str, memo_id: str = "", short_id: str = ""):
     ))
 
 
+async def handle_timezone(user: dict, timezone: str):
+    """시간대 조회/변경 ("시간대" → 현재 시간대, "시간대 America/New_York" → 변경)"""
+    sub_qr = get_sub_page_quick_replies()
+
+    if not timezone:
+        current = user.get("timezone") or DEFAULT_TIMEZONE
+        return JSONResponse(create_simple_response(
+            f"현재 시간대: {current}\n\n바꾸려면 \"시간대 America/New_York\"처럼 보내주세요.",
+            quick_replies=sub_qr
+        ))
+
+    result = await service_set_timezone(user, timezone)
+    if not result.get("success"):
+        return JSONResponse(create_simple_response(result.get("error", "시간대 변경 실패"), quick_replies=sub_qr))
+
+    message = f"시간대를 {result['timezone']}(으)로 바꿨어요."
+    if result["rescheduled"]:
+        message += f"\n대기 중인 리마인더 {result['rescheduled']}개도 새 시간대 기준으로 다시 예약했어요."
+    return JSONResponse(create_simple_response(message, quick_replies=sub_qr))
+
+
 async def handle_stats(user_id: str):
     """통계 처리 - ListCard로 모던하게"""
     result = await service_get_stats(user_id)
@@ -876,6 +1103,83 @@ async def handle_stats(user_id: str):
     return JSONResponse(response)
 
 
+async def handle_similar(user_id: str, memo_id: str = "", short_id: str = ""):
+    """비슷한 메모 - ID 없으면 최근 메모 중 비슷한 묶음, 있으면 그 메모와 비슷한 메모"""
+    sub_qr = get_sub_page_quick_replies()
+
+    if not memo_id and not short_id:
+        result = await service_get_similar_groups(user_id)
+        groups = result.get("groups", [])
+        if not groups:
+            return JSONResponse(create_simple_response(
+                "최근 메모 중 비슷한 메모가 없어요.",
+                quick_replies=sub_qr
+            ))
+
+        list_items = []
+        for group in groups[:5]:
+            leader = group[0]
+            summary = leader.get("summary", leader.get("content", ""))[:35]
+            list_items.append({
+                "title": f"[{leader.get('category', '기타')}] {summary}",
+                "description": f"비슷한 메모 {len(group) - 1}개",
+                "action": "message",
+                "messageText": f"비슷한 {leader.get('id', '')}"
+            })
+        return JSONResponse(create_list_card(
+            f"비슷한 메모 | {len(groups)}묶음", list_items, quick_replies=sub_qr
+        ))
+
+    result = await service_find_similar(user_id, memo_id=memo_id, short_id=short_id)
+    if not result.get("success"):
+        return JSONResponse(create_simple_response(
+            result.get("error", "메모를 찾을 수 없습니다."),
+            quick_replies=sub_qr
+        ))
+
+    memo = result["memo"]
+    similar = result.get("similar", [])
+    if not similar:
+        return JSONResponse(create_simple_response(
+            "비슷한 메모가 없어요.",
+            quick_replies=sub_qr
+        ))
+
+    list_items = []
+    for item in similar[:5]:
+        item_id = item.get("id", "")
+        time_str = format_relative_time(item.get("created_at", ""))
+        list_items.append({
+            "title": f"[{item.get('category', '기타')}] {item.get('summary', '')[:35]}",
+            "description": time_str,
+            "action": "message",
+            "messageText": f"#{item_id[:8]}"
+        })
+    buttons = [{"action": "message", "label": f"{len(similar)}개 합치기", "messageText": f"합치기 {memo['id']}"}]
+    return JSONResponse(create_list_card(
+        f"비슷한 메모 | {len(similar)}건", list_items, buttons=buttons, quick_replies=sub_qr
+    ))
+
+
+async def handle_merge_similar(user_id: str, memo_id: str = "", short_id: str = ""):
+    """비슷한 메모 합치기 (기준 메모만 남기고 태그 통합)"""
+    sub_qr = get_sub_page_quick_replies()
+
+    result = await service_merge_similar(user_id, memo_id=memo_id, short_id=short_id)
+    if not result.get("success"):
+        return JSONResponse(create_simple_response(
+            result.get("error", "합치기 실패"),
+            quick_replies=sub_qr
+        ))
+
+    return JSONResponse(create_simple_response(
+        f"비슷한 메모 {result['merged_count']}개를 합쳤어요.",
+        quick_replies=[
+            {"label": "합친 메모", "action": "message", "messageText": f"#{result['memo_id'][:8]}"}
+        ] + sub_qr
+    ))
+
+
 def handle_help():
     """도움말 처리"""
     help_text = """챗노트 사용법
@@ -893,9 +1197,11 @@ def handle_help():
 
 검색·삭제
 검색 유튜브 / 삭제 유튜브
+#강남 (태그별 메모) / 태그 (태그 목록)
 
 기타
-통계 / 리마인더"""
+통계 / 리마인더 / 비슷한 메모
+시간대 (현재 시간대) / 시간대 America/New_York"""
 
     return JSONResponse(create_simple_response(
         help_text,
@@ -910,15 +1216,27 @@ def handle_help():
     ))
 
 
-async def handle_save(user_id: str, access_token: str, content: str, use_ai: bool = False):
+async def handle_save(user_id: str, access_token: str, content: str, use_ai: bool = False,
+                      background_tasks: BackgroundTasks = None):
     """메모 저장 처리 - 모던 스타일
 
     use_ai=False (기본): 원본 그대로 저장
     use_ai=True: AI 분류/요약 사용
+
+    유튜브/깃허브 등 URL만으로 제목·썸네일을 만들 수 있으면 즉시 응답하고,
+    네트워크 메타데이터 추출은 응답 후 백그라운드에서 보강
     """
     personalized_qr = await get_personalized_quick_replies(user_id)
 
-    result = await service_save_memo(user_id, content, use_ai=use_ai)
+    result = await service_save_memo(user_id, content, use_ai=use_ai,
+                                     offline_first=background_tasks is not None)
+
+    if result.get("pending"):
+        # 같은 발화를 먼저 받은 요청이 아직 저장 중 (카카오 재시도/연타)
+        return JSONResponse(create_simple_response(
+            "방금 보낸 메모를 저장하는 중이에요.\n잠시 후 '오늘 정리'에서 확인해주세요.",
+            quick_replies=personalized_qr
+        ))
 
     if not result.get("success"):
         return JSONResponse(create_simple_response(
@@ -926,6 +1244,12 @@ async def handle_save(user_id: str, access_token: str, content: str, use_ai: boo
             quick_replies=personalized_qr
         ))
 
+    # 재시도로 돌려받은 결과/이미 저장한 링크면 보강·나에게 보내기는 이미 처리됨
+    replayed = result.get("replayed", False) or result.get("duplicate", False)
+
+    if background_tasks is not None and result.get("needs_refinement") and not replayed:
+        background_tasks.add_task(service_refine_metadata, user_id, result["memo_id"])
+
     category = result.get("category", "기타")
     summary = result.get("summary", content[:30])
     url = result.get("url")
@@ -938,12 +1262,36 @@ async def handle_save(user_id: str, access_token: str, content: str, use_ai: boo
     # 리마인더가 있으면 표시
     extra_info = ""
     if reminder_at:
-        extra_info = "\n└ 리마인더 설정됨"
+        extra_info = "\n└ 반복 리마인더 설정됨" if result.get("recurrence") else "\n└ 리마인더 설정됨"
+        if result.get("reminder_count", 0) > 1:
+            extra_info = f"\n└ 리마인더 {result['reminder_count']}건 설정됨"
 
-    # 카카오 나에게 보내기 (선택)
-    if access_token:
+    # 카카오 나에게 보내기 (선택) - 시간이 부족하면 응답 후 전송
+    if access_token and not replayed:
         message = f"{category}: {summary}"
-        await send_to_me(access_token, message)
+        if background_tasks is not None and not has_time(OPTIONAL_WORK_BUDGET):
+            background_tasks.add_task(send_to_me, access_token, message)
+        else:
+            await send_to_me(access_token, message)
+
+    links = metadata.get("links", []) if metadata else []
+    if len(links) > 1:
+        # 여러 링크 메모 - 링크별 BasicCard Carousel
+        cards = []
+        for link in links:
+            link_url = link.get("url", "")
+            desc_parts = [category]
+            if link.get("site_name"):
+                desc_parts.append(link["site_name"])
+            if result.get("duplicate"):
+                desc_parts.append("이미 저장한 링크")
+            cards.append({
+                "title": link.get("title") or link_url,
+                "description": " · ".join(desc_parts),
+                "thumbnail": link.get("thumbnail"),
+                "buttons": [{"action": "webLink", "label": "바로가기", "webLinkUrl": link_url}]
+            })
+        return JSONResponse(create_carousel(cards, quick_replies=personalized_qr))
 
     if url:
         # URL 메모 - BasicCard
@@ -953,6 +1301,8 @@ async def handle_save(user_id: str, access_token: str, content: str, use_ai: boo
         desc_parts = [category]
         if site_name:
             desc_parts.append(site_name)
+        if result.get("duplicate"):
+            desc_parts.append("이미 저장한 링크")
         description = " · ".join(desc_parts)
 
         return JSONResponse(create_basic_card(
@@ -966,7 +1316,10 @@ async def handle_save(user_id: str, access_token: str, content: str, use_ai: boo
         # 텍스트 메모 - TextCard (이미지 없이 깔끔하게)
         desc = f"[{category}] 저장 완료"
         if reminder_at:
-            desc += " | 리마인더 설정됨"
+            if result.get("reminder_count", 0) > 1:
+                desc += f" | 리마인더 {result['reminder_count']}건 설정됨"
+            else:
+                desc += " | 반복 리마인더 설정됨" if result.get("recurrence") else " | 리마인더 설정됨"
         return JSONResponse(create_text_card(
             title=summary[:40],
             description=desc,
@@ -0,0 +1,128 @@
+"""
+AI 응답 캐시 (정규화 텍스트 해시 기반)
+같은 입력(URL 제목, 자주 쓰는 문구 등)은 OpenAI를 다시 호출하지 않음
+
+- 인스턴스 LRU 캐시 → Redis (ai:{kind}:{prompt_version}:{hash}, TTL)
+- 프롬프트/모델/파라미터가 바뀌면 prompt_version이 바뀌어 자동 무효화
+- get_ai_cache_metrics()로 적중률/절약 토큰/절약 지연시간 확인
+"""
+import copy
+import json
+import time
+import hashlib
+import unicodedata
+from collections import OrderedDict
+
+AI_CACHE_PREFIX = "ai:"
+AI_CACHE_TTL = 30 * 24 * 3600      # Redis TTL (30일)
+AI_CACHE_LOCAL_TTL = 3600          # 인스턴스 캐시 TTL (1시간)
+AI_CACHE_LOCAL_MAX = 1000          # 인스턴스 캐시 최대 항목 수
+
+# {key: (expires_at, entry)} - entry: {"value", "tokens", "latency_ms"}
+_local_cache = OrderedDict()
+
+# {kind: {"hits_local", "hits_redis", "misses", "saved_tokens", "saved_ms", "spent_tokens"}}
+_metrics = {}
+
+
+def prompt_version(*parts) -> str:
+    """프롬프트 템플릿 + 모델/파라미터로 만든 버전 해시 (8자리)"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:8]
+
+
+def normalize_ai_text(text: str) -> str:
+    """캐시 키용 정규화 (유니코드 NFC + 공백 정리 + 소문자)"""
+    text = unicodedata.normalize("NFC", text or "")
+    return " ".join(text.split()).lower()
+
+
+def make_ai_cache_key(kind: str, version: str, text: str, extra: dict = None) -> str:
+    """ai:{kind}:{version}:{sha256(정규화 텍스트 + 부가 입력)}"""
+    payload = normalize_ai_text(text)
+    if extra:
+        payload += "\n" + json.dumps(extra, ensure_ascii=False, sort_keys=True)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+    return f"{AI_CACHE_PREFIX}{kind}:{version}:{digest}"
+
+
+def _kind_metrics(kind: str) -> dict:
+    return _metrics.setdefault(kind, {
+        "hits_local": 0, "hits_redis": 0, "misses": 0,
+        "saved_tokens": 0, "saved_ms": 0.0, "spent_tokens": 0,
+    })
+
+
+def _local_get(key: str):
+    item = _local_cache.get(key)
+    if not item:
+        return None
+    if item[0] < time.time():
+        _local_cache.pop(key, None)
+        return None
+    _local_cache.move_to_end(key)
+    return item[1]
+
+
+def _local_put(key: str, entry: dict) -> None:
+    _local_cache[key] = (time.time() + AI_CACHE_LOCAL_TTL, entry)
+    _local_cache.move_to_end(key)
+    while len(_local_cache) > AI_CACHE_LOCAL_MAX:
+        _local_cache.popitem(last=False)
+
+
+async def get_ai_cache(kind: str, key: str):
+    """캐시된 AI 응답 조회 (없으면 None)"""
+    metrics = _kind_metrics(kind)
+
+    entry = _local_get(key)
+    if entry is not None:
+        metrics["hits_local"] += 1
+    else:
+        try:
+            from .redis_db import redis_command
+            data = await redis_command("GET", key)
+            if data:
+                entry = json.loads(data)
+                _local_put(key, entry)
+                metrics["hits_redis"] += 1
+        except Exception as e:
+            print(f"[AICache] Load error: {e}")
+
+    if entry is None:
+        metrics["misses"] += 1
+        return None
+
+    metrics["saved_tokens"] += entry.get("tokens", 0)
+    metrics["saved_ms"] += entry.get("latency_ms", 0.0)
+    # 호출부가 결과를 수정해도 캐시는 그대로 유지
+    return copy.deepcopy(entry.get("value"))
+
+
+async def set_ai_cache(kind: str, key: str, value, tokens: int = 0, latency_ms: float = 0.0) -> None:
+    """AI 응답 저장 (호출 비용도 함께 기록 → 적중 시 절약량 집계)"""
+    _kind_metrics(kind)["spent_tokens"] += tokens
+    entry = {"value": value, "tokens": tokens, "latency_ms": round(latency_ms, 1)}
+    _local_put(key, entry)
+    try:
+        from .redis_db import redis_command
+        await redis_command(
+            "SET", key, json.dumps(entry, ensure_ascii=False, separators=(",", ":")),
+            "EX", AI_CACHE_TTL
+        )
+    except Exception as e:
+        print(f"[AICache] Save error: {e}")
+
+
+def get_ai_cache_metrics() -> dict:
+    """종류별 적중률 + 절약 토큰/지연시간"""
+    kinds = {}
+    for kind, metrics in _metrics.items():
+        hits = metrics["hits_local"] + metrics["hits_redis"]
+        lookups = hits + metrics["misses"]
+        kinds[kind] = {
+            **metrics,
+            "saved_ms": round(metrics["saved_ms"], 1),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+    return {"local_entries": len(_local_cache), "kinds": kinds}
@@ -5,11 +5,24 @@ AI 주도 의도 분류 모듈 (비즈니스용)
 - Few-shot 프롬프트로 정확도 향상
 """
 import os
+import re
 import json
-import httpx
-from typing import Optional
+import time
+from typing import Optional, Tuple
+
+from .http_client import get_http_client
+from .deadline import fit_timeout, has_time
+from .ai_cache import prompt_version, make_ai_cache_key, get_ai_cache, set_ai_cache
+from .keyword_matcher import build_keyword_matcher, match_keywords
+from .periods import parse_period
+from .localtime import resolve_timezone
+from .tag_index import parse_tag_command
+from .constants import CATEGORIES
 
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
+OPENAI_MODEL = "gpt-4o-mini"
+OPENAI_MIN_BUDGET = 1.5     # 요청 마감까지 이보다 적게 남으면 AI 호출 생략 (폴백)
+OPENAI_RESERVE = 0.5        # AI 응답 후 저장/응답 생성용으로 남길 시간 (초)
 
 # ============ 의도 분류 (AI 주도) ============
 
@@ -89,7 +102,7 @@ INTENT_PROMPT = """당신은 메모 앱의 의도 분류 AI입니다.
     "intent": "의도",
     "confidence": 0.0~1.0,
     "keyword": "검색어/삭제대상 (search/delete만)",
-    "period": "today/yesterday/week/last_week/month/last_month/all (summary만)",
+    "period": "today/yesterday/week/last_week/month/last_month/all 또는 '3월'/'지난 금요일'/'2주 전' 같은 기간 표현 그대로 (summary만)",
     "category": "영상/음악/맛집/쇼핑/여행/할일/아이디어/학습/건강/읽을거리 (summary 카테고리별만)",
     "reasoning": "판단 근거 한줄"
 }}
@@ -100,6 +113,278 @@ INTENT_PROMPT = """당신은 메모 앱의 의도 분류 AI입니다.
 
 JSON으로만 응답하세요:"""
 
+INTENT_SYSTEM_PROMPT = "의도 분류 AI입니다. JSON으로만 응답합니다."
+
+# 프롬프트/모델/파라미터 변경 시 캐시 자동 무효화
+INTENT_PROMPT_VERSION = prompt_version(INTENT_PROMPT, INTENT_SYSTEM_PROMPT, OPENAI_MODEL, 0.1, 200)
+
+
+# ============ 명령어 문법 (import 시 1회 컴파일) ============
+# 명령어를 기간 × 카테고리 × 동작 조합으로 선언하고, 띄어쓰기/조사/어미 변형까지
+# 정규화된 키로 펼쳐 하나의 조회 테이블로 컴파일한다. 메시지당 비용은
+# 정규화 1번 + dict 조회 몇 번 + 앞/뒤 단어 확인뿐이다.
+
+# 기간: 정규 키 → 표면형 (띄어쓰기는 정규화에서 제거되므로 붙여 쓴 형태만)
+GRAMMAR_PERIODS = {
+    "today": ["오늘"],
+    "yesterday": ["어제"],
+    "week": ["이번주", "금주"],
+    "last_week": ["지난주", "저번주"],
+    "month": ["이번달"],
+    "last_month": ["지난달", "저번달"],
+    "all": ["전체"],
+}
+
+# 삭제 명령에서 기간을 keyword로 넘길 때 쓰는 대표 표현 (service_delete_memo 기준)
+PERIOD_DELETE_KEYWORDS = {
+    "today": "오늘", "yesterday": "어제", "week": "이번주", "last_week": "지난주",
+    "month": "이번달", "last_month": "지난달", "all": "전체",
+}
+
+# 기간/카테고리와 동작 사이에 올 수 있는 말 ("오늘의 메모 정리", "맛집을 정리")
+GRAMMAR_FILLERS = ["", "메모", "의메모", "저장한메모", "에저장한메모", "을", "를"]
+
+# 기간과 카테고리 사이 ("이번주 맛집", "이번주의 맛집")
+GRAMMAR_JOINERS = ["", "의"]
+
+# 동작 → 의도
+GRAMMAR_ACTIONS = {
+    "정리": "summary",
+    "보여줘": "summary",
+    "요약": "ai_summary",
+    "삭제": "delete",
+}
+
+# 동작 뒤에 붙는 어미 (정규화 키 끝에서 한 번 제거 후 재조회)
+GRAMMAR_SUFFIXES = ("해주세요", "해줘", "해봐", "해", "좀")
+
+# 인자 없는 단독 명령
+GRAMMAR_STANDALONE = {
+    "reminder": ["리마인더", "리마인더목록", "알림", "알림목록"],
+    "stats": ["통계"],
+    "help": ["도움말", "홈", "사용법", "?"],
+    "save_with_ai": ["ai분류", "요약저장", "분류저장"],
+    "delete": ["메모삭제", "삭제"],
+    "similar": ["비슷한메모", "중복메모", "유사메모"],
+    "tag": ["태그", "태그목록"],
+    "timezone": ["시간대"],
+}
+
+# 인자 명령 규칙 (위에서부터 순서대로 검사)
+#   prefix: "검색 XXX"   suffix: "XXX 검색"   contains: "XXX 찾아줘"
+#   trailing: "XXX 지워줘" (공백 없이 붙어도 됨)
+ARGUMENT_RULES = [
+    ("prefix", "검색", "search"),
+    ("suffix", "검색", "search"),
+    ("contains", "찾아줘", "search"),
+    ("prefix", "삭제", "delete"),
+    ("suffix", "삭제", "delete"),
+    ("trailing", "지워", "delete"),
+    ("prefix", "상세", "detail"),
+    ("prefix", "비슷한", "similar"),
+    ("prefix", "합치기", "merge_similar"),
+    ("prefix", "시간대", "timezone"),
+]
+
+# 메모 ID가 인자일 때만 명령으로 보는 의도 ("비슷한 느낌의 카페" 같은 메모 보호)
+ID_ONLY_INTENTS = ("similar", "merge_similar")
+
+# 끝에 붙는 삭제 동사 ("맛집 지워줘", "맛집지워")
+DELETE_VERB_SUFFIXES = ("지워주세요", "지워줘", "지워")
+
+UUID_PATTERN = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I)
+SHORT_ID_PATTERN = re.compile(r'^#[0-9a-fA-F]{8}$')
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_command(text: str) -> str:
+    """명령어 정규화 키 (공백 제거 + 소문자)"""
+    return _WHITESPACE.sub("", text).lower()
+
+
+def _compile_command_table() -> dict:
+    """문법 선언을 정규화 키 → 분류 결과 테이블로 펼침"""
+    table = {}
+
+    def add(key: str, result: dict):
+        # 먼저 선언된 규칙 우선 (중복 키는 덮어쓰지 않음)
+        table.setdefault(normalize_command(key), {"confidence": 1.0, **result})
+
+    for intent, phrases in GRAMMAR_STANDALONE.items():
+        for phrase in phrases:
+            add(phrase, {"intent": intent})
+
+    # 요약만 (기본: 오늘)
+    add("요약", {"intent": "ai_summary", "period": "today"})
+
+    for action, intent in GRAMMAR_ACTIONS.items():
+        for filler in GRAMMAR_FILLERS:
+            # 기간 + 동작 ("오늘 정리", "이번주 메모 삭제", "지난달 요약")
+            for period, forms in GRAMMAR_PERIODS.items():
+                for form in forms:
+                    if intent == "delete":
+                        result = {"intent": "delete", "keyword": PERIOD_DELETE_KEYWORDS[period]}
+                    else:
+                        result = {"intent": intent, "period": period}
+                    add(form + filler + action, result)
+
+            # 카테고리 + 동작 ("맛집 정리", "영상 삭제") - 요약은 기간 전용
+            if intent == "ai_summary":
+                continue
+            for category in CATEGORIES:
+                if intent == "delete":
+                    result = {"intent": "delete", "keyword": category}
+                else:
+                    result = {"intent": intent, "category": category}
+                add(category + filler + action, result)
+
+                # 기간 × 카테고리 + 동작 ("이번주 맛집 정리") - 정리/보여줘만
+                if intent != "summary":
+                    continue
+                for period, forms in GRAMMAR_PERIODS.items():
+                    for form in forms:
+                        for joiner in GRAMMAR_JOINERS:
+                            add(form + joiner + category + filler + action,
+                                {"intent": "summary", "period": period, "category": category})
+
+    # 전체보기 (show_all=True) - QuickReplies 버튼용 ("전체보기 week", "전체보기 맛집")
+    for period in GRAMMAR_PERIODS:
+        add(f"전체보기 {period}", {"intent": "summary", "period": period, "show_all": True})
+        for category in CATEGORIES:
+            add(f"전체보기 {period} {category}",
+                {"intent": "summary", "period": period, "category": category, "show_all": True})
+    for category in CATEGORIES:
+        add(f"전체보기 {category}", {"intent": "summary", "category": category, "show_all": True})
+
+    return table
+
+
+COMMAND_TABLE = _compile_command_table()
+
+
+def _match_command_table(msg: str) -> dict | None:
+    """정규화 키로 명령 테이블 조회 (어미 1개 제거 후 재시도)"""
+    key = normalize_command(msg)
+    result = COMMAND_TABLE.get(key)
+    if result is None:
+        for suffix in GRAMMAR_SUFFIXES:
+            if key.endswith(suffix) and len(key) > len(suffix):
+                result = COMMAND_TABLE.get(key[:-len(suffix)])
+                if result is not None:
+                    break
+    return dict(result) if result is not None else None
+
+
+# 달력 기간 명령에서 동작 → 의도 (삭제는 인자 명령의 keyword로 서비스에서 기간 해석)
+PERIOD_COMMAND_ACTIONS = {"정리": "summary", "보여줘": "summary", "요약": "ai_summary"}
+SHOW_ALL_PREFIX = "전체보기"
+
+
+def _split_category(body: str) -> tuple:
+    """"3월의맛집" → ("3월", "맛집") (카테고리가 없으면 (body, None))"""
+    for category in CATEGORIES:
+        if body.endswith(category) and len(body) > len(category):
+            head = body[:-len(category)]
+            for joiner in sorted(GRAMMAR_JOINERS, key=len, reverse=True):
+                if joiner and head.endswith(joiner) and parse_period(head[:-len(joiner)]):
+                    return head[:-len(joiner)], category
+            return head, category
+    return body, None
+
+
+def _match_period_command(msg: str) -> dict | None:
+    """달력 기간 명령 ("3월 정리", "지난 금요일 맛집 보여줘", "2주 전 요약", "전체보기 3월")
+
+    명령 테이블에 없는 기간 표현만 기간 엔진으로 해석 (기간이 아니면 None → 저장)
+    """
+    key = normalize_command(msg)
+    if key.startswith(SHOW_ALL_PREFIX):
+        intent, body = "summary", key[len(SHOW_ALL_PREFIX):]
+    else:
+        for suffix in GRAMMAR_SUFFIXES:
+            if key.endswith(suffix):
+                key = key[:-len(suffix)]
+                break
+        intent = None
+        for action, action_intent in PERIOD_COMMAND_ACTIONS.items():
+            if key.endswith(action):
+                intent, body = action_intent, key[:-len(action)]
+                break
+        if not intent:
+            return None
+
+    for filler in sorted(GRAMMAR_FILLERS, key=len, reverse=True):
+        if filler and not body.endswith(filler):
+            continue
+        head = body[:-len(filler)] if filler else body
+        period_text, category = _split_category(head) if intent == "summary" else (head, None)
+        period = parse_period(period_text)
+        if not period:
+            continue
+        result = {"intent": intent, "confidence": 1.0, "period": period["key"]}
+        if category:
+            result["category"] = category
+        if key.startswith(SHOW_ALL_PREFIX):
+            result["show_all"] = True
+        return result
+    return None
+
+
+def _match_argument_command(msg: str) -> dict | None:
+    """인자가 있는 명령 (검색/삭제/상세/비슷한 메모/짧은 ID)"""
+    head, _, head_rest = msg.partition(" ")
+    tail_rest, _, tail = msg.rpartition(" ")
+
+    for kind, word, intent in ARGUMENT_RULES:
+        confidence = 1.0
+        if kind == "prefix":
+            argument = head_rest.strip() if head == word else ""
+        elif kind == "suffix":
+            argument = tail_rest.strip() if tail == word else ""
+        elif kind == "contains":
+            argument = msg.replace(word, "").strip() if word in msg else ""
+            confidence = 0.9
+        else:
+            # 문장 끝 동사일 때만 ("지워지지 않는 펜" 같은 메모 보호)
+            argument = ""
+            for verb in DELETE_VERB_SUFFIXES:
+                if msg.endswith(verb):
+                    argument = msg[:-len(verb)].strip()
+                    break
+            confidence = 0.9
+
+        if not argument:
+            continue
+        if intent in ID_ONLY_INTENTS:
+            if UUID_PATTERN.match(argument):
+                return {"intent": intent, "confidence": confidence, "memo_id": argument}
+            if SHORT_ID_PATTERN.match(argument):
+                return {"intent": intent, "confidence": confidence, "short_id": argument[1:]}
+            continue
+        if intent == "detail":
+            return {"intent": "detail", "confidence": confidence, "memo_id": argument}
+        if intent == "timezone":
+            # IANA 이름 1단어만 ("시간대 America/New_York", "시간대 바꾸는 법" 같은 메모 보호)
+            if " " in argument or not resolve_timezone(argument):
+                continue
+            return {"intent": "timezone", "confidence": confidence, "timezone": argument}
+        # UUID면 memo_id로 처리 (상세보기에서 삭제 버튼 클릭 시)
+        if intent == "delete" and kind == "prefix" and UUID_PATTERN.match(argument):
+            return {"intent": "delete", "confidence": confidence, "memo_id": argument}
+        return {"intent": intent, "confidence": confidence, "keyword": argument}
+
+    # 짧은 ID 패턴: "#a448275d" (8자리)
+    if SHORT_ID_PATTERN.match(msg):
+        return {"intent": "detail", "confidence": 1.0, "short_id": msg[1:]}
+
+    # 태그별 목록: "#강남", "#강남 2" (페이지)
+    tag_command = parse_tag_command(msg)
+    if tag_command:
+        tag, page = tag_command
+        return {"intent": "tag", "confidence": 1.0, "tag": tag, "page": page}
+
+    return None
+
 
 # ============ 빠른 규칙 기반 분류 (AI 호출 없이 즉시 응답) ============
 
@@ -109,160 +394,28 @@ def fast_rule_classify(message: str) -> dict | None:
     명확한 명령어만 처리, 애매하면 None 반환하여 AI로 위임
     """
     msg = message.strip()
-    msg_lower = msg.lower()
-
-    # 정확 매칭 (가장 빠름)
-    EXACT_MATCHES = {
-        # 리마인더
-        "리마인더": {"intent": "reminder", "confidence": 1.0},
-        "알림": {"intent": "reminder", "confidence": 1.0},
-        "알림 목록": {"intent": "reminder", "confidence": 1.0},
-        # 통계
-        "통계": {"intent": "stats", "confidence": 1.0},
-        # 도움말/홈
-        "도움말": {"intent": "help", "confidence": 1.0},
-        "홈": {"intent": "help", "confidence": 1.0},
-        "사용법": {"intent": "help", "confidence": 1.0},
-        "?": {"intent": "help", "confidence": 1.0},
-        # AI 분류 저장 (사용자 요청 시에만 AI 사용)
-        "AI 분류": {"intent": "save_with_ai", "confidence": 1.0},
-        "ai 분류": {"intent": "save_with_ai", "confidence": 1.0},
-        "요약 저장": {"intent": "save_with_ai", "confidence": 1.0},
-        "분류 저장": {"intent": "save_with_ai", "confidence": 1.0},
-        # 기간별 정리
-        "오늘 정리": {"intent": "summary", "confidence": 1.0, "period": "today"},
-        "오늘정리": {"intent": "summary", "confidence": 1.0, "period": "today"},
-        "어제 정리": {"intent": "summary", "confidence": 1.0, "period": "yesterday"},
-        "이번주 정리": {"intent": "summary", "confidence": 1.0, "period": "week"},
-        "이번 주 정리": {"intent": "summary", "confidence": 1.0, "period": "week"},
-        "지난주 정리": {"intent": "summary", "confidence": 1.0, "period": "last_week"},
-        "지난 주 정리": {"intent": "summary", "confidence": 1.0, "period": "last_week"},
-        "이번달 정리": {"intent": "summary", "confidence": 1.0, "period": "month"},
-        "이번 달 정리": {"intent": "summary", "confidence": 1.0, "period": "month"},
-        "지난달 정리": {"intent": "summary", "confidence": 1.0, "period": "last_month"},
-        "전체 보여줘": {"intent": "summary", "confidence": 1.0, "period": "all"},
-        "전체보여줘": {"intent": "summary", "confidence": 1.0, "period": "all"},
-        # 요약 (AI 인사이트)
-        "오늘 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "today"},
-        "오늘요약": {"intent": "ai_summary", "confidence": 1.0, "period": "today"},
-        "어제 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "yesterday"},
-        "이번주 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "week"},
-        "이번 주 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "week"},
-        "지난주 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "last_week"},
-        "이번달 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "month"},
-        "지난달 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "last_month"},
-        "전체 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "all"},
-        "요약": {"intent": "ai_summary", "confidence": 1.0, "period": "today"},
-        # 카테고리별 정리
-        "영상 정리": {"intent": "summary", "confidence": 1.0, "category": "영상"},
-        "음악 정리": {"intent": "summary", "confidence": 1.0, "category": "음악"},
-        "맛집 정리": {"intent": "summary", "confidence": 1.0, "category": "맛집"},
-        "쇼핑 정리": {"intent": "summary", "confidence": 1.0, "category": "쇼핑"},
-        "여행 정리": {"intent": "summary", "confidence": 1.0, "category": "여행"},
-        "할일 정리": {"intent": "summary", "confidence": 1.0, "category": "할일"},
-        "아이디어 정리": {"intent": "summary", "confidence": 1.0, "category": "아이디어"},
-        "학습 정리": {"intent": "summary", "confidence": 1.0, "category": "학습"},
-        "건강 정리": {"intent": "summary", "confidence": 1.0, "category": "건강"},
-        "읽을거리 정리": {"intent": "summary", "confidence": 1.0, "category": "읽을거리"},
-        "기타 정리": {"intent": "summary", "confidence": 1.0, "category": "기타"},
-        # 전체보기 (show_all=True)
-        "전체보기 today": {"intent": "summary", "confidence": 1.0, "period": "today", "show_all": True},
-        "전체보기 yesterday": {"intent": "summary", "confidence": 1.0, "period": "yesterday", "show_all": True},
-        "전체보기 week": {"intent": "summary", "confidence": 1.0, "period": "week", "show_all": True},
-        "전체보기 last_week": {"intent": "summary", "confidence": 1.0, "period": "last_week", "show_all": True},
-        "전체보기 month": {"intent": "summary", "confidence": 1.0, "period": "month", "show_all": True},
-        "전체보기 all": {"intent": "summary", "confidence": 1.0, "period": "all", "show_all": True},
-        "전체보기 영상": {"intent": "summary", "confidence": 1.0, "category": "영상", "show_all": True},
-        "전체보기 음악": {"intent": "summary", "confidence": 1.0, "category": "음악", "show_all": True},
-        "전체보기 맛집": {"intent": "summary", "confidence": 1.0, "category": "맛집", "show_all": True},
-        "전체보기 쇼핑": {"intent": "summary", "confidence": 1.0, "category": "쇼핑", "show_all": True},
-        "전체보기 여행": {"intent": "summary", "confidence": 1.0, "category": "여행", "show_all": True},
-        "전체보기 할일": {"intent": "summary", "confidence": 1.0, "category": "할일", "show_all": True},
-        "전체보기 아이디어": {"intent": "summary", "confidence": 1.0, "category": "아이디어", "show_all": True},
-        "전체보기 학습": {"intent": "summary", "confidence": 1.0, "category": "학습", "show_all": True},
-        "전체보기 건강": {"intent": "summary", "confidence": 1.0, "category": "건강", "show_all": True},
-        "전체보기 읽을거리": {"intent": "summary", "confidence": 1.0, "category": "읽을거리", "show_all": True},
-        "전체보기 기타": {"intent": "summary", "confidence": 1.0, "category": "기타", "show_all": True},
-        # 삭제 (기간별/카테고리별) - QuickReplies용
-        "메모 삭제": {"intent": "delete", "confidence": 1.0},  # 삭제 옵션 보여주기
-        "삭제": {"intent": "delete", "confidence": 1.0},  # 삭제 옵션 보여주기
-        "오늘 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "오늘"},
-        "오늘메모삭제": {"intent": "delete", "confidence": 1.0, "keyword": "오늘"},
-        "어제 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "어제"},
-        "어제메모삭제": {"intent": "delete", "confidence": 1.0, "keyword": "어제"},
-        "이번주 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "이번주"},
-        "이번 주 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "이번주"},
-        "지난주 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "지난주"},
-        "이번달 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "이번달"},
-        "전체 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "전체"},
-        "전체메모삭제": {"intent": "delete", "confidence": 1.0, "keyword": "전체"},
-        # 카테고리별 삭제
-        "영상 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "영상"},
-        "음악 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "음악"},
-        "맛집 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "맛집"},
-        "쇼핑 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "쇼핑"},
-        "여행 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "여행"},
-        "할일 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "할일"},
-        "학습 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "학습"},
-        "기타 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "기타"},
-    }
 
-    if msg in EXACT_MATCHES:
-        return EXACT_MATCHES[msg]
-
-    # 패턴 매칭 (검색/삭제)
-    # "검색 XXX" 또는 "XXX 검색"
-    if msg.startswith("검색 "):
-        keyword = msg[3:].strip()
-        if keyword:
-            return {"intent": "search", "confidence": 1.0, "keyword": keyword}
-    if msg.endswith(" 검색"):
-        keyword = msg[:-3].strip()
-        if keyword:
-            return {"intent": "search", "confidence": 1.0, "keyword": keyword}
-    if "찾아줘" in msg:
-        keyword = msg.replace("찾아줘", "").strip()
-        if keyword:
-            return {"intent": "search", "confidence": 0.9, "keyword": keyword}
-
-    # "삭제 XXX" 또는 "XXX 삭제" 또는 "XXX 지워"
-    # UUID 패턴이면 memo_id로 처리 (상세보기에서 삭제 버튼 클릭 시)
-    import re
-    uuid_pattern = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I)
-
-    if msg.startswith("삭제 "):
-        keyword = msg[3:].strip()
-        if keyword:
-            if uuid_pattern.match(keyword):
-                return {"intent": "delete", "confidence": 1.0, "memo_id": keyword}
-            return {"intent": "delete", "confidence": 1.0, "keyword": keyword}
-    if msg.endswith(" 삭제"):
-        keyword = msg[:-3].strip()
-        if keyword:
-            return {"intent": "delete", "confidence": 1.0, "keyword": keyword}
-    if "지워줘" in msg or "지워" in msg:
-        keyword = msg.replace("지워줘", "").replace("지워", "").strip()
-        if keyword:
-            return {"intent": "delete", "confidence": 0.9, "keyword": keyword}
-
-    # 상세 보기 패턴: "상세 {memo_id}" 또는 "#{short_id}"
-    if msg.startswith("상세 "):
-        memo_id = msg[3:].strip()
-        if memo_id:
-            return {"intent": "detail", "confidence": 1.0, "memo_id": memo_id}
+    # 명령 테이블 (기간 × 카테고리 × 동작, 띄어쓰기/조사 변형 포함)
+    result = _match_command_table(msg)
+    if result:
+        return result
 
-    # 짧은 ID 패턴: "#a448275d" (8자리)
-    if msg.startswith("#") and len(msg) == 9:
-        short_id = msg[1:]  # # 제거
-        if all(c in "0123456789abcdef" for c in short_id.lower()):
-            return {"intent": "detail", "confidence": 1.0, "short_id": short_id}
+    # 달력 기간 명령 ("3월 정리", "지난 금요일 요약")
+    result = _match_period_command(msg)
+    if result:
+        return result
+
+    # 인자 명령 (검색/삭제/상세)
+    result = _match_argument_command(msg)
+    if result:
+        return result
 
     # URL은 무조건 저장 (AI 호출 불필요)
-    if msg_lower.startswith(("http://", "https://", "www.")):
+    if msg.lower().startswith(("http://", "https://", "www.")):
         return {"intent": "save", "confidence": 1.0, "reasoning": "URL 감지"}
 
     # "AI:" 접두사 → AI 분류 저장 (사용자 명시적 요청)
-    if msg.startswith("AI:") or msg.startswith("ai:") or msg.startswith("AI ") or msg.startswith("ai "):
+    if msg.startswith(("AI:", "ai:", "AI ", "ai ")):
         content = msg[3:].strip() if msg[2] == ":" else msg[2:].strip()
         return {"intent": "save_with_ai", "confidence": 1.0, "content": content, "reasoning": "AI 분류 요청"}
 
@@ -307,46 +460,61 @@ async def classify_intent(message: str) -> dict:
 async def openai_intent_classification(message: str) -> Optional[dict]:
     """OpenAI API로 의도 분류"""
 
-    prompt = INTENT_PROMPT.format(message=message)
+    cache_key = make_ai_cache_key("intent", INTENT_PROMPT_VERSION, message)
+    cached = await get_ai_cache("intent", cache_key)
+    if cached:
+        print(f"[Classifier] AI Result (cached): {cached}")
+        return cached
 
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4o-mini",
-                    "messages": [
-                        {"role": "system", "content": "의도 분류 AI입니다. JSON으로만 응답합니다."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.1,  # 일관성 최대화
-                    "max_tokens": 200,
-                    "response_format": {"type": "json_object"}  # JSON 강제
-                },
-                timeout=10.0
-            )
+    if not has_time(OPENAI_MIN_BUDGET):
+        print("[Classifier] Skip AI intent (deadline)")
+        return None
 
-            if response.status_code != 200:
-                print(f"[Classifier] API Error: {response.status_code}")
-                return None
-
-            result = response.json()
-            answer = result["choices"][0]["message"]["content"]
-
-            parsed = json.loads(answer)
-
-            # 필수 필드 검증
-            if "intent" not in parsed:
-                parsed["intent"] = "save"
-            if "confidence" not in parsed:
-                parsed["confidence"] = 0.7
+    prompt = INTENT_PROMPT.format(message=message)
 
-            print(f"[Classifier] AI Result: {parsed}")
-            return parsed
+    try:
+        started = time.monotonic()
+        client = get_http_client("openai")
+        response = await client.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": OPENAI_MODEL,
+                "messages": [
+                    {"role": "system", "content": INTENT_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": 0.1,  # 일관성 최대화
+                "max_tokens": 200,
+                "response_format": {"type": "json_object"}  # JSON 강제
+            },
+            timeout=fit_timeout(10.0, reserve=OPENAI_RESERVE)
+        )
+
+        if response.status_code != 200:
+            print(f"[Classifier] API Error: {response.status_code}")
+            return None
+
+        result = response.json()
+        answer = result["choices"][0]["message"]["content"]
+
+        parsed = json.loads(answer)
+
+        # 필수 필드 검증
+        if "intent" not in parsed:
+            parsed["intent"] = "save"
+        if "confidence" not in parsed:
+            parsed["confidence"] = 0.7
+
+        print(f"[Classifier] AI Result: {parsed}")
+        await set_ai_cache(
+            "intent", cache_key, parsed,
+            tokens=_usage_tokens(result), latency_ms=(time.monotonic() - started) * 1000
+        )
+        return parsed
 
     except json.JSONDecodeError as e:
         print(f"[Classifier] JSON Parse Error: {e}")
@@ -356,21 +524,15 @@ async def openai_intent_classification(message: str) -> Optional[dict]:
     return None
 
 
-# ============ 메모 분류 (카테고리/태그/요약) ============
+def _usage_tokens(response_json: dict) -> int:
+    """OpenAI 응답의 사용 토큰 수 (캐시 절약량 집계용)"""
+    return (response_json.get("usage") or {}).get("total_tokens", 0)
 
-CLASSIFICATION_PROMPT = """다음 메모를 분석해서 JSON으로 반환해줘.
 
-메모: {content}
-{metadata_info}
-
-응답 형식:
-{{
-    "category": "영상/음악/맛집/쇼핑/여행/할일/아이디어/학습/건강/읽을거리/기타 중 하나",
-    "tags": ["태그1", "태그2"],
-    "summary": "한줄 요약 (30자 이내)"
-}}
+# ============ 메모 분류 (카테고리/태그/요약) ============
 
-카테고리 기준:
+# 카테고리 기준 (단건/배치 분류 프롬프트 공통)
+CATEGORY_GUIDE = """카테고리 기준:
 - 영상: 유튜브, 동영상, 릴스, 틱톡, 넷플릭스
 - 음악: 스포티파이, 멜론, 애플뮤직, 플레이리스트, 노래
 - 맛집: 음식점, 카페, 맛집, 레스토랑
@@ -383,26 +545,61 @@ CLASSIFICATION_PROMPT = """다음 메모를 분석해서 JSON으로 반환해줘
 - 읽을거리: 블로그, 뉴스, 기사, 아티클, Medium, 개인블로그
 - 기타: 위 카테고리에 명확히 해당하지 않는 것"""
 
+CLASSIFICATION_PROMPT = """다음 메모를 분석해서 JSON으로 반환해줘.
+
+메모: {content}
+{metadata_info}
+
+응답 형식:
+{{
+    "category": "영상/음악/맛집/쇼핑/여행/할일/아이디어/학습/건강/읽을거리/기타 중 하나",
+    "tags": ["태그1", "태그2"],
+    "summary": "한줄 요약 (30자 이내)"
+}}
+
+""" + CATEGORY_GUIDE
+
+CLASSIFICATION_PROMPT_VERSION = prompt_version(CLASSIFICATION_PROMPT, OPENAI_MODEL, 0.3, 200)
+
+# 분류에 쓰는 메타데이터 필드 (썸네일/출처 등은 프롬프트와 캐시 키에서 제외)
+CLASSIFICATION_METADATA_FIELDS = ("title", "description", "site_name", "type")
+
 
 async def analyze_memo(content: str, metadata: Optional[dict] = None) -> dict:
-    """메모 분석 (분류 + 태그 + 요약)"""
+    """메모 분석 (분류 + 태그 + 요약)
+
+    결과의 source: "ai" (LLM/캐시) / "rule" (규칙 폴백) - 로컬 분류기는 AI 결과만 학습
+    """
 
     # OpenAI API 키가 있으면 AI 분류
     if OPENAI_API_KEY:
         result = await openai_classification(content, metadata)
         if result:
-            return result
+            return {**result, "source": "ai"}
 
     # 폴백: 기본 분류
-    return rule_based_classification(content, metadata)
+    return {**rule_based_classification(content, metadata), "source": "rule"}
 
 
 async def openai_classification(content: str, metadata: Optional[dict] = None) -> Optional[dict]:
     """OpenAI API로 메모 분류"""
 
+    metadata_fields = {
+        key: metadata[key] for key in CLASSIFICATION_METADATA_FIELDS
+        if metadata and metadata.get(key)
+    }
     metadata_info = ""
-    if metadata:
-        metadata_info = f"메타데이터: {json.dumps(metadata, ensure_ascii=False)}"
+    if metadata_fields:
+        metadata_info = f"메타데이터: {json.dumps(metadata_fields, ensure_ascii=False)}"
+
+    cache_key = make_ai_cache_key("memo", CLASSIFICATION_PROMPT_VERSION, content, metadata_fields)
+    cached = await get_ai_cache("memo", cache_key)
+    if cached:
+        return cached
+
+    if not has_time(OPENAI_MIN_BUDGET):
+        print("[Classifier] Skip AI memo analysis (deadline)")
+        return None
 
     prompt = CLASSIFICATION_PROMPT.format(
         content=content,
@@ -410,30 +607,36 @@ async def openai_classification(content: str, metadata: Optional[dict] = None) -
     )
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4o-mini",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.3,
-                    "max_tokens": 200,
-                    "response_format": {"type": "json_object"}
-                },
-                timeout=10.0
-            )
-
-            if response.status_code != 200:
-                print(f"[Classifier] Memo API Error: {response.status_code}")
-                return None
-
-            result = response.json()
-            answer = result["choices"][0]["message"]["content"]
-            return json.loads(answer)
+        started = time.monotonic()
+        client = get_http_client("openai")
+        response = await client.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": OPENAI_MODEL,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.3,
+                "max_tokens": 200,
+                "response_format": {"type": "json_object"}
+            },
+            timeout=fit_timeout(10.0, reserve=OPENAI_RESERVE)
+        )
+
+        if response.status_code != 200:
+            print(f"[Classifier] Memo API Error: {response.status_code}")
+            return None
+
+        result = response.json()
+        answer = result["choices"][0]["message"]["content"]
+        parsed = json.loads(answer)
+        await set_ai_cache(
+            "memo", cache_key, parsed,
+            tokens=_usage_tokens(result), latency_ms=(time.monotonic() - started) * 1000
+        )
+        return parsed
 
     except Exception as e:
         print(f"[Classifier] Memo Classification Error: {e}")
@@ -441,16 +644,145 @@ async def openai_classification(content: str, metadata: Optional[dict] = None) -
     return None
 
 
-async def classify_category_only(content: str, use_ai: bool = False) -> str:
-    """카테고리만 분류 (원본 텍스트는 그대로 유지)
+# ============ 배치 분류 (백로그 재분류용) ============
+
+BATCH_CLASSIFICATION_PROMPT = """여러 메모를 한 번에 분류해서 JSON으로 반환해줘.
 
-    use_ai=False (기본): URL이면 플랫폼 기반, 아니면 첫 단어
-    use_ai=True: AI가 분류
+메모 목록 (번호: 내용):
+{items}
+
+응답 형식 (모든 번호에 대해):
+{{
+    "results": [
+        {{"n": 1, "category": "영상/음악/맛집/쇼핑/여행/할일/아이디어/학습/건강/읽을거리/기타 중 하나", "tags": ["태그1", "태그2"]}}
+    ]
+}}
+
+""" + CATEGORY_GUIDE
+
+BATCH_ITEM_CHARS = 200           # 메모당 프롬프트에 넣는 최대 글자 수
+BATCH_TOKENS_PER_ITEM = 40       # 응답 max_tokens 산정용 (메모당)
+
+BATCH_CLASSIFICATION_PROMPT_VERSION = prompt_version(
+    BATCH_CLASSIFICATION_PROMPT, OPENAI_MODEL, 0.2, BATCH_ITEM_CHARS, BATCH_TOKENS_PER_ITEM
+)
+
+
+async def classify_memos_batch(items: list) -> tuple:
+    """여러 메모를 프롬프트 1번으로 분류 (카테고리 + 태그)
+
+    items: [{"id", "content", "title"(선택)}, ...]
+    Returns: ({memo_id: {"category", "tags"}}, 사용 토큰 수)
+        - 캐시 적중 메모는 OpenAI 호출 없이 포함, 응답에서 빠진 메모는 결과 없음
+    """
+    results = {}
+    pending = []
+    for item in items:
+        text = item.get("content", "")[:BATCH_ITEM_CHARS]
+        extra = {"title": item["title"]} if item.get("title") else None
+        cache_key = make_ai_cache_key("memo_batch", BATCH_CLASSIFICATION_PROMPT_VERSION, text, extra)
+        cached = await get_ai_cache("memo_batch", cache_key)
+        if cached:
+            results[item["id"]] = cached
+        else:
+            pending.append((item, text, cache_key))
+
+    if not pending or not OPENAI_API_KEY:
+        return results, 0
+
+    lines = []
+    for n, (item, text, _) in enumerate(pending, 1):
+        line = " ".join(text.split())
+        if item.get("title"):
+            line += f" (제목: {item['title'][:80]})"
+        lines.append(f"{n}: {line}")
+    prompt = BATCH_CLASSIFICATION_PROMPT.format(items="\n".join(lines))
+
+    try:
+        started = time.monotonic()
+        client = get_http_client("openai")
+        response = await client.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": OPENAI_MODEL,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.2,
+                "max_tokens": 50 + BATCH_TOKENS_PER_ITEM * len(pending),
+                "response_format": {"type": "json_object"}
+            },
+            timeout=fit_timeout(30.0, reserve=OPENAI_RESERVE)
+        )
+
+        if response.status_code != 200:
+            print(f"[Classifier] Batch API Error: {response.status_code}")
+            return results, 0
+
+        result = response.json()
+        tokens = _usage_tokens(result)
+        answer = json.loads(result["choices"][0]["message"]["content"])
+        latency_ms = (time.monotonic() - started) * 1000
+
+        for entry in answer.get("results", []):
+            try:
+                item, _, cache_key = pending[int(entry.get("n")) - 1]
+            except (TypeError, ValueError, IndexError):
+                continue
+            category = str(entry.get("category") or "").strip()
+            if not category:
+                continue
+            tags = [str(t).strip() for t in entry.get("tags") or [] if str(t).strip()][:5]
+            classified = {"category": category, "tags": tags}
+            results[item["id"]] = classified
+            await set_ai_cache(
+                "memo_batch", cache_key, classified,
+                tokens=tokens // len(pending), latency_ms=latency_ms / len(pending)
+            )
+        return results, tokens
+
+    except Exception as e:
+        print(f"[Classifier] Batch Classification Error: {e}")
+
+    return results, 0
+
+
+CATEGORY_PROMPT = """메모 카테고리 분류.
+
+메모: {content}
+
+기본 카테고리: 영상, 음악, 맛집, 쇼핑, 여행, 할일, 아이디어, 학습, 건강, 읽을거리
+
+규칙:
+1. 기본 카테고리에 해당하면 그걸로
+2. 전문/특수 분야면 첫 단어나 핵심 주제 (예: 건축사, 법률, 의료, 회계, 부동산)
+3. 애매하면 메모의 첫 단어
+
+한 단어만 답변:"""
+
+CATEGORY_PROMPT_VERSION = prompt_version(CATEGORY_PROMPT, OPENAI_MODEL, 0.1, 20)
+
+
+async def classify_category_only(content: str, use_ai: bool = False, user_id: str = None) -> str:
+    """카테고리만 분류 (원본 텍스트는 그대로 유지) - classify_category의 카테고리만 반환"""
+    category, _ = await classify_category(content, use_ai=use_ai, user_id=user_id)
+    return category
+
+
+async def classify_category(content: str, use_ai: bool = False, user_id: str = None) -> Tuple[str, str]:
+    """카테고리 분류 + 출처
+
+    URL이면 플랫폼 기반, 아니면 저장된 메모로 학습한 로컬 모델 먼저 (네트워크 없음)
+    로컬 신뢰도 미달이면 use_ai=False (기본): 첫 단어, use_ai=True: AI가 분류
+
+    Returns: (카테고리, 출처) - 출처는 "local" / "ai" / "rule" (플랫폼·첫 단어·AI 실패 폴백)
 
     예시:
-    - "https://youtube.com/..." → "영상" (플랫폼 기반)
-    - "건축사 층고제한규정" → "건축사" (첫 단어)
-    - "맛있는 파스타집" + AI → "맛집" (AI 분류)
+    - "https://youtube.com/..." → ("영상", "rule") (플랫폼 기반)
+    - "건축사 층고제한규정" → ("건축사", "rule") (첫 단어)
+    - "맛있는 파스타집" + AI → ("맛집", "ai") (AI 분류)
     """
     # URL인 경우 플랫폼 기반 카테고리 분류
     if content.strip().startswith(("http://", "https://", "www.")):
@@ -490,66 +822,87 @@ async def classify_category_only(content: str, use_ai: bool = False) -> str:
         }
 
         if platform in type_to_category:
-            return type_to_category[platform]
-        return "링크"  # 알 수 없는 URL은 "링크" 카테고리
+            return type_to_category[platform], "rule"
+        return "링크", "rule"  # 알 수 없는 URL은 "링크" 카테고리
+
+    # 저장된 메모로 학습한 로컬 모델 먼저 - 신뢰도 기준 이상이면 LLM/첫 단어 생략
+    from .local_classifier import classify_category_local
+    local_category, confidence = await classify_category_local(content, user_id)
+    if local_category:
+        print(f"[Classifier] Local category: {local_category} ({confidence:.2f})")
+        return local_category, "local"
 
     # 일반 텍스트: 첫 단어를 카테고리로
     words = content.split()
     first_word = words[0] if words else "기타"
 
-    if not use_ai:
-        return first_word
-
-    # AI 분류 요청 시
-    if not OPENAI_API_KEY:
-        return first_word
+    if not use_ai or not OPENAI_API_KEY:
+        return first_word, "rule"
 
-    prompt = f"""메모 카테고리 분류.
+    cache_key = make_ai_cache_key("category", CATEGORY_PROMPT_VERSION, content)
+    cached = await get_ai_cache("category", cache_key)
+    if cached:
+        return cached, "ai"
 
-메모: {content}
-
-기본 카테고리: 영상, 음악, 맛집, 쇼핑, 여행, 할일, 아이디어, 학습, 건강, 읽을거리
-
-규칙:
-1. 기본 카테고리에 해당하면 그걸로
-2. 전문/특수 분야면 첫 단어나 핵심 주제 (예: 건축사, 법률, 의료, 회계, 부동산)
-3. 애매하면 메모의 첫 단어
+    if not has_time(OPENAI_MIN_BUDGET):
+        print("[Classifier] Skip AI category (deadline)")
+        return first_word, "rule"
 
-한 단어만 답변:"""
+    prompt = CATEGORY_PROMPT.format(content=content)
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4o-mini",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.1,
-                    "max_tokens": 20
-                },
-                timeout=5.0
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                category = result["choices"][0]["message"]["content"].strip()
-                return category
+        started = time.monotonic()
+        client = get_http_client("openai")
+        response = await client.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": OPENAI_MODEL,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.1,
+                "max_tokens": 20
+            },
+            timeout=fit_timeout(5.0, reserve=OPENAI_RESERVE)
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+            category = result["choices"][0]["message"]["content"].strip()
+            if category:
+                await set_ai_cache(
+                    "category", cache_key, category,
+                    tokens=_usage_tokens(result), latency_ms=(time.monotonic() - started) * 1000
+                )
+                return category, "ai"
 
     except Exception as e:
         print(f"[Classifier] Category Error: {e}")
 
     # 폴백: 첫 단어
-    return first_word
+    return first_word, "rule"
+
+
+# 규칙 분류 키워드 (동점이면 위에 있는 카테고리 우선)
+RULE_KEYWORDS = {
+    "영상": ["youtube", "youtu.be", "영상", "동영상", "넷플릭스"],
+    "음악": ["spotify", "멜론", "음악", "노래", "플레이리스트"],
+    "맛집": ["맛집", "음식", "카페", "식당", "레스토랑"],
+    "쇼핑": ["쇼핑", "구매", "상품", "쿠팡", "할인"],
+    "여행": ["여행", "호텔", "항공", "숙소", "관광"],
+    "할일": ["해야", "할일", "예약", "약속", "회의", "내일", "오전", "오후"],
+    "학습": ["강의", "공부", "코딩", "tutorial", "교육"],
+    "건강": ["운동", "헬스", "다이어트", "건강"],
+    "읽을거리": ["블로그", "뉴스", "기사", "글"]
+}
+
+RULE_KEYWORD_MATCHER = build_keyword_matcher(RULE_KEYWORDS)
 
 
 def rule_based_classification(content: str, metadata: dict = None) -> dict:
     """규칙 기반 분류 (폴백용)"""
-    content_lower = content.lower()
-
     # URL 기반 분류
     if metadata and metadata.get("type"):
         url_type = metadata["type"]
@@ -569,25 +922,22 @@ def rule_based_classification(content: str, metadata: dict = None) -> dict:
         if url_type in type_to_category:
             return {"category": type_to_category[url_type], "tags": [url_type], "summary": title}
 
-    # 키워드 기반
-    keywords = {
-        "영상": ["youtube", "youtu.be", "영상", "동영상", "넷플릭스"],
-        "음악": ["spotify", "멜론", "음악", "노래", "플레이리스트"],
-        "맛집": ["맛집", "음식", "카페", "식당", "레스토랑"],
-        "쇼핑": ["쇼핑", "구매", "상품", "쿠팡", "할인"],
-        "여행": ["여행", "호텔", "항공", "숙소", "관광"],
-        "할일": ["해야", "할일", "예약", "약속", "회의", "내일", "오전", "오후"],
-        "학습": ["강의", "공부", "코딩", "tutorial", "교육"],
-        "건강": ["운동", "헬스", "다이어트", "건강"],
-        "읽을거리": ["블로그", "뉴스", "기사", "글"]
-    }
-
-    for category, kws in keywords.items():
-        if any(kw in content_lower for kw in kws):
-            return {"category": category, "tags": [category], "summary": content[:30]}
+    # 키워드 기반 (1회 스캔으로 전체 카테고리 점수화, 최고점 선택)
+    candidates = rank_rule_categories(content)
+    if candidates:
+        category = candidates[0]["category"]
+        return {"category": category, "tags": [category], "summary": content[:30]}
 
     return {"category": "기타", "tags": [], "summary": content[:30]}
 
 
-# get_category_emoji는 constants.py에서 import하여 재export
-from .constants import get_category_emoji, CATEGORY_EMOJIS, CATEGORIES
+def rank_rule_categories(content: str) -> list:
+    """키워드 테이블 기반 카테고리 후보 (점수순, 근거 키워드 포함)
+
+    Returns: [{"category": "맛집", "score": 2, "evidence": {"맛집": 1, "카페": 1}}, ...]
+    """
+    return match_keywords(RULE_KEYWORD_MATCHER, content)
+
+
+# get_category_emoji는 constants.py에서 import하여 재export (CATEGORIES는 맨 위에서 import)
+from .constants import get_category_emoji, CATEGORY_EMOJIS
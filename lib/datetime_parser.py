@@ -1,43 +1,157 @@
 """
 날짜/시간 파싱 모듈
 한국어 자연어에서 날짜와 시간 추출
+
+한 번 컴파일한 토크나이저(DATETIME_TOKEN_PATTERN)로 텍스트를 한 번만 훑어
+날짜/시간 토큰(종류, 위치, 값)을 만들고, 파싱과 리마인더 문구 정리에 같이 사용
+
+반복 리마인더 ("매일 아침 8시", "매주 월요일 9시", "매달 25일")는 규칙 dict로 저장하고
+next_occurrence()로 다음 발송 시각만 계산 (reminders:pending에는 다음 1회만 등록)
+반복 표현만으로는 할일로 보지 않음 - is_recurring_todo(): 시각 명시 + 할일 단서
+("매주 월요일 휴무", "매일 10시 오픈하는 빵집" 같은 가게 정보 제외)
+
+한 메모에 여러 일정 ("월요일 3시 치과, 수요일 7시 저녁약속")은 extract_reminders()가
+쉼표/줄바꿈 조각별 토큰 위치로 나눠 일정마다 리마인더 하나씩 반환
+
+now를 주지 않으면 유저 시간대(lib/localtime.py)의 현재 시각 기준 → 결과는 aware datetime
 """
 import re
+import calendar
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
-
-
-def parse_datetime(text: str) -> Optional[datetime]:
+from typing import List, Optional, Tuple
+
+from .localtime import local_now, to_local
+
+WEEKDAY_NUMBERS = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
+RELATIVE_DAYS = {"오늘": 0, "내일": 1, "모레": 2, "글피": 3}
+RECURRENCE_FREQUENCIES = {"매일": "daily", "매주": "weekly", "매달": "monthly", "매월": "monthly"}
+WEEKDAY_NAMES = ["월", "화", "수", "목", "금", "토", "일"]
+PM_WORDS = ("오후", "저녁", "밤")
+AM_WORDS = ("오전", "아침")
+
+# 같은 위치에서는 위에 있는 대안이 우선 ("3시 30분" > "3시 반" > "3시")
+DATETIME_TOKEN_PATTERN = re.compile(r"""
+    (?P<url>https?://\S+)                                          # URL 안 숫자는 날짜가 아님 (정리 대상 아님)
+  | (?P<month_day>(?<!\d)(?P<md_month>\d{1,2})월\s*(?P<md_day>\d{1,2})일)
+  | (?P<slash_date>(?<!\d)(?P<sd_month>\d{1,2})/(?P<sd_day>\d{1,2})(?!\d))
+  | (?P<dash_date>(?<!\d)(?P<dd_month>\d{1,2})-(?P<dd_day>\d{1,2})(?!\d))
+  | (?P<hour_minute>(?<!\d)(?P<hm_hour>\d{1,2})시\s*(?P<hm_minute>\d{1,2})분)
+  | (?P<half_hour>(?<!\d)(?P<hh_hour>\d{1,2})시\s*반)
+  | (?P<hour>(?<!\d)(?P<h_hour>\d{1,2})시(?!간))                  # "3시간"은 시각 아님
+  | (?P<clock>(?<!\d)(?P<cl_hour>\d{1,2}):(?P<cl_minute>\d{2}))
+  | (?P<recurrence>(?P<rec_word>매일|매주|매달|매월)
+        (?:\s*(?P<rec_weekday>[월화수목금토일])(?:요일)?(?![가-힣])       # "매주 월요일", "매주 월"
+         |\s*(?P<rec_day>\d{1,2})일)?)                                # "매달 25일"
+  | (?P<relative_day>오늘|내일|모레|글피)
+  | (?P<week>(?P<week_which>이번|다음)\s*주
+        (?:\s*(?P<week_day>[월화수목금토일])(?:요일)?(?![가-힣]))?)  # "다음주 금", "다음주 금요일"
+  | (?P<month>(?P<month_which>이번|다음)\s*달)
+  | (?P<weekday>(?P<wd_day>[월화수목금토일])요일)                   # 한 글자 요일은 주 표현 뒤에서만
+  | (?P<meridiem>오전|오후|아침|저녁|밤)
+  | (?P<deadline>까지|전에|마감)
+""", re.VERBOSE)
+
+# 명시 날짜 우선순위 (앞 형식이 유효하지 않으면 다음 형식)
+DATE_TOKEN_KINDS = ("month_day", "slash_date", "dash_date")
+# 시각 우선순위 ("3시 회의 후 5시 30분"은 5시 30분)
+TIME_TOKEN_KINDS = ("hour_minute", "half_hour", "hour", "clock")
+# 다음 조각에 시각만 있으면 이어받는 날짜 ("월요일 3시 치과, 5시 미용실")
+DATE_CONTEXT_KINDS = DATE_TOKEN_KINDS + ("relative_day", "week", "month", "weekday")
+# 이 중 하나가 있어야 일정 조각 (오전/오후, 까지/마감만 있는 조각은 앞 일정의 설명)
+SCHEDULE_TOKEN_KINDS = DATE_CONTEXT_KINDS + TIME_TOKEN_KINDS + ("recurrence",)
+
+# 일정 구분 (URL 안 쉼표는 구분자가 아님, "회의, 그리고 5시"의 쉼표+그리고는 구분자 하나)
+SEGMENT_SEPARATOR_PATTERN = re.compile(r"https?://\S+|[,;，\n]+\s*(?:그리고\s)?|\s그리고\s")
+
+# 반복 일정을 할일로 볼 단서 (동작/챙길 일) - 가게 영업 정보 등은 해당 없음
+TODO_CUE_PATTERN = re.compile(
+    r"하기|해야|할\s?것|할일|챙기|잊지|까먹지|알림|알려|리마인드|먹기|내기|보내기|납부|제출|확인|"
+    r"회의|약속|예약|운동|복용|(?<!\S)약(?!\S)"
+)
+
+
+def tokenize_datetime(text: str) -> List[tuple]:
+    """날짜/시간 토큰 [(종류, 시작, 끝, 값)] - 텍스트를 한 번만 훑음
+
+    값: 날짜 (월, 일) / 시각 (시, 분) / relative_day 일수 / weekday 요일 번호
+        week·month ("이번"|"다음", 요일 번호 또는 None) / meridiem·deadline 원문
+        recurrence (daily|weekly|monthly, 요일 번호 또는 날짜 또는 None)
+    """
+    tokens = []
+    for match in DATETIME_TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        group = match.group
+        if kind == "url":
+            continue
+        if kind == "month_day":
+            value = (int(group("md_month")), int(group("md_day")))
+        elif kind == "slash_date":
+            value = (int(group("sd_month")), int(group("sd_day")))
+        elif kind == "dash_date":
+            value = (int(group("dd_month")), int(group("dd_day")))
+        elif kind == "hour_minute":
+            value = (int(group("hm_hour")), int(group("hm_minute")))
+        elif kind == "half_hour":
+            value = (int(group("hh_hour")), 30)
+        elif kind == "hour":
+            value = (int(group("h_hour")), 0)
+        elif kind == "clock":
+            value = (int(group("cl_hour")), int(group("cl_minute")))
+        elif kind == "recurrence":
+            frequency = RECURRENCE_FREQUENCIES[group("rec_word")]
+            if group("rec_weekday") and frequency == "weekly":
+                value = (frequency, WEEKDAY_NUMBERS[group("rec_weekday")])
+            elif group("rec_day") and frequency == "monthly":
+                value = (frequency, int(group("rec_day")))
+            else:
+                value = (frequency, None)
+        elif kind == "relative_day":
+            value = RELATIVE_DAYS[group(kind)]
+        elif kind == "week":
+            week_day = group("week_day")
+            value = (group("week_which"), WEEKDAY_NUMBERS[week_day] if week_day else None)
+        elif kind == "month":
+            value = (group("month_which"), None)
+        elif kind == "weekday":
+            value = WEEKDAY_NUMBERS[group("wd_day")]
+        else:
+            value = group(kind)
+        tokens.append((kind, match.start(), match.end(), value))
+    return tokens
+
+
+def parse_datetime(text: str, now: datetime = None) -> Optional[datetime]:
     """
     텍스트에서 날짜/시간 추출
 
     지원하는 표현:
-    - 날짜: 오늘, 내일, 모레, 글피, 이번주 X요일, 다음주 X요일
-    - 시간: X시, 오전/오후 X시, X시 반, X시 X분
+    - 날짜: 오늘, 내일, 모레, 글피, 이번주 X요일, 다음주 X요일, X월 X일, X/X
+    - 시간: X시, 오전/오후 X시, X시 반, X시 X분, HH:MM
     - 복합: 내일 3시, 다음주 월요일 오후 2시
 
     Returns:
         datetime 객체 또는 None
     """
-    text = text.lower().strip()
+    return resolve_datetime(tokenize_datetime(text), now)
 
-    # 날짜 파싱
-    date = parse_date(text)
 
-    # 시간 파싱
-    time = parse_time(text)
+def resolve_datetime(tokens: List[tuple], now: datetime = None) -> Optional[datetime]:
+    """토큰 → datetime (날짜만 있으면 오전 9시, 시각만 있으면 오늘/지났으면 내일)"""
+    now = now or local_now()
+    date = _resolve_date(tokens, now)
+    time = _resolve_time(tokens)
 
     if date is None and time is None:
         return None
 
     # 날짜만 있으면 오전 9시 기본값
-    if date and time is None:
+    if time is None:
         return date.replace(hour=9, minute=0, second=0, microsecond=0)
 
+    hour, minute = time
+
     # 시간만 있으면 오늘 또는 내일
-    if time and date is None:
-        now = datetime.now()
-        hour, minute = time
+    if date is None:
         result = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
         # 이미 지난 시간이면 내일로
         if result <= now:
@@ -45,152 +159,222 @@ def parse_datetime(text: str) -> Optional[datetime]:
         return result
 
     # 둘 다 있으면 합치기
-    if date and time:
-        hour, minute = time
-        return date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-
-    return None
+    return date.replace(hour=hour, minute=minute, second=0, microsecond=0)
 
 
-def parse_date(text: str) -> Optional[datetime]:
+def parse_date(text: str, now: datetime = None) -> Optional[datetime]:
     """날짜 파싱"""
-    now = datetime.now()
-    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return _resolve_date(tokenize_datetime(text), now or local_now())
 
-    # 오늘/내일/모레/글피
-    if "오늘" in text:
-        return today
-    if "내일" in text:
-        return today + timedelta(days=1)
-    if "모레" in text:
-        return today + timedelta(days=2)
-    if "글피" in text:
-        return today + timedelta(days=3)
-
-    # 요일 처리
-    weekdays = {
-        "월요일": 0, "월": 0,
-        "화요일": 1, "화": 1,
-        "수요일": 2, "수": 2,
-        "목요일": 3, "목": 3,
-        "금요일": 4, "금": 4,
-        "토요일": 5, "토": 5,
-        "일요일": 6, "일": 6,
-    }
 
-    for day_name, day_num in weekdays.items():
-        if day_name in text:
-            # 다음주 X요일
-            if "다음주" in text or "다음 주" in text:
-                days_ahead = day_num - today.weekday()
-                if days_ahead <= 0:
-                    days_ahead += 7
-                days_ahead += 7  # 다음주니까 +7
-                return today + timedelta(days=days_ahead)
-
-            # 이번주 X요일 또는 그냥 X요일
-            days_ahead = day_num - today.weekday()
-            if days_ahead < 0:  # 이미 지난 요일이면 다음주
+def parse_time(text: str) -> Optional[Tuple[int, int]]:
+    """시간 파싱 -> (hour, minute) 튜플"""
+    return _resolve_time(tokenize_datetime(text))
+
+
+def _resolve_date(tokens: List[tuple], now: datetime) -> Optional[datetime]:
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    relative_days, weekdays, weeks, months = [], [], [], []
+    dates = {}
+    for kind, _, _, value in tokens:
+        if kind == "relative_day":
+            relative_days.append(value)
+        elif kind == "weekday":
+            weekdays.append(value)
+        elif kind == "week":
+            weeks.append(value[0])
+            if value[1] is not None:
+                weekdays.append(value[1])
+        elif kind == "month":
+            months.append(value[0])
+        elif kind in DATE_TOKEN_KINDS:
+            dates.setdefault(kind, value)
+
+    # 오늘/내일/모레/글피 (여러 개면 가까운 날)
+    if relative_days:
+        return today + timedelta(days=min(relative_days))
+
+    # 요일 (여러 개면 주 앞쪽 요일)
+    if weekdays:
+        day_num = min(weekdays)
+        days_ahead = day_num - today.weekday()
+        # 다음주 X요일
+        if "다음" in weeks:
+            if days_ahead <= 0:
                 days_ahead += 7
-            elif days_ahead == 0:  # 오늘이면 오늘
-                pass
-            return today + timedelta(days=days_ahead)
-
-    # 이번주/다음주/이번달/다음달
-    if "이번주" in text or "이번 주" in text:
-        # 이번주 일요일 (주의 마지막)
-        days_ahead = 6 - today.weekday()
+            return today + timedelta(days=days_ahead + 7)
+        # 이번주 X요일 또는 그냥 X요일 (이미 지난 요일이면 다음주, 오늘이면 오늘)
+        if days_ahead < 0:
+            days_ahead += 7
         return today + timedelta(days=days_ahead)
 
-    if "다음주" in text or "다음 주" in text:
-        # 다음주 월요일
-        days_ahead = 7 - today.weekday()
-        return today + timedelta(days=days_ahead)
+    # 이번주 (일요일, 주의 마지막) / 다음주 (월요일)
+    if "이번" in weeks:
+        return today + timedelta(days=6 - today.weekday())
+    if "다음" in weeks:
+        return today + timedelta(days=7 - today.weekday())
 
-    if "이번달" in text or "이번 달" in text:
-        # 이번달 말일
+    # 이번달 (말일) / 다음달 (1일)
+    if "이번" in months:
         next_month = today.replace(day=28) + timedelta(days=4)
-        last_day = next_month - timedelta(days=next_month.day)
-        return last_day
-
-    if "다음달" in text or "다음 달" in text:
-        # 다음달 1일
+        return next_month - timedelta(days=next_month.day)
+    if "다음" in months:
         if today.month == 12:
             return today.replace(year=today.year + 1, month=1, day=1)
         return today.replace(month=today.month + 1, day=1)
 
-    # 특정 날짜 패턴: X월 X일, X/X, X-X
-    date_patterns = [
-        r'(\d{1,2})월\s*(\d{1,2})일',  # 1월 15일
-        r'(\d{1,2})/(\d{1,2})',  # 1/15
-        r'(\d{1,2})-(\d{1,2})',  # 1-15
-    ]
-
-    for pattern in date_patterns:
-        match = re.search(pattern, text)
-        if match:
-            month = int(match.group(1))
-            day = int(match.group(2))
-            try:
-                result = today.replace(month=month, day=day)
-                # 이미 지난 날짜면 내년
-                if result < today:
-                    result = result.replace(year=result.year + 1)
-                return result
-            except ValueError:
-                pass
+    # 특정 날짜: X월 X일, X/X, X-X
+    for kind in DATE_TOKEN_KINDS:
+        if kind not in dates:
+            continue
+        month, day = dates[kind]
+        try:
+            result = today.replace(month=month, day=day)
+        except ValueError:
+            continue
+        # 이미 지난 날짜면 내년
+        if result < today:
+            result = result.replace(year=result.year + 1)
+        return result
 
     return None
 
 
-def parse_time(text: str) -> Optional[Tuple[int, int]]:
-    """시간 파싱 -> (hour, minute) 튜플"""
+def _resolve_time(tokens: List[tuple]) -> Optional[Tuple[int, int]]:
+    times = {}
+    meridiems = set()
+    for kind, _, _, value in tokens:
+        if kind in TIME_TOKEN_KINDS:
+            times.setdefault(kind, value)
+        elif kind == "meridiem":
+            meridiems.add(value)
+
+    kind = next((kind for kind in TIME_TOKEN_KINDS if kind in times), None)
+    if kind is None:
+        return None
+    hour, minute = times[kind]
 
     # 오전/오후 처리
-    is_pm = "오후" in text or "저녁" in text or "밤" in text
-    is_am = "오전" in text or "아침" in text
-
-    # 시간 패턴들
-    patterns = [
-        r'(\d{1,2})시\s*(\d{1,2})분',  # 3시 30분
-        r'(\d{1,2})시\s*반',  # 3시 반
-        r'(\d{1,2})시',  # 3시
-        r'(\d{1,2}):(\d{2})',  # 15:30
-    ]
+    is_pm = any(word in meridiems for word in PM_WORDS)
+    is_am = any(word in meridiems for word in AM_WORDS)
+    if is_pm and hour < 12:
+        hour += 12
+    elif is_am and hour == 12:
+        hour = 0
+    # 애매한 경우 (오전/오후 명시 안됨): 1~6시는 오후로 추정 (낮 시간대)
+    elif not is_am and not is_pm and 1 <= hour <= 6:
+        hour += 12
+
+    # "25시", "3시 75분" 같은 표현은 시각으로 보지 않음
+    if hour > 23 or minute > 59:
+        return None
+    return (hour, minute)
 
-    for i, pattern in enumerate(patterns):
-        match = re.search(pattern, text)
-        if match:
-            hour = int(match.group(1))
-
-            if i == 0:  # X시 X분
-                minute = int(match.group(2))
-            elif i == 1:  # X시 반
-                minute = 30
-            elif i == 2:  # X시
-                minute = 0
-            elif i == 3:  # HH:MM
-                minute = int(match.group(2))
-            else:
-                minute = 0
 
-            # 오전/오후 변환
-            if is_pm and hour < 12:
-                hour += 12
-            elif is_am and hour == 12:
-                hour = 0
-            # 애매한 경우 (오전/오후 명시 안됨)
-            elif not is_am and not is_pm:
-                # 1~6시는 오후로 추정 (낮 시간대)
-                if 1 <= hour <= 6:
-                    hour += 12
+def resolve_recurrence(tokens: List[tuple], now: datetime = None) -> Optional[dict]:
+    """토큰 → 반복 규칙 {"freq", "hour", "minute", ["weekday" | "day"]}
+
+    시각/요일/날짜 중 하나는 있어야 반복 리마인더로 봄 ("매일 운동"은 일반 메모)
+    요일/날짜가 없으면 오늘 기준 ("매주 3시" → 매주 오늘 요일), 시각이 없으면 오전 9시
+    """
+    recurrence = next((value for kind, _, _, value in tokens if kind == "recurrence"), None)
+    if recurrence is None:
+        return None
+    now = now or local_now()
+    frequency, anchor = recurrence
 
-            return (hour, minute)
+    if frequency == "weekly" and anchor is None:
+        weekdays = [value for kind, _, _, value in tokens if kind == "weekday"]
+        anchor = min(weekdays) if weekdays else None
+    if frequency == "monthly" and anchor is not None and not 1 <= anchor <= 31:
+        return None
 
-    return None
+    time = _resolve_time(tokens)
+    if time is None and anchor is None:
+        return None
+    hour, minute = time or (9, 0)
 
+    rule = {"freq": frequency, "hour": hour, "minute": minute}
+    if frequency == "weekly":
+        rule["weekday"] = anchor if anchor is not None else now.weekday()
+    elif frequency == "monthly":
+        rule["day"] = anchor if anchor is not None else now.day
+    return rule
 
-def extract_reminder_info(text: str) -> dict:
+
+def parse_recurrence(text: str, now: datetime = None) -> Optional[dict]:
+    """반복 규칙 파싱 ("매주 월요일 9시" → {"freq": "weekly", "weekday": 0, "hour": 9, "minute": 0})"""
+    return resolve_recurrence(tokenize_datetime(text), now)
+
+
+def next_occurrence(rule: dict, after: datetime) -> datetime:
+    """after 이후(초과) 첫 발송 시각
+
+    발송이 밀렸어도 지난 회차를 몰아 보내지 않도록 항상 after 이후 1회만 계산
+    매달 31일처럼 없는 날짜는 그 달 말일
+    """
+    candidate = after.replace(hour=rule["hour"], minute=rule["minute"], second=0, microsecond=0)
+    frequency = rule["freq"]
+
+    if frequency == "daily":
+        if candidate <= after:
+            candidate += timedelta(days=1)
+        return candidate
+
+    if frequency == "weekly":
+        candidate += timedelta(days=(rule["weekday"] - after.weekday()) % 7)
+        if candidate <= after:
+            candidate += timedelta(days=7)
+        return candidate
+
+    # monthly: 이번 달 → 다음 달
+    year, month = after.year, after.month
+    while True:
+        day = min(rule["day"], calendar.monthrange(year, month)[1])
+        candidate = candidate.replace(year=year, month=month, day=day)
+        if candidate > after:
+            return candidate
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def format_recurrence(rule: dict) -> str:
+    """반복 규칙을 읽기 좋게 ("매주 월요일 오전 9시")"""
+    frequency = rule.get("freq")
+    if frequency == "weekly":
+        date_str = f"매주 {WEEKDAY_NAMES[rule['weekday']]}요일"
+    elif frequency == "monthly":
+        date_str = f"매달 {rule['day']}일"
+    else:
+        date_str = "매일"
+    return f"{date_str} {_format_clock(rule['hour'], rule['minute'])}"
+
+
+def strip_datetime_tokens(text: str, tokens: List[tuple]) -> str:
+    """날짜/시간 표현을 뺀 핵심 문구 (토큰 위치로 한 번에 잘라냄, 공백 정리)"""
+    parts = []
+    position = 0
+    for _, start, end, _ in tokens:
+        parts.append(text[position:start])
+        position = end
+    parts.append(text[position:])
+    return " ".join("".join(parts).split())
+
+
+def is_recurring_todo(text: str) -> bool:
+    """반복 표현이 할일인지 - 시각이 명시되고 할일 단서가 있을 때만
+
+    "매주 월요일 9시 회의" → True, "매일 10시 오픈하는 빵집"/"매주 월요일 휴무" → False
+    """
+    tokens = tokenize_datetime(text)
+    if not any(kind == "recurrence" for kind, _, _, _ in tokens):
+        return False
+    if not any(kind in TIME_TOKEN_KINDS for kind, _, _, _ in tokens):
+        return False
+    return bool(TODO_CUE_PATTERN.search(strip_datetime_tokens(text, tokens)))
+
+
+def extract_reminder_info(text: str, now: datetime = None) -> dict:
     """
     텍스트에서 리마인더 정보 추출
 
@@ -198,44 +382,103 @@ def extract_reminder_info(text: str) -> dict:
         {
             "reminder_at": datetime or None,
             "reminder_text": str (시간 표현 제거된 텍스트),
-            "has_time": bool
+            "has_time": bool,
+            "recurrence": dict or None (반복 규칙, 있으면 reminder_at은 첫 발송 시각)
         }
     """
-    reminder_at = parse_datetime(text)
-
-    # 시간 관련 키워드 제거하여 핵심 내용 추출
-    time_keywords = [
-        r'\d{1,2}월\s*\d{1,2}일',
-        r'\d{1,2}/\d{1,2}',
-        r'\d{1,2}-\d{1,2}',
-        r'오전|오후|아침|저녁|밤',
-        r'\d{1,2}시\s*\d{0,2}분?',
-        r'\d{1,2}시\s*반',
-        r'\d{1,2}:\d{2}',
-        r'오늘|내일|모레|글피',
-        r'이번\s*주|다음\s*주|이번주|다음주',
-        r'이번\s*달|다음\s*달|이번달|다음달',
-        r'월요일|화요일|수요일|목요일|금요일|토요일|일요일',
-        r'까지|전에|마감',
-    ]
+    return _reminder_from_tokens(text, tokenize_datetime(text), now or local_now())
 
-    cleaned_text = text
-    for pattern in time_keywords:
-        cleaned_text = re.sub(pattern, '', cleaned_text)
 
-    # 공백 정리
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
+def extract_reminders(text: str, now: datetime = None) -> List[dict]:
+    """
+    텍스트의 모든 일정을 리마인더로 추출 (extract_reminder_info 형식의 리스트, 없으면 [])
+
+    토큰화는 전체 텍스트에 한 번, 쉼표/줄바꿈/"그리고"로 나눈 조각에 토큰을 위치로 배분
+    - 날짜/시각이 없는 조각은 앞 일정의 설명으로 붙임 (맨 앞이면 첫 일정에)
+    - 시각만 있는 조각은 앞 일정의 날짜를 이어받음
+    - 일정이 하나뿐이면 extract_reminder_info(text)와 같은 결과
+    """
+    now = now or local_now()
+    tokens = tokenize_datetime(text)
+
+    groups = []        # [시작, 끝, 일정 조각 여부]
+    for start, end in _segment_spans(text):
+        has_schedule = any(
+            start <= token[1] < end and token[0] in SCHEDULE_TOKEN_KINDS for token in tokens
+        )
+        if groups and not (has_schedule and groups[-1][2]):
+            # 설명 조각은 앞 조각에, 앞이 설명뿐이었으면 이 일정 조각과 합침
+            groups[-1][1] = end
+            groups[-1][2] = groups[-1][2] or has_schedule
+        else:
+            groups.append([start, end, has_schedule])
+
+    if len(groups) <= 1:
+        info = _reminder_from_tokens(text, tokens, now)
+        return [info] if info["has_time"] else []
+
+    reminders = []
+    date_context = []
+    for start, end, _ in groups:
+        segment = text[start:end]
+        segment_tokens = [
+            (kind, token_start - start, token_end - start, value)
+            for kind, token_start, token_end, value in tokens if start <= token_start < end
+        ]
+        if any(token[0] in DATE_CONTEXT_KINDS for token in segment_tokens):
+            date_context = [token for token in segment_tokens if token[0] in DATE_CONTEXT_KINDS]
+        info = _reminder_from_tokens(segment, segment_tokens, now, date_context)
+        if info["has_time"]:
+            # "치과: 월요일 3시" → "치과"
+            info["reminder_text"] = info["reminder_text"].strip(" :-·")
+            reminders.append(info)
+    return reminders
+
+
+def _segment_spans(text: str) -> List[Tuple[int, int]]:
+    spans = []
+    position = 0
+    for match in SEGMENT_SEPARATOR_PATTERN.finditer(text):
+        if match.group().startswith("http"):
+            continue
+        spans.append((position, match.start()))
+        position = match.end()
+    spans.append((position, len(text)))
+    return spans
+
+
+def _reminder_from_tokens(
+    text: str,
+    tokens: List[tuple],
+    now: datetime,
+    date_context: List[tuple] = ()
+) -> dict:
+    """토큰 → 리마인더 정보 (date_context: 조각에 날짜가 없을 때 이어받을 날짜 토큰)"""
+    schedule_tokens = tokens
+    if date_context and not any(token[0] in DATE_CONTEXT_KINDS for token in tokens):
+        schedule_tokens = list(date_context) + list(tokens)
+
+    recurrence = resolve_recurrence(schedule_tokens, now)
+    if recurrence:
+        reminder_at = next_occurrence(recurrence, now)
+    else:
+        reminder_at = resolve_datetime(schedule_tokens, now)
+
+    # 시간 관련 표현(까지/전에/마감 포함) 제거하여 핵심 내용 추출
+    cleaned_text = strip_datetime_tokens(text, tokens)
 
     return {
         "reminder_at": reminder_at,
         "reminder_text": cleaned_text if cleaned_text else text,
-        "has_time": reminder_at is not None
+        "has_time": reminder_at is not None,
+        "recurrence": recurrence
     }
 
 
 def format_reminder_time(dt: datetime) -> str:
-    """리마인더 시간을 읽기 좋게 포맷"""
-    now = datetime.now()
+    """리마인더 시간을 읽기 좋게 포맷 (유저 시간대 기준, naive는 유저 시간대 시각으로 해석)"""
+    dt = to_local(dt)
+    now = local_now()
     today = now.replace(hour=0, minute=0, second=0, microsecond=0)
     target_day = dt.replace(hour=0, minute=0, second=0, microsecond=0)
 
@@ -249,15 +492,15 @@ def format_reminder_time(dt: datetime) -> str:
     elif diff_days == 2:
         date_str = "모레"
     elif diff_days < 7:
-        weekdays = ["월", "화", "수", "목", "금", "토", "일"]
-        date_str = f"{weekdays[dt.weekday()]}요일"
+        date_str = f"{WEEKDAY_NAMES[dt.weekday()]}요일"
     else:
         date_str = f"{dt.month}월 {dt.day}일"
 
-    # 시간 부분
-    hour = dt.hour
-    minute = dt.minute
+    return f"{date_str} {_format_clock(dt.hour, dt.minute)}"
+
 
+def _format_clock(hour: int, minute: int) -> str:
+    """시각 부분 ("오전 9시", "낮 12시", "오후 2시 30분")"""
     if hour < 12:
         time_str = f"오전 {hour}시"
     elif hour == 12:
@@ -268,7 +511,7 @@ def format_reminder_time(dt: datetime) -> str:
     if minute > 0:
         time_str += f" {minute}분"
 
-    return f"{date_str} {time_str}"
+    return time_str
 
 
 # 테스트
@@ -282,6 +525,9 @@ if __name__ == "__main__":
         "3시까지 보고서 제출",
         "아침 9시 운동",
         "저녁 7시 저녁약속",
+        "매주 월요일 9시 회의",
+        "매일 아침 8시 약",
+        "매달 25일 월세",
     ]
 
     for text in test_cases:
@@ -290,4 +536,6 @@ if __name__ == "__main__":
         print(f"  시간: {result['reminder_at']}")
         if result['reminder_at']:
             print(f"  포맷: {format_reminder_time(result['reminder_at'])}")
+        if result['recurrence']:
+            print(f"  반복: {format_recurrence(result['recurrence'])}")
         print(f"  내용: {result['reminder_text']}")
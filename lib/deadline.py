@@ -0,0 +1,61 @@
+"""
+요청 단위 마감 시간 (contextvars)
+skill_handler/mcp_handler에서 설정하면 같은 요청 안의 Redis/메타데이터/OpenAI 호출이
+남은 시간에 맞춰 타임아웃을 줄이거나 선택 작업을 건너뛴다.
+
+- 마감 시간이 없으면(크론/백그라운드) 모든 호출은 기본 타임아웃 그대로
+- asyncio 태스크는 생성 시점의 컨텍스트를 복사하므로 동시 추출에도 전파됨
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# time.monotonic() 기준 마감 시각 (None = 제한 없음)
+_deadline: ContextVar = ContextVar("request_deadline", default=None)
+
+
+def start_deadline(seconds: float):
+    """마감 시간 설정 - 반환된 토큰으로 reset_deadline() 호출"""
+    return _deadline.set(time.monotonic() + seconds)
+
+
+def reset_deadline(token) -> None:
+    """start_deadline() 이전 상태로 복원 (응답 후 백그라운드 작업은 제한 없음)"""
+    _deadline.reset(token)
+
+
+@contextmanager
+def request_deadline(seconds: float):
+    """with 블록 동안 마감 시간 적용"""
+    token = start_deadline(seconds)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간 (초, 마감 없으면 None)"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def fit_timeout(default: float, reserve: float = 0.0, minimum: float = 0.1) -> float:
+    """남은 시간에 맞춘 타임아웃
+
+    reserve: 이 호출 뒤에 남겨둘 시간 (응답 생성 등)
+    minimum: 마감이 지났어도 최소 이만큼은 시도 (즉시 실패 후 폴백)
+    """
+    left = remaining()
+    if left is None:
+        return default
+    return max(minimum, min(default, left - reserve))
+
+
+def has_time(seconds: float) -> bool:
+    """선택 작업을 할 시간이 남았는지 (마감 없으면 항상 True)"""
+    left = remaining()
+    return left is None or left >= seconds
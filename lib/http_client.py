@@ -0,0 +1,171 @@
+"""
+공유 HTTP 클라이언트 레지스트리
+서비스(호스트)별 커넥션 풀을 재사용해 매 호출마다 DNS/TCP/TLS를 반복하지 않음
+
+- get_http_client("openai" | "kakao" | "redis" | "metadata")
+- FastAPI lifespan에서 close_http_clients()로 정리
+- get_http_metrics()로 풀 사용률 확인
+"""
+import time
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+
+# HTTP/2 (h2 패키지 설치 시에만 활성화)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# 클라이언트 프로필: 호스트 특성에 맞춘 타임아웃/풀 크기
+CLIENT_PROFILES = {
+    # OpenAI - 응답이 느리므로 read 타임아웃 길게, 연결은 빠르게 실패
+    "openai": {
+        "timeout": httpx.Timeout(10.0, connect=3.0),
+        "limits": httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0),
+    },
+    # 카카오 API (kapi/kauth)
+    "kakao": {
+        "timeout": httpx.Timeout(10.0, connect=3.0),
+        "limits": httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60.0),
+    },
+    # Upstash Redis REST - 요청당 여러 번 호출되는 가장 빈번한 호스트
+    "redis": {
+        "timeout": httpx.Timeout(5.0, connect=2.0),
+        "limits": httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=120.0),
+    },
+    # 메타데이터 추출 (임의 호스트 + oEmbed) - 리다이렉트 따라감
+    "metadata": {
+        "timeout": httpx.Timeout(10.0, connect=3.0),
+        "limits": httpx.Limits(max_connections=30, max_keepalive_connections=10, keepalive_expiry=30.0),
+        "follow_redirects": True,
+    },
+}
+
+# {name: (event_loop, client)} - 이벤트 루프가 바뀌면 새로 생성
+_clients = {}
+
+# {name: {"requests", "errors", "in_flight", "peak_in_flight", "total_ms"}}
+_metrics = {}
+
+
+class _MeteredTransport(httpx.AsyncHTTPTransport):
+    """요청 수/진행 중 요청/지연시간을 기록하는 트랜스포트"""
+
+    def __init__(self, name: str, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        metrics = _metrics.setdefault(self.name, _new_metrics())
+        metrics["requests"] += 1
+        metrics["in_flight"] += 1
+        metrics["peak_in_flight"] = max(metrics["peak_in_flight"], metrics["in_flight"])
+        started = time.monotonic()
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            metrics["errors"] += 1
+            raise
+        finally:
+            metrics["in_flight"] -= 1
+            metrics["total_ms"] += (time.monotonic() - started) * 1000
+
+
+def _new_metrics() -> dict:
+    return {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0, "total_ms": 0.0}
+
+
+def _current_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """이름별 공유 AsyncClient 반환 (없으면 생성)
+
+    호출부는 `async with`로 닫지 말고 그대로 사용한다.
+    """
+    loop = _current_loop()
+    entry = _clients.get(name)
+    if entry and entry[0] is loop and not entry[1].is_closed:
+        return entry[1]
+
+    profile = CLIENT_PROFILES.get(name, CLIENT_PROFILES["metadata"])
+    transport = _MeteredTransport(
+        name,
+        http2=HTTP2_AVAILABLE,
+        limits=profile["limits"],
+        retries=1,  # 연결 실패(재사용 커넥션 끊김 등) 1회 재시도
+    )
+    client = httpx.AsyncClient(
+        transport=transport,
+        timeout=profile["timeout"],
+        follow_redirects=profile.get("follow_redirects", False),
+    )
+    _clients[name] = (loop, client)
+    _metrics.setdefault(name, _new_metrics())
+    return client
+
+
+async def close_http_clients() -> None:
+    """모든 공유 클라이언트 종료 (lifespan 종료 시)"""
+    loop = _current_loop()
+    for name, (client_loop, client) in list(_clients.items()):
+        if client_loop is loop and not client.is_closed:
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"[HTTP] Close error ({name}): {e}")
+    _clients.clear()
+
+
+@asynccontextmanager
+async def http_client_lifespan(app):
+    """FastAPI lifespan - 앱 종료 시 커넥션 풀 정리"""
+    yield
+    await close_http_clients()
+
+
+def get_http_metrics() -> dict:
+    """클라이언트별 요청 통계 + 커넥션 풀 사용률"""
+    result = {}
+    for name, metrics in _metrics.items():
+        requests = metrics["requests"]
+        item = {
+            "requests": requests,
+            "errors": metrics["errors"],
+            "in_flight": metrics["in_flight"],
+            "peak_in_flight": metrics["peak_in_flight"],
+            "avg_latency_ms": round(metrics["total_ms"] / requests, 1) if requests else 0.0,
+        }
+
+        entry = _clients.get(name)
+        if entry and not entry[1].is_closed:
+            max_connections = CLIENT_PROFILES.get(name, CLIENT_PROFILES["metadata"])["limits"].max_connections
+            connections = _pool_connections(entry[1])
+            idle = sum(1 for conn in connections if conn.is_idle())
+            active = len(connections) - idle
+            item["pool"] = {
+                "connections": len(connections),
+                "active": active,
+                "idle": idle,
+                "max": max_connections,
+                "utilization": round(active / max_connections, 3) if max_connections else 0.0,
+                "http2": HTTP2_AVAILABLE,
+            }
+        result[name] = item
+    return result
+
+
+def _pool_connections(client: httpx.AsyncClient) -> list:
+    """httpcore 커넥션 풀의 커넥션 목록 (구현 세부사항이라 실패 시 빈 목록)"""
+    try:
+        return list(client._transport._pool.connections)
+    except Exception:
+        return []
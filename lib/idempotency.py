@@ -0,0 +1,105 @@
+"""
+멱등 저장 (카카오 재시도/퀵리플라이 연타로 인한 중복 메모 방지)
+
+- 키: idem:{user_id}:{sha256(정규화 발화 + 저장 옵션)}, 짧은 TTL(IDEMPOTENCY_WINDOW)
+- SET NX GET 한 번으로 선점하거나 기존 기록을 읽음
+  - 기록 없음: 선점 성공 → 저장 후 record_idempotent_result()로 결과 기록
+  - "done": 첫 저장의 결과를 그대로 반환 (메타데이터/인덱스 재작업 없음)
+  - "pending": 첫 요청이 처리 중 → 마감 안에서 잠시 기다렸다가 결과 반환
+- Redis 오류 시에는 중복 방지 없이 저장 진행 (저장 자체를 막지 않음)
+"""
+import json
+import asyncio
+import hashlib
+import unicodedata
+from typing import Optional
+
+from .redis_db import redis_command
+from .deadline import has_time
+
+IDEMPOTENCY_PREFIX = "idem:"
+IDEMPOTENCY_WINDOW = 30        # 같은 발화를 중복으로 보는 시간 (초)
+IDEMPOTENCY_POLL = 0.3         # 처리 중 기록 재확인 간격 (초)
+IDEMPOTENCY_MAX_WAIT = 3.0     # 처리 중 기록을 기다리는 최대 시간 (초)
+
+PENDING = {"status": "pending"}
+
+
+def normalize_utterance(text: str) -> str:
+    """중복 판별용 정규화 (유니코드 NFC + 공백 정리, 대소문자는 유지)"""
+    text = unicodedata.normalize("NFC", text or "")
+    return " ".join(text.split())
+
+
+def idempotency_key(user_id: str, content: str, options: dict = None) -> str:
+    """idem:{user_id}:{sha256(정규화 발화 + 옵션)}"""
+    payload = normalize_utterance(content)
+    if options:
+        payload += "\n" + json.dumps(options, ensure_ascii=False, sort_keys=True)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+    return f"{IDEMPOTENCY_PREFIX}{user_id}:{digest}"
+
+
+def _parse_record(raw) -> Optional[dict]:
+    if not raw:
+        return None
+    try:
+        record = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    return record if isinstance(record, dict) else None
+
+
+async def claim_idempotency(key: str) -> Optional[dict]:
+    """선점 시도 (SET NX GET EX)
+
+    Returns: None = 선점 성공(처음 요청), dict = 기존 기록 ({"status": "pending"|"done", ...})
+    """
+    try:
+        previous = await redis_command(
+            "SET", key, json.dumps(PENDING), "NX", "GET", "EX", IDEMPOTENCY_WINDOW
+        )
+    except Exception as e:
+        print(f"[Idempotency] Claim error: {e}")
+        return None
+    return _parse_record(previous)
+
+
+async def wait_for_idempotent_result(key: str) -> Optional[dict]:
+    """처리 중인 첫 요청의 결과 대기 (마감/최대 대기 시간 안에서만)
+
+    Returns: "done" 기록 또는 None (아직 처리 중이거나 첫 요청이 실패해 기록이 사라짐)
+    """
+    waited = 0.0
+    while waited < IDEMPOTENCY_MAX_WAIT and has_time(IDEMPOTENCY_POLL + 1.0):
+        await asyncio.sleep(IDEMPOTENCY_POLL)
+        waited += IDEMPOTENCY_POLL
+        try:
+            record = _parse_record(await redis_command("GET", key))
+        except Exception as e:
+            print(f"[Idempotency] Poll error: {e}")
+            return None
+        if not record:
+            return None
+        if record.get("status") == "done":
+            return record
+    return None
+
+
+async def record_idempotent_result(key: str, result: dict) -> None:
+    """첫 요청의 결과 기록 (재시도는 이 결과를 그대로 받음)"""
+    record = {"status": "done", "result": result}
+    try:
+        await redis_command(
+            "SET", key, json.dumps(record, ensure_ascii=False), "EX", IDEMPOTENCY_WINDOW
+        )
+    except Exception as e:
+        print(f"[Idempotency] Record error: {e}")
+
+
+async def release_idempotency(key: str) -> None:
+    """저장 실패 시 선점 해제 (재시도가 다시 저장할 수 있도록)"""
+    try:
+        await redis_command("DEL", key)
+    except Exception as e:
+        print(f"[Idempotency] Release error: {e}")
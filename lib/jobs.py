@@ -0,0 +1,600 @@
+"""
+백그라운드 배치 작업 모듈
+api/cron.py에서 호출 (메타데이터 갱신, 백로그 재분류 등)
+"""
+import json
+import time
+import asyncio
+from datetime import datetime
+
+from .redis_db import (
+    redis_command,
+    redis_pipeline,
+    get_due_metadata_refreshes,
+    metadata_refresh_due,
+    patch_memos,
+    update_memos_batch,
+    METADATA_REFRESH_KEY
+)
+from .metadata import enrich_urls
+from .simhash import simhash_index_commands
+from .rollups import rebuild_rollups, ROLLUP_REBUILD_QUEUE
+from .tag_index import rebuild_tag_index, TAG_REBUILD_QUEUE
+from .memo_service import get_memo_link_urls, link_metadata_patch
+from .classifier import classify_memos_batch
+from .local_classifier import (
+    learning_commands,
+    merge_learning_commands,
+    max_model_fields,
+    prune_commands,
+    LEARN_QUEUE_KEY
+)
+
+
+# ============ 메타데이터 갱신 ============
+
+REFRESH_BATCH_SIZE = 50        # 배치당 메모 수
+REFRESH_CONCURRENCY = 6        # 동시 URL 추출 수
+REFRESH_TIME_BUDGET = 45.0     # 작업 전체 시간 예산 (초, 서버리스 제한 고려)
+
+
+async def refresh_stale_metadata(
+    batch_size: int = REFRESH_BATCH_SIZE,
+    concurrency: int = REFRESH_CONCURRENCY,
+    time_budget: float = REFRESH_TIME_BUDGET
+) -> dict:
+    """폴백/오래된 링크 메타데이터 재추출
+
+    metadata:refresh 인덱스에서 갱신 시각이 지난 메모만 배치로 가져와
+    (전체 스캔 없음) 사용자 간 중복 URL은 한 번만 추출하고,
+    결과는 배치마다 파이프라인 1번으로 반영한다.
+    - 작업 시작 시각까지 예정된 메모만 집고, 재예약은 그 이후로 (같은 실행에서 다시 처리하지 않음)
+    - 메타데이터 필드만 비교 후 교체 (추출 중 수정/삭제된 메모를 덮거나 되살리지 않음)
+    """
+    started = time.monotonic()
+    run_started = datetime.now().timestamp()
+    stats = {"batches": 0, "memos": 0, "urls": 0, "updated": 0, "failed": 0, "removed": 0}
+
+    while True:
+        remaining = time_budget - (time.monotonic() - started)
+        if remaining < 2:
+            break
+
+        members = await get_due_metadata_refreshes(batch_size, until=run_started)
+        if not members:
+            break
+
+        processed = await _refresh_metadata_batch(members, concurrency, remaining - 1, stats, run_started)
+        stats["batches"] += 1
+        if processed == 0:
+            break
+
+    stats["elapsed"] = round(time.monotonic() - started, 2)
+    print(f"[Jobs] Metadata refresh: {stats}")
+    return {"success": True, **stats}
+
+
+async def _refresh_metadata_batch(
+    members: list, concurrency: int, deadline: float, stats: dict, run_started: float
+) -> int:
+    """배치 1개 처리 - 처리(갱신/실패/제거)한 메모 수 반환"""
+    targets = []
+    for member in members:
+        user_id, _, memo_id = member.partition(":")
+        targets.append((member, user_id, memo_id))
+
+    batch_data = await redis_command("MGET", *[f"memo:{u}:{m}" for _, u, m in targets])
+
+    memos = []
+    removed = []
+    for (member, user_id, memo_id), memo_data in zip(targets, batch_data or []):
+        if not memo_data:
+            removed.append(member)  # 삭제된 메모
+            continue
+        memos.append((user_id, memo_id, memo_data, json.loads(memo_data)))
+
+    # 사용자 간 URL 중복 제거 후 한 번에 추출
+    unique_urls = list(dict.fromkeys(
+        url for _, _, _, memo in memos for url in get_memo_link_urls(memo.get("metadata"))
+    ))
+    enriched = await enrich_urls(
+        unique_urls, concurrency=concurrency, deadline=deadline, max_urls=len(unique_urls)
+    ) if unique_urls else []
+    by_url = {m["url"]: m for m in enriched}
+
+    if removed:
+        await redis_command("ZREM", METADATA_REFRESH_KEY, *removed)
+
+    # 추출 결과는 링크별로 병합 (폴백이 된 링크는 기존 항목 유지 + 재시도 횟수 증가)
+    # patch는 쓰기 직전 최신 본문에 다시 적용되므로 그 사이 바뀐 요약/카테고리/태그는 그대로
+    patches = []
+    for user_id, memo_id, memo_data, memo in memos:
+        fresh = [by_url[url] for url in get_memo_link_urls(memo.get("metadata")) if url in by_url]
+        if not fresh or all(m.get("source") == "fallback" for m in fresh):
+            stats["failed"] += 1
+        else:
+            stats["updated"] += 1
+        patches.append((user_id, memo_id, memo_data, link_metadata_patch(fresh)))
+
+    result = await patch_memos(patches, not_before=run_started)
+    stats["removed"] += result["gone"]
+
+    stats["memos"] += len(memos)
+    stats["urls"] += len(unique_urls)
+    stats["removed"] += len(removed)
+    return len(memos) + len(removed)
+
+
+# ============ 인덱스 백필 (1회성) ============
+# 인덱스 도입 전에 저장된 메모를 user:*:memos SCAN으로 훑어 인덱스에 등록
+# 진행 상태(SCAN 커서/대기 사용자)는 jobs:{이름}_backfill 에 사용자마다 저장 → 다음 실행이 이어서 처리
+# - 메타데이터 갱신: 링크 메모를 metadata:refresh에 (폴백/오프라인은 바로, 정상은 METADATA_MAX_AGE 후)
+# - SimHash 밴드: 비슷한 메모 찾기/합치기용 밴드 집합에 등록
+# 둘 다 ZADD NX / SADD라 사용자 도중에 멈춰 다음 실행에서 다시 처리해도 안전
+
+METADATA_BACKFILL_STATE_KEY = "jobs:metadata_backfill"
+SIMHASH_BACKFILL_STATE_KEY = "jobs:simhash_backfill"
+BACKFILL_PAGE_SIZE = 200     # 사용자 메모 MGET 1번에 읽는 수
+
+
+def _new_backfill_state(counter: str) -> dict:
+    return {
+        "scan_cursor": "0",
+        "scan_started": False,
+        "queue": [],
+        "done": False,
+        "users": 0,
+        "memos": 0,
+        counter: 0,
+        "updated_at": None,
+    }
+
+
+async def _backfill_memo_index(
+    label: str,
+    state_key: str,
+    counter: str,
+    memo_commands,
+    restart: bool,
+    time_budget: float
+) -> dict:
+    """모든 사용자 메모에 memo_commands(user_id, memo_id, memo, now) 명령 실행
+
+    counter: 결과가 1(새로 등록)인 명령 수를 세는 상태 필드
+    """
+    started = time.monotonic()
+    data = None if restart else await redis_command("GET", state_key)
+    state = json.loads(data) if data else _new_backfill_state(counter)
+
+    async def save_state():
+        state["updated_at"] = datetime.now().isoformat()
+        await redis_command("SET", state_key, json.dumps(state, ensure_ascii=False))
+
+    while not state["done"] and time.monotonic() - started < time_budget - 5:
+        if not state["queue"]:
+            if state["scan_started"] and state["scan_cursor"] == "0":
+                state["done"] = True
+                break
+            cursor, keys = await redis_command(
+                "SCAN", state["scan_cursor"], "MATCH", "user:*:memos", "COUNT", 100
+            )
+            state["scan_started"] = True
+            state["scan_cursor"] = str(cursor)
+            state["queue"] = [key.split(":")[1] for key in keys]
+            await save_state()
+            continue
+
+        user_id = state["queue"][0]
+        memo_ids = await redis_command("ZRANGE", f"user:{user_id}:memos", 0, -1) or []
+        now = datetime.now().timestamp()
+        for offset in range(0, len(memo_ids), BACKFILL_PAGE_SIZE):
+            page = memo_ids[offset:offset + BACKFILL_PAGE_SIZE]
+            batch_data = await redis_command("MGET", *[f"memo:{user_id}:{mid}" for mid in page])
+            commands = []
+            for memo_id, memo_data in zip(page, batch_data or []):
+                if memo_data:
+                    commands.extend(memo_commands(user_id, memo_id, json.loads(memo_data), now))
+            if commands:
+                results = await redis_pipeline(commands)
+                state[counter] += sum(1 for r in results if r == 1)
+        state["queue"].pop(0)
+        state["users"] += 1
+        state["memos"] += len(memo_ids)
+        await save_state()
+
+    await save_state()
+    print(f"[Jobs] {label} backfill: users={state['users']} memos={state['memos']} "
+          f"{counter}={state[counter]} done={state['done']}")
+    return {"success": True, **state, "elapsed": round(time.monotonic() - started, 2)}
+
+
+def _metadata_refresh_commands(user_id: str, memo_id: str, memo: dict, now: float) -> list:
+    due = metadata_refresh_due(memo.get("metadata"), now)
+    if due is None:
+        return []
+    return [["ZADD", METADATA_REFRESH_KEY, "NX", due, f"{user_id}:{memo_id}"]]
+
+
+def _simhash_band_commands(user_id: str, memo_id: str, memo: dict, now: float) -> list:
+    return simhash_index_commands(user_id, memo_id, memo.get("content", ""))
+
+
+async def backfill_metadata_refresh(restart: bool = False, time_budget: float = REFRESH_TIME_BUDGET) -> dict:
+    """기존 링크 메모를 메타데이터 갱신 인덱스에 등록 (scheduled: 새로 예약한 메모 수)"""
+    return await _backfill_memo_index(
+        "Metadata", METADATA_BACKFILL_STATE_KEY, "scheduled", _metadata_refresh_commands, restart, time_budget
+    )
+
+
+async def backfill_simhash_index(restart: bool = False, time_budget: float = REFRESH_TIME_BUDGET) -> dict:
+    """기존 메모를 SimHash 밴드 인덱스에 등록 (added: 새로 넣은 밴드 항목 수)"""
+    return await _backfill_memo_index(
+        "SimHash", SIMHASH_BACKFILL_STATE_KEY, "added", _simhash_band_commands, restart, time_budget
+    )
+
+
+# ============ 백로그 재분류 ("AI 분류" 일괄 적용) ============
+# 기본 저장(첫 단어 카테고리, 태그 없음) 메모를 여러 개씩 묶어 LLM 1회로 분류
+# 진행 상태는 jobs:reclassify:{scope} 에 페이지마다 저장 → 다음 실행이 이어서 처리
+# 한 바퀴(pass)가 끝나면 다음 실행은 그 바퀴 시작 시각 이후 저장된 메모만 새로 훑음
+
+RECLASSIFY_STATE_PREFIX = "jobs:reclassify:"
+RECLASSIFY_PAGE_SIZE = 100         # 한 번에 읽는 메모 수 (사용자별 ZSET 구간)
+RECLASSIFY_BATCH_SIZE = 20         # LLM 요청 1번에 넣는 메모 수
+RECLASSIFY_CONCURRENCY = 3         # 동시 LLM 요청 수
+RECLASSIFY_TOKEN_BUDGET = 60000    # 실행 1회당 토큰 예산
+RECLASSIFY_TIME_BUDGET = 45.0      # 실행 1회당 시간 예산 (초)
+RECLASSIFY_EST_BATCH_TOKENS = 1500 # 실측 전 배치당 예상 토큰
+RECLASSIFY_MAX_ATTEMPTS = 3        # LLM 응답에서 빠진 메모 재시도 횟수
+
+
+def needs_reclassification(memo: dict) -> bool:
+    """재분류 대상: 태그 없는 텍스트/링크 메모 중 아직 일괄 분류 안 된 것
+
+    사용자가 직접 지정했거나 이미 AI가 분류한 카테고리(category_source)는 제외
+    """
+    if memo.get("category_source") in ("explicit", "ai"):
+        return False
+    return not memo.get("tags") and not memo.get("reclassified_at")
+
+
+def _new_reclassify_state(scope: str, since: float = None) -> dict:
+    return {
+        "scope": scope,
+        "since": since,         # 이전 바퀴 시작 시각 (이 score 이후 메모만, 첫 바퀴는 None=전체)
+        "pass_started": time.time(),
+        "scan_cursor": "0",     # 전체 사용자: SCAN 커서
+        "scan_started": False,
+        "queue": [],            # 이번 SCAN 페이지에서 찾은 사용자 (대기)
+        "user_id": None,        # 처리 중인 사용자
+        "score": None,          # 처리 중인 사용자의 마지막 처리 score (이 score부터 재개)
+        "last_id": None,        # 같은 score 메모 중 마지막 처리 ID (이후부터)
+        "retry": {},            # 처리 중인 사용자의 LLM 응답에서 빠진 메모 {memo_id: 시도 횟수}
+        "done": False,
+        "runs": 0,
+        "scanned": 0,
+        "updated": 0,
+        "failed": 0,
+        "tokens": 0,
+        "started_at": datetime.now().isoformat(),
+        "updated_at": None,
+    }
+
+
+async def get_reclassify_progress(user_id: str = None) -> dict:
+    """재분류 진행 상태 조회 (없으면 빈 dict)"""
+    scope = user_id or "all"
+    data = await redis_command("GET", f"{RECLASSIFY_STATE_PREFIX}{scope}")
+    return json.loads(data) if data else {}
+
+
+def _after_cursor(page: list, score, last_id: str) -> list:
+    """ZRANGEBYSCORE WITHSCORES 결과에서 커서(score, last_id) 이후 항목만 [(memo_id, score), ...]
+
+    같은 score 안에서는 멤버 사전순 (Redis ZSET 정렬과 같음)
+    """
+    entries = list(zip(page[0::2], page[1::2]))
+    if score is None:
+        return entries
+    return [
+        (memo_id, s) for memo_id, s in entries
+        if float(s) > float(score) or (float(s) == float(score) and memo_id > (last_id or ""))
+    ]
+
+
+async def reclassify_backlog(
+    user_id: str = None,
+    restart: bool = False,
+    batch_size: int = RECLASSIFY_BATCH_SIZE,
+    concurrency: int = RECLASSIFY_CONCURRENCY,
+    token_budget: int = RECLASSIFY_TOKEN_BUDGET,
+    time_budget: float = RECLASSIFY_TIME_BUDGET
+) -> dict:
+    """사용자 1명(user_id) 또는 전체 사용자의 메모 백로그 재분류
+
+    사용자별 메모를 score(저장 시각) 순으로 페이지 단위로 읽어
+    대상 메모를 batch_size개씩 묶어 동시에 분류하고, 결과는 페이지마다
+    파이프라인 1번으로 반영(메모 저장 + 카테고리 인덱스 이동 + 로컬 분류기 학습 + 진행 상태)한다.
+    LLM 응답에서 빠진 메모는 같은 사용자의 다음 페이지와 함께 다시 보낸다 (RECLASSIFY_MAX_ATTEMPTS회).
+    시간/토큰 예산이 다하면 멈추고 다음 실행이 이어서 처리, 바퀴가 끝나면 새 메모만 다시 훑음.
+    """
+    scope = user_id or "all"
+    state_key = f"{RECLASSIFY_STATE_PREFIX}{scope}"
+    state = None if restart else await get_reclassify_progress(user_id)
+    if not state:
+        state = _new_reclassify_state(scope)
+    elif state["done"]:
+        state = _new_reclassify_state(scope, since=state.get("pass_started"))
+    state.setdefault("retry", {})
+
+    started = time.monotonic()
+    run_tokens = 0
+    batch_tokens = RECLASSIFY_EST_BATCH_TOKENS
+    semaphore = asyncio.Semaphore(concurrency)
+    stop_reason = None
+
+    def save_state_command() -> list:
+        state["updated_at"] = datetime.now().isoformat()
+        return ["SET", state_key, json.dumps(state, ensure_ascii=False)]
+
+    async def classify(batch):
+        async with semaphore:
+            return await classify_memos_batch(batch)
+
+    skip = 0    # 같은 score가 페이지 크기보다 많을 때 건너뛸 수
+    while True:
+        if time.monotonic() - started > time_budget - 5:
+            stop_reason = "time_budget"
+            break
+        if run_tokens + batch_tokens > token_budget:
+            stop_reason = "token_budget"
+            break
+
+        # 다음 사용자 선택
+        if not state["user_id"]:
+            if user_id:
+                if state["scan_started"]:
+                    state["done"] = True
+                    break
+                state["scan_started"] = True
+                state["user_id"] = user_id
+            elif state["queue"]:
+                state["user_id"] = state["queue"].pop(0)
+            elif state["scan_started"] and state["scan_cursor"] == "0":
+                state["done"] = True
+                break
+            else:
+                cursor, keys = await redis_command(
+                    "SCAN", state["scan_cursor"], "MATCH", "user:*:memos", "COUNT", 100
+                )
+                state["scan_started"] = True
+                state["scan_cursor"] = str(cursor)
+                state["queue"] = [key.split(":")[1] for key in keys]
+                continue
+
+        # 사용자 메모 페이지 (마지막 처리 score부터 포함해서 읽고 같은 score는 ID로 이어서)
+        current = state["user_id"]
+        if state["score"] is not None:
+            min_score = state["score"]
+        elif state.get("since"):
+            min_score = state["since"]
+        else:
+            min_score = "-inf"
+        page = await redis_command(
+            "ZRANGEBYSCORE", f"user:{current}:memos", min_score, "+inf",
+            "WITHSCORES", "LIMIT", skip, RECLASSIFY_PAGE_SIZE
+        ) or []
+        entries = _after_cursor(page, state["score"], state["last_id"])
+        if not entries and len(page) == RECLASSIFY_PAGE_SIZE * 2:
+            skip += RECLASSIFY_PAGE_SIZE
+            continue
+        skip = 0
+
+        retry_ids = [m for m in state["retry"] if m not in dict(entries)]
+        if not entries and not retry_ids:
+            state["user_id"] = None
+            state["score"] = None
+            state["last_id"] = None
+            continue
+
+        memo_ids = [memo_id for memo_id, _ in entries]
+        lookup = retry_ids + memo_ids
+        memo_data = await redis_command("MGET", *[f"memo:{current}:{m}" for m in lookup])
+        memos = {}
+        for memo_id, data in zip(lookup, memo_data or []):
+            if data:
+                memo = json.loads(data)
+                memo.setdefault("id", memo_id)
+                memos[memo_id] = memo
+        for memo_id in retry_ids:
+            if memo_id not in memos or not needs_reclassification(memos[memo_id]):
+                state["retry"].pop(memo_id, None)
+        # 재시도 메모 먼저
+        targets = [memos[m] for m in lookup if m in memos and needs_reclassification(memos[m])]
+
+        # 예산 안에서 처리할 수 있는 배치만 (남은 메모는 다음 실행)
+        batches = [targets[i:i + batch_size] for i in range(0, len(targets), batch_size)]
+        affordable = max(1, (token_budget - run_tokens) // batch_tokens)
+        partial = len(batches) > affordable
+        batches = batches[:affordable]
+
+        responses = await asyncio.gather(*[
+            classify([
+                {"id": m["id"], "content": m.get("content", ""), "title": (m.get("metadata") or {}).get("title")}
+                for m in batch
+            ])
+            for batch in batches
+        ])
+
+        classified = {}
+        page_tokens = 0
+        for results, tokens in responses:
+            classified.update(results)
+            page_tokens += tokens
+        run_tokens += page_tokens
+        state["tokens"] += page_tokens
+        spent = [tokens for _, tokens in responses if tokens]
+        if spent:
+            batch_tokens = max(batch_tokens, max(spent))
+
+        attempted = [m for batch in batches for m in batch]
+        if attempted and not classified:
+            # LLM 실패 (키 없음/장애) - 커서를 옮기지 않고 중단
+            stop_reason = "classification_failed"
+            break
+
+        now = datetime.now().isoformat()
+        updates = []
+        learning = []
+        for memo in attempted:
+            result = classified.get(memo["id"])
+            if not result:
+                # 응답에서 빠진 메모 - 다음 페이지와 함께 재시도
+                attempts = state["retry"].get(memo["id"], 0) + 1
+                if attempts < RECLASSIFY_MAX_ATTEMPTS:
+                    state["retry"][memo["id"]] = attempts
+                else:
+                    state["retry"].pop(memo["id"], None)
+                    state["failed"] += 1
+                continue
+            state["retry"].pop(memo["id"], None)
+            old_category = memo.get("category", "기타")
+            old_tags = memo.get("tags") or []
+            memo["category"] = result["category"]
+            memo["tags"] = result["tags"]
+            memo["category_source"] = "ai"
+            memo["reclassified_at"] = now
+            updates.append((current, memo, old_category, old_tags))
+            learning.extend(learning_commands(current, memo.get("content", ""), result["category"]))
+
+        # 커서 이동: 예산 때문에 일부만 처리했으면 처리한 마지막 페이지 메모까지만
+        processed = entries
+        if partial:
+            attempted_ids = {m["id"] for m in attempted}
+            last_index = max((i for i, (m, _) in enumerate(entries) if m in attempted_ids), default=-1)
+            processed = entries[:last_index + 1]
+        if processed:
+            state["score"], state["last_id"] = processed[-1][1], processed[-1][0]
+        state["scanned"] += len(processed)
+        state["updated"] += len(updates)
+
+        # 메모 반영 + 진행 상태 저장을 파이프라인 1번으로 (중간에 끊겨도 처리한 페이지는 다시 안 함)
+        if updates:
+            await update_memos_batch(updates, merge_learning_commands(learning) + [save_state_command()])
+        else:
+            await redis_command(*save_state_command())
+
+    state["runs"] += 1
+    await redis_command(*save_state_command())
+
+    result = {
+        **state,
+        "run_tokens": run_tokens,
+        "elapsed": round(time.monotonic() - started, 2),
+        "stopped": stop_reason or ("done" if state["done"] else None),
+    }
+    print(f"[Jobs] Reclassify ({scope}): updated={state['updated']} scanned={state['scanned']} "
+          f"tokens={run_tokens} stopped={result['stopped']}")
+    return {"success": True, **result}
+
+
+# ============ 로컬 분류기 학습 ============
+# 저장/카테고리 변경이 nb:learn 대기열에 쌓은 학습 건을 모아서 반영
+# 같은 모델 필드의 HINCRBY를 합쳐 보내고, 필드 수가 상한을 넘은 모델은 정리
+
+LEARN_BATCH_SIZE = 500             # 대기열에서 한 번에 꺼내는 수
+LEARN_TIME_BUDGET = 45.0           # 실행 1회당 시간 예산 (초)
+
+
+async def train_local_classifier(batch_size: int = LEARN_BATCH_SIZE, time_budget: float = LEARN_TIME_BUDGET) -> dict:
+    """학습 대기열 반영 + 상한 넘은 모델 정리"""
+    started = time.monotonic()
+    learned = 0
+    fields = 0
+    touched = set()
+
+    while time.monotonic() - started < time_budget - 5:
+        entries = await redis_command("LPOP", LEARN_QUEUE_KEY, batch_size)
+        if not entries:
+            break
+
+        commands = []
+        for data in entries:
+            entry = json.loads(data)
+            commands.extend(learning_commands(
+                entry["user_id"], entry.get("content", ""), entry.get("category"), entry.get("weight", 1)
+            ))
+        commands = merge_learning_commands(commands)
+        if commands:
+            await redis_pipeline(commands)
+        touched.update(command[1] for command in commands)
+        learned += len(entries)
+        fields += len(commands)
+        if len(entries) < batch_size:
+            break
+
+    # 모델 크기 확인 → 상한 넘은 모델만 HGETALL 후 정리
+    pruned = 0
+    keys = sorted(touched)
+    if keys:
+        sizes = await redis_pipeline([["HLEN", key] for key in keys])
+        for key, size in zip(keys, sizes):
+            if isinstance(size, Exception) or size <= max_model_fields(key):
+                continue
+            commands = prune_commands(key, await redis_command("HGETALL", key), max_model_fields(key))
+            if commands:
+                await redis_pipeline(commands)
+                pruned += sum(len(command) - 2 for command in commands if command[0] == "HDEL")
+
+    print(f"[Jobs] Local classifier: learned={learned} fields={fields} pruned={pruned}")
+    return {
+        "success": True,
+        "learned": learned,
+        "fields": fields,
+        "pruned": pruned,
+        "elapsed": round(time.monotonic() - started, 2),
+    }
+
+
+# ============ 인덱스 재계산 ============
+# 집계/태그 인덱스 도입 전 메모가 있는 유저는 조회 때 대기열(SET)에 등록만 하고 (그동안은 스캔으로 응답)
+# 전체 재계산은 여기서 - 재계산 파이프라인이 ready 키 설정과 함께 대기열에서 제거
+
+INDEX_REBUILD_BATCH_SIZE = 20      # 대기열에서 한 번에 꺼내는 유저 수
+INDEX_REBUILD_TIME_BUDGET = 45.0   # 실행 1회당 시간 예산 (초)
+
+INDEX_REBUILDS = [
+    ("rollups", ROLLUP_REBUILD_QUEUE, rebuild_rollups),
+    ("tags", TAG_REBUILD_QUEUE, rebuild_tag_index),
+]
+
+
+async def rebuild_pending_indexes(
+    batch_size: int = INDEX_REBUILD_BATCH_SIZE,
+    time_budget: float = INDEX_REBUILD_TIME_BUDGET
+) -> dict:
+    """재계산 대기열에 등록된 유저의 인덱스 재계산 (실패한 유저는 대기열에 남아 다음 실행에)"""
+    started = time.monotonic()
+    stats = {}
+
+    for name, queue, rebuild in INDEX_REBUILDS:
+        counts = stats[name] = {"rebuilt": 0, "failed": 0}
+        attempted = set()
+        while time.monotonic() - started < time_budget - 5:
+            user_ids = [u for u in await redis_command("SRANDMEMBER", queue, batch_size) or []
+                        if u not in attempted]
+            if not user_ids:
+                break
+            for user_id in user_ids:
+                if time.monotonic() - started >= time_budget - 5:
+                    break
+                attempted.add(user_id)
+                try:
+                    await rebuild(user_id)
+                    counts["rebuilt"] += 1
+                except Exception as e:
+                    print(f"[Jobs] {name} rebuild failed for {user_id[:8]}: {e}")
+                    counts["failed"] += 1
+
+    print(f"[Jobs] Index rebuild: {stats}")
+    return {"success": True, **stats, "elapsed": round(time.monotonic() - started, 2)}
@@ -4,10 +4,11 @@
 """
 import os
 import json
-import httpx
 from typing import Optional
 
 from .constants import get_category_emoji
+from .http_client import get_http_client
+from .deadline import fit_timeout
 
 KAKAO_MEMO_API = "https://kapi.kakao.com/v2/api/talk/memo/default/send"
 KAKAO_TOKEN_API = "https://kauth.kakao.com/oauth/token"
@@ -34,20 +35,20 @@ async def send_to_me(access_token: str, message: str, link_url: str = None) -> d
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                KAKAO_MEMO_API,
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": "application/x-www-form-urlencoded"
-                },
-                data={
-                    "template_object": json.dumps(template, ensure_ascii=False)
-                },
-                timeout=10.0
-            )
-
-            return response.json()
+        client = get_http_client("kakao")
+        response = await client.post(
+            KAKAO_MEMO_API,
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": "application/x-www-form-urlencoded"
+            },
+            data={
+                "template_object": json.dumps(template, ensure_ascii=False)
+            },
+            timeout=fit_timeout(10.0, minimum=0.5)
+        )
+
+        return response.json()
 
     except Exception as e:
         print(f"Send to me error: {e}")
@@ -86,20 +87,20 @@ async def send_memo_card(access_token: str, memo: dict) -> dict:
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                KAKAO_MEMO_API,
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": "application/x-www-form-urlencoded"
-                },
-                data={
-                    "template_object": json.dumps(template, ensure_ascii=False)
-                },
-                timeout=10.0
-            )
-
-            return response.json()
+        client = get_http_client("kakao")
+        response = await client.post(
+            KAKAO_MEMO_API,
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": "application/x-www-form-urlencoded"
+            },
+            data={
+                "template_object": json.dumps(template, ensure_ascii=False)
+            },
+            timeout=10.0
+        )
+
+        return response.json()
 
     except Exception as e:
         print(f"Send card error: {e}")
@@ -110,20 +111,20 @@ async def exchange_code_for_token(code: str) -> dict:
     """인가 코드를 토큰으로 교환"""
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                KAKAO_TOKEN_API,
-                data={
-                    "grant_type": "authorization_code",
-                    "client_id": KAKAO_CLIENT_ID,
-                    "client_secret": KAKAO_CLIENT_SECRET,
-                    "redirect_uri": KAKAO_REDIRECT_URI,
-                    "code": code
-                },
-                timeout=10.0
-            )
-
-            return response.json()
+        client = get_http_client("kakao")
+        response = await client.post(
+            KAKAO_TOKEN_API,
+            data={
+                "grant_type": "authorization_code",
+                "client_id": KAKAO_CLIENT_ID,
+                "client_secret": KAKAO_CLIENT_SECRET,
+                "redirect_uri": KAKAO_REDIRECT_URI,
+                "code": code
+            },
+            timeout=10.0
+        )
+
+        return response.json()
 
     except Exception as e:
         print(f"Token exchange error: {e}")
@@ -134,19 +135,19 @@ async def refresh_token(refresh_token: str) -> dict:
     """토큰 갱신"""
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                KAKAO_TOKEN_API,
-                data={
-                    "grant_type": "refresh_token",
-                    "client_id": KAKAO_CLIENT_ID,
-                    "client_secret": KAKAO_CLIENT_SECRET,
-                    "refresh_token": refresh_token
-                },
-                timeout=10.0
-            )
-
-            return response.json()
+        client = get_http_client("kakao")
+        response = await client.post(
+            KAKAO_TOKEN_API,
+            data={
+                "grant_type": "refresh_token",
+                "client_id": KAKAO_CLIENT_ID,
+                "client_secret": KAKAO_CLIENT_SECRET,
+                "refresh_token": refresh_token
+            },
+            timeout=10.0
+        )
+
+        return response.json()
 
     except Exception as e:
         print(f"Token refresh error: {e}")
@@ -157,14 +158,14 @@ async def get_user_info(access_token: str) -> dict:
     """사용자 정보 조회"""
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                KAKAO_USER_API,
-                headers={"Authorization": f"Bearer {access_token}"},
-                timeout=10.0
-            )
-
-            return response.json()
+        client = get_http_client("kakao")
+        response = await client.get(
+            KAKAO_USER_API,
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=10.0
+        )
+
+        return response.json()
 
     except Exception as e:
         print(f"User info error: {e}")
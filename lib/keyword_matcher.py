@@ -0,0 +1,59 @@
+"""
+다중 키워드 매처 (카테고리 키워드 테이블 → 1회 스캔 점수화)
+
+모든 키워드를 하나의 정규식 alternation으로 컴파일해서 텍스트를 한 번만 훑고,
+카테고리별 점수 + 근거 키워드를 함께 반환한다.
+- 같은 위치에서는 긴 키워드 우선 ("동영상" > "영상")
+- 점수 동률이면 테이블 선언 순서 우선
+- 한 글자 키워드("글")는 다른 단어 속에서도 걸리므로 (글자/글쎄) 횟수와 관계없이
+  SHORT_KEYWORD_WEIGHT만 반영
+- 긴 붙여넣기도 전체를 검사 (alternation 1회 스캔이라 길이에 비례하는 비용뿐)
+"""
+import re
+
+SHORT_KEYWORD_WEIGHT = 0.5     # 한 글자 키워드 점수 (여러 번 나와도 1회)
+
+
+def build_keyword_matcher(table: dict) -> dict:
+    """{카테고리: [키워드, ...]} → 매처 (import 시 1회)
+
+    같은 키워드가 여러 카테고리에 있으면 모두에 점수 부여
+    """
+    owners = {}
+    for category, keywords in table.items():
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if keyword:
+                owners.setdefault(keyword, []).append(category)
+
+    alternation = "|".join(re.escape(k) for k in sorted(owners, key=len, reverse=True))
+    return {
+        "pattern": re.compile(alternation) if alternation else None,
+        "owners": owners,
+        "order": {category: i for i, category in enumerate(table)},
+    }
+
+
+def match_keywords(matcher: dict, text: str) -> list:
+    """텍스트의 카테고리 후보 (점수 내림차순)
+
+    Returns: [{"category", "score", "evidence": {키워드: 횟수}}, ...]
+    """
+    pattern = matcher["pattern"]
+    if pattern is None or not text:
+        return []
+
+    hits = {}
+    for keyword in pattern.findall(text.lower()):
+        hits[keyword] = hits.get(keyword, 0) + 1
+
+    candidates = {}
+    for keyword, count in hits.items():
+        score = SHORT_KEYWORD_WEIGHT if len(keyword) == 1 else count
+        for category in matcher["owners"][keyword]:
+            candidate = candidates.setdefault(category, {"category": category, "score": 0, "evidence": {}})
+            candidate["score"] += score
+            candidate["evidence"][keyword] = count
+
+    order = matcher["order"]
+    return sorted(candidates.values(), key=lambda c: (-c["score"], order[c["category"]]))
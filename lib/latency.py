@@ -0,0 +1,105 @@
+"""
+스킬 응답 지연시간 예측 (동기 응답 vs 카카오 콜백 선택용)
+
+- 의도별(+ 링크/일괄 여부) 처리 시간 EWMA (인스턴스 메모리)
+- 링크 저장은 도메인 헬스(메타데이터 소스 지연시간/백오프)로 보정
+- choose_response_mode(): 카카오 5초 제한 안에 못 끝낼 것 같으면 "callback"
+"""
+from .metadata import (
+    extract_urls,
+    derive_offline_metadata,
+    get_health_domain,
+    get_domain_health,
+    should_skip_source,
+    DEFAULT_SOURCE_TIMEOUTS,
+)
+
+KAKAO_SKILL_TIMEOUT = 5.0        # 카카오 스킬 응답 제한 (초)
+SYNC_SAFETY_MARGIN = 1.0         # 네트워크/직렬화 여유 (초)
+LATENCY_EWMA_ALPHA = 0.3
+
+# 관측 전 기본 예상치 (ms)
+DEFAULT_LATENCY_MS = {
+    "save": 600,
+    "save:link": 2500,
+    "save_with_ai": 3500,
+    "save_with_ai:link": 5000,
+    "ai_summary": 4000,
+    "delete:bulk": 2500,
+    "search": 800,
+    "summary": 800,
+}
+DEFAULT_INTENT_LATENCY_MS = 400
+
+# {key: ewma_ms}
+_latency_ewma = {}
+
+
+def latency_key(intent: str, intent_result: dict, utterance: str) -> str:
+    """예측 단위 키 (의도 + 링크 저장/일괄 삭제 구분)"""
+    if intent in ("save", "save_with_ai"):
+        content = intent_result.get("content", utterance) if intent == "save_with_ai" else utterance
+        if extract_urls(content):
+            return f"{intent}:link"
+    if intent == "delete" and intent_result.get("keyword") and not intent_result.get("memo_id"):
+        return "delete:bulk"
+    return intent
+
+
+def record_latency(key: str, elapsed_ms: float) -> None:
+    """실제 처리 시간 반영"""
+    previous = _latency_ewma.get(key)
+    if previous is None:
+        _latency_ewma[key] = elapsed_ms
+    else:
+        _latency_ewma[key] = (1 - LATENCY_EWMA_ALPHA) * previous + LATENCY_EWMA_ALPHA * elapsed_ms
+
+
+async def _link_latency_ms(content: str) -> float:
+    """링크 메타데이터 예상 시간 (동시 추출이므로 가장 느린 링크 기준)
+
+    오프라인 추출 가능 링크는 0, 소스가 모두 백오프 중이면 폴백(0)
+    """
+    slowest = 0.0
+    for url in extract_urls(content):
+        if derive_offline_metadata(url):
+            continue
+        state = await get_domain_health(get_health_domain(url))
+        expected = 0.0
+        for source, default_timeout in DEFAULT_SOURCE_TIMEOUTS.items():
+            if should_skip_source(state, source):
+                continue
+            health = state.get(source) or {}
+            if health.get("latency_ewma"):
+                expected = health["latency_ewma"]
+            else:
+                expected = default_timeout * 1000 / 4  # 관측 없음: 타임아웃의 1/4 가정
+            break
+        slowest = max(slowest, expected)
+    return slowest
+
+
+async def predict_latency_ms(key: str, content: str = "") -> float:
+    """처리 시간 예측 (ms)"""
+    predicted = _latency_ewma.get(key, DEFAULT_LATENCY_MS.get(key, DEFAULT_INTENT_LATENCY_MS))
+    if key.endswith(":link"):
+        base = _latency_ewma.get(key.split(":")[0], DEFAULT_LATENCY_MS["save"])
+        predicted = max(predicted, base + await _link_latency_ms(content))
+    return predicted
+
+
+async def choose_response_mode(key: str, content: str, elapsed: float, callback_available: bool) -> str:
+    """"sync" 또는 "callback"
+
+    elapsed: 요청 수신 후 이미 쓴 시간 (초)
+    """
+    if not callback_available:
+        return "sync"
+    remaining_ms = (KAKAO_SKILL_TIMEOUT - SYNC_SAFETY_MARGIN - elapsed) * 1000
+    predicted = await predict_latency_ms(key, content)
+    return "callback" if predicted > remaining_ms else "sync"
+
+
+def get_latency_stats() -> dict:
+    """의도별 EWMA (헬스 체크용)"""
+    return {key: round(value, 1) for key, value in _latency_ewma.items()}
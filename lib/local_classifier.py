@@ -0,0 +1,287 @@
+"""
+로컬 카테고리 분류기 (문자 n-gram 나이브 베이즈, CPU 전용)
+저장된 메모의 카테고리로 학습해서 OpenAI 호출 전에 먼저 분류
+
+- 전역 모델 (nb:global) + 사용자 모델 (nb:user:{user_id}) 가중 합산
+- 학습은 직접 지정/AI 카테고리만 (로컬 예측·첫 단어·규칙 폴백은 자기 강화라 제외)
+- 저장/카테고리 변경 시 학습 대기열(nb:learn)에 RPUSH 1번 → cron이 모아서
+  같은 필드를 합친 HINCRBY로 반영 (요청 경로에서 메모당 수백 개 HINCRBY 안 보냄)
+- 모델 해시 필드가 상한을 넘으면 빈도 낮은 n-gram부터 정리 (HGETALL 크기 제한)
+- 모델은 인스턴스에 캐시 → 분류는 네트워크 없이 순수 연산
+- 신뢰도가 기준 미만이거나 학습량이 부족하면 None (LLM 폴백)
+
+Redis 해시 필드:
+    d\t{category}            학습 문서 수
+    t\t{category}            n-gram 총 개수
+    f\t{category}\t{ngram}   n-gram 빈도
+"""
+import json
+import math
+import time
+from collections import Counter
+from typing import Optional, Tuple
+
+from .constants import CATEGORIES
+
+LOCAL_MODEL_GLOBAL_KEY = "nb:global"
+LOCAL_MODEL_USER_PREFIX = "nb:user:"
+LEARN_QUEUE_KEY = "nb:learn"
+
+NGRAM_SIZES = (2, 3)                 # 단어 경계 포함 문자 2/3-gram
+MAX_TRAINING_CHARS = 300             # 긴 메모는 앞부분만 학습/분류
+USER_MODEL_WEIGHT = 3                # 사용자 모델 가중치 (개인 습관 우선)
+SMOOTHING = 0.5                      # 라플라스 스무딩
+CONFIDENCE_THRESHOLD = 0.7           # 이 이상이면 로컬 결과 사용
+MIN_TRAINING_DOCS = 20               # 학습 문서가 이보다 적으면 사용 안 함
+MODEL_LOCAL_TTL = 600                # 인스턴스 모델 캐시 (10분)
+LEARNED_SOURCES = ("explicit", "ai") # 학습에 쓰는 카테고리 출처
+MAX_GLOBAL_MODEL_FIELDS = 30000      # 모델 해시 필드 상한 - 넘으면 PRUNE_RATIO까지 정리
+MAX_USER_MODEL_FIELDS = 5000
+PRUNE_RATIO = 0.8
+
+# {redis_key: (loaded_at, model)}
+_model_cache = {}
+
+
+def extract_features(text: str) -> Counter:
+    """문자 n-gram 빈도 (소문자, URL 제외, 단어 앞뒤 공백 패딩)"""
+    words = [
+        word for word in text.lower()[:MAX_TRAINING_CHARS].split()
+        if not word.startswith(("http://", "https://", "www."))
+    ]
+    features = Counter()
+    for word in words:
+        padded = f" {word} "
+        for size in NGRAM_SIZES:
+            for i in range(len(padded) - size + 1):
+                features[padded[i:i + size]] += 1
+    return features
+
+
+def new_model() -> dict:
+    return {"docs": {}, "tokens": {}, "counts": {}, "vocab": set()}
+
+
+def model_from_hash(flat: list) -> dict:
+    """HGETALL 결과 [field, value, ...] → 모델"""
+    model = new_model()
+    for i in range(0, len(flat or []) - 1, 2):
+        field, value = flat[i], int(flat[i + 1])
+        if value <= 0:
+            continue
+        kind, _, rest = field.partition("\t")
+        if kind == "d":
+            model["docs"][rest] = value
+        elif kind == "t":
+            model["tokens"][rest] = value
+        elif kind == "f":
+            category, _, ngram = rest.partition("\t")
+            model["counts"].setdefault(category, {})[ngram] = value
+            model["vocab"].add(ngram)
+    return model
+
+
+def update_model(model: dict, features: Counter, category: str, weight: int = 1) -> None:
+    """모델에 문서 1건 반영 (weight=-1이면 학습 취소)"""
+    model["docs"][category] = model["docs"].get(category, 0) + weight
+    model["tokens"][category] = model["tokens"].get(category, 0) + weight * sum(features.values())
+    counts = model["counts"].setdefault(category, {})
+    for ngram, count in features.items():
+        counts[ngram] = counts.get(ngram, 0) + weight * count
+        model["vocab"].add(ngram)
+
+
+def model_commands(key: str, features: Counter, category: str, weight: int = 1) -> list:
+    """update_model과 같은 변경을 Redis HINCRBY 명령으로"""
+    commands = [
+        ["HINCRBY", key, f"d\t{category}", weight],
+        ["HINCRBY", key, f"t\t{category}", weight * sum(features.values())],
+    ]
+    for ngram, count in features.items():
+        commands.append(["HINCRBY", key, f"f\t{category}\t{ngram}", weight * count])
+    return commands
+
+
+def predict_category(features: Counter, global_model: dict, user_model: dict = None) -> list:
+    """카테고리별 사후확률 (내림차순)
+
+    전역 + 사용자 모델 빈도를 USER_MODEL_WEIGHT로 합산한 다항 나이브 베이즈
+    Returns: [(category, probability), ...]
+    """
+    models = [(global_model, 1)]
+    if user_model:
+        models.append((user_model, USER_MODEL_WEIGHT))
+
+    docs = Counter()
+    tokens = Counter()
+    for model, weight in models:
+        for category, count in model["docs"].items():
+            docs[category] += weight * count
+        for category, count in model["tokens"].items():
+            tokens[category] += weight * count
+
+    categories = [c for c, count in docs.items() if count > 0]
+    if not categories or not features:
+        return []
+
+    total_docs = sum(docs[c] for c in categories)
+    # 스무딩용 어휘 크기 (모델 간 중복은 무시한 상한값 - 매 호출 합집합 계산 회피)
+    vocab_size = sum(len(model["vocab"]) for model, _ in models) or 1
+
+    scores = {}
+    for category in categories:
+        score = math.log((docs[category] + 1) / (total_docs + len(categories)))
+        denominator = math.log(tokens[category] + SMOOTHING * vocab_size)
+        for ngram, count in features.items():
+            frequency = 0
+            for model, weight in models:
+                frequency += weight * model["counts"].get(category, {}).get(ngram, 0)
+            score += count * (math.log(frequency + SMOOTHING) - denominator)
+        scores[category] = score
+
+    # softmax
+    best = max(scores.values())
+    exps = {c: math.exp(s - best) for c, s in scores.items()}
+    total = sum(exps.values())
+    return sorted(((c, e / total) for c, e in exps.items()), key=lambda x: x[1], reverse=True)
+
+
+async def load_models(user_id: str = None) -> Tuple[dict, Optional[dict]]:
+    """전역/사용자 모델 로드 (인스턴스 캐시 → Redis HGETALL 파이프라인)"""
+    keys = [LOCAL_MODEL_GLOBAL_KEY]
+    if user_id:
+        keys.append(f"{LOCAL_MODEL_USER_PREFIX}{user_id}")
+
+    now = time.time()
+    missing = [k for k in keys if not (k in _model_cache and now - _model_cache[k][0] < MODEL_LOCAL_TTL)]
+    if missing:
+        try:
+            from .redis_db import redis_pipeline
+            results = await redis_pipeline([["HGETALL", k] for k in missing])
+        except Exception as e:
+            print(f"[LocalClassifier] Load error: {e}")
+            results = [None] * len(missing)
+        for key, flat in zip(missing, results):
+            model = new_model() if isinstance(flat, Exception) else model_from_hash(flat)
+            _model_cache[key] = (now, model)
+
+    global_model = _model_cache[LOCAL_MODEL_GLOBAL_KEY][1]
+    user_model = _model_cache[keys[1]][1] if user_id else None
+    return global_model, user_model
+
+
+async def classify_category_local(content: str, user_id: str = None) -> Tuple[Optional[str], float]:
+    """로컬 모델로 카테고리 분류
+
+    Returns: (카테고리, 신뢰도) - 신뢰도 미달/학습 부족이면 (None, 신뢰도)
+    """
+    features = extract_features(content)
+    if not features:
+        return None, 0.0
+
+    global_model, user_model = await load_models(user_id)
+    trained_docs = sum(global_model["docs"].values())
+    if user_model:
+        trained_docs += sum(user_model["docs"].values())
+    if trained_docs < MIN_TRAINING_DOCS:
+        return None, 0.0
+
+    ranked = predict_category(features, global_model, user_model)
+    if not ranked:
+        return None, 0.0
+
+    category, confidence = ranked[0]
+    if confidence < CONFIDENCE_THRESHOLD:
+        return None, confidence
+    return category, confidence
+
+
+def is_learned(category: Optional[str], source: Optional[str]) -> bool:
+    """이 카테고리가 학습 대상인지 (직접 지정/AI 라벨, "기타" 제외)"""
+    return bool(category) and category != "기타" and source in LEARNED_SOURCES
+
+
+def learning_commands(user_id: str, content: str, category: str, weight: int = 1) -> list:
+    """메모 1건 학습 명령 (HINCRBY 목록)
+
+    사용자 모델에는 모든 카테고리, 전역 모델에는 기본 카테고리만 반영
+    (사용자 정의 카테고리가 다른 사용자 분류를 오염시키지 않도록)
+    """
+    if not category:
+        return []
+    features = extract_features(content)
+    if not features:
+        return []
+
+    commands = []
+    for key in model_keys(user_id, category):
+        commands.extend(model_commands(key, features, category, weight))
+    return commands
+
+
+def model_keys(user_id: str, category: str) -> list:
+    keys = [f"{LOCAL_MODEL_USER_PREFIX}{user_id}"]
+    if category in CATEGORIES:
+        keys.append(LOCAL_MODEL_GLOBAL_KEY)
+    return keys
+
+
+def merge_learning_commands(commands: list) -> list:
+    """같은 해시 필드의 HINCRBY를 하나로 합침 (0이 된 변경은 제외)"""
+    totals = Counter()
+    for _, key, field, amount in commands:
+        totals[(key, field)] += amount
+    return [["HINCRBY", key, field, amount] for (key, field), amount in totals.items() if amount]
+
+
+def max_model_fields(key: str) -> int:
+    return MAX_GLOBAL_MODEL_FIELDS if key == LOCAL_MODEL_GLOBAL_KEY else MAX_USER_MODEL_FIELDS
+
+
+def prune_commands(key: str, flat: list, max_fields: int) -> list:
+    """필드 수가 상한을 넘은 모델 해시 정리 명령 (HGETALL 결과 기준)
+
+    빈도 낮은 n-gram부터 지워 max_fields * PRUNE_RATIO까지 줄이고,
+    지운 빈도만큼 카테고리 n-gram 총 개수(t)도 빼서 확률 분모를 맞춘다.
+    """
+    fields = [(flat[i], int(flat[i + 1])) for i in range(0, len(flat or []) - 1, 2)]
+    if len(fields) <= max_fields:
+        return []
+
+    ngrams = sorted((value, field) for field, value in fields if field.startswith("f\t"))
+    excess = len(fields) - int(max_fields * PRUNE_RATIO)
+    removed = [field for _, field in ngrams[:excess]]
+    removed_tokens = Counter()
+    for value, field in ngrams[:excess]:
+        if value > 0:
+            removed_tokens[field.split("\t")[1]] += value
+
+    commands = [["HDEL", key, *removed[i:i + 1000]] for i in range(0, len(removed), 1000)]
+    for category, amount in removed_tokens.items():
+        commands.append(["HINCRBY", key, f"t\t{category}", -amount])
+    return commands
+
+
+async def learn_category(user_id: str, content: str, category: str, weight: int = 1) -> None:
+    """메모 1건 학습 (weight=-1: 카테고리 변경 시 이전 학습 취소)
+
+    학습 대기열에 RPUSH 1번 (Redis 모델 반영은 train_local_classifier cron),
+    이 인스턴스의 캐시 모델에는 바로 반영해 다음 분류부터 적용
+    """
+    if not category:
+        return
+    content = content[:MAX_TRAINING_CHARS]
+    features = extract_features(content)
+    if not features:
+        return
+
+    for key in model_keys(user_id, category):
+        if key in _model_cache:
+            update_model(_model_cache[key][1], features, category, weight)
+
+    entry = {"user_id": user_id, "content": content, "category": category, "weight": weight}
+    try:
+        from .redis_db import redis_command
+        await redis_command("RPUSH", LEARN_QUEUE_KEY, json.dumps(entry, ensure_ascii=False))
+    except Exception as e:
+        print(f"[LocalClassifier] Learn error: {e}")
@@ -0,0 +1,121 @@
+"""
+유저 시간대 (기본 Asia/Seoul) - 요청 단위 contextvars
+
+서버리스 런타임은 UTC라 naive datetime.now()로 계산하면 "오늘" 경계와 리마인더 시각이
+9시간 어긋난다. dispatch_intent에서 유저 시간대를 설정하면 같은 요청 안의
+날짜 파싱/기간 경계/리마인더 점수가 모두 그 시간대 기준으로 계산된다.
+
+- 설정이 없으면(크론/MCP) DEFAULT_TIMEZONE
+- 자정/주 시작/월 시작 timestamp는 (시간대, 날짜)별로 캐시 (calendar_bounds)
+- 저장된 naive 리마인더 시각(이전 데이터)은 유저 시간대의 벽시계 시각으로 해석
+- 유저 시간대는 "시간대 America/New_York" 명령으로 변경 (resolve_timezone으로 검증)
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+DEFAULT_TIMEZONE = "Asia/Seoul"
+
+_timezone: ContextVar = ContextVar("user_timezone", default=DEFAULT_TIMEZONE)
+
+
+@lru_cache(maxsize=64)
+def get_zone(name: str) -> ZoneInfo:
+    """IANA 시간대 (잘못된 이름이면 기본 시간대)"""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        print(f"[Timezone] Unknown timezone '{name}', using {DEFAULT_TIMEZONE}")
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def is_valid_timezone(name: str) -> bool:
+    try:
+        ZoneInfo(name)
+        return True
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=1)
+def _timezone_names() -> dict:
+    """소문자 이름 → IANA 시간대 이름"""
+    return {name.lower(): name for name in available_timezones()}
+
+
+def resolve_timezone(name: str) -> Optional[str]:
+    """사용자 입력 → IANA 시간대 이름 (대소문자 무시, 없는 이름이면 None)"""
+    name = (name or "").strip()
+    if not name:
+        return None
+    canonical = _timezone_names().get(name.lower())
+    if canonical:
+        return canonical
+    return name if is_valid_timezone(name) else None
+
+
+def current_timezone() -> str:
+    """현재 요청의 유저 시간대 이름"""
+    return _timezone.get()
+
+
+@contextmanager
+def user_timezone(name: Optional[str]):
+    """with 블록 동안 유저 시간대 적용 (None이면 기본 시간대)"""
+    token = _timezone.set(name or DEFAULT_TIMEZONE)
+    try:
+        yield
+    finally:
+        _timezone.reset(token)
+
+
+def local_now(tz: str = None) -> datetime:
+    """유저 시간대의 현재 시각 (aware)"""
+    return datetime.now(get_zone(tz or current_timezone()))
+
+
+def to_local(dt: datetime, tz: str = None) -> datetime:
+    """유저 시간대 aware datetime으로 (naive는 그 시간대의 벽시계 시각으로 해석)"""
+    zone = get_zone(tz or current_timezone())
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=zone)
+    return dt.astimezone(zone)
+
+
+def parse_local(iso_time: str, tz: str = None) -> datetime:
+    """저장된 ISO 시각 → 유저 시간대 aware datetime"""
+    return to_local(datetime.fromisoformat(iso_time.replace("Z", "+00:00")), tz)
+
+
+@lru_cache(maxsize=512)
+def local_midnight(tz: str, day: date) -> float:
+    """그 날짜의 유저 시간대 자정 timestamp"""
+    return datetime.combine(day, time(), tzinfo=get_zone(tz)).timestamp()
+
+
+@lru_cache(maxsize=256)
+def calendar_bounds(tz: str, day: date) -> dict:
+    """그 날짜 기준 달력 경계 timestamp (시간대, 날짜별 캐시)
+
+    today/tomorrow/yesterday: 자정, week: 이번 주 월요일 자정, month: 이번 달 1일 자정
+    """
+    def midnight(d: date) -> float:
+        return local_midnight(tz, d)
+
+    return {
+        "today": midnight(day),
+        "tomorrow": midnight(day + timedelta(days=1)),
+        "yesterday": midnight(day - timedelta(days=1)),
+        "week": midnight(day - timedelta(days=day.weekday())),
+        "month": midnight(day.replace(day=1)),
+    }
+
+
+def local_bounds(now: datetime = None) -> dict:
+    """현재 요청 시간대의 오늘 기준 달력 경계 (calendar_bounds 캐시 사용)"""
+    tz = current_timezone()
+    now = now or local_now(tz)
+    return calendar_bounds(tz, now.date())
@@ -0,0 +1,304 @@
+"""
+Redis Lua 스크립트 - 후보 필터링/부분 문자열 매칭/LIMIT을 데이터 옆에서 처리
+
+검색/리마인더 목록/기간 × 카테고리 조회가 메모 JSON 전체를 HTTPS로 받아 파이썬에서
+대부분 버리던 것을, 스크립트가 매칭되는 메모(또는 필요한 필드만 추린 투영)만 돌려준다.
+
+- 스크립트는 SHA1로 EVALSHA 호출 (본문 전송 없음)
+- 서버에 없으면 (NOSCRIPT: 재시작/FLUSH/새 인스턴스) SCRIPT LOAD 후 한 번 재시도
+- 메모 키(memo:{user_id}:{id})는 스크립트 안에서 조합 (Upstash 단일 인스턴스 기준)
+- 대소문자 무시는 ASCII만 (한글은 대소문자가 없으므로 검색 결과 동일)
+- 카드 모드("1")면 매칭된 메모의 본문 대신 목록용 카드(card:{user_id}:{id})를 반환
+  (카드가 아직 없는 메모는 본문 - 호출 측 load_cards가 카드로 바꿔 저장)
+"""
+import hashlib
+from typing import List
+
+# 검색 대상 문자열 (content + summary + tags, 소문자) - 검색/쿼리 스크립트 공통
+SEARCHABLE_LUA = """
+local function text(value)
+  if type(value) == 'string' then return value end
+  return ''
+end
+
+local function searchable(memo)
+  local tags = {}
+  if type(memo.tags) == 'table' then
+    for _, tag in ipairs(memo.tags) do tags[#tags + 1] = text(tag) end
+  end
+  return string.lower(text(memo.content) .. ' ' .. text(memo.summary) .. ' ' .. table.concat(tags, ' '))
+end
+"""
+
+# 후보 인덱스에서 검색어가 포함된 메모 JSON만
+# KEYS[1]: user:{id}:memos(ZSET) 또는 user:{id}:category:{cat}(SET)
+# ARGV: user_id, 검색어(소문자), 최대 결과 수(0=제한 없음), ZSET 후보 수, "zset"|"set", 카드 모드
+SEARCH_MEMOS = SEARCHABLE_LUA + """
+local ids
+if ARGV[5] == 'zset' then
+  ids = redis.call('ZREVRANGE', KEYS[1], 0, tonumber(ARGV[4]) - 1)
+else
+  ids = redis.call('SMEMBERS', KEYS[1])
+end
+local prefix = 'memo:' .. ARGV[1] .. ':'
+local card_prefix = ARGV[6] == '1' and 'card:' .. ARGV[1] .. ':'
+local query, limit = ARGV[2], tonumber(ARGV[3])
+
+local found = {}
+for _, id in ipairs(ids) do
+  local raw = redis.call('GET', prefix .. id)
+  if raw then
+    local ok, memo = pcall(cjson.decode, raw)
+    if ok and type(memo) == 'table' then
+      if string.find(searchable(memo), query, 1, true) then
+        found[#found + 1] = card_prefix and redis.call('GET', card_prefix .. id) or raw
+        if limit > 0 and #found >= limit then break end
+      end
+    end
+  end
+end
+return found
+"""
+
+# 카테고리 메모 중 리마인더가 있는 메모의 투영 (목록 표시에 필요한 필드만)
+# KEYS[1]: user:{id}:category:할일   ARGV: user_id, "1"=발송 완료 포함
+REMINDER_MEMOS = """
+local FIELDS = {'id', 'summary', 'content', 'category', 'created_at', 'url',
+                'reminder_at', 'reminder_sent', 'reminders', 'recurrence', 'timezone'}
+local prefix = 'memo:' .. ARGV[1] .. ':'
+local include_sent = ARGV[2] == '1'
+
+local function present(value)
+  return value ~= nil and value ~= cjson.null and value ~= false and value ~= ''
+end
+
+local found = {}
+for _, id in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+  local raw = redis.call('GET', prefix .. id)
+  if raw then
+    local ok, memo = pcall(cjson.decode, raw)
+    if ok and type(memo) == 'table' then
+      local due = false
+      if type(memo.reminders) == 'table' and #memo.reminders > 0 then
+        for _, entry in ipairs(memo.reminders) do
+          if include_sent or not present(entry.sent) then due = true break end
+        end
+      elseif present(memo.reminder_at) then
+        due = include_sent or not present(memo.reminder_sent)
+      end
+      if due then
+        local row = {}
+        for _, field in ipairs(FIELDS) do
+          if present(memo[field]) or memo[field] == false then row[field] = memo[field] end
+        end
+        row.id = row.id or id
+        found[#found + 1] = cjson.encode(row)
+      end
+    end
+  end
+end
+return found
+"""
+
+# 점수 범위(최신순) 중 카테고리에 속한 메모 JSON만, 최대 N개
+# KEYS[1]: user:{id}:memos, KEYS[2]: user:{id}:category:{cat}
+# ARGV: user_id, max, min (ZREVRANGEBYSCORE 형식), 최대 결과 수(0=제한 없음), 카드 모드
+RANGE_IN_CATEGORY = """
+local prefix = 'memo:' .. ARGV[1] .. ':'
+local card_prefix = ARGV[5] == '1' and 'card:' .. ARGV[1] .. ':'
+local limit = tonumber(ARGV[4])
+local found = {}
+for _, id in ipairs(redis.call('ZREVRANGEBYSCORE', KEYS[1], ARGV[2], ARGV[3])) do
+  if redis.call('SISMEMBER', KEYS[2], id) == 1 then
+    local raw = card_prefix and redis.call('GET', card_prefix .. id) or redis.call('GET', prefix .. id)
+    if raw then
+      found[#found + 1] = raw
+      if limit > 0 and #found >= limit then break end
+    end
+  end
+end
+return found
+"""
+
+# 쿼리 플래너 최종 단계: 후보 ZSET을 최신순으로 훑으며 SET 소속(카테고리/태그)과
+# 검색어(모두 포함) 확인, 매칭 수를 세고 offset 이후 limit개만 메모 JSON으로
+# 태그 인덱스 재구축 전이면 태그는 메모의 tags 배열에서 직접 확인 (본문/요약 매칭 아님)
+# KEYS[1]: 후보 ZSET, KEYS[2..]: 소속을 확인할 SET
+# ARGV: user_id, max, min, offset, limit, 최대 스캔 수, 카드 모드, 태그('' = 없음), 검색어...
+# 반환: {매칭 수, 스캔 수, 메모(또는 카드) JSON...}
+FILTER_PAGE = SEARCHABLE_LUA + """
+local prefix = 'memo:' .. ARGV[1] .. ':'
+local card_prefix = ARGV[7] == '1' and 'card:' .. ARGV[1] .. ':'
+local offset, limit = tonumber(ARGV[4]), tonumber(ARGV[5])
+local tag = ARGV[8]
+local terms = {}
+for i = 9, #ARGV do terms[#terms + 1] = ARGV[i] end
+local need_body = #terms > 0 or tag ~= ''
+
+local function has_tag(memo)
+  if type(memo.tags) ~= 'table' then return false end
+  for _, value in ipairs(memo.tags) do
+    local name = string.gsub(string.gsub(text(value), '^[%s#]+', ''), '%s+$', '')
+    if name == tag then return true end
+  end
+  return false
+end
+
+local function matches(raw)
+  local ok, memo = pcall(cjson.decode, raw)
+  if not ok or type(memo) ~= 'table' then return false end
+  if tag ~= '' and not has_tag(memo) then return false end
+  local haystack = searchable(memo)
+  for _, term in ipairs(terms) do
+    if not string.find(haystack, term, 1, true) then return false end
+  end
+  return true
+end
+
+local ids = redis.call('ZREVRANGEBYSCORE', KEYS[1], ARGV[2], ARGV[3], 'LIMIT', 0, tonumber(ARGV[6]))
+local result = {0, #ids}
+local matched = 0
+for _, id in ipairs(ids) do
+  local ok = true
+  for k = 2, #KEYS do
+    if redis.call('SISMEMBER', KEYS[k], id) == 0 then ok = false break end
+  end
+  local raw
+  if ok and need_body then
+    raw = redis.call('GET', prefix .. id)
+    ok = raw and matches(raw)
+  end
+  if ok then
+    matched = matched + 1
+    if matched > offset and #result - 2 < limit then
+      local card = card_prefix and redis.call('GET', card_prefix .. id)
+      result[#result + 1] = card or raw or redis.call('GET', prefix .. id) or false
+    end
+  end
+end
+result[1] = matched
+return result
+"""
+
+# 메모 본문 비교 후 교체 (CAS) - 읽은 뒤 수정/삭제됐으면 쓰지 않음
+# 오래 걸리는 작업(메타데이터 재추출)이 읽어 둔 본문으로 사용자 수정을 덮거나
+# 삭제된 메모를 되살리지 않도록
+# KEYS[1]: memo:{user_id}:{id}, KEYS[2]: card:{user_id}:{id}, KEYS[3]: metadata:refresh
+# ARGV: 읽은 본문 (그대로 비교 - redis.sha1hex가 없는 환경 대비), 새 본문, 새 카드, 갱신 인덱스 member, 다음 갱신 시각('' = 인덱스에서 제거)
+# 반환: 1 = 저장, 0 = 그 사이 수정됨 (다시 읽어 재시도), -1 = 삭제됨 (갱신 인덱스에서도 제거)
+PATCH_MEMO = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+  redis.call('ZREM', KEYS[3], ARGV[4])
+  return -1
+end
+if current ~= ARGV[1] then
+  return 0
+end
+redis.call('SET', KEYS[1], ARGV[2])
+redis.call('SET', KEYS[2], ARGV[3])
+if ARGV[5] == '' then
+  redis.call('ZREM', KEYS[3], ARGV[4])
+else
+  redis.call('ZADD', KEYS[3], ARGV[5], ARGV[4])
+end
+return 1
+"""
+
+# URL 인덱스 항목 비교 후 삭제 - 지우는 메모가 아직 그 URL의 주인일 때만 HDEL
+# (같은 URL을 더 최근 메모가 차지했으면 그 항목은 유지)
+# KEYS[1]: user:{user_id}:urls, ARGV[1]: 삭제하는 memo_id, ARGV[2..]: URL 해시
+# 반환: 지운 항목 수
+URL_UNINDEX = """
+local removed = 0
+for i = 2, #ARGV do
+  if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[1] then
+    removed = removed + redis.call('HDEL', KEYS[1], ARGV[i])
+  end
+end
+return removed
+"""
+
+# 태그 SET에 추가하고 빈도를 SET 크기로 맞춤 (재구축 중 저장된 메모 재반영용 -
+# 저장 파이프라인의 SADD/HINCRBY가 재구축 교체 전후 어느 쪽에 적용됐든 빈도가 SET과 같아짐)
+# KEYS[1]: user:{user_id}:tag:{태그}, KEYS[2]: user:{user_id}:tags, ARGV: memo_id, 태그
+# 반환: 태그 메모 수
+TAG_ADD = """
+redis.call('SADD', KEYS[1], ARGV[1])
+local count = redis.call('SCARD', KEYS[1])
+redis.call('HSET', KEYS[2], ARGV[2], count)
+return count
+"""
+
+SCRIPTS = {
+    "search_memos": SEARCH_MEMOS,
+    "filter_page": FILTER_PAGE,
+    "reminder_memos": REMINDER_MEMOS,
+    "range_in_category": RANGE_IN_CATEGORY,
+    "patch_memo": PATCH_MEMO,
+    "url_unindex": URL_UNINDEX,
+    "tag_add": TAG_ADD,
+}
+
+SCRIPT_SHAS = {name: hashlib.sha1(body.encode()).hexdigest() for name, body in SCRIPTS.items()}
+
+
+async def run_script(name: str, keys: List[str], args: List) -> list:
+    """EVALSHA로 스크립트 실행 (서버에 없으면 SCRIPT LOAD 후 한 번 재시도)"""
+    from .redis_db import redis_command
+
+    command = ["EVALSHA", SCRIPT_SHAS[name], len(keys), *keys, *[str(arg) for arg in args]]
+    try:
+        return await redis_command(*command) or []
+    except Exception as e:
+        if "NOSCRIPT" not in str(e):
+            raise
+    print(f"[Lua] Loading script '{name}'")
+    await redis_command("SCRIPT", "LOAD", SCRIPTS[name])
+    return await redis_command(*command) or []
+
+
+async def run_script_batch(name: str, calls: List[tuple]) -> list:
+    """같은 스크립트를 여러 번 파이프라인 1번으로 (calls: [(keys, args)], NOSCRIPT면 로드 후 재시도)
+
+    Returns: 호출별 결과 (실패한 호출은 Exception 객체)
+    """
+    from .redis_db import redis_command, redis_pipeline
+
+    commands = [["EVALSHA", SCRIPT_SHAS[name], len(keys), *keys, *[str(arg) for arg in args]]
+                for keys, args in calls]
+    results = await redis_pipeline(commands)
+    if any(isinstance(result, Exception) and "NOSCRIPT" in str(result) for result in results):
+        print(f"[Lua] Loading script '{name}'")
+        await redis_command("SCRIPT", "LOAD", SCRIPTS[name])
+        results = await redis_pipeline(commands)
+    return results
+
+
+def script_command(name: str, keys: List[str], args: List) -> list:
+    """파이프라인에 붙일 EVALSHA 명령 (NOSCRIPT는 retry_noscript로 처리)"""
+    return ["EVALSHA", SCRIPT_SHAS[name], len(keys), *keys, *[str(arg) for arg in args]]
+
+
+async def retry_noscript(commands: List[list], results: list) -> list:
+    """파이프라인 결과 중 NOSCRIPT로 실패한 EVALSHA만 스크립트 로드 후 다시 실행
+
+    Returns: 재실행 결과를 반영한 결과 목록
+    """
+    failed = [
+        i for i, (command, result) in enumerate(zip(commands, results or []))
+        if command[0] == "EVALSHA" and isinstance(result, Exception) and "NOSCRIPT" in str(result)
+    ]
+    if not failed:
+        return results
+
+    from .redis_db import redis_command, redis_pipeline
+
+    names = {sha: name for name, sha in SCRIPT_SHAS.items()}
+    for sha in dict.fromkeys(commands[i][1] for i in failed):
+        print(f"[Lua] Loading script '{names[sha]}'")
+        await redis_command("SCRIPT", "LOAD", SCRIPTS[names[sha]])
+    results = list(results)
+    for i, result in zip(failed, await redis_pipeline([commands[i] for i in failed])):
+        results[i] = result
+    return results
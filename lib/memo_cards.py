@@ -0,0 +1,96 @@
+"""
+메모 카드 - 목록 표시용 가벼운 레코드 (본문/메타데이터와 분리)
+
+정리 카드/검색/태그 목록은 요약 35자와 썸네일만 그리는데, 메모 JSON 전체
+(content + 설명/이미지 목록이 든 metadata)를 MGET해 디코드하던 것을
+card:{user_id}:{memo_id}에 표시 필드만 따로 저장해 그것만 읽는다.
+전체 본문은 상세 보기(handle_detail)에서만 조회.
+
+- 필드: id, category, summary, created_at, url, title, thumbnail
+  (+ simhash: 검색 결과의 비슷한 메모 접기를 본문 없이 하기 위한 시그니처)
+- 저장/수정/메타데이터 보강/삭제 파이프라인에 card_commands()/card_unindex_commands()를
+  덧붙여 추가 왕복 없이 유지
+- 카드 도입 전 메모는 목록 조회 때 본문으로 카드를 만들어 돌려주고 함께 저장 (한 번만)
+"""
+import json
+from typing import List, Optional
+
+from .simhash import simhash
+
+CARD_SUMMARY_CHARS = 100    # 목록은 35~40자만 표시 - 카드에는 넉넉히 이만큼만
+
+
+def card_key(user_id: str, memo_id: str) -> str:
+    return f"card:{user_id}:{memo_id}"
+
+
+def is_card(memo: dict) -> bool:
+    """카드 레코드인지 (메모 본문에는 항상 content가 있음)"""
+    return "content" not in memo
+
+
+def memo_card(memo: dict) -> dict:
+    """메모 본문 → 카드 (이미 카드면 그대로)"""
+    if is_card(memo):
+        return memo
+    metadata = memo.get("metadata") or {}
+    return {
+        "id": memo.get("id"),
+        "category": memo.get("category", "기타"),
+        "summary": (memo.get("summary") or "")[:CARD_SUMMARY_CHARS],
+        "created_at": memo.get("created_at"),
+        "url": memo.get("url"),
+        "title": metadata.get("title"),
+        "thumbnail": metadata.get("image") or metadata.get("thumbnail"),
+        "simhash": simhash(memo.get("content", "")),
+    }
+
+
+def card_commands(user_id: str, memo: dict) -> List[list]:
+    """저장/수정 파이프라인에 붙일 카드 저장 명령"""
+    card = json.dumps(memo_card(memo), ensure_ascii=False, separators=(",", ":"))
+    return [["SET", card_key(user_id, memo["id"]), card]]
+
+
+def card_unindex_commands(user_id: str, memo_id: str) -> List[list]:
+    """삭제 파이프라인에 붙일 명령"""
+    return [["DEL", card_key(user_id, memo_id)]]
+
+
+async def load_cards(user_id: str, results: List[Optional[str]], memo_ids: List[str] = None) -> List[dict]:
+    """카드/본문 JSON 목록 → 카드 목록 (없는 항목 제외, 본문이면 카드로 바꿔 저장)
+
+    memo_ids: results와 같은 순서의 ID (본문에 id가 없는 오래된 메모 대비)
+    """
+    from .redis_db import redis_pipeline
+
+    cards, backfill = [], []
+    for index, data in enumerate(results or []):
+        if not data:
+            continue
+        memo = json.loads(data)
+        if memo_ids:
+            memo.setdefault("id", memo_ids[index])
+        if not is_card(memo):
+            memo = memo_card(memo)
+            backfill += card_commands(user_id, memo)
+        cards.append(memo)
+    if backfill:
+        await redis_pipeline(backfill)
+        print(f"[Cards] Backfilled {len(backfill)} cards for {user_id[:8]}")
+    return cards
+
+
+async def get_memo_cards(user_id: str, memo_ids: List[str]) -> List[dict]:
+    """메모 ID 목록 → 카드 (MGET 1번, 입력 순서 유지, 카드 없는 메모만 본문 MGET)"""
+    from .redis_db import redis_command
+
+    memo_ids = list(memo_ids or [])
+    if not memo_ids:
+        return []
+    results = await redis_command("MGET", *[card_key(user_id, mid) for mid in memo_ids]) or []
+    missing = [mid for mid, data in zip(memo_ids, results) if not data]
+    if missing:
+        bodies = dict(zip(missing, await redis_command("MGET", *[f"memo:{user_id}:{mid}" for mid in missing]) or []))
+        results = [data or bodies.get(mid) for mid, data in zip(memo_ids, results)]
+    return await load_cards(user_id, results, memo_ids)
@@ -2,6 +2,7 @@
 메모 서비스 - 핵심 비즈니스 로직
 skill.py와 mcp_server.py 모두 이 모듈을 사용
 """
+import json
 from typing import Optional, List
 
 # 상대 경로 import (lib 폴더 내부이므로)
@@ -9,51 +10,131 @@ from .redis_db import (
     search_memos,
     get_memos_by_category,
     get_memos_by_period,
+    get_period_page,
     get_recent_memos,
     save_memo,
+    bump_memo,
     delete_memo as db_delete_memo,
     update_memo as db_update_memo,
+    apply_memo_metadata,
+    patch_memos,
+    get_memo_raw,
     get_memo_by_id,
+    get_memo_by_short_id,
+    get_memos_by_ids,
     get_user_reminders,
     get_user_stats,
-    get_or_create_user as db_get_or_create_user
+    get_or_create_user as db_get_or_create_user,
+    set_user_timezone,
+    reschedule_user_reminders
+)
+from .classifier import get_category_emoji, analyze_memo, classify_intent, classify_category
+from .local_classifier import learn_category, classify_category_local, is_learned
+from .metadata import enrich_urls, extract_urls, merge_link_metadata, merge_refreshed_links
+from .datetime_parser import extract_reminders, format_reminder_time, format_recurrence, is_recurring_todo
+from .url_index import is_link_only, find_saved_urls, url_hash
+from .simhash import find_similar_ids, group_similar
+from .rollups import get_period_rollup, rollup_fields, merge_rollups
+from .periods import parse_period, period_label
+from .localtime import DEFAULT_TIMEZONE, resolve_timezone
+from .query_planner import parse_query, is_structured, query_memos
+from .tag_index import normalize_tag, get_tag_counts, extract_hashtags, unique_tags
+from .idempotency import (
+    idempotency_key,
+    claim_idempotency,
+    wait_for_idempotent_result,
+    record_idempotent_result,
+    release_idempotency,
 )
-from .classifier import get_category_emoji, analyze_memo, classify_intent, classify_category_only
-from .metadata import extract_metadata, extract_urls
-from .datetime_parser import extract_reminder_info, format_reminder_time
 
 
-async def service_search(user_id: str, query: str, category: str = None, limit: int = 5) -> dict:
-    """메모 검색 서비스"""
-    memos = await search_memos(user_id, query, category, limit)
+async def service_search(
+    user_id: str,
+    query: str,
+    category: str = None,
+    limit: int = 5,
+    period: str = None,
+    tag: str = None,
+    explain: bool = False,
+    cards: bool = False
+) -> dict:
+    """메모 검색 서비스
 
+    "지난주 맛집 강남"처럼 기간/카테고리/태그가 섞인 검색은 쿼리 플래너로 (Redis 안에서 교집합),
+    키워드만/카테고리만이면 기존 검색
+    cards: 목록 표시용 카드만 (id/카테고리/요약/시각/URL/제목/썸네일)
+    """
+    filters = parse_query(query)
+    filters.update({k: v for k, v in {"category": category, "period": period, "tag": tag}.items() if v})
+
+    result = {"success": True, "query": query}
+    if is_structured(filters) or explain:
+        planned = await query_memos(user_id, **filters, limit=limit, explain=explain, cards=cards)
+        memos = planned["memos"]
+        result.update({"filters": filters, "total": planned["total"]})
+        if explain:
+            result["explain"] = planned["explain"]
+    else:
+        memos = await search_memos(user_id, query, category, limit, cards=cards)
+
+    result.update({"count": len(memos), "memos": memos})
+    return result
+
+
+async def service_list_by_tag(user_id: str, tag: str, limit: int = 10, offset: int = 0) -> dict:
+    """태그별 메모 목록 (최신순 페이지, 태그 인덱스 교집합 후 최종 페이지 카드만 조회)"""
+    tag = normalize_tag(tag)
+    result = await query_memos(user_id, tag=tag, limit=limit, offset=offset, cards=True)
     return {
         "success": True,
-        "query": query,
-        "count": len(memos),
-        "memos": memos
+        "tag": tag,
+        "total": result["total"],
+        "offset": offset,
+        "limit": limit,
+        "count": len(result["memos"]),
+        "memos": result["memos"]
     }
 
 
-async def service_get_summary(user_id: str, period: str = "today", category: str = None) -> dict:
-    """기간별/카테고리별 요약 서비스"""
+async def service_get_tags(user_id: str, limit: int = 20, scan: bool = True) -> dict:
+    """자주 쓴 태그 목록 (태그 빈도 해시, scan=False면 재구축 전 메모 스캔 없이)"""
+    tags = await get_tag_counts(user_id, limit, scan=scan)
+    return {
+        "success": True,
+        "count": len(tags),
+        "tags": [{"tag": tag, "count": count} for tag, count in tags]
+    }
 
-    # 카테고리 지정 시 카테고리별 조회 (전체 표시)
-    if category:
-        memos = await get_memos_by_category(user_id, category, limit=100)
+
+async def service_get_summary(
+    user_id: str,
+    period: str = "today",
+    category: str = None,
+    limit: int = None,
+    cards: bool = False
+) -> dict:
+    """기간별/카테고리별 요약 서비스 (기간 + 카테고리 동시 지정 가능)
+
+    period: 기간 키 또는 자연어 ("3월", "지난 금요일", "2주 전")
+    limit: 기간만 지정 시 최신 N개만 조회 (count는 기간 전체 개수)
+    cards: 목록 표시용 카드만 (본문/메타데이터 없음)
+    """
+    count = None
+    if category and period:
+        # 기간 + 카테고리: 기간 메모 중 해당 카테고리만 (Redis 안에서 필터)
+        memos = await get_memos_by_period(user_id, period, category=category, cards=cards)
+        period_name = f"{period_label(period)} {category}"
+    elif category:
+        # 카테고리만 지정 시 카테고리별 조회 (전체 표시)
+        memos = await get_memos_by_category(user_id, category, limit=100, cards=cards)
         period_name = f"{category}"
     else:
-        memos = await get_memos_by_period(user_id, period)
-        period_names = {
-            "today": "오늘",
-            "yesterday": "어제",
-            "week": "이번 주",
-            "last_week": "지난 주",
-            "month": "이번 달",
-            "last_month": "지난 달",
-            "all": "전체"
-        }
-        period_name = period_names.get(period, period)
+        period = period or "today"
+        if limit:
+            memos, count = await get_period_page(user_id, period, limit, cards=cards)
+        else:
+            memos = await get_memos_by_period(user_id, period, cards=cards)
+        period_name = period_label(period)
 
     # 카테고리별 분류
     by_category = {}
@@ -68,12 +149,33 @@ async def service_get_summary(user_id: str, period: str = "today", category: str
         "period": period,
         "period_name": period_name,
         "category": category,
-        "count": len(memos),
+        "count": len(memos) if count is None else count,
         "memos": memos,
         "by_category": by_category
     }
 
 
+async def service_get_insights(user_id: str, period: str = "today") -> dict:
+    """기간 인사이트용 집계 (카테고리별/링크·텍스트/상위 태그 수)
+
+    일/월 집계 해시만 합침 (메모 본문 조회 없음), 집계 조회 실패 시 기간 메모로 계산
+    """
+    period = period or "today"
+    try:
+        rollup = await get_period_rollup(user_id, period)
+    except Exception as e:
+        print(f"[Insights] Rollup error, falling back to memos: {e}")
+        memos = await get_memos_by_period(user_id, period)
+        rollup = merge_rollups([rollup_fields(memo) for memo in memos])
+
+    return {
+        "success": True,
+        "period": period,
+        "period_name": period_label(period),
+        **rollup
+    }
+
+
 async def service_get_stats(user_id: str) -> dict:
     """통계 서비스"""
     stats = await get_user_stats(user_id)
@@ -127,37 +229,115 @@ async def service_save_memo(
     category: str = None,
     summary: str = None,
     tags: List[str] = None,
-    use_ai: bool = False  # 기본: AI 사용 안 함 (원본 그대로 저장)
+    use_ai: bool = False,  # 기본: AI 사용 안 함 (원본 그대로 저장)
+    offline_first: bool = False,
+    idempotent: bool = True
 ) -> dict:
     """메모 저장 서비스
 
     use_ai=False (기본): 원본 그대로 저장
     use_ai=True: AI 분류/요약 사용 ("요약 저장" 명령 시)
+    offline_first=True: 지원 플랫폼 URL은 네트워크 없이 저장
+        (결과의 needs_refinement=True면 service_refine_metadata로 보강)
+    idempotent=True: 같은 발화가 짧은 시간 안에 다시 오면 (카카오 재시도/연타)
+        새로 저장하지 않고 첫 저장 결과를 반환 (replayed=True)
+        첫 요청이 아직 처리 중이면 잠시 기다리고, 그래도 안 끝나면 pending=True
     """
+    if not idempotent:
+        return await _save_memo(user_id, content, category, summary, tags, use_ai, offline_first)
+
+    key = idempotency_key(user_id, content, {
+        "category": category, "summary": summary, "tags": tags, "use_ai": use_ai
+    })
+    previous = await claim_idempotency(key)
+    if previous and previous.get("status") == "pending":
+        previous = await wait_for_idempotent_result(key)
+        if not previous:
+            return {"success": False, "pending": True, "error": "같은 메모를 저장하는 중입니다."}
+    if previous and previous.get("status") == "done":
+        result = previous.get("result") or {}
+        print(f"[Save] Duplicate request → {result.get('memo_id')}")
+        return {**result, "replayed": True}
+
+    try:
+        result = await _save_memo(user_id, content, category, summary, tags, use_ai, offline_first)
+    except Exception:
+        await release_idempotency(key)
+        raise
+    if result.get("success"):
+        await record_idempotent_result(key, result)
+    else:
+        await release_idempotency(key)
+    return result
+
+
+async def _save_memo(
+    user_id: str,
+    content: str,
+    category: Optional[str],
+    summary: Optional[str],
+    tags: Optional[List[str]],
+    use_ai: bool,
+    offline_first: bool
+) -> dict:
+    """메모 저장 (메타데이터 추출 → 분류 → 저장 → 학습)"""
+
+    # 카테고리 출처: explicit(직접 지정) / ai / local(로컬 모델) / rule(플랫폼·첫 단어·규칙 폴백)
+    # 메모에 저장 - 로컬 분류기 학습(explicit/ai만)과 일괄 재분류 대상 판단에 사용
+    category_source = "explicit" if category else None
+    category_given = bool(category)
 
     # URL 추출
     urls = extract_urls(content)
     memo_type = "url" if urls else "text"
 
+    # 이미 저장한 링크만 다시 보낸 경우: 기존 메모의 재저장 횟수만 올리고 반환 (추출/저장 생략)
+    if urls and is_link_only(content):
+        existing = await find_resaved_link_memo(user_id, urls)
+        memo = await bump_memo(user_id, existing["id"]) if existing else None
+        if memo:
+            print(f"[Save] Link re-saved → {memo['id']} (x{memo['save_count']})")
+            return {
+                "success": True,
+                "memo_id": memo["id"],
+                "category": memo.get("category", "기타"),
+                "summary": memo.get("summary", ""),
+                "tags": memo.get("tags", []),
+                "memo_type": memo.get("memo_type", "url"),
+                "url": urls[0],
+                "reminder_at": memo.get("reminder_at"),
+                "metadata": memo.get("metadata") or {},
+                "needs_refinement": False,
+                "duplicate": True,
+            }
+
     # 메타데이터 추출 (URL이면 OG태그는 가져옴 - 제목/썸네일용)
+    # 여러 링크는 동시에 추출하고, 대표(첫 번째) 링크 외에는 links 배열로 저장
     metadata = {}
     if urls:
-        metadata = await extract_metadata(urls[0])
-        metadata["url"] = urls[0]
+        enriched = await enrich_urls(urls, offline_first=offline_first)
+        metadata = merge_link_metadata(enriched)
+
+    # 로컬 모델이 확신하면 카테고리는 LLM 없이 (요약까지 있으면 LLM 호출 생략)
+    if use_ai and not category:
+        category, _ = await classify_category_local(content, user_id)
+        if category:
+            category_source = "local"
 
     # AI 분류 (use_ai=True일 때만)
     if use_ai and (not category or not summary):
         analysis = await analyze_memo(content, metadata)
         if not category:
             category = analysis.get("category", "기타")
+            category_source = analysis.get("source", "rule")
         if not summary:
             summary = analysis.get("summary", content[:30])
         if not tags:
             tags = analysis.get("tags", [])
     else:
-        # 기본 저장: 원본 그대로, 카테고리는 AI 분류
+        # 기본 저장: 원본 그대로, 카테고리는 플랫폼/로컬 모델/첫 단어
         if not category:
-            category = await classify_category_only(content)
+            category, category_source = await classify_category(content, user_id=user_id)
         if not summary:
             # URL이면 메타데이터 제목 사용, 아니면 원본 그대로
             if metadata.get("title"):
@@ -167,16 +347,36 @@ async def service_save_memo(
         if not tags:
             tags = []
 
-    # 할일 카테고리면 리마인더 정보 추출
-    reminder_at = None
-    if category == "할일":
-        reminder_info = extract_reminder_info(content)
-        reminder_at = reminder_info.get("reminder_at")
+    # 본문의 #태그 ("파스타 맛집 #강남")는 태그로 (AI/직접 지정 태그와 합침)
+    tags = unique_tags(list(tags or []) + extract_hashtags(content))
 
-        if reminder_at:
-            time_str = format_reminder_time(reminder_at)
-            clean_text = reminder_info.get("reminder_text", content[:30])
-            summary = f"{clean_text} ({time_str})"
+    # 할일 카테고리면 리마인더 정보 추출 (일정이 여러 개면 일정마다 리마인더)
+    # 반복 표현은 시각이 명시되고 할일 단서가 있을 때만 할일로 ("매주 월요일 9시 회의", 직접 지정 제외)
+    # → "매주 월요일 휴무", "매일 10시 오픈하는 빵집" 같은 가게 정보는 분류 결과 그대로
+    reminder_at = None
+    recurrence = None
+    reminders = extract_reminders(content)
+    if (category != "할일" and not category_given
+            and any(info.get("recurrence") for info in reminders) and is_recurring_todo(content)):
+        category = "할일"
+        category_source = "rule"
+    if category != "할일":
+        reminders = []
+
+    if len(reminders) == 1:
+        reminder_info = reminders[0]
+        reminder_at = reminder_info["reminder_at"]
+        recurrence = reminder_info.get("recurrence")
+        time_str = format_recurrence(recurrence) if recurrence else format_reminder_time(reminder_at)
+        clean_text = reminder_info.get("reminder_text", content[:30])
+        summary = f"{clean_text} ({time_str})"
+    elif reminders:
+        # "치과 · 저녁약속 (월요일 오후 3시 외 1건)"
+        reminder_at = min(info["reminder_at"] for info in reminders)
+        first = reminders[0]
+        time_str = format_recurrence(first["recurrence"]) if first.get("recurrence") else format_reminder_time(first["reminder_at"])
+        clean_text = " · ".join(info["reminder_text"] for info in reminders)
+        summary = f"{clean_text} ({time_str} 외 {len(reminders) - 1}건)"
 
     # 저장
     memo_id = await save_memo(
@@ -187,9 +387,15 @@ async def service_save_memo(
         tags=tags or [],
         summary=summary,
         metadata=metadata if metadata else None,
-        reminder_at=reminder_at
+        reminder_at=reminder_at,
+        recurrence=recurrence,
+        reminders=reminders,
+        category_source=category_source
     )
 
+    if is_learned(category, category_source):
+        await learn_category(user_id, content, category)
+
     return {
         "success": True,
         "memo_id": memo_id,
@@ -199,28 +405,156 @@ async def service_save_memo(
         "memo_type": memo_type,
         "url": urls[0] if urls else None,
         "reminder_at": str(reminder_at) if reminder_at else None,
-        "metadata": metadata if metadata else {}
+        "recurrence": recurrence,
+        "reminder_count": len(reminders),
+        "metadata": metadata if metadata else {},
+        "needs_refinement": any(m.get("source") == "offline" for m in enriched) if urls else False
     }
 
 
+async def find_resaved_link_memo(user_id: str, urls: list) -> Optional[dict]:
+    """같은 링크(들)만 담은 기존 메모 (URL 인덱스 HMGET → 메모 GET)
+
+    모든 URL이 같은 메모를 가리키고, 그 메모의 링크 구성이 같을 때만 재저장으로 봄
+    """
+    saved = await find_saved_urls(user_id, urls)
+    memo_ids = set(saved.values())
+    if len(saved) != len(urls) or len(memo_ids) != 1:
+        return None
+    memo_id = memo_ids.pop()
+    memo = await get_memo_by_id(user_id, memo_id)
+    if not memo or not is_link_only(memo.get("content", "")):
+        return None
+    memo.setdefault("id", memo_id)
+    if {url_hash(url) for url in extract_urls(memo["content"])} != {url_hash(url) for url in urls}:
+        return None
+    return memo
+
+
+async def service_find_similar(user_id: str, memo_id: str = None, short_id: str = None) -> dict:
+    """비슷한 메모 찾기 (SimHash 밴드 인덱스, 가까운 순)"""
+    if short_id:
+        memo = await get_memo_by_short_id(user_id, short_id)
+    elif memo_id:
+        memo = await get_memo_by_id(user_id, memo_id)
+    else:
+        memo = None
+    if not memo:
+        return {"success": False, "error": "메모를 찾을 수 없습니다."}
+    memo.setdefault("id", memo_id or "")
+
+    similar_ids = await find_similar_ids(user_id, memo.get("content", ""), exclude_id=memo["id"])
+    distances = dict(similar_ids)
+    similar = await get_memos_by_ids(user_id, [mid for mid, _ in similar_ids])
+    for item in similar:
+        item["distance"] = distances.get(item["id"])
+
+    return {"success": True, "memo": memo, "count": len(similar), "similar": similar}
+
+
+async def service_get_similar_groups(user_id: str, limit: int = 100) -> dict:
+    """최근 메모 중 비슷한 메모 묶음 (2개 이상인 그룹만, 큰 그룹 순)
+
+    본문 대신 카드를 읽고 저장 때 계산해 둔 시그니처로 묶음 (SimHash 재계산 없음)
+    """
+    memos = await get_recent_memos(user_id, limit, cards=True)
+    groups = [group for group in group_similar(memos) if len(group) > 1]
+    groups.sort(key=len, reverse=True)
+    return {"success": True, "count": len(groups), "groups": groups}
+
+
+async def service_merge_similar(user_id: str, memo_id: str = None, short_id: str = None) -> dict:
+    """비슷한 메모를 하나로 합치기 (기준 메모에 태그를 모으고 나머지는 삭제)
+
+    기준 메모는 전체 ID 또는 짧은 ID("합치기 #a448275d")로 지정
+    """
+    found = await service_find_similar(user_id, memo_id=memo_id, short_id=short_id)
+    if not found.get("success"):
+        return found
+    duplicates = found["similar"]
+    if not duplicates:
+        return {"success": False, "error": "합칠 비슷한 메모가 없습니다."}
+
+    memo = found["memo"]
+    tags = list(dict.fromkeys(
+        tag for item in [memo] + duplicates for tag in item.get("tags", []) if tag
+    ))
+    if tags != memo.get("tags", []):
+        await db_update_memo(user_id, memo["id"], tags=tags)
+
+    merged = 0
+    for item in duplicates:
+        if await db_delete_memo(user_id, item["id"]):
+            merged += 1
+
+    return {"success": True, "memo_id": memo["id"], "merged_count": merged, "tags": tags}
+
+
+async def service_refine_metadata(user_id: str, memo_id: str) -> dict:
+    """오프라인으로 저장된 링크 메타데이터를 네트워크로 보강 (백그라운드용)
+
+    summary가 기존 메타데이터 제목에서 만들어진 경우에만 새 제목으로 교체
+    """
+    raw_memo = await get_memo_raw(user_id, memo_id)
+    if not raw_memo:
+        return {"success": False, "error": "메모를 찾을 수 없습니다."}
+
+    urls = get_memo_link_urls(json.loads(raw_memo).get("metadata"))
+    if not urls:
+        return {"success": False, "error": "링크가 없습니다."}
+
+    enriched = await enrich_urls(urls)
+    if all(m.get("source") == "fallback" for m in enriched):
+        # 네트워크 추출이 모두 실패하면 기존(오프라인) 정보 유지
+        return {"success": False, "error": "메타데이터 보강 실패"}
+
+    # 링크별 병합은 쓰기 직전 최신 본문에 (추출 중 수정/삭제된 메모 보존)
+    patch = link_metadata_patch(enriched)
+    result = await patch_memos([(user_id, memo_id, raw_memo, patch)])
+    if not result["written"]:
+        return {"success": False, "error": "메모를 찾을 수 없습니다."}
+    return {"success": True, "memo_id": memo_id, "metadata": patch.metadata}
+
+
+def get_memo_link_urls(metadata: dict) -> list:
+    """메모 메타데이터의 링크 URL 목록 (links 배열 우선)"""
+    if not metadata:
+        return []
+    urls = [link["url"] for link in metadata.get("links", []) if link.get("url")]
+    if not urls and metadata.get("url"):
+        urls = [metadata["url"]]
+    return urls
+
+
+def link_metadata_patch(fresh: list):
+    """새로 추출한 링크 메타데이터를 메모에 병합하는 patch (patch_memos용)
+
+    링크별로 병합하고(폴백이 된 링크는 기존 항목 + 재시도 횟수 증가),
+    새 정보가 있을 때만 요약 교체/갱신 시각 기록 - 마지막 결과는 patch.metadata
+    """
+    def patch(memo: dict) -> None:
+        metadata = merge_refreshed_links(memo.get("metadata") or {}, fresh)
+        if all(m.get("source") == "fallback" for m in fresh):
+            memo["metadata"] = metadata
+        else:
+            apply_memo_metadata(memo, metadata, refined_summary(memo, metadata))
+        patch.metadata = metadata
+
+    patch.metadata = None
+    return patch
+
+
+def refined_summary(memo: dict, new_metadata: dict) -> Optional[str]:
+    """summary가 이전 메타데이터 제목 그대로면 새 제목으로 (아니면 None = 유지)"""
+    old_title = (memo.get("metadata") or {}).get("title")
+    if old_title and memo.get("summary") == old_title[:50] and new_metadata.get("title"):
+        return new_metadata["title"][:50]
+    return None
+
+
 async def service_delete_memo(user_id: str, memo_id: str = None, keyword: str = None) -> dict:
     """메모 삭제 서비스 - 기간별/카테고리별/키워드별 지원"""
 
-    # 기간 키워드 매핑
-    PERIOD_KEYWORDS = {
-        "오늘": "today",
-        "어제": "yesterday",
-        "이번주": "week",
-        "이번 주": "week",
-        "지난주": "last_week",
-        "지난 주": "last_week",
-        "이번달": "month",
-        "이번 달": "month",
-        "지난달": "last_month",
-        "지난 달": "last_month",
-        "전체": "all"
-    }
-
     # 카테고리 목록
     CATEGORIES = ["영상", "음악", "맛집", "쇼핑", "여행", "학습", "할일", "아이디어", "링크", "기타"]
 
@@ -228,14 +562,13 @@ async def service_delete_memo(user_id: str, memo_id: str = None, keyword: str =
     delete_type = "single"  # single, period, category, keyword
 
     if keyword and not memo_id:
-        # 1. 기간 키워드 확인
-        if keyword in PERIOD_KEYWORDS:
-            period = PERIOD_KEYWORDS[keyword]
-            memos_to_delete = await get_memos_by_period(user_id, period)
+        # 1. 기간 키워드 확인 (기간 엔진: "오늘", "3월", "지난 금요일", "2주 전")
+        period = parse_period(keyword)
+        if period:
+            memos_to_delete = await get_memos_by_period(user_id, period["key"])
             delete_type = "period"
             if not memos_to_delete:
-                period_name = keyword
-                return {"success": False, "error": f"{period_name} 메모가 없습니다."}
+                return {"success": False, "error": f"{period['label']} 메모가 없습니다."}
 
         # 2. 카테고리 키워드 확인
         elif keyword in CATEGORIES:
@@ -246,7 +579,7 @@ async def service_delete_memo(user_id: str, memo_id: str = None, keyword: str =
 
         # 3. 일반 키워드 검색
         else:
-            memos_to_delete = await search_memos(user_id, keyword, limit=10)
+            memos_to_delete = await search_memos(user_id, keyword, limit=10, collapse=False)
             delete_type = "keyword"
             if not memos_to_delete:
                 return {"success": False, "error": f"'{keyword}' 관련 메모가 없습니다."}
@@ -304,6 +637,32 @@ async def service_get_or_create_user(kakao_id: str) -> dict:
     return await db_get_or_create_user(kakao_id)
 
 
+async def service_set_timezone(user: dict, timezone: str) -> dict:
+    """유저 시간대 변경 서비스 (IANA 이름, 대소문자 무시)
+
+    바꾼 뒤 대기 중인 리마인더를 새 시간대의 같은 벽시계 시각으로 다시 예약
+    """
+    name = resolve_timezone(timezone)
+    if not name:
+        return {"success": False, "error": f"알 수 없는 시간대: {timezone}"}
+
+    old_timezone = user.get("timezone") or DEFAULT_TIMEZONE
+    updated = await set_user_timezone(user["kakao_id"], name)
+    if not updated:
+        return {"success": False, "error": "사용자를 찾을 수 없습니다"}
+
+    rescheduled = 0
+    if name != old_timezone:
+        rescheduled = await reschedule_user_reminders(user["id"], old_timezone, name)
+
+    return {
+        "success": True,
+        "timezone": name,
+        "previous": old_timezone,
+        "rescheduled": rescheduled
+    }
+
+
 # 포맷팅 유틸리티
 def format_memo_list(memos: list, title: str = "메모 목록") -> str:
     """메모 목록을 텍스트로 포맷팅"""
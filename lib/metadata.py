@@ -3,11 +3,16 @@
 URL에서 OG 태그, 제목 등 추출
 """
 import re
-import httpx
+import json
+import time
+import asyncio
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 from typing import Optional
 
+from .http_client import get_http_client
+from .deadline import fit_timeout, has_time
+
 # 플랫폼별 도메인 (확장)
 PLATFORM_DOMAINS = {
     # 영상
@@ -121,7 +126,162 @@ def extract_youtube_id(url: str) -> Optional[str]:
     return None
 
 
-async def fetch_oembed_metadata(url: str) -> Optional[dict]:
+# ============ 도메인 헬스 (네거티브 캐시 + 적응형 타임아웃) ============
+# 쿠팡/인스타그램처럼 봇을 차단하는 도메인은 oEmbed/직접 파싱이 항상 실패하므로
+# 도메인별 실패율·지연시간을 기록해 실패할 소스는 건너뛰고 타임아웃을 줄인다.
+# 상태는 Redis에 저장되어 모든 서버리스 인스턴스가 함께 학습한다.
+
+METADATA_SOURCES = ("oembed", "direct")
+DEFAULT_SOURCE_TIMEOUTS = {"oembed": 8.0, "direct": 10.0}
+MIN_SOURCE_TIMEOUT = 1.5            # 적응형 타임아웃 하한 (초)
+HEALTH_KEY_PREFIX = "metadata:health:"
+HEALTH_TTL = 7 * 24 * 3600          # Redis 보관 기간 (7일)
+HEALTH_LOCAL_TTL = 60               # 인스턴스 내 캐시 유효시간 (초)
+HEALTH_EWMA_ALPHA = 0.3             # 지연시간/실패율 EWMA 가중치
+HEALTH_DECAY_HALF_LIFE = 24 * 3600  # 실패율 반감기 (초)
+HEALTH_LATENCY_SAMPLES = 20         # 백분위 계산용 최근 성공 지연시간 개수
+HEALTH_MIN_SAMPLES = 5              # 적응형 타임아웃 적용 최소 샘플 수
+SKIP_AFTER_FAILURES = 2             # 연속 실패 N회부터 소스 스킵
+SKIP_FAIL_RATE = 0.5                # 감쇠 실패율이 이 이상이면 실패 직후 소스 스킵
+BACKOFF_BASE = 10 * 60              # 첫 스킵 기간 (초), 이후 2배씩 증가
+BACKOFF_MAX = 24 * 3600             # 최대 스킵 기간 (초)
+
+# 인스턴스 내 캐시: {domain: (loaded_at, state)}
+_domain_health_cache = {}
+
+
+def get_health_domain(url: str) -> str:
+    """헬스 추적용 도메인 키 (소문자, www. 제거)"""
+    try:
+        domain = urlparse(url).netloc.lower().split("@")[-1].split(":")[0]
+    except Exception:
+        return ""
+    if domain.startswith("www."):
+        domain = domain[4:]
+    return domain
+
+
+def _new_source_health() -> dict:
+    return {"fail_rate": 0.0, "latency_ewma": 0.0, "samples": [], "streak": 0, "skip_until": 0, "updated_at": 0}
+
+
+async def get_domain_health(domain: str) -> dict:
+    """도메인 헬스 상태 조회 (인스턴스 캐시 → Redis)
+
+    Returns: {"oembed": {...}, "direct": {...}}
+    """
+    if not domain:
+        return {}
+
+    cached = _domain_health_cache.get(domain)
+    if cached and time.time() - cached[0] < HEALTH_LOCAL_TTL:
+        return cached[1]
+
+    state = {}
+    try:
+        from .redis_db import redis_command
+        data = await redis_command("GET", f"{HEALTH_KEY_PREFIX}{domain}")
+        if data:
+            state = json.loads(data)
+    except Exception as e:
+        print(f"[Metadata] Health load error: {e}")
+
+    _domain_health_cache[domain] = (time.time(), state)
+    return state
+
+
+async def save_domain_health(domain: str, state: dict) -> None:
+    """도메인 헬스 상태 저장 (Redis + 인스턴스 캐시)"""
+    if not domain:
+        return
+
+    _domain_health_cache[domain] = (time.time(), state)
+    try:
+        from .redis_db import redis_command
+        await redis_command(
+            "SET", f"{HEALTH_KEY_PREFIX}{domain}",
+            json.dumps(state, separators=(",", ":")), "EX", HEALTH_TTL
+        )
+    except Exception as e:
+        print(f"[Metadata] Health save error: {e}")
+
+
+def record_source_result(state: dict, source: str, ok: bool, latency_ms: float, now: float = None) -> dict:
+    """소스 호출 결과를 헬스 상태에 반영 (state를 직접 수정)
+
+    - 실패율: 시간 감쇠 후 EWMA 갱신
+    - 지연시간: 성공한 호출만 EWMA + 최근 샘플에 기록
+    - 연속 실패 시 지수 백오프로 skip_until 설정, 성공하면 초기화
+      (성공/실패가 번갈아 나오는 소스는 should_skip_source가 실패율로 판단)
+    """
+    now = now if now is not None else time.time()
+    health = state.setdefault(source, _new_source_health())
+
+    fail_rate = _decayed_fail_rate(health, now)
+    health["fail_rate"] = round((1 - HEALTH_EWMA_ALPHA) * fail_rate + HEALTH_EWMA_ALPHA * (0.0 if ok else 1.0), 4)
+
+    if ok:
+        ewma = health.get("latency_ewma") or latency_ms
+        health["latency_ewma"] = round((1 - HEALTH_EWMA_ALPHA) * ewma + HEALTH_EWMA_ALPHA * latency_ms, 1)
+        samples = health.get("samples", [])
+        samples.append(round(latency_ms))
+        health["samples"] = samples[-HEALTH_LATENCY_SAMPLES:]
+        health["streak"] = 0
+        health["skip_until"] = 0
+    else:
+        health["streak"] = health.get("streak", 0) + 1
+        if health["streak"] >= SKIP_AFTER_FAILURES:
+            backoff = min(BACKOFF_BASE * 2 ** (health["streak"] - SKIP_AFTER_FAILURES), BACKOFF_MAX)
+            health["skip_until"] = int(now + backoff)
+
+    health["updated_at"] = int(now)
+    return state
+
+
+def _decayed_fail_rate(health: dict, now: float) -> float:
+    """마지막 기록 이후 경과 시간만큼 실패율 감쇠"""
+    fail_rate = health.get("fail_rate", 0.0)
+    updated_at = health.get("updated_at", 0)
+    if fail_rate and updated_at:
+        elapsed = max(0.0, now - updated_at)
+        fail_rate *= 0.5 ** (elapsed / HEALTH_DECAY_HALF_LIFE)
+    return fail_rate
+
+
+def should_skip_source(state: dict, source: str, now: float = None) -> bool:
+    """백오프 기간 중인 소스인지 (만료되면 한 번 재시도 허용)
+
+    - 연속 실패: record_source_result가 설정한 skip_until까지
+    - 간헐적 실패: 마지막 호출이 실패했고 감쇠 실패율이 SKIP_FAIL_RATE 이상이면
+      마지막 실패 후 BACKOFF_BASE 동안 (성공 한 번으로 초기화되지 않음)
+    """
+    health = state.get(source)
+    if not health:
+        return False
+    now = now if now is not None else time.time()
+    if now < health.get("skip_until", 0):
+        return True
+    if health.get("streak", 0) and _decayed_fail_rate(health, now) >= SKIP_FAIL_RATE:
+        return now < health.get("updated_at", 0) + BACKOFF_BASE
+    return False
+
+
+def get_source_timeout(state: dict, source: str) -> float:
+    """관측된 지연시간 p95 기반 소스별 타임아웃 (샘플 부족 시 기본값)"""
+    default = DEFAULT_SOURCE_TIMEOUTS.get(source, 8.0)
+    health = state.get(source)
+    if not health:
+        return default
+
+    samples = sorted(health.get("samples", []))
+    if len(samples) < HEALTH_MIN_SAMPLES:
+        return default
+
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] / 1000
+    return round(max(MIN_SOURCE_TIMEOUT, min(default, p95 * 1.5 + 0.5)), 2)
+
+
+async def fetch_oembed_metadata(url: str, timeout: float = 8.0) -> Optional[dict]:
     """open.iframe.ly oEmbed API로 메타데이터 가져오기 (1600+ 도메인 지원)
 
     서버리스 환경에서 봇 차단 우회, 모든 URL에 대해 안정적인 메타데이터 추출
@@ -132,18 +292,18 @@ async def fetch_oembed_metadata(url: str) -> Optional[dict]:
         # origin: GitHub 프로젝트명 (open.iframe.ly 정책)
         oembed_url = f"https://open.iframe.ly/api/oembed?url={quote(url, safe='')}&origin=memomate-pmc"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(oembed_url, timeout=8.0)
-
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "title": data.get("title", ""),
-                    "description": data.get("description", ""),
-                    "thumbnail_url": data.get("thumbnail_url", ""),
-                    "provider_name": data.get("provider_name", ""),
-                    "author_name": data.get("author_name", ""),
-                }
+        client = get_http_client("metadata")
+        response = await client.get(oembed_url, timeout=timeout)
+
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                "title": data.get("title", ""),
+                "description": data.get("description", ""),
+                "thumbnail_url": data.get("thumbnail_url", ""),
+                "provider_name": data.get("provider_name", ""),
+                "author_name": data.get("author_name", ""),
+            }
     except Exception as e:
         print(f"oEmbed API error: {e}")
 
@@ -231,12 +391,39 @@ def has_url(text: str) -> bool:
     return bool(URL_PATTERN.search(text))
 
 
+METADATA_RESERVE = 1.0      # 요청 마감 전 응답 생성용으로 남길 시간 (초)
+METADATA_MIN_BUDGET = 0.5   # 이보다 짧게 남으면 네트워크 소스 생략
+
+
+def _source_budget(health: dict, source: str) -> tuple:
+    """(타임아웃, 마감 때문에 줄었는지)"""
+    timeout = get_source_timeout(health, source)
+    fitted = fit_timeout(timeout, reserve=METADATA_RESERVE, minimum=METADATA_MIN_BUDGET)
+    return fitted, fitted < timeout
+
+
+def _record_unless_capped(health: dict, source: str, ok: bool, started: float, capped: bool) -> bool:
+    """헬스 기록 (기록했으면 True)
+
+    마감 때문에 줄인 타임아웃으로 실패한 건 도메인 탓이 아니므로 기록하지 않음
+    (요청 압박이 도메인 백오프로 번지는 것 방지)
+    """
+    if not ok and capped:
+        return False
+    record_source_result(health, source, ok, (time.monotonic() - started) * 1000)
+    return True
+
+
 async def extract_metadata(url: str) -> dict:
     """URL에서 메타데이터 추출 (oEmbed API 우선, 실패 시 직접 파싱)
 
     1단계: open.iframe.ly oEmbed API (1600+ 도메인, 봇 차단 우회)
     2단계: 직접 OG 태그 파싱 (폴백)
     3단계: 기본 썸네일/favicon (최후 폴백)
+
+    도메인 헬스에 따라 실패가 반복되는 소스는 건너뛰고,
+    관측된 지연시간에 맞춰 소스별 타임아웃을 줄인다.
+    요청 마감이 있으면 남은 시간에 맞춰 더 줄이고, 시간이 없으면 폴백으로 바로 응답한다.
     """
 
     platform = detect_platform(url)
@@ -249,93 +436,80 @@ async def extract_metadata(url: str) -> dict:
         if youtube_id:
             youtube_thumbnail = f"https://i.ytimg.com/vi/{youtube_id}/hqdefault.jpg"
 
-    # ========== 1단계: oEmbed API 시도 (가장 안정적) ==========
-    oembed_data = await fetch_oembed_metadata(url)
-    if oembed_data and oembed_data.get("title"):
-        # oEmbed 성공!
-        thumbnail = oembed_data.get("thumbnail_url", "")
-
-        # YouTube는 직접 생성한 썸네일이 더 안정적
-        if platform == "youtube" and youtube_thumbnail:
-            thumbnail = youtube_thumbnail
-
-        # 썸네일 폴백
-        if not thumbnail:
-            thumbnail = get_default_thumbnail(platform) or get_favicon_url(url)
-
-        result = {
-            "title": oembed_data.get("title", ""),
-            "description": oembed_data.get("description", ""),
-            "image": thumbnail,
-            "thumbnail": thumbnail,
-            "site_name": oembed_data.get("provider_name", "") or get_domain_name(url),
-            "url": url,
-            "type": platform
-        }
-        if youtube_id:
-            result["video_id"] = youtube_id
-        return result
+    domain = get_health_domain(url)
+    health = await get_domain_health(domain)
+    health_changed = False
 
-    # ========== 2단계: 직접 OG 태그 파싱 (oEmbed 실패 시) ==========
     try:
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(
-                url,
-                timeout=10.0,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7"
-                }
-            )
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # OG 태그 추출
-            og_title = soup.find("meta", property="og:title")
-            og_description = soup.find("meta", property="og:description")
-            og_image = soup.find("meta", property="og:image")
-            og_site_name = soup.find("meta", property="og:site_name")
-
-            # 일반 title, description
-            title_tag = soup.find("title")
-            desc_tag = soup.find("meta", attrs={"name": "description"})
-
-            # 이미지 URL 정규화
-            raw_image = _get_content(og_image)
-            image_url = normalize_image_url(raw_image, url)
-
-            # YouTube 썸네일 우선
+        # ========== 1단계: oEmbed API 시도 (가장 안정적) ==========
+        oembed_data = None
+        if should_skip_source(health, "oembed"):
+            print(f"[Metadata] Skip oEmbed for {domain} (backoff)")
+        elif not has_time(METADATA_MIN_BUDGET + METADATA_RESERVE):
+            print(f"[Metadata] Skip oEmbed for {domain} (deadline)")
+        else:
+            timeout, capped = _source_budget(health, "oembed")
+            started = time.monotonic()
+            oembed_data = await fetch_oembed_metadata(url, timeout=timeout)
+            ok = bool(oembed_data and oembed_data.get("title"))
+            health_changed = _record_unless_capped(health, "oembed", ok, started, capped) or health_changed
+
+        if oembed_data and oembed_data.get("title"):
+            # oEmbed 성공!
+            thumbnail = oembed_data.get("thumbnail_url", "")
+
+            # YouTube는 직접 생성한 썸네일이 더 안정적
             if platform == "youtube" and youtube_thumbnail:
-                if not image_url or "ytimg.com" not in image_url:
-                    image_url = youtube_thumbnail
-
-            # 이미지 폴백
-            final_image = image_url or get_default_thumbnail(platform) or get_favicon_url(url)
+                thumbnail = youtube_thumbnail
 
-            # 제목 폴백
-            title = _get_content(og_title) or _get_text(title_tag) or get_domain_name(url)
-
-            # 사이트명 폴백
-            site_name = _get_content(og_site_name) or get_domain_name(url)
+            # 썸네일 폴백
+            if not thumbnail:
+                thumbnail = get_default_thumbnail(platform) or get_favicon_url(url)
 
             result = {
-                "title": title or "",
-                "description": _get_content(og_description) or _get_content(desc_tag) or "",
-                "image": final_image or "",
-                "thumbnail": final_image or "",
-                "site_name": site_name or "",
+                "title": oembed_data.get("title", ""),
+                "description": oembed_data.get("description", ""),
+                "image": thumbnail,
+                "thumbnail": thumbnail,
+                "site_name": oembed_data.get("provider_name", "") or get_domain_name(url),
                 "url": url,
-                "type": platform
+                "type": platform,
+                "source": "oembed"
             }
             if youtube_id:
                 result["video_id"] = youtube_id
             return result
 
-    except Exception as e:
-        print(f"Metadata extraction error: {e}")
+        # ========== 2단계: 직접 OG 태그 파싱 (oEmbed 실패 시) ==========
+        if should_skip_source(health, "direct"):
+            print(f"[Metadata] Skip direct fetch for {domain} (backoff)")
+        elif not has_time(METADATA_MIN_BUDGET + METADATA_RESERVE):
+            print(f"[Metadata] Skip direct fetch for {domain} (deadline)")
+        else:
+            timeout, capped = _source_budget(health, "direct")
+            started = time.monotonic()
+            result = await _fetch_direct_metadata(
+                url, platform, youtube_id, youtube_thumbnail,
+                timeout=timeout
+            )
+            health_changed = _record_unless_capped(health, "direct", result is not None, started, capped) or health_changed
+            if result:
+                return result
+
+    finally:
+        if health_changed:
+            await save_domain_health(domain, health)
 
     # ========== 3단계: 최후 폴백 ==========
+    return get_fallback_metadata(url)
+
+
+def get_fallback_metadata(url: str) -> dict:
+    """네트워크 없이 만드는 최후 폴백 메타데이터 (도메인명 + 기본 썸네일/favicon)"""
+    platform = detect_platform(url)
+    youtube_id = extract_youtube_id(url) if platform == "youtube" else None
+    youtube_thumbnail = f"https://i.ytimg.com/vi/{youtube_id}/hqdefault.jpg" if youtube_id else None
+
     fallback_image = youtube_thumbnail or get_default_thumbnail(platform) or get_favicon_url(url)
     result = {
         "title": get_domain_name(url),
@@ -344,13 +518,372 @@ async def extract_metadata(url: str) -> dict:
         "type": platform,
         "image": fallback_image or "",
         "thumbnail": fallback_image or "",
-        "site_name": get_domain_name(url)
+        "site_name": get_domain_name(url),
+        "source": "fallback"
     }
     if youtube_id:
         result["video_id"] = youtube_id
     return result
 
 
+# ============ 오프라인 메타데이터 (URL만으로 추출) ============
+# 잘 알려진 플랫폼은 URL 경로만으로 제목/썸네일/타입을 만들 수 있다.
+# 저장 응답은 즉시 하고, 네트워크 추출은 백그라운드 보강(refine)으로 미룬다.
+
+def _offline_youtube(url: str, parsed) -> Optional[dict]:
+    video_id = extract_youtube_id(url)
+    if not video_id:
+        return None
+    kind = "Shorts" if "/shorts/" in parsed.path else "영상"
+    return {
+        "title": f"YouTube {kind}",
+        "thumbnail": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+        "site_name": "YouTube",
+        "video_id": video_id,
+    }
+
+
+SPOTIFY_TYPE_NAMES = {
+    "track": "트랙", "album": "앨범", "playlist": "플레이리스트",
+    "artist": "아티스트", "episode": "에피소드", "show": "팟캐스트",
+}
+
+
+def _offline_spotify(url: str, parsed) -> Optional[dict]:
+    # /track/{id}, /intl-ko/album/{id} 등
+    match = re.search(r"/(track|album|playlist|artist|episode|show)/([A-Za-z0-9]+)", parsed.path)
+    if not match:
+        return None
+    spotify_type, spotify_id = match.groups()
+    return {
+        "title": f"Spotify {SPOTIFY_TYPE_NAMES[spotify_type]}",
+        "site_name": "Spotify",
+        "spotify_type": spotify_type,
+        "spotify_id": spotify_id,
+    }
+
+
+GITHUB_RESERVED_PATHS = {"settings", "orgs", "marketplace", "explore", "topics", "features", "login", "search", "sponsors"}
+
+
+def _offline_github(url: str, parsed) -> Optional[dict]:
+    if parsed.netloc.lower().split(":")[0] not in ("github.com", "www.github.com"):
+        return None
+    parts = [p for p in parsed.path.split("/") if p]
+    if not parts or parts[0] in GITHUB_RESERVED_PATHS:
+        return None
+    owner = parts[0]
+    if len(parts) == 1:
+        return {"title": owner, "thumbnail": f"https://github.com/{owner}.png", "site_name": "GitHub"}
+    repo = parts[1].removesuffix(".git")
+    return {
+        "title": f"{owner}/{repo}",
+        # GitHub 공식 OG 이미지 서비스 (저장소 카드)
+        "thumbnail": f"https://opengraph.githubassets.com/1/{owner}/{repo}",
+        "site_name": "GitHub",
+        "repo": f"{owner}/{repo}",
+    }
+
+
+def _offline_naver_blog(url: str, parsed) -> Optional[dict]:
+    from urllib.parse import parse_qs
+    query = parse_qs(parsed.query)
+    blog_id = (query.get("blogId") or [None])[0]
+    log_no = (query.get("logNo") or [None])[0]
+    if not blog_id:
+        # blog.naver.com/{blogId}/{logNo}
+        match = re.match(r"/([A-Za-z0-9_-]+)(?:/(\d+))?/?$", parsed.path)
+        if not match:
+            return None
+        blog_id, log_no = match.group(1), match.group(2)
+    result = {
+        "title": f"{blog_id}님의 블로그" + (" 글" if log_no else ""),
+        "site_name": "네이버 블로그",
+        "blog_id": blog_id,
+    }
+    if log_no:
+        result["post_id"] = log_no
+    return result
+
+
+def _offline_kakao_map(url: str, parsed) -> Optional[dict]:
+    from urllib.parse import unquote
+    # place.map.kakao.com/{placeId}
+    match = re.match(r"/(?:m/)?(\d+)/?$", parsed.path)
+    if "place.map.kakao.com" in parsed.netloc and match:
+        return {"title": "카카오맵 장소", "site_name": "카카오맵", "place_id": match.group(1)}
+    # map.kakao.com/link/map/{이름},{위도},{경도} 또는 /link/to/...
+    match = re.match(r"/link/(?:map|to|search)/([^/]+)", parsed.path)
+    if match:
+        name = unquote(match.group(1)).split(",")[0]
+        if name.isdigit():
+            return {"title": "카카오맵 장소", "site_name": "카카오맵", "place_id": name}
+        return {"title": name, "site_name": "카카오맵"}
+    match = re.search(r"itemId=(\d+)", parsed.query)
+    if match:
+        return {"title": "카카오맵 장소", "site_name": "카카오맵", "place_id": match.group(1)}
+    return None
+
+
+def _offline_naver_map(url: str, parsed) -> Optional[dict]:
+    # map.naver.com/p/entry/place/{id}, /v5/entry/place/{id}, /p/search/.../place/{id}
+    match = re.search(r"/place/(\d+)", parsed.path)
+    if not match:
+        return None  # naver.me 단축 URL 등은 네트워크 필요
+    return {"title": "네이버 지도 장소", "site_name": "네이버 지도", "place_id": match.group(1)}
+
+
+def _offline_instagram(url: str, parsed) -> Optional[dict]:
+    match = re.match(r"/(?:[^/]+/)?(p|reel|reels|tv)/([A-Za-z0-9_-]+)", parsed.path)
+    if not match:
+        return None
+    kind = "게시물" if match.group(1) == "p" else "릴스"
+    return {"title": f"Instagram {kind}", "site_name": "Instagram", "post_id": match.group(2)}
+
+
+def _offline_coupang(url: str, parsed) -> Optional[dict]:
+    match = re.search(r"/vp/products/(\d+)", parsed.path)
+    if not match:
+        return None
+    return {"title": "쿠팡 상품", "site_name": "쿠팡", "product_id": match.group(1)}
+
+
+# 플랫폼 → 오프라인 추출기 (URL만으로 판단 못 하면 None 반환)
+OFFLINE_EXTRACTORS = {
+    "youtube": _offline_youtube,
+    "spotify": _offline_spotify,
+    "github": _offline_github,
+    "naver_blog": _offline_naver_blog,
+    "kakao_map": _offline_kakao_map,
+    "naver_map": _offline_naver_map,
+    "instagram": _offline_instagram,
+    "coupang": _offline_coupang,
+}
+
+
+def derive_offline_metadata(url: str) -> Optional[dict]:
+    """네트워크 없이 URL만으로 메타데이터 생성 (지원 플랫폼이 아니면 None)"""
+    platform = detect_platform(url)
+    extractor = OFFLINE_EXTRACTORS.get(platform)
+    if not extractor:
+        return None
+
+    try:
+        derived = extractor(url, urlparse(url))
+    except Exception as e:
+        print(f"[Metadata] Offline extractor error ({platform}): {e}")
+        return None
+    if not derived:
+        return None
+
+    thumbnail = derived.pop("thumbnail", None) or get_default_thumbnail(platform) or get_favicon_url(url)
+    result = {
+        "title": derived.pop("title"),
+        "description": "",
+        "image": thumbnail,
+        "thumbnail": thumbnail,
+        "site_name": derived.pop("site_name", "") or get_domain_name(url),
+        "url": url,
+        "type": platform,
+        "source": "offline",
+    }
+    result.update(derived)
+    return result
+
+
+# ============ 다중 URL 메타데이터 (동시 추출) ============
+
+MAX_LINKS_PER_MEMO = 10     # 카카오 캐러셀 최대 카드 수
+ENRICH_CONCURRENCY = 4      # 메모 하나당 동시 추출 개수
+ENRICH_DEADLINE = 3.5       # 전체 추출 마감 (초) - 카카오 스킬 응답 제한(5초) 안에서 응답 생성 여유 포함
+
+# metadata["links"]에 저장할 필드 (description 등 무거운 필드 제외, 재시도 횟수는 링크별)
+LINK_FIELDS = ("url", "title", "thumbnail", "site_name", "type", "video_id", "source", "refresh_attempts")
+
+
+async def enrich_urls(
+    urls: list,
+    concurrency: int = ENRICH_CONCURRENCY,
+    deadline: float = ENRICH_DEADLINE,
+    offline_first: bool = False,
+    max_urls: int = MAX_LINKS_PER_MEMO
+) -> list:
+    """여러 URL의 메타데이터를 동시에 추출 (입력 순서 유지)
+
+    - 중복 URL 제거, 최대 max_urls개 (기본: 메모당 MAX_LINKS_PER_MEMO)
+    - 동시 실행 수 제한 (Semaphore)
+    - 전체 마감 시간 초과 시 남은 URL은 폴백 메타데이터 사용
+      (요청 마감이 있으면 그 안에 끝나도록 deadline 축소)
+    - offline_first=True: 오프라인 추출 가능한 URL은 네트워크 호출 생략
+    """
+    unique_urls = list(dict.fromkeys(urls))[:max_urls]
+    if not unique_urls:
+        return []
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _extract(url: str) -> dict:
+        async with semaphore:
+            return await extract_metadata(url)
+
+    offline = {}
+    if offline_first:
+        for url in unique_urls:
+            derived = derive_offline_metadata(url)
+            if derived:
+                offline[url] = derived
+
+    tasks = {url: asyncio.create_task(_extract(url)) for url in unique_urls if url not in offline}
+    done, pending = set(), set()
+    if tasks:
+        deadline = fit_timeout(deadline, reserve=METADATA_RESERVE)
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    results = []
+    for url in unique_urls:
+        metadata = offline.get(url)
+        task = tasks.get(url)
+        if task is not None and task in done:
+            if task.exception() is None:
+                metadata = task.result()
+            else:
+                print(f"[Metadata] Enrich error for {url}: {task.exception()}")
+        if not metadata:
+            metadata = get_fallback_metadata(url)
+        metadata["url"] = url
+        results.append(metadata)
+
+    if pending:
+        print(f"[Metadata] Enrich deadline exceeded: {len(pending)}/{len(unique_urls)} URL 폴백")
+
+    return results
+
+
+def to_link_summary(metadata: dict) -> dict:
+    """metadata["links"] 배열용 경량 링크 정보"""
+    return {k: metadata[k] for k in LINK_FIELDS if metadata.get(k)}
+
+
+def merge_link_metadata(enriched: list) -> dict:
+    """메모 저장용 메타데이터 (대표 링크 + 여러 링크면 links 배열)"""
+    if not enriched:
+        return {}
+    metadata = dict(enriched[0])
+    if len(enriched) > 1:
+        metadata["links"] = [to_link_summary(m) for m in enriched]
+    return metadata
+
+
+def stored_links(metadata: dict) -> list:
+    """저장된 메모 메타데이터 → 링크별 항목 (대표 링크는 전체 필드, 나머지는 links 요약)"""
+    if not metadata or not metadata.get("url"):
+        return []
+    primary = {k: v for k, v in metadata.items() if k != "links"}
+    links = [dict(link) for link in metadata.get("links") or [] if link.get("url")]
+    if not links:
+        return [primary]
+    if links[0]["url"] == primary["url"]:
+        links[0] = primary
+    return links
+
+
+def merge_refreshed_links(old_metadata: dict, fresh: list) -> dict:
+    """링크별로 새 메타데이터 반영 - 새 결과가 없거나 폴백이면 그 링크는 기존 항목 유지
+
+    (일부 링크만 실패해도 기존 오프라인/네트워크 정보가 폴백으로 내려가지 않음)
+    폴백이 된 링크는 refresh_attempts를 늘려 다음 재시도 간격을 키우고,
+    새 정보로 바뀐 링크는 새 항목이라 횟수가 초기화됨
+    """
+    by_url = {m["url"]: m for m in fresh}
+    merged = []
+    for entry in stored_links(old_metadata):
+        new = by_url.get(entry["url"])
+        if new and new.get("source") != "fallback":
+            merged.append(new)
+            continue
+        if new:
+            entry["refresh_attempts"] = entry.get("refresh_attempts", 0) + 1
+        merged.append(entry)
+    return merge_link_metadata(merged)
+
+
+async def _fetch_direct_metadata(
+    url: str,
+    platform: str,
+    youtube_id: Optional[str],
+    youtube_thumbnail: Optional[str],
+    timeout: float = 10.0
+) -> Optional[dict]:
+    """직접 HTML을 받아 OG 태그 파싱 (차단/에러 응답이면 None)"""
+    try:
+        client = get_http_client("metadata")
+        response = await client.get(
+            url,
+            timeout=timeout,
+            headers={
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7"
+            }
+        )
+
+        # 봇 차단 페이지(403 "Access Denied" 등)는 실패로 취급
+        if response.status_code >= 400:
+            print(f"[Metadata] Direct fetch HTTP {response.status_code}: {url}")
+            return None
+
+        soup = BeautifulSoup(response.text, 'html.parser')
+
+        # OG 태그 추출
+        og_title = soup.find("meta", property="og:title")
+        og_description = soup.find("meta", property="og:description")
+        og_image = soup.find("meta", property="og:image")
+        og_site_name = soup.find("meta", property="og:site_name")
+
+        # 일반 title, description
+        title_tag = soup.find("title")
+        desc_tag = soup.find("meta", attrs={"name": "description"})
+
+        # 이미지 URL 정규화
+        raw_image = _get_content(og_image)
+        image_url = normalize_image_url(raw_image, url)
+
+        # YouTube 썸네일 우선
+        if platform == "youtube" and youtube_thumbnail:
+            if not image_url or "ytimg.com" not in image_url:
+                image_url = youtube_thumbnail
+
+        # 이미지 폴백
+        final_image = image_url or get_default_thumbnail(platform) or get_favicon_url(url)
+
+        # 제목 폴백
+        title = _get_content(og_title) or _get_text(title_tag) or get_domain_name(url)
+
+        # 사이트명 폴백
+        site_name = _get_content(og_site_name) or get_domain_name(url)
+
+        result = {
+            "title": title or "",
+            "description": _get_content(og_description) or _get_content(desc_tag) or "",
+            "image": final_image or "",
+            "thumbnail": final_image or "",
+            "site_name": site_name or "",
+            "url": url,
+            "type": platform,
+            "source": "direct"
+        }
+        if youtube_id:
+            result["video_id"] = youtube_id
+        return result
+
+    except Exception as e:
+        print(f"Metadata extraction error: {e}")
+
+    return None
+
+
 def detect_platform(url: str) -> str:
     """URL 플랫폼 감지"""
     try:
@@ -0,0 +1,202 @@
+"""
+기간 엔진 - 자연어 기간 → 유저 시간대 달력 범위 → 메모 점수(timestamp) 범위
+
+정리/요약/삭제/통계/검색이 같은 규칙으로 기간을 해석한다.
+
+- 기본 키: today/yesterday/week/last_week/month/last_month/all
+  week = 이번 주 월요일~오늘, last_week = 지난주 월~일, month = 이번 달 1일~오늘,
+  last_month = 지난달 1일~말일, all = 최근 365일
+- 자연어: "3월", "2025년 3월", "3월 5일", "지난 금요일", "이번 수요일", "그저께",
+  "3일 전", "2주 전", "1달 전", "최근 10일", "올해", "작년"
+  (띄어쓰기 무시, 연도 없는 날짜가 미래면 작년)
+- 범위는 날짜 포함 구간 (start, end), 점수 범위는 [start 자정, end 다음날 자정)
+  → ZREVRANGEBYSCORE/ZCOUNT에 그대로 넘기고 LIMIT도 Redis에서 적용
+- 자연어 기간의 key는 띄어쓰기를 뺀 원문 ("지난금요일") - 다시 해석 가능한 명령 인자
+"""
+import re
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+from .localtime import current_timezone, local_now, local_midnight
+
+PERIOD_NAMES = {
+    "today": "오늘",
+    "yesterday": "어제",
+    "week": "이번 주",
+    "last_week": "지난 주",
+    "month": "이번 달",
+    "last_month": "지난 달",
+    "all": "전체"
+}
+
+DEFAULT_PERIOD = "week"     # 해석할 수 없는 기간
+ALL_PERIOD_DAYS = 365
+
+# 표면형 → 기본 키 (띄어쓰기 제거 후)
+NAMED_PERIODS = {
+    "오늘": "today", "금일": "today",
+    "어제": "yesterday",
+    "이번주": "week", "금주": "week",
+    "지난주": "last_week", "저번주": "last_week",
+    "이번달": "month",
+    "지난달": "last_month", "저번달": "last_month",
+    "전체": "all",
+    **{key: key for key in PERIOD_NAMES},
+}
+
+WEEKDAYS = "월화수목금토일"
+
+PERIOD_PATTERN = re.compile(r"""
+      (?P<named>[a-z_]+|오늘|금일|어제|이번주|금주|지난주|저번주|이번달|지난달|저번달|전체)
+    | (?P<day_before>그저께|그제)
+    | (?P<this_year>올해|금년)
+    | (?P<last_year>작년|지난해)
+    | (?:(?P<year>\d{4})년)?(?P<month>\d{1,2})월(?:(?P<day>\d{1,2})일)?
+    | (?P<relative>지난|저번|이번)(?P<weekday>[월화수목금토일])요일
+    | (?P<ago>\d{1,3})(?P<unit>일|주|달|개월|년)전
+    | 최근(?P<recent>\d{1,3})일
+""", re.VERBOSE)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_period(text: str) -> str:
+    return _WHITESPACE.sub("", text or "").lower()
+
+
+def _month_range(year: int, month: int) -> Tuple[date, date]:
+    start = date(year, month, 1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    return start, next_month - timedelta(days=1)
+
+
+def _shift_months(day: date, months: int) -> date:
+    """그 달 1일에서 months달 이동한 달의 1일"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _date_label(day: date, today: date) -> str:
+    if day.year != today.year:
+        return f"{day.year}년 {day.month}월 {day.day}일"
+    return f"{day.month}월 {day.day}일"
+
+
+def _named_range(key: str, today: date) -> Tuple[date, date]:
+    monday = today - timedelta(days=today.weekday())
+    if key == "today":
+        return today, today
+    if key == "yesterday":
+        yesterday = today - timedelta(days=1)
+        return yesterday, yesterday
+    if key == "week":
+        return monday, today
+    if key == "last_week":
+        return monday - timedelta(days=7), monday - timedelta(days=1)
+    if key == "month":
+        return today.replace(day=1), today
+    if key == "last_month":
+        previous = _shift_months(today, -1)
+        return _month_range(previous.year, previous.month)
+    return today - timedelta(days=ALL_PERIOD_DAYS - 1), today
+
+
+def parse_period(text: str, today: date = None) -> Optional[dict]:
+    """기간 표현 → {"key", "label", "start", "end"} (날짜 포함 구간), 기간이 아니면 None"""
+    key = normalize_period(text)
+    match = PERIOD_PATTERN.fullmatch(key) if key else None
+    if not match:
+        return None
+    today = today or local_now().date()
+
+    if match.group("named"):
+        named = NAMED_PERIODS.get(match.group("named"))
+        if not named:
+            return None
+        start, end = _named_range(named, today)
+        return {"key": named, "label": PERIOD_NAMES[named], "start": start, "end": end}
+
+    if match.group("day_before"):
+        start = end = today - timedelta(days=2)
+        label = "그저께"
+
+    elif match.group("this_year") or match.group("last_year"):
+        year = today.year - (1 if match.group("last_year") else 0)
+        start, end = date(year, 1, 1), min(date(year, 12, 31), today)
+        label = "올해" if year == today.year else f"{year}년"
+
+    elif match.group("month"):
+        month = int(match.group("month"))
+        day = int(match.group("day")) if match.group("day") else None
+        year = int(match.group("year")) if match.group("year") else today.year
+        # 연도 없이 미래 날짜면 작년 ("10월에 3월 정리" = 올해 3월, "2월에 3월 정리" = 작년 3월)
+        if not match.group("year") and (month, day or 1) > (today.month, today.day):
+            year -= 1
+        try:
+            start, end = (date(year, month, day),) * 2 if day else _month_range(year, month)
+        except ValueError:
+            return None
+        if day:
+            label = _date_label(start, today)
+        else:
+            label = f"{month}월" if year == today.year else f"{year}년 {month}월"
+
+    elif match.group("weekday"):
+        weekday = WEEKDAYS.index(match.group("weekday"))
+        relative = match.group("relative")
+        if relative == "이번":
+            start = today - timedelta(days=today.weekday() - weekday)
+        else:
+            # 지난 X요일 = 오늘 이전 가장 가까운 X요일
+            start = today - timedelta(days=(today.weekday() - weekday - 1) % 7 + 1)
+        end = start
+        label = f"{relative} {WEEKDAYS[weekday]}요일 ({start.month}월 {start.day}일)"
+
+    elif match.group("ago"):
+        amount, unit = int(match.group("ago")), match.group("unit")
+        if unit == "일":
+            start = end = today - timedelta(days=amount)
+        elif unit == "주":
+            start = today - timedelta(days=today.weekday() + 7 * amount)
+            end = start + timedelta(days=6)
+        elif unit == "년":
+            start, end = date(today.year - amount, 1, 1), date(today.year - amount, 12, 31)
+        else:
+            month = _shift_months(today, -amount)
+            start, end = _month_range(month.year, month.month)
+        label = f"{amount}{'개월' if unit == '달' else unit} 전"
+
+    else:
+        days = int(match.group("recent"))
+        if days < 1:
+            return None
+        start, end = today - timedelta(days=days - 1), today
+        label = f"최근 {days}일"
+
+    return {"key": key, "label": label, "start": start, "end": end}
+
+
+def resolve_period(period: str, today: date = None) -> dict:
+    """기간 키/표현 → 범위 (해석할 수 없으면 DEFAULT_PERIOD)"""
+    return parse_period(period, today) or parse_period(DEFAULT_PERIOD, today)
+
+
+def period_label(period: str) -> str:
+    """표시용 기간 이름 (해석할 수 없으면 원문)"""
+    parsed = parse_period(period)
+    return parsed["label"] if parsed else period
+
+
+def period_scores(period_range: dict, tz: str = None) -> Tuple[float, float]:
+    """범위 → 점수 범위 [min, max) (유저 시간대 자정 기준)"""
+    tz = tz or current_timezone()
+    return (
+        local_midnight(tz, period_range["start"]),
+        local_midnight(tz, period_range["end"] + timedelta(days=1)),
+    )
+
+
+def score_range_args(period_range: dict, tz: str = None) -> Tuple[str, str]:
+    """ZCOUNT/ZRANGEBYSCORE 인자 (min, "(max") - 끝은 다음날 자정 제외"""
+    min_score, max_score = period_scores(period_range, tz)
+    return str(min_score), f"({max_score}"
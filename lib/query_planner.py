@@ -0,0 +1,220 @@
+"""
+멀티 필터 쿼리 플래너 - 기간 × 카테고리 × 키워드 × 태그
+
+"지난주 맛집 강남" 같은 조합을 저장 함수 하나로는 표현할 수 없어 전부 읽어 오던 것을,
+인덱스 크기를 먼저 재고 가장 좁은 인덱스부터 Redis 안에서 걸러 최종 페이지만 가져온다.
+
+1. 추정: 시간 범위(ZCOUNT)와 SET 인덱스(SCARD)를 파이프라인 1번 - 0이면 바로 빈 결과
+   (카테고리/태그 SET 인덱스, 태그 인덱스가 아직 없는 유저는 재구축 대기열에 넣고
+   이번 조회는 메모의 tags 배열을 Lua에서 훑음 - 요청 안에서 재구축하지 않음)
+2. 계획: 가장 작은 인덱스가 드라이버
+   - SET이 가장 작으면 intersect: ZINTERSTORE로 임시 ZSET(짧은 TTL)에 교집합 → 시간 범위
+   - 시간 범위가 가장 작으면 range: 범위를 훑으며 SET 소속만 확인 (큰 SET 교집합 생략)
+3. 실행: 남은 조건(SET 소속/검색어)이 없으면 ZCOUNT + LIMIT 조회 + MGET,
+   있으면 Lua 스크립트(filter_page)가 매칭 수와 최종 페이지 JSON만 반환
+   (cards=True면 본문 대신 목록용 카드만 받아 옴)
+4. explain=True면 계획/추정/스캔 수/왕복 수/소요 시간을 함께 반환, 느린 쿼리는 로그
+"""
+import hashlib
+import json
+import time
+from typing import Optional
+
+from .periods import parse_period, resolve_period, score_range_args
+from .tag_index import normalize_tag, tag_key, tag_ready_key, request_tag_rebuild
+
+QUERY_TMP_TTL = 30          # 교집합 임시 키 TTL (초)
+QUERY_SCAN_LIMIT = 1000     # Lua 최종 단계에서 훑는 최대 후보 수
+SLOW_QUERY_MS = 300         # 이보다 오래 걸리면 계획을 로그로 남김
+
+
+def parse_query(text: str) -> dict:
+    """검색 문장 → 필터 ("지난주 맛집 강남 #데이트" → 기간/카테고리/태그/키워드)
+
+    기간은 1~3 단어 조합 ("지난 금요일", "2025년 3월 5일"), 카테고리/태그/기간은 처음 것만
+    """
+    from .constants import CATEGORIES
+
+    filters = {"period": None, "category": None, "tag": None, "keyword": None}
+    words = (text or "").split()
+    rest = []
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if filters["period"] is None:
+            size = next((size for size in (3, 2, 1)
+                         if i + size <= len(words) and parse_period("".join(words[i:i + size]))), 0)
+            if size:
+                filters["period"] = parse_period("".join(words[i:i + size]))["key"]
+                i += size
+                continue
+        if filters["category"] is None and word in CATEGORIES:
+            filters["category"] = word
+        elif filters["tag"] is None and word.startswith("#") and len(word) > 1:
+            filters["tag"] = word[1:]
+        else:
+            rest.append(word)
+        i += 1
+    filters["keyword"] = " ".join(rest) or None
+    return filters
+
+
+def is_structured(filters: dict) -> bool:
+    """플래너가 필요한 조합인지 (키워드만/카테고리만은 기존 검색)"""
+    return bool(filters.get("period") or filters.get("tag")
+                or (filters.get("category") and filters.get("keyword")))
+
+
+def plan_query(indexes: list, residual: list) -> dict:
+    """추정 크기로 실행 계획 결정 (indexes: [{"index", "key", "kind", "estimate"}])"""
+    if any(index["estimate"] == 0 for index in indexes):
+        return {"strategy": "empty", "driver": min(indexes, key=lambda i: i["estimate"])["index"]}
+
+    driver = min(indexes, key=lambda i: i["estimate"])
+    sets = [index for index in indexes if index["kind"] == "set"]
+    if driver["kind"] == "set":
+        # 작은 SET부터 교집합 (ZINTERSTORE 비용은 가장 작은 입력 크기에 비례)
+        return {"strategy": "intersect", "driver": driver["index"],
+                "intersect": [index["key"] for index in sorted(sets, key=lambda i: i["estimate"])],
+                "member_keys": [], "residual": residual}
+    return {"strategy": "range", "driver": driver["index"], "intersect": [],
+            "member_keys": [index["key"] for index in sets], "residual": residual}
+
+
+async def query_memos(
+    user_id: str,
+    period: str = None,
+    category: str = None,
+    keyword: str = None,
+    tag: str = None,
+    limit: int = 10,
+    offset: int = 0,
+    explain: bool = False,
+    cards: bool = False
+) -> dict:
+    """조합 필터 조회 → {"memos", "total"[, "explain"]} (memos는 최신순 offset부터 limit개)"""
+    from .redis_db import redis_pipeline, get_memos_by_ids
+    from .lua_scripts import run_script
+    from .memo_cards import get_memo_cards, load_cards
+
+    started = time.monotonic()
+    memos_key = f"user:{user_id}:memos"
+    if period:
+        period_range = resolve_period(period)
+        min_score, max_score = score_range_args(period_range)
+    else:
+        min_score, max_score = "-inf", "+inf"
+
+    terms = [term.lower() for term in (keyword or "").split()]
+    residual = ["keyword"] if terms else []
+
+    # 1. 인덱스 크기 추정 (태그 인덱스 준비 여부도 같은 파이프라인에서)
+    indexes = [{"index": "time", "key": memos_key, "kind": "range"}]
+    if category:
+        indexes.append({"index": f"category:{category}", "key": f"user:{user_id}:category:{category}", "kind": "set"})
+    if tag:
+        indexes.append({"index": f"tag:{normalize_tag(tag)}", "key": tag_key(user_id, tag), "kind": "set"})
+    estimate_commands = [
+        ["ZCOUNT", memos_key, min_score, max_score] if index["kind"] == "range" else ["SCARD", index["key"]]
+        for index in indexes
+    ]
+    if tag:
+        estimate_commands.append(["GET", tag_ready_key(user_id)])
+    estimates = await redis_pipeline(estimate_commands)
+    round_trips = 1
+    tag_scan = bool(tag) and (not estimates[-1] or isinstance(estimates[-1], Exception))
+    if tag_scan:
+        # 태그 인덱스 재구축 전: 태그 SET 대신 메모의 tags 배열을 Lua에서 직접 확인
+        await request_tag_rebuild(user_id)
+        round_trips += 1
+        indexes.pop()
+        residual.append("tag")
+    for index, estimate in zip(indexes, estimates):
+        index["estimate"] = estimate if isinstance(estimate, int) else 0
+
+    # 2. 계획
+    plan = plan_query(indexes, residual)
+    memos, total, scanned = [], 0, 0
+
+    # 3. 실행
+    if plan["strategy"] != "empty":
+        commands = []
+        candidate_key = memos_key
+        if plan["intersect"]:
+            digest = hashlib.sha1("|".join(plan["intersect"]).encode()).hexdigest()[:12]
+            candidate_key = f"tmp:query:{user_id}:{digest}"
+            keys = [memos_key] + plan["intersect"]
+            commands += [
+                ["ZINTERSTORE", candidate_key, len(keys), *keys, "WEIGHTS", 1, *[0] * len(plan["intersect"])],
+                ["EXPIRE", candidate_key, QUERY_TMP_TTL],
+            ]
+            plan["temp_key"] = candidate_key
+
+        if plan["member_keys"] or residual:
+            if commands:
+                await redis_pipeline(commands)
+                round_trips += 1
+            result = await run_script(
+                "filter_page", [candidate_key] + plan["member_keys"],
+                [user_id, max_score, min_score, offset, limit, QUERY_SCAN_LIMIT, "1" if cards else "0",
+                 normalize_tag(tag) if tag_scan else "", *terms],
+            )
+            round_trips += 1
+            total, scanned = (result[0], result[1]) if len(result) >= 2 else (0, 0)
+            if cards:
+                memos = await load_cards(user_id, result[2:])
+            else:
+                memos = [json.loads(memo_data) for memo_data in result[2:] if memo_data]
+        else:
+            results = await redis_pipeline(commands + [
+                ["ZCOUNT", candidate_key, min_score, max_score],
+                ["ZREVRANGEBYSCORE", candidate_key, max_score, min_score, "LIMIT", offset, limit],
+            ])
+            count, memo_ids = results[-2], results[-1]
+            if isinstance(memo_ids, Exception):
+                raise memo_ids
+            memos = await (get_memo_cards if cards else get_memos_by_ids)(user_id, memo_ids or [])
+            round_trips += 1 + bool(memo_ids)
+            total = count if isinstance(count, int) else len(memos)
+            scanned = len(memo_ids or [])
+
+    elapsed_ms = round((time.monotonic() - started) * 1000, 1)
+    report = {
+        "filters": {"period": period, "category": category, "keyword": keyword, "tag": tag},
+        "indexes": [{"index": i["index"], "estimate": i["estimate"]} for i in indexes],
+        **plan,
+        "scanned": scanned,
+        "truncated": scanned >= QUERY_SCAN_LIMIT,
+        "round_trips": round_trips,
+        "tag_scan": tag_scan,
+        "elapsed_ms": elapsed_ms,
+    }
+    if elapsed_ms >= SLOW_QUERY_MS:
+        print(f"[Query] Slow query {elapsed_ms}ms for {user_id[:8]}: {json.dumps(report, ensure_ascii=False)}")
+
+    response = {"memos": memos, "total": total}
+    if explain:
+        response["explain"] = report
+    return response
+
+
+def format_explain(report: Optional[dict]) -> str:
+    """explain 결과 → 사람이 읽는 여러 줄 (MCP 디버깅용)"""
+    if not report:
+        return ""
+    estimates = ", ".join(f"{i['index']}≈{i['estimate']}" for i in report["indexes"])
+    lines = [
+        f"plan: {report['strategy']} (driver: {report['driver']})",
+        f"indexes: {estimates}",
+    ]
+    if report.get("intersect"):
+        lines.append(f"intersect: {' ∩ '.join(report['intersect'])} → {report.get('temp_key')} (TTL {QUERY_TMP_TTL}s)")
+    if report.get("member_keys"):
+        lines.append(f"member check: {', '.join(report['member_keys'])}")
+    if report.get("residual"):
+        lines.append(f"residual (Lua): {', '.join(report['residual'])}")
+    lines.append(
+        f"scanned: {report['scanned']}{' (truncated)' if report['truncated'] else ''}"
+        f" | round trips: {report['round_trips']} | {report['elapsed_ms']}ms"
+    )
+    return "\n".join(lines)
@@ -6,30 +6,127 @@ import os
 import json
 import uuid
 import asyncio
-import httpx
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from .http_client import get_http_client
+from .deadline import fit_timeout
+from .datetime_parser import next_occurrence
+from .localtime import DEFAULT_TIMEZONE, current_timezone, local_now, parse_local, to_local
+from .periods import resolve_period, score_range_args
+from .rollups import rollup_commands, rollup_change_commands
+from .lua_scripts import run_script, run_script_batch, retry_noscript
+from .memo_cards import card_key, card_commands, card_unindex_commands, get_memo_cards, load_cards
+from .tag_index import tag_index_commands, tag_change_commands
+from .url_index import url_index_commands, url_unindex_commands
+from .simhash import simhash, hamming, simhash_index_commands, simhash_unindex_commands, SIMILAR_MAX_DISTANCE
 
 # Upstash Redis 설정
 UPSTASH_REDIS_REST_URL = os.environ.get("UPSTASH_REDIS_REST_URL", "")
 UPSTASH_REDIS_REST_TOKEN = os.environ.get("UPSTASH_REDIS_REST_TOKEN", "")
 
+REDIS_TIMEOUT = 5.0        # 기본 요청 타임아웃 (초)
+REDIS_MIN_TIMEOUT = 0.5    # 마감 임박해도 최소 대기 (저장은 가능한 한 완료)
+SEARCH_CANDIDATES = 100    # 카테고리 없는 검색은 최근 N개 메모에서만
+SEARCH_COLLAPSE_OVERFETCH = 4   # 비슷한 메모 접기 시 limit의 몇 배까지 매칭을 받아 올지
+
 
 async def redis_command(*args) -> any:
     """Upstash Redis REST API 호출"""
     if not UPSTASH_REDIS_REST_URL or not UPSTASH_REDIS_REST_TOKEN:
         raise Exception("Redis 환경변수가 설정되지 않았습니다")
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            UPSTASH_REDIS_REST_URL,
-            headers={"Authorization": f"Bearer {UPSTASH_REDIS_REST_TOKEN}"},
-            json=list(args)
-        )
-        result = response.json()
-        if "error" in result:
-            raise Exception(result["error"])
-        return result.get("result")
+    client = get_http_client("redis")
+    response = await client.post(
+        UPSTASH_REDIS_REST_URL,
+        headers={"Authorization": f"Bearer {UPSTASH_REDIS_REST_TOKEN}"},
+        json=list(args),
+        timeout=fit_timeout(REDIS_TIMEOUT, minimum=REDIS_MIN_TIMEOUT)
+    )
+    result = response.json()
+    if "error" in result:
+        raise Exception(result["error"])
+    return result.get("result")
+
+
+async def redis_pipeline(commands: List[list]) -> list:
+    """Upstash 파이프라인 호출 (여러 명령을 HTTP 요청 1번으로)
+
+    Returns: 명령별 결과 리스트 (실패한 명령은 Exception 객체)
+    """
+    if not commands:
+        return []
+    if not UPSTASH_REDIS_REST_URL or not UPSTASH_REDIS_REST_TOKEN:
+        raise Exception("Redis 환경변수가 설정되지 않았습니다")
+
+    client = get_http_client("redis")
+    response = await client.post(
+        f"{UPSTASH_REDIS_REST_URL}/pipeline",
+        headers={"Authorization": f"Bearer {UPSTASH_REDIS_REST_TOKEN}"},
+        json=[list(cmd) for cmd in commands],
+        timeout=fit_timeout(REDIS_TIMEOUT, minimum=REDIS_MIN_TIMEOUT)
+    )
+    result = response.json()
+    if isinstance(result, dict) and "error" in result:
+        raise Exception(result["error"])
+    return [
+        Exception(item["error"]) if "error" in item else item.get("result")
+        for item in result
+    ]
+
+
+async def redis_transaction(commands: List[list]) -> list:
+    """Upstash 트랜잭션 호출 (MULTI/EXEC - 명령들이 원자적으로 함께 적용)
+
+    Returns: 명령별 결과 리스트 (실패한 명령은 Exception 객체)
+    """
+    if not commands:
+        return []
+    if not UPSTASH_REDIS_REST_URL or not UPSTASH_REDIS_REST_TOKEN:
+        raise Exception("Redis 환경변수가 설정되지 않았습니다")
+
+    client = get_http_client("redis")
+    response = await client.post(
+        f"{UPSTASH_REDIS_REST_URL}/multi-exec",
+        headers={"Authorization": f"Bearer {UPSTASH_REDIS_REST_TOKEN}"},
+        json=[list(cmd) for cmd in commands],
+        timeout=fit_timeout(REDIS_TIMEOUT, minimum=REDIS_MIN_TIMEOUT)
+    )
+    result = response.json()
+    if isinstance(result, dict) and "error" in result:
+        raise Exception(result["error"])
+    return [
+        Exception(item["error"]) if "error" in item else item.get("result")
+        for item in result
+    ]
+
+
+# ============ 메타데이터 갱신 인덱스 ============
+# metadata:refresh (ZSET) - member: "user_id:memo_id", score: 다음 갱신 예정 timestamp
+# 폴백/오프라인 메타데이터는 즉시, 정상 메타데이터는 METADATA_MAX_AGE 후 갱신 대상
+# 재시도 횟수(refresh_attempts)는 링크별 - 실패한 링크만 늘고 성공하면 새 항목으로 초기화
+
+METADATA_REFRESH_KEY = "metadata:refresh"
+METADATA_MAX_AGE = 30 * 24 * 3600       # 정상 메타데이터 재확인 주기 (30일)
+METADATA_RETRY_BASE = 6 * 3600          # 보강 실패 시 재시도 간격 (지수 증가)
+METADATA_RETRY_MAX = 7 * 24 * 3600
+
+
+def metadata_refresh_due(metadata: dict, now: float = None) -> Optional[float]:
+    """메타데이터 상태로 다음 갱신 시각 계산 (URL이 없으면 None)"""
+    if not metadata or not metadata.get("url"):
+        return None
+    now = now if now is not None else datetime.now().timestamp()
+
+    links = metadata.get("links") or [metadata]
+    pending = [link for link in links if link.get("source") in ("offline", "fallback")]
+    if not pending:
+        return now + METADATA_MAX_AGE
+    # 아직 한 번도 재시도 안 한 링크가 있으면 바로, 아니면 가장 적게 시도한 링크 기준 지수 백오프
+    attempts = min(link.get("refresh_attempts", 0) for link in pending)
+    if attempts == 0:
+        return now
+    return now + min(METADATA_RETRY_BASE * 2 ** (attempts - 1), METADATA_RETRY_MAX)
 
 
 # ============ 저장 함수 ============
@@ -42,9 +139,18 @@ async def save_memo(
     tags: List[str],
     summary: str,
     metadata: dict = None,
-    reminder_at: datetime = None
+    reminder_at: datetime = None,
+    recurrence: dict = None,
+    reminders: List[dict] = None,
+    category_source: str = None
 ) -> str:
-    """메모 저장"""
+    """메모 저장
+
+    recurrence: 반복 규칙 (reminder_at은 첫 발송 시각)
+    reminders: 한 메모의 여러 일정 (extract_reminders 결과, 2개 이상일 때)
+        → memo["reminders"]에 일정별로 저장, reminder_at은 가장 이른 일정
+    category_source: 카테고리 출처 (explicit/ai/local/rule) - 로컬 분류기 학습/재분류 판단용
+    """
     memo_id = str(uuid.uuid4())
     now = datetime.now().isoformat()
 
@@ -59,100 +165,172 @@ async def save_memo(
         "url": metadata.get("url") if metadata else None,
         "metadata": metadata or {},
         "created_at": now,
+        "day": local_now().date().isoformat(),     # 집계 날짜 (유저 시간대)
         "reminder_at": reminder_at.isoformat() if reminder_at else None,
         "reminder_sent": False
     }
-
-    # 메모 저장 (Hash)
+    if category_source:
+        memo["category_source"] = category_source
+    if recurrence:
+        memo["recurrence"] = recurrence
+    if reminders and len(reminders) > 1:
+        memo["reminders"] = [reminder_entry(info) for info in reminders]
+        memo["reminder_at"] = min(memo["reminders"], key=lambda entry: parse_local(entry["at"]))["at"]
+    if memo["reminder_at"]:
+        # 반복 리마인더 다음 회차를 크론(시간대 설정 없음)에서도 유저 시간대로 계산
+        memo["timezone"] = current_timezone()
+
+    # 메모 저장 + 인덱스 갱신을 파이프라인 1번으로
     memo_key = f"memo:{user_id}:{memo_id}"
-    await redis_command("SET", memo_key, json.dumps(memo, ensure_ascii=False))
-
-    # 유저 메모 목록에 추가 (최신순 정렬을 위해 score = timestamp)
     timestamp = datetime.now().timestamp()
-    await redis_command("ZADD", f"user:{user_id}:memos", timestamp, memo_id)
-
-    # 카테고리 인덱스에 추가
-    await redis_command("SADD", f"user:{user_id}:category:{category}", memo_id)
+    commands = [
+        ["SET", memo_key, json.dumps(memo, ensure_ascii=False)],
+        # 유저 메모 목록에 추가 (최신순 정렬을 위해 score = timestamp)
+        ["ZADD", f"user:{user_id}:memos", timestamp, memo_id],
+        # 카테고리 인덱스에 추가
+        ["SADD", f"user:{user_id}:category:{category}", memo_id],
+    ]
 
-    # 리마인더 인덱스에 추가 (있는 경우)
-    if reminder_at:
+    # 리마인더 인덱스에 추가 (있는 경우, 여러 일정이면 일정마다 1개)
+    if memo.get("reminders"):
+        for index, entry in enumerate(memo["reminders"]):
+            reminder_timestamp = parse_local(entry["at"]).timestamp()
+            commands.append(["ZADD", "reminders:pending", reminder_timestamp, reminder_member(user_id, memo_id, index)])
+    elif reminder_at:
         reminder_timestamp = reminder_at.timestamp()
-        await redis_command("ZADD", "reminders:pending", reminder_timestamp, f"{user_id}:{memo_id}")
+        commands.append(["ZADD", "reminders:pending", reminder_timestamp, f"{user_id}:{memo_id}"])
+
+    # 메타데이터 갱신 인덱스 (링크 메모)
+    refresh_due = metadata_refresh_due(memo["metadata"], timestamp)
+    if refresh_due is not None:
+        commands.append(["ZADD", METADATA_REFRESH_KEY, refresh_due, f"{user_id}:{memo_id}"])
+
+    # URL 인덱스 (같은 링크 재저장 감지) + SimHash 밴드 인덱스 (비슷한 메모)
+    commands += url_index_commands(user_id, memo_id, content)
+    commands += simhash_index_commands(user_id, memo_id, content)
+    # 일/월 집계 + 태그 인덱스 + 목록용 카드
+    commands += rollup_commands(user_id, memo)
+    commands += tag_index_commands(user_id, memo_id, tags)
+    commands += card_commands(user_id, memo)
+
+    # 리마인더가 있으면 메모와 pending 항목이 함께 적용되도록 트랜잭션 (왕복 수는 같음)
+    if memo["reminder_at"]:
+        await redis_transaction(commands)
+    else:
+        await redis_pipeline(commands)
 
     return memo_id
 
 
+async def bump_memo(user_id: str, memo_id: str) -> Optional[dict]:
+    """같은 링크를 다시 저장하면 새 메모 대신 기존 메모의 save_count/resaved_at만 갱신
+
+    patch_memos 비교 후 교체라 그 사이 카테고리/태그/메타데이터 수정은 보존.
+    목록 score·day·집계는 처음 저장한 날 그대로 (오늘 정리/인사이트가 서로 어긋나지 않도록)
+    Returns: 갱신된 메모 (그 사이 삭제됐으면 None)
+    """
+    memo_data = await redis_command("GET", f"memo:{user_id}:{memo_id}")
+    if not memo_data:
+        return None
+
+    bumped = {}
+
+    def patch(memo: dict):
+        memo["save_count"] = memo.get("save_count", 1) + 1
+        memo["resaved_at"] = datetime.now().isoformat()
+        bumped["memo"] = memo
+
+    stats = await patch_memos([(user_id, memo_id, memo_data, patch)])
+    if not stats["written"]:
+        return None
+    return bumped["memo"]
+
+
 # ============ 검색 함수 ============
 
 async def search_memos(
     user_id: str,
     query: str,
     category: Optional[str] = None,
-    limit: int = 5
+    limit: int = 5,
+    collapse: bool = True,
+    cards: bool = False
 ) -> List[dict]:
-    """메모 검색 (content, summary, tags에서 검색) - 배치 최적화"""
+    """메모 검색 (content, summary, tags에서 검색) - Lua 스크립트로 Redis 안에서 매칭
+
+    collapse=True: 비슷한 메모(SimHash)는 먼저 찾은 메모 하나로 접고 similar_count로 표시
+        (매칭은 limit × SEARCH_COLLAPSE_OVERFETCH개까지만 받아 옴 - similar_count는 그 안에서 센 값,
+        키워드 삭제처럼 모든 매칭이 필요하면 False)
+    cards=True: 매칭은 본문으로 하되 목록용 카드만 받아 옴 (접기는 카드의 simhash로)
+    """
 
-    # 카테고리 필터가 있으면 해당 카테고리 메모만 검색 (범위 축소)
+    # 카테고리 필터가 있으면 해당 카테고리 메모만, 없으면 최근 100개만 (전체 검색 방지)
+    # 매칭은 Lua 스크립트가 Redis 안에서 처리 → 매칭된 메모 JSON만 받아 옴
+    # (카테고리 SET은 순서가 없어 최신순 정렬에 매칭 전체가 필요 → 그때만 제한 없이,
+    #  접기는 접힐 메모를 감안해 limit의 몇 배까지만)
     if category:
-        memo_ids = await redis_command("SMEMBERS", f"user:{user_id}:category:{category}")
+        index_key, mode = f"user:{user_id}:category:{category}", "set"
     else:
-        # 최근 100개만 검색 (전체 검색 방지)
-        memo_ids = await redis_command("ZREVRANGE", f"user:{user_id}:memos", 0, 99)
-
-    if not memo_ids:
-        return []
+        index_key, mode = f"user:{user_id}:memos", "zset"
+    if category:
+        script_limit = 0
+    elif collapse:
+        script_limit = limit * SEARCH_COLLAPSE_OVERFETCH
+    else:
+        script_limit = limit
+    matches = await run_script(
+        "search_memos", [index_key],
+        [user_id, query.lower(), script_limit, SEARCH_CANDIDATES, mode, "1" if cards else "0"]
+    )
 
     results = []
-    query_lower = query.lower()
+    signatures = []     # results와 같은 순서 (시그니처 없으면 None)
+    if cards:
+        memos = await load_cards(user_id, matches)
+    else:
+        memos = [json.loads(memo_data) for memo_data in matches]
+    if category:
+        memos.sort(key=lambda x: x.get("created_at", ""), reverse=True)
 
-    # 배치로 메모 조회 (한 번에 최대 20개씩)
-    batch_size = 20
-    for i in range(0, len(memo_ids), batch_size):
+    for memo in memos:
+        if not collapse:
+            signature = None
+        else:
+            signature = memo.get("simhash") if cards else simhash(memo.get("content", ""))
+        if signature is not None:
+            duplicate_of = next((
+                i for i, other in enumerate(signatures)
+                if other is not None and hamming(signature, other) <= SIMILAR_MAX_DISTANCE
+            ), None)
+            if duplicate_of is not None:
+                results[duplicate_of]["similar_count"] = results[duplicate_of].get("similar_count", 0) + 1
+                continue
+        results.append(memo)
+        signatures.append(signature)
         if len(results) >= limit:
             break
 
-        batch_ids = memo_ids[i:i + batch_size]
-        batch_keys = [f"memo:{user_id}:{mid}" for mid in batch_ids]
-
-        # MGET으로 배치 조회 (N번 호출 -> 1번 호출)
-        batch_data = await redis_command("MGET", *batch_keys)
-
-        if not batch_data:
-            continue
-
-        for memo_data in batch_data:
-            if not memo_data:
-                continue
-
-            memo = json.loads(memo_data)
-
-            # 검색어 매칭 (content, summary, tags)
-            searchable = f"{memo.get('content', '')} {memo.get('summary', '')} {' '.join(memo.get('tags', []))}".lower()
-
-            if query_lower in searchable:
-                results.append(memo)
-                if len(results) >= limit:
-                    break
-
-    # 카테고리 필터 사용 시 최신순 정렬
-    if category:
-        results.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-
     return results[:limit]
 
 
 async def get_memos_by_category(
     user_id: str,
     category: str,
-    limit: int = 10
+    limit: int = 10,
+    cards: bool = False
 ) -> List[dict]:
-    """카테고리별 메모 조회 - MGET 배치 최적화"""
+    """카테고리별 메모 조회 - MGET 배치 최적화 (cards=True면 목록용 카드만)"""
     # 카테고리 인덱스에서 메모 ID 가져오기
     memo_ids = await redis_command("SMEMBERS", f"user:{user_id}:category:{category}")
 
     if not memo_ids:
         return []
 
+    if cards:
+        results = await get_memo_cards(user_id, memo_ids)
+        results.sort(key=lambda x: x.get("created_at") or "", reverse=True)
+        return results[:limit]
+
     # MGET으로 한 번에 조회
     memo_keys = [f"memo:{user_id}:{mid}" for mid in memo_ids]
     batch_data = await redis_command("MGET", *memo_keys)
@@ -170,65 +348,64 @@ async def get_memos_by_category(
 
 async def get_memos_by_period(
     user_id: str,
-    period: str
+    period: str,
+    limit: int = None,
+    category: str = None,
+    cards: bool = False
 ) -> List[dict]:
-    """기간별 메모 조회 (확장) - MGET 배치 최적화"""
-    now = datetime.now()
-    end_timestamp = None  # 기본: 현재까지
-
-    if period == "today":
-        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    elif period == "yesterday":
-        yesterday = now - timedelta(days=1)
-        start = yesterday.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_timestamp = now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
-    elif period == "week":
-        start = now - timedelta(days=7)
-    elif period == "last_week":
-        start = now - timedelta(days=14)
-        end_timestamp = (now - timedelta(days=7)).timestamp()
-    elif period == "month":
-        start = now - timedelta(days=30)
-    elif period == "last_month":
-        start = now - timedelta(days=60)
-        end_timestamp = (now - timedelta(days=30)).timestamp()
-    elif period == "all":
-        start = now - timedelta(days=365)  # 1년치
-    else:
-        start = now - timedelta(days=7)
+    """기간별 메모 조회 - 기간 엔진의 점수 범위로 ZREVRANGEBYSCORE + MGET
 
-    start_timestamp = start.timestamp()
-    max_score = end_timestamp if end_timestamp else "+inf"
+    period: 기간 키 또는 자연어 ("3월", "지난 금요일", "2주 전")
+    limit: 최신순 앞에서부터 N개만 (Redis LIMIT으로 잘라 옴)
+    category: 카테고리 필터 (Lua 스크립트가 Redis 안에서 걸러 해당 메모만 받아 옴)
+    cards: 본문 대신 목록용 카드만
+    """
+    min_score, max_score = score_range_args(resolve_period(period))
+    if category:
+        matches = await run_script(
+            "range_in_category",
+            [f"user:{user_id}:memos", f"user:{user_id}:category:{category}"],
+            [user_id, max_score, min_score, limit or 0, "1" if cards else "0"],
+        )
+        if cards:
+            return await load_cards(user_id, matches)
+        return [json.loads(memo_data) for memo_data in matches]
 
-    # 기간 내 메모 ID 가져오기
-    memo_ids = await redis_command("ZREVRANGEBYSCORE", f"user:{user_id}:memos", max_score, start_timestamp)
+    args = ["ZREVRANGEBYSCORE", f"user:{user_id}:memos", max_score, min_score]
+    if limit:
+        args += ["LIMIT", 0, limit]
 
-    if not memo_ids:
-        return []
+    memo_ids = await redis_command(*args)
+    if cards:
+        return await get_memo_cards(user_id, memo_ids or [])
+    return await get_memos_by_ids(user_id, memo_ids or [])
 
-    # MGET으로 한 번에 조회
-    memo_keys = [f"memo:{user_id}:{mid}" for mid in memo_ids]
-    batch_data = await redis_command("MGET", *memo_keys)
 
-    results = []
-    if batch_data:
-        for memo_data in batch_data:
-            if memo_data:
-                results.append(json.loads(memo_data))
-
-    return results
+async def get_period_page(user_id: str, period: str, limit: int, cards: bool = False) -> Tuple[List[dict], int]:
+    """기간 메모 최신 N개 + 기간 전체 개수 (ZCOUNT와 LIMIT 조회를 파이프라인 1번, cards=True면 카드만)"""
+    min_score, max_score = score_range_args(resolve_period(period))
+    memos_key = f"user:{user_id}:memos"
+    count, memo_ids = await redis_pipeline([
+        ["ZCOUNT", memos_key, min_score, max_score],
+        ["ZREVRANGEBYSCORE", memos_key, max_score, min_score, "LIMIT", 0, limit],
+    ])
+    if isinstance(memo_ids, Exception):
+        raise memo_ids
+    load = get_memo_cards if cards else get_memos_by_ids
+    memos = await load(user_id, memo_ids or [])
+    total = count if isinstance(count, int) else len(memos)
+    return memos, max(total, len(memos))
 
 
 async def get_user_stats(user_id: str) -> dict:
     """유저 통계 조회 (병렬 처리 최적화)"""
     from .constants import CATEGORIES
-    now = datetime.now()
+    today = local_now().date()
 
-    # 기간별 timestamp 계산
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
-    week_start = (now - timedelta(days=7)).timestamp()
-    month_start = (now - timedelta(days=30)).timestamp()
-    now_timestamp = now.timestamp()
+    # 기간별 점수 범위 (기간 엔진: 오늘/이번 주/이번 달 달력 기준)
+    today_range, week_range, month_range = (
+        score_range_args(resolve_period(period, today)) for period in ("today", "week", "month")
+    )
 
     memos_key = f"user:{user_id}:memos"
 
@@ -238,9 +415,9 @@ async def get_user_stats(user_id: str) -> dict:
     tasks = [
         # 기본 통계 (4개)
         redis_command("ZCARD", memos_key),
-        redis_command("ZCOUNT", memos_key, str(int(today_start)), str(int(now_timestamp))),
-        redis_command("ZCOUNT", memos_key, str(int(week_start)), str(int(now_timestamp))),
-        redis_command("ZCOUNT", memos_key, str(int(month_start)), str(int(now_timestamp))),
+        redis_command("ZCOUNT", memos_key, *today_range),
+        redis_command("ZCOUNT", memos_key, *week_range),
+        redis_command("ZCOUNT", memos_key, *month_range),
     ]
 
     # 카테고리별 SCARD (11개)
@@ -274,14 +451,17 @@ async def get_user_stats(user_id: str) -> dict:
 
 async def get_recent_memos(
     user_id: str,
-    limit: int = 5
+    limit: int = 5,
+    cards: bool = False
 ) -> List[dict]:
-    """최근 메모 조회 - MGET 배치 최적화"""
+    """최근 메모 조회 - MGET 배치 최적화 (cards=True: 목록용 카드만)"""
     # 최신순으로 limit개 가져오기
     memo_ids = await redis_command("ZREVRANGE", f"user:{user_id}:memos", 0, limit - 1)
 
     if not memo_ids:
         return []
+    if cards:
+        return await get_memo_cards(user_id, memo_ids)
 
     # MGET으로 한 번에 조회
     memo_keys = [f"memo:{user_id}:{mid}" for mid in memo_ids]
@@ -310,14 +490,28 @@ async def delete_memo(user_id: str, memo_id: str) -> bool:
     memo = json.loads(memo_data)
     category = memo.get("category", "기타")
 
-    # 1. 메모 데이터 삭제
-    await redis_command("DEL", memo_key)
-
-    # 2. 유저 메모 목록에서 제거
-    await redis_command("ZREM", f"user:{user_id}:memos", memo_id)
+    commands = [
+        # 1. 메모 데이터 삭제
+        ["DEL", memo_key],
+        # 2. 유저 메모 목록에서 제거
+        ["ZREM", f"user:{user_id}:memos", memo_id],
+        # 3. 카테고리 인덱스에서 제거
+        ["SREM", f"user:{user_id}:category:{category}", memo_id],
+        # 4. 리마인더/메타데이터 갱신 인덱스에서 제거
+        ["ZREM", "reminders:pending"] + [
+            reminder_member(user_id, memo_id, index)
+            for index in range(max(len(memo.get("reminders") or []), 1))
+        ],
+        ["ZREM", METADATA_REFRESH_KEY, f"{user_id}:{memo_id}"],
+    ]
+    # 5. URL/SimHash/태그 인덱스와 카드 제거, 일/월 집계에서 빼기
+    commands += url_unindex_commands(user_id, memo_id, memo.get("content", ""))
+    commands += simhash_unindex_commands(user_id, memo_id, memo.get("content", ""))
+    commands += rollup_commands(user_id, memo, sign=-1)
+    commands += tag_index_commands(user_id, memo_id, memo.get("tags"), sign=-1)
+    commands += card_unindex_commands(user_id, memo_id)
 
-    # 3. 카테고리 인덱스에서 제거
-    await redis_command("SREM", f"user:{user_id}:category:{category}", memo_id)
+    await retry_noscript(commands, await redis_pipeline(commands))
 
     return True
 
@@ -329,7 +523,7 @@ async def update_memo(
     category: str = None,
     tags: List[str] = None
 ) -> dict:
-    """메모 수정 (summary, category, tags)"""
+    """메모 수정 (summary, category, tags) - 카테고리를 바꾸면 직접 지정(explicit)으로 기록"""
     memo_key = f"memo:{user_id}:{memo_id}"
     memo_data = await redis_command("GET", memo_key)
 
@@ -337,27 +531,180 @@ async def update_memo(
         return None
 
     memo = json.loads(memo_data)
+    memo.setdefault("id", memo_id)
     old_category = memo.get("category", "기타")
+    old_tags = memo.get("tags") or []
 
     # 필드 업데이트
     if summary is not None:
         memo["summary"] = summary
     if tags is not None:
         memo["tags"] = tags
-    if category is not None and category != old_category:
-        # 카테고리 변경 시 인덱스 업데이트
-        await redis_command("SREM", f"user:{user_id}:category:{old_category}", memo_id)
-        await redis_command("SADD", f"user:{user_id}:category:{category}", memo_id)
+    if category is not None:
         memo["category"] = category
+        memo["category_source"] = "explicit"
+
+    # 저장 + 카테고리/태그 인덱스 이동 + 집계 수정을 파이프라인 1번으로
+    await redis_pipeline(memo_update_commands(user_id, memo, old_category, old_tags))
+
+    return memo
+
 
+def memo_update_commands(user_id: str, memo: dict, old_category: str, old_tags: List[str] = None) -> List[list]:
+    """수정된 메모 저장 명령 (카테고리가 바뀌었으면 인덱스 이동, 카테고리/태그 집계·태그 인덱스·카드 수정 포함)
+
+    old_tags: 수정 전 태그 (None이면 태그는 안 바뀐 것으로 봄)
+    """
+    memo_id = memo["id"]
     memo["updated_at"] = datetime.now().isoformat()
+    commands = [["SET", f"memo:{user_id}:{memo_id}", json.dumps(memo, ensure_ascii=False)]]
+
+    new_category = memo.get("category", "기타")
+    if new_category != old_category:
+        commands.append(["SREM", f"user:{user_id}:category:{old_category}", memo_id])
+        commands.append(["SADD", f"user:{user_id}:category:{new_category}", memo_id])
+
+    old_memo = {**memo, "category": old_category}
+    if old_tags is not None:
+        old_memo["tags"] = old_tags
+        commands += tag_change_commands(user_id, memo_id, old_tags, memo.get("tags"))
+    commands += rollup_change_commands(user_id, old_memo, memo)
+    commands += card_commands(user_id, memo)
+    return commands
+
+
+async def update_memos_batch(updates: List[tuple], extra_commands: List[list] = None) -> int:
+    """여러 메모 수정을 파이프라인 1번으로 반영
+
+    updates: [(user_id, 수정된 memo, 이전 카테고리[, 이전 태그]), ...]
+    extra_commands: 같은 파이프라인에 함께 보낼 명령 (학습 등)
+    Returns: 실패한 명령 수
+    """
+    commands = []
+    for user_id, memo, old_category, *old_tags in updates:
+        commands.extend(memo_update_commands(user_id, memo, old_category, *old_tags))
+    commands.extend(extra_commands or [])
+
+    results = await redis_pipeline(commands)
+    return sum(1 for r in results if isinstance(r, Exception))
+
+
+async def update_memo_metadata(
+    user_id: str,
+    memo_id: str,
+    metadata: dict,
+    summary: str = None
+) -> dict:
+    """메모 메타데이터 교체 (summary는 선택) - 메타데이터 필드만 바꿔 비교 후 교체
+
+    Returns: 저장된 메모 (없거나 삭제됐으면 None)
+    """
+    memo_key = f"memo:{user_id}:{memo_id}"
+    memo_data = await redis_command("GET", memo_key)
+
+    if not memo_data:
+        return None
+
+    saved = {}
+
+    def patch(memo):
+        apply_memo_metadata(memo, metadata, summary)
+        saved["memo"] = memo
+
+    result = await patch_memos([(user_id, memo_id, memo_data, patch)])
+    return saved["memo"] if result["written"] else None
 
-    # 저장
-    await redis_command("SET", memo_key, json.dumps(memo, ensure_ascii=False))
 
+MEMO_PATCH_RETRIES = 3      # 그 사이 수정된 메모를 다시 읽어 재적용하는 최대 횟수
+
+
+async def patch_memos(patches: List[tuple], not_before: float = None) -> dict:
+    """읽어 둔 메모에 일부 필드만 반영해 비교 후 교체 (patch_memo 스크립트, 메모 수와 무관하게 파이프라인 1번)
+
+    patches: [(user_id, memo_id, 읽은 본문 JSON, patch(memo))] - patch는 memo dict를 직접 수정
+    not_before: 갱신 인덱스 재예약 하한 (이 시각 이하로는 예약하지 않음 - 같은 실행에서 다시 집지 않도록)
+    - 읽은 뒤 다른 요청이 수정했으면 최신 본문을 다시 읽어 patch 재적용 (카테고리/태그/요약 수정 보존)
+    - 삭제됐으면 쓰지 않고 갱신 인덱스에서도 제거 (본문/카드가 고아 키로 되살아나지 않음)
+    Returns: {"written", "gone", "conflicts"}
+    """
+    stats = {"written": 0, "gone": 0, "conflicts": 0}
+    pending = list(patches)
+    for attempt in range(MEMO_PATCH_RETRIES):
+        if not pending:
+            break
+        now = datetime.now().timestamp()
+        calls = []
+        for user_id, memo_id, memo_data, patch in pending:
+            memo = json.loads(memo_data)
+            memo.setdefault("id", memo_id)
+            patch(memo)
+            refresh_due = metadata_refresh_due(memo.get("metadata"), now)
+            if refresh_due is not None and not_before is not None:
+                refresh_due = max(refresh_due, not_before + 1)
+            calls.append((
+                [f"memo:{user_id}:{memo_id}", card_key(user_id, memo_id), METADATA_REFRESH_KEY],
+                [memo_data,
+                 json.dumps(memo, ensure_ascii=False),
+                 card_commands(user_id, memo)[0][2],
+                 f"{user_id}:{memo_id}",
+                 "" if refresh_due is None else refresh_due],
+            ))
+        results = await run_script_batch("patch_memo", calls)
+
+        conflicted = []
+        for item, result in zip(pending, results):
+            if result == 1:
+                stats["written"] += 1
+            elif result == -1:
+                stats["gone"] += 1
+            else:
+                if isinstance(result, Exception):
+                    print(f"[Redis] Memo patch error for {item[0][:8]}:{item[1]}: {result}")
+                conflicted.append(item)
+        if not conflicted:
+            pending = []
+            break
+
+        # 그 사이 수정된 메모는 최신 본문으로 다시
+        latest = await redis_command("MGET", *[f"memo:{u}:{m}" for u, m, _, _ in conflicted]) or []
+        pending = []
+        for (user_id, memo_id, _, patch), memo_data in zip(conflicted, latest):
+            if memo_data:
+                pending.append((user_id, memo_id, memo_data, patch))
+            else:
+                stats["gone"] += 1
+
+    stats["conflicts"] += len(pending)
+    return stats
+
+
+def apply_memo_metadata(memo: dict, metadata: dict, summary: str = None) -> dict:
+    """메모 dict에 새 메타데이터 반영 (memo를 직접 수정)"""
+    memo["metadata"] = metadata
+    if metadata.get("url"):
+        memo["url"] = metadata["url"]
+    if summary is not None:
+        memo["summary"] = summary
+    memo["metadata_updated_at"] = datetime.now().isoformat()
     return memo
 
 
+async def get_due_metadata_refreshes(limit: int = 50, until: float = None) -> List[str]:
+    """갱신 예정 시각이 지난 메모 목록 ("user_id:memo_id") - 오래된 순
+
+    until: 이 시각까지 예정된 것만 (작업 시작 시각을 주면 실행 중 재예약된 메모는 다시 집지 않음)
+    """
+    until = until if until is not None else datetime.now().timestamp()
+    return await redis_command(
+        "ZRANGEBYSCORE", METADATA_REFRESH_KEY, "-inf", until, "LIMIT", 0, limit
+    ) or []
+
+
+async def get_memo_raw(user_id: str, memo_id: str) -> Optional[str]:
+    """메모 본문 JSON 문자열 그대로 (patch_memos 비교 후 교체용)"""
+    return await redis_command("GET", f"memo:{user_id}:{memo_id}")
+
+
 async def get_memo_by_id(user_id: str, memo_id: str) -> dict:
     """메모 ID로 조회"""
     memo_key = f"memo:{user_id}:{memo_id}"
@@ -369,6 +716,20 @@ async def get_memo_by_id(user_id: str, memo_id: str) -> dict:
     return json.loads(memo_data)
 
 
+async def get_memos_by_ids(user_id: str, memo_ids: List[str]) -> List[dict]:
+    """메모 ID 목록으로 조회 (MGET 1번, 입력 순서 유지, 없는 메모 제외)"""
+    if not memo_ids:
+        return []
+    batch_data = await redis_command("MGET", *[f"memo:{user_id}:{mid}" for mid in memo_ids])
+    results = []
+    for memo_id, memo_data in zip(memo_ids, batch_data or []):
+        if memo_data:
+            memo = json.loads(memo_data)
+            memo.setdefault("id", memo_id)
+            results.append(memo)
+    return results
+
+
 async def get_memo_by_short_id(user_id: str, short_id: str) -> dict:
     """짧은 ID (8자리)로 메모 조회 - UUID prefix 매칭"""
     if not short_id or len(short_id) < 4:
@@ -385,7 +746,10 @@ async def get_memo_by_short_id(user_id: str, short_id: str) -> dict:
     # prefix가 일치하는 메모 찾기
     for memo_id in memo_ids:
         if memo_id.lower().startswith(short_id_lower):
-            return await get_memo_by_id(user_id, memo_id)
+            memo = await get_memo_by_id(user_id, memo_id)
+            if memo:
+                memo.setdefault("id", memo_id)
+            return memo
 
     return None
 
@@ -407,6 +771,7 @@ async def get_or_create_user(kakao_id: str) -> dict:
     user = {
         "id": user_id,
         "kakao_id": kakao_id,
+        "timezone": DEFAULT_TIMEZONE,
         "created_at": now,
         "updated_at": now
     }
@@ -415,12 +780,65 @@ async def get_or_create_user(kakao_id: str) -> dict:
     return user
 
 
+async def set_user_timezone(kakao_id: str, timezone: str) -> Optional[dict]:
+    """사용자 시간대 변경 (timezone: IANA 이름, 검증은 호출 쪽에서)
+
+    Returns: 변경된 사용자 (없는 사용자면 None)
+    """
+    user_key = f"user:{kakao_id}"
+    user_data = await redis_command("GET", user_key)
+
+    if not user_data:
+        return None
+
+    user = json.loads(user_data)
+    user["timezone"] = timezone
+    user["updated_at"] = datetime.now().isoformat()
+    await redis_command("SET", user_key, json.dumps(user, ensure_ascii=False))
+    return user
+
+
 # ============ 리마인더 함수 ============
+# reminders:pending (ZSET) - score: 발송 예정 timestamp
+#   member: "user_id:memo_id" (일정 1개 / 여러 일정의 첫 번째), "user_id:memo_id:N" (N번째 일정)
+
+def reminder_member(user_id: str, memo_id: str, index: int = 0) -> str:
+    """pending 멤버 (첫 일정은 기존 형식 그대로)"""
+    if index == 0:
+        return f"{user_id}:{memo_id}"
+    return f"{user_id}:{memo_id}:{index}"
+
+
+def reminder_entry(info: dict) -> dict:
+    """extract_reminders 결과 → 메모에 저장할 일정 항목"""
+    entry = {"at": info["reminder_at"].isoformat(), "text": info["reminder_text"], "sent": False}
+    if info.get("recurrence"):
+        entry["recurrence"] = info["recurrence"]
+    return entry
+
+
+def _memo_reminder(memo: dict, index: int) -> Optional[dict]:
+    """메모의 index번째 일정 (일정 1개짜리 메모는 메모 필드로 구성, 없으면 None)"""
+    entries = memo.get("reminders")
+    if entries:
+        return entries[index] if index < len(entries) else None
+    if index != 0 or not memo.get("reminder_at"):
+        return None
+    reminder = {
+        "at": memo["reminder_at"],
+        "text": memo.get("summary") or memo.get("content", "")[:50],
+        "sent": memo.get("reminder_sent", False),
+    }
+    if memo.get("recurrence"):
+        reminder["recurrence"] = memo["recurrence"]
+    return reminder
+
 
 async def get_pending_reminders() -> List[dict]:
     """
     현재 시간 이전의 미발송 리마인더 조회
-    Returns: [{"user_id": str, "memo_id": str, "memo": dict}, ...]
+    Returns: [{"user_id": str, "memo_id": str, "memo": dict, "index": int, "reminder": dict}, ...]
+        reminder: {"at", "text", "sent", ["recurrence"]} - 발송할 일정 (여러 일정 메모는 그중 하나)
     """
     now_timestamp = datetime.now().timestamp()
 
@@ -431,27 +849,50 @@ async def get_pending_reminders() -> List[dict]:
         return []
 
     results = []
+    memos = {}      # 같은 메모의 여러 일정은 GET 1번
     for item in pending:
-        # item = "user_id:memo_id"
-        parts = item.split(":", 1)
-        if len(parts) != 2:
+        # item = "user_id:memo_id" 또는 "user_id:memo_id:N"
+        parts = item.split(":")
+        if len(parts) not in (2, 3):
             continue
 
-        user_id, memo_id = parts
-        memo = await get_memo_by_id(user_id, memo_id)
+        user_id, memo_id = parts[0], parts[1]
+        index = int(parts[2]) if len(parts) == 3 and parts[2].isdigit() else 0
+        if (user_id, memo_id) not in memos:
+            memos[(user_id, memo_id)] = await get_memo_by_id(user_id, memo_id)
+        memo = memos[(user_id, memo_id)]
 
-        if memo and not memo.get("reminder_sent", False):
+        reminder = _memo_reminder(memo, index) if memo else None
+        if reminder and not reminder.get("sent", False):
             results.append({
                 "user_id": user_id,
                 "memo_id": memo_id,
-                "memo": memo
+                "memo": memo,
+                "index": index,
+                "reminder": reminder
             })
 
     return results
 
 
-async def mark_reminder_sent(user_id: str, memo_id: str) -> bool:
-    """리마인더 발송 완료 처리"""
+def _advance_reminder(reminder: dict, now: datetime) -> Optional[datetime]:
+    """발송한 일정의 다음 회차 (반복 아니면 None, now의 시간대 기준)
+
+    발송이 늦어졌어도 지금 이후 첫 회차로 (밀린 회차 몰아 보내기 없음)
+    """
+    recurrence = reminder.get("recurrence")
+    if not recurrence:
+        return None
+    scheduled = parse_local(reminder["at"], now.tzinfo.key) if reminder.get("at") else now
+    return next_occurrence(recurrence, max(scheduled, now))
+
+
+async def mark_reminder_sent(user_id: str, memo_id: str, index: int = 0) -> bool:
+    """리마인더 발송 완료 처리 (index: 여러 일정 메모의 일정 번호)
+
+    반복 리마인더는 다음 회차로 옮김 (reminder_at 갱신 + 같은 멤버 ZADD로 score만 변경)
+    → pending 항목은 일정당 항상 1개, 메모와 인덱스는 트랜잭션 1번으로 함께 갱신
+    """
     memo_key = f"memo:{user_id}:{memo_id}"
     memo_data = await redis_command("GET", memo_key)
 
@@ -459,26 +900,146 @@ async def mark_reminder_sent(user_id: str, memo_id: str) -> bool:
         return False
 
     memo = json.loads(memo_data)
-    memo["reminder_sent"] = True
-    memo["reminder_sent_at"] = datetime.now().isoformat()
-
-    # 메모 업데이트
-    await redis_command("SET", memo_key, json.dumps(memo, ensure_ascii=False))
+    now = local_now(memo.get("timezone") or DEFAULT_TIMEZONE)
+    memo["reminder_sent_at"] = now.isoformat()
+    member = reminder_member(user_id, memo_id, index)
+
+    entries = memo.get("reminders")
+    if entries:
+        if index >= len(entries):
+            return False
+        entry = entries[index]
+        next_at = _advance_reminder(entry, now)
+        entry["sent_at"] = now.isoformat()
+        if next_at:
+            entry["at"] = next_at.isoformat()
+        else:
+            entry["sent"] = True
+        # 메모 대표 필드: 남은 일정 중 가장 이른 시각
+        remaining = [e["at"] for e in entries if not e.get("sent")]
+        if remaining:
+            memo["reminder_at"] = min(remaining, key=parse_local)
+        memo["reminder_sent"] = not remaining
+    else:
+        next_at = _advance_reminder(_memo_reminder(memo, 0) or {}, now)
+        if next_at:
+            memo["reminder_at"] = next_at.isoformat()
+            memo["reminder_sent"] = False
+        else:
+            memo["reminder_sent"] = True
+
+    if next_at:
+        index_command = ["ZADD", "reminders:pending", next_at.timestamp(), member]
+    else:
+        index_command = ["ZREM", "reminders:pending", member]
 
-    # pending 목록에서 제거
-    await redis_command("ZREM", "reminders:pending", f"{user_id}:{memo_id}")
+    await redis_transaction([
+        ["SET", memo_key, json.dumps(memo, ensure_ascii=False)],
+        index_command,
+    ])
 
     return True
 
 
+REMINDER_SCAN_COUNT = 500     # 시간대 변경 시 pending ZSCAN 1번에 훑는 항목 수
+
+
+def _shift_wall_clock(iso_time: str, old_tz: str, new_tz: str) -> datetime:
+    """old_tz 기준 벽시계 시각을 new_tz의 같은 벽시계 시각으로 ("오후 3시"는 새 시간대에서도 오후 3시)"""
+    return to_local(parse_local(iso_time, old_tz).replace(tzinfo=None), new_tz)
+
+
+async def reschedule_user_reminders(user_id: str, old_tz: str, new_tz: str) -> int:
+    """시간대 변경 후 유저의 미발송 리마인더를 새 시간대 기준으로 다시 예약 (변경 시 한 번)
+
+    reminders:pending에서 그 유저 멤버만 ZSCAN MATCH로 찾아, 메모의 일정 시각과
+    pending score를 같은 벽시계 시각의 새 시간대 값으로 바꿈 (메모별 시간대가 이미 new_tz면 그대로)
+    Returns: 다시 예약한 일정 수
+    """
+    members = []
+    cursor = "0"
+    while True:
+        cursor, page = await redis_command(
+            "ZSCAN", "reminders:pending", cursor, "MATCH", f"{user_id}:*", "COUNT", REMINDER_SCAN_COUNT
+        )
+        members += page[0::2]
+        if str(cursor) == "0":
+            break
+
+    memo_ids = list(dict.fromkeys(member.split(":")[1] for member in members))
+    if not memo_ids:
+        return 0
+
+    batch_data = await redis_command("MGET", *[f"memo:{user_id}:{mid}" for mid in memo_ids]) or []
+    commands = []
+    rescheduled = 0
+    for memo_id, memo_data in zip(memo_ids, batch_data):
+        if not memo_data:
+            continue
+        memo = json.loads(memo_data)
+        memo_tz = memo.get("timezone") or old_tz
+        if memo_tz == new_tz:
+            continue
+
+        entries = memo.get("reminders")
+        if entries:
+            for index, entry in enumerate(entries):
+                if entry.get("sent") or not entry.get("at"):
+                    continue
+                at = _shift_wall_clock(entry["at"], memo_tz, new_tz)
+                entry["at"] = at.isoformat()
+                commands.append(["ZADD", "reminders:pending", "XX", at.timestamp(),
+                                 reminder_member(user_id, memo_id, index)])
+                rescheduled += 1
+            remaining = [e["at"] for e in entries if not e.get("sent")]
+            if remaining:
+                memo["reminder_at"] = min(remaining, key=parse_local)
+        elif memo.get("reminder_at") and not memo.get("reminder_sent"):
+            at = _shift_wall_clock(memo["reminder_at"], memo_tz, new_tz)
+            memo["reminder_at"] = at.isoformat()
+            commands.append(["ZADD", "reminders:pending", "XX", at.timestamp(), reminder_member(user_id, memo_id)])
+            rescheduled += 1
+
+        memo["timezone"] = new_tz
+        commands.append(["SET", f"memo:{user_id}:{memo_id}", json.dumps(memo, ensure_ascii=False), "XX"])
+
+    if commands:
+        await redis_transaction(commands)
+    print(f"[Reminder] Rescheduled {rescheduled} reminders for {user_id[:8]} ({old_tz} → {new_tz})")
+    return rescheduled
+
+
+async def get_reminder_memos(user_id: str, include_sent: bool = False, limit: int = 50) -> List[dict]:
+    """할일 카테고리에서 (미발송) 리마인더가 있는 메모만, 최신 N개 (목록용 필드만)
+
+    필터링/투영은 Lua 스크립트가 Redis 안에서 처리
+    """
+    matches = await run_script("reminder_memos", [f"user:{user_id}:category:할일"], [user_id, int(include_sent)])
+    memos = [json.loads(memo_data) for memo_data in matches]
+    memos.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+    return memos[:limit]
+
+
 async def get_user_reminders(user_id: str, include_sent: bool = False) -> List[dict]:
-    """유저의 리마인더 목록 조회"""
-    # 할일 카테고리에서 리마인더가 있는 메모 조회
-    memos = await get_memos_by_category(user_id, "할일", limit=50)
+    """유저의 리마인더 목록 조회 (여러 일정 메모는 일정마다 한 줄)
+
+    일정 줄: 메모 + reminder_at/summary/recurrence를 그 일정 값으로, reminder_index 추가
+    """
+    memos = await get_reminder_memos(user_id, include_sent=include_sent)
 
     reminders = []
     for memo in memos:
-        if memo.get("reminder_at"):
+        entries = memo.get("reminders")
+        if entries:
+            for index, entry in enumerate(entries):
+                if include_sent or not entry.get("sent", False):
+                    row = {**memo, "reminder_at": entry["at"], "summary": entry["text"],
+                           "reminder_sent": entry.get("sent", False), "reminder_index": index}
+                    row.pop("recurrence", None)
+                    if entry.get("recurrence"):
+                        row["recurrence"] = entry["recurrence"]
+                    reminders.append(row)
+        elif memo.get("reminder_at"):
             if include_sent or not memo.get("reminder_sent", False):
                 reminders.append(memo)
 
@@ -0,0 +1,201 @@
+"""
+유저별 일/월 집계 (기간 요약/인사이트용)
+
+- user:{user_id}:rollup:day:{YYYY-MM-DD}, user:{user_id}:rollup:month:{YYYY-MM} 해시
+  필드: total, url, text, cat:{카테고리}, tag:{태그} → 메모 수
+- 저장/삭제/카테고리·태그 수정 파이프라인에 HINCRBY를 덧붙여 추가 왕복 없이 유지
+- 기간 집계: 기간 엔진(periods)의 달력 범위 중 완전히 들어가는 달은 월 해시,
+  나머지 가장자리만 일 해시
+  → "전체"(365일)도 HGETALL 약 12 + 60개를 파이프라인 1번 (메모 본문 조회 없음)
+- 집계 이전에 저장된 메모가 있는 유저는 재계산 대기열(rollup:rebuild)에 넣고 크론이 전체 재계산
+  (rebuild_rollups) - 그 전까지 조회는 기간 메모로 계산 (요청 안에서 전체 재계산 없음)
+- 메모의 집계 날짜는 저장 시 유저 시간대 날짜 (memo["day"])
+"""
+import asyncio
+import json
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+
+from .localtime import get_zone, current_timezone, local_now
+from .periods import resolve_period
+
+DAY_ROLLUP_TTL = 400 * 24 * 3600    # 일 해시 보관 (월 해시가 있으므로 1년 남짓이면 충분)
+REBUILD_PAGE_SIZE = 200              # 재계산 시 MGET 1번에 읽는 메모 수
+TOP_TAGS = 5
+ROLLUP_REBUILD_QUEUE = "rollup:rebuild"    # 재계산 대기 유저 SET (크론이 처리)
+
+
+def rollup_ready_key(user_id: str) -> str:
+    return f"user:{user_id}:rollup:ready"
+
+
+def day_rollup_key(user_id: str, day: date) -> str:
+    return f"user:{user_id}:rollup:day:{day.isoformat()}"
+
+
+def month_rollup_key(user_id: str, day: date) -> str:
+    return f"user:{user_id}:rollup:month:{day.strftime('%Y-%m')}"
+
+
+def memo_day(memo: dict) -> date:
+    """메모 집계 날짜 (저장 시 기록한 유저 시간대 날짜, 없으면 created_at으로 계산)"""
+    if memo.get("day"):
+        return date.fromisoformat(memo["day"])
+    created_at = memo.get("created_at")
+    if not created_at:
+        return local_now().date()
+    created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    # naive created_at은 서버 시계 기준으로 기록됨 → astimezone()이 서버 시간대로 해석
+    return created.astimezone(get_zone(current_timezone())).date()
+
+
+def rollup_fields(memo: dict) -> Counter:
+    """메모 1개가 집계에 더하는 필드"""
+    fields = Counter({"total": 1})
+    fields["url" if memo.get("url") else "text"] += 1
+    fields[f"cat:{memo.get('category', '기타')}"] += 1
+    for tag in dict.fromkeys(memo.get("tags") or []):
+        fields[f"tag:{tag}"] += 1
+    return fields
+
+
+def _increment_commands(user_id: str, day: date, delta: Counter) -> List[list]:
+    commands = []
+    day_key = day_rollup_key(user_id, day)
+    for key in (day_key, month_rollup_key(user_id, day)):
+        for field, amount in delta.items():
+            if amount:
+                commands.append(["HINCRBY", key, field, amount])
+    if commands:
+        commands.append(["EXPIRE", day_key, DAY_ROLLUP_TTL])
+    return commands
+
+
+def rollup_commands(user_id: str, memo: dict, sign: int = 1) -> List[list]:
+    """저장(sign=1)/삭제(sign=-1) 파이프라인에 붙일 집계 명령"""
+    delta = Counter({field: count * sign for field, count in rollup_fields(memo).items()})
+    return _increment_commands(user_id, memo_day(memo), delta)
+
+
+def rollup_change_commands(user_id: str, old_memo: dict, new_memo: dict) -> List[list]:
+    """수정 파이프라인에 붙일 집계 명령 (바뀐 카테고리/태그만)"""
+    delta = rollup_fields(new_memo)
+    delta.subtract(rollup_fields(old_memo))
+    return _increment_commands(user_id, memo_day(new_memo), delta)
+
+
+def period_day_range(period: str, today: date) -> Tuple[date, date]:
+    """기간 → (시작 날짜, 끝 날짜) 포함 범위 (기간 엔진, 오늘 이후는 잘라냄)"""
+    period_range = resolve_period(period, today)
+    return period_range["start"], min(period_range["end"], today)
+
+
+def rollup_keys_for_range(user_id: str, start: date, end: date, today: date) -> List[str]:
+    """범위를 덮는 최소 해시 목록 (범위에 완전히 들어가는 달은 월 해시 1개)
+
+    오늘이 속한 달은 오늘 이후 메모가 없으므로 오늘까지 들어가면 완전히 들어간 것으로 봄
+    """
+    keys = []
+    day = start
+    while day <= end:
+        month_start = day.replace(day=1)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        month_last = min(next_month - timedelta(days=1), today)
+        if day == month_start and month_last <= end:
+            keys.append(month_rollup_key(user_id, day))
+            day = next_month
+        else:
+            keys.append(day_rollup_key(user_id, day))
+            day += timedelta(days=1)
+    return keys
+
+
+def merge_rollups(records: List[dict]) -> dict:
+    """일/월 해시 합치기 → {"total", "url", "text", "categories", "tags"} (0 이하 필드 제외)"""
+    merged = Counter()
+    for record in records:
+        for field, value in (record or {}).items():
+            merged[field] += int(value)
+    categories = {f[4:]: n for f, n in merged.items() if f.startswith("cat:") and n > 0}
+    tags = {f[4:]: n for f, n in merged.items() if f.startswith("tag:") and n > 0}
+    return {
+        "total": max(merged["total"], 0),
+        "url": max(merged["url"], 0),
+        "text": max(merged["text"], 0),
+        "categories": dict(sorted(categories.items(), key=lambda item: item[1], reverse=True)),
+        "tags": dict(sorted(tags.items(), key=lambda item: item[1], reverse=True)[:TOP_TAGS]),
+    }
+
+
+def _hash_result(result) -> dict:
+    """HGETALL 결과 (Upstash: [필드, 값, ...]) → dict"""
+    if isinstance(result, dict):
+        return result
+    if not isinstance(result, list):
+        return {}
+    return dict(zip(result[0::2], result[1::2]))
+
+
+async def get_period_rollup(user_id: str, period: str) -> dict:
+    """기간 집계 (HGETALL 파이프라인 1번, 재계산 전이면 기간 메모로 계산하고 재계산 대기열에 등록)"""
+    from .redis_db import redis_pipeline
+
+    today = local_now().date()
+    start, end = period_day_range(period, today)
+    keys = rollup_keys_for_range(user_id, start, end, today) if start <= end else []
+
+    results = await redis_pipeline([["GET", rollup_ready_key(user_id)]] + [["HGETALL", key] for key in keys])
+    if not results[0] or isinstance(results[0], Exception):
+        return await scan_period_rollup(user_id, period)
+    return merge_rollups([_hash_result(r) for r in results[1:] if not isinstance(r, Exception)])
+
+
+async def scan_period_rollup(user_id: str, period: str) -> dict:
+    """집계 해시 대신 기간 메모로 계산 (재계산 전 임시) + 재계산 대기열 등록"""
+    from .redis_db import redis_command, get_memos_by_period
+
+    _, memos = await asyncio.gather(
+        redis_command("SADD", ROLLUP_REBUILD_QUEUE, user_id),
+        get_memos_by_period(user_id, period),
+    )
+    return merge_rollups([rollup_fields(memo) for memo in memos])
+
+
+async def rebuild_rollups(user_id: str) -> Dict[str, Counter]:
+    """유저 메모 전체로 일/월 해시 재계산 (집계 도입 전 메모 반영, 크론에서 유저당 한 번)
+
+    재계산 도중 저장/삭제된 메모 1~2건은 어긋날 수 있음 (다음 재계산 전까지)
+    Returns: {해시 키: 필드 Counter}
+    """
+    from .redis_db import redis_command, redis_pipeline
+
+    memo_ids = await redis_command("ZRANGE", f"user:{user_id}:memos", 0, -1) or []
+    rollups: Dict[str, Counter] = {}
+    for offset in range(0, len(memo_ids), REBUILD_PAGE_SIZE):
+        page = memo_ids[offset:offset + REBUILD_PAGE_SIZE]
+        batch_data = await redis_command("MGET", *[f"memo:{user_id}:{mid}" for mid in page])
+        for memo_data in batch_data or []:
+            if not memo_data:
+                continue
+            memo = json.loads(memo_data)
+            day = memo_day(memo)
+            fields = rollup_fields(memo)
+            for key in (day_rollup_key(user_id, day), month_rollup_key(user_id, day)):
+                rollups.setdefault(key, Counter()).update(fields)
+
+    commands = []
+    for key, fields in rollups.items():
+        commands.append(["DEL", key])
+        args = []
+        for field, count in fields.items():
+            args += [field, count]
+        commands.append(["HSET", key] + args)
+        if ":rollup:day:" in key:
+            commands.append(["EXPIRE", key, DAY_ROLLUP_TTL])
+    commands.append(["SET", rollup_ready_key(user_id), "1"])
+    commands.append(["SREM", ROLLUP_REBUILD_QUEUE, user_id])
+    await redis_pipeline(commands)
+    print(f"[Rollup] Rebuilt {len(rollups)} rollups from {len(memo_ids)} memos for {user_id[:8]}")
+    return rollups
+
@@ -0,0 +1,178 @@
+"""
+비슷한 메모 감지 (SimHash, 64비트)
+
+- 시그니처: 전달 머리말/URL/공백/문장부호를 뺀 본문의 문자 3-gram 빈도 가중 SimHash
+- 해밍 거리 SIMILAR_MAX_DISTANCE(7) 이하 = 비슷한 메모
+  (짧은 메모 기준 변형/전달 메시지는 0~8, 주제만 비슷한 메모는 15 이상)
+- 밴드 인덱스: 64비트를 8비트 × 8 밴드로 나눠 user:{user_id}:simhash:{밴드}:{값} 집합에 등록
+  거리 7 이하면 최소 한 밴드가 같으므로(비둘기집), 8개 버킷 SUNION 1번으로 후보만 조회
+  (버킷당 전체 메모의 약 1/256)
+- 집합 멤버는 "{memo_id}:{시그니처}"라 후보 거리 계산에 추가 조회 없음
+- 목록용 카드에 저장된 시그니처(card["simhash"])가 있으면 본문으로 다시 계산하지 않음
+"""
+import re
+import hashlib
+import unicodedata
+from collections import Counter
+from typing import List, Optional
+
+from .metadata import URL_PATTERN
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 8
+SIMHASH_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+SIMILAR_MAX_DISTANCE = SIMHASH_BANDS - 1   # 이 이하면 비슷한 메모 (밴드 인덱스로 누락 없이 찾는 최대 거리)
+SHINGLE_SIZE = 3                 # 문자 n-gram 크기
+MIN_SHINGLES = 4                 # 이보다 짧은 메모는 시그니처 없음 (오탐 방지)
+MAX_SIGNATURE_CHARS = 2000       # 긴 메모는 앞부분만
+
+_NON_WORD = re.compile(r"[\W_]+")
+# 전달 메시지 머리말 ("[Web발신]", "[광고]")
+_FORWARD_TAG = re.compile(r"^\s*\[[^\]\n]{1,10}\]")
+
+
+def signature_text(content: str) -> str:
+    """시그니처용 정규화 (전달 머리말/URL 제거, NFC, 소문자, 공백/문장부호 제거)"""
+    text = URL_PATTERN.sub(" ", _FORWARD_TAG.sub("", content or ""))
+    text = unicodedata.normalize("NFC", text).lower()
+    return _NON_WORD.sub("", text)[:MAX_SIGNATURE_CHARS]
+
+
+def shingles(content: str) -> Counter:
+    """문자 3-gram 빈도 ("강남역 맛집" ≈ "강남역맛집")"""
+    text = signature_text(content)
+    return Counter(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(content: str) -> Optional[int]:
+    """64비트 SimHash (짧아서 신뢰할 수 없으면 None)"""
+    features = shingles(content)
+    if len(features) < MIN_SHINGLES:
+        return None
+    weights = [0] * SIMHASH_BITS
+    for feature, count in features.items():
+        value = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+    signature = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            signature |= 1 << bit
+    return signature
+
+
+def memo_signature(memo: dict) -> Optional[int]:
+    """메모/카드의 시그니처 (카드는 저장된 값, 본문은 계산)"""
+    if "simhash" in memo:
+        return memo["simhash"]
+    return simhash(memo.get("content", ""))
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def signature_bands(signature: int) -> List[int]:
+    """8비트 밴드 8개"""
+    mask = (1 << SIMHASH_BAND_BITS) - 1
+    return [signature >> (band * SIMHASH_BAND_BITS) & mask for band in range(SIMHASH_BANDS)]
+
+
+def band_keys(user_id: str, signature: int) -> List[str]:
+    width = SIMHASH_BAND_BITS // 4
+    return [
+        f"user:{user_id}:simhash:{band}:{value:0{width}x}"
+        for band, value in enumerate(signature_bands(signature))
+    ]
+
+
+def _member(memo_id: str, signature: int) -> str:
+    return f"{memo_id}:{signature:016x}"
+
+
+def simhash_index_commands(user_id: str, memo_id: str, content: str) -> List[list]:
+    """메모 저장 파이프라인에 붙일 밴드 인덱스 명령"""
+    signature = simhash(content)
+    if signature is None:
+        return []
+    member = _member(memo_id, signature)
+    return [["SADD", key, member] for key in band_keys(user_id, signature)]
+
+
+def simhash_unindex_commands(user_id: str, memo_id: str, content: str) -> List[list]:
+    """메모 삭제 파이프라인에 붙일 밴드 인덱스 명령"""
+    signature = simhash(content)
+    if signature is None:
+        return []
+    member = _member(memo_id, signature)
+    return [["SREM", key, member] for key in band_keys(user_id, signature)]
+
+
+async def find_similar_ids(user_id: str, content: str, exclude_id: str = None) -> List[tuple]:
+    """비슷한 메모 [(memo_id, 거리)] (가까운 순, SUNION 1번)"""
+    signature = simhash(content)
+    if signature is None:
+        return []
+    from .redis_db import redis_command
+    try:
+        members = await redis_command("SUNION", *band_keys(user_id, signature))
+    except Exception as e:
+        print(f"[SimHash] Lookup error: {e}")
+        return []
+
+    found = {}
+    for member in members or []:
+        memo_id, _, hex_signature = member.rpartition(":")
+        if not memo_id or memo_id == exclude_id:
+            continue
+        distance = hamming(signature, int(hex_signature, 16))
+        if distance <= SIMILAR_MAX_DISTANCE:
+            found[memo_id] = distance
+    return sorted(found.items(), key=lambda item: item[1])
+
+
+def group_similar(memos: List[dict]) -> List[List[dict]]:
+    """메모 목록을 비슷한 메모끼리 묶음 (입력 순서 유지, 각 그룹 첫 메모가 대표)
+
+    밴드가 하나라도 같은 메모끼리만 거리 계산 (전체 쌍 비교 없음)
+    카드 목록이면 저장된 시그니처 사용 (본문 없이)
+    """
+    groups = []
+    owner = {}          # memo 위치 → 그룹 번호
+    buckets = {}        # (밴드, 값) → [그룹 대표 위치]
+    signatures = {}
+    for index, memo in enumerate(memos):
+        signature = memo_signature(memo)
+        if signature is not None:
+            signatures[index] = signature
+            bands = list(enumerate(signature_bands(signature)))
+            for band in bands:
+                for leader in buckets.get(band, []):
+                    if hamming(signature, signatures[leader]) <= SIMILAR_MAX_DISTANCE:
+                        owner[index] = owner[leader]
+                        break
+                if index in owner:
+                    break
+        if index not in owner:
+            owner[index] = len(groups)
+            groups.append([])
+            if signature is not None:
+                for band in bands:
+                    buckets.setdefault(band, []).append(index)
+        groups[owner[index]].append(memo)
+    return groups
+
+
+def collapse_similar(memos: List[dict]) -> List[dict]:
+    """비슷한 메모는 대표(먼저 나온 메모) 하나만 남김 (대표에 similar_count 표시)"""
+    collapsed = []
+    for group in group_similar(memos):
+        leader = group[0]
+        if len(group) > 1:
+            leader = {**leader, "similar_count": len(group) - 1}
+        collapsed.append(leader)
+    return collapsed
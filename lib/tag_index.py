@@ -0,0 +1,178 @@
+"""
+유저별 태그 인덱스 (태그별 메모 목록, 태그 빈도)
+
+- user:{user_id}:tag:{태그} SET: 그 태그가 붙은 memo_id
+  (카테고리 인덱스와 같은 형태 → 쿼리 플래너가 SET 인덱스로 교집합/소속 확인)
+- user:{user_id}:tags 해시: 태그 → 메모 수 (0 이하는 조회 시 제외)
+- 저장/삭제/수정 파이프라인에 tag_index_commands()/tag_change_commands()를 덧붙여
+  추가 왕복 없이 유지
+- 인덱스 도입 전에 저장된 메모가 있는 유저는 재구축 대기열(tags:rebuild)에 넣고 크론이 재구축
+  (rebuild_tag_index) - 그 전까지 태그 빈도는 최근 메모로, 태그 목록은 검색어 스캔으로 응답
+"""
+import asyncio
+import json
+import re
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+REBUILD_PAGE_SIZE = 200     # 재구축 시 MGET 1번에 읽는 메모 수
+TAG_REBUILD_QUEUE = "tags:rebuild"    # 재구축 대기 유저 SET (크론이 처리)
+TAG_SCAN_LIMIT = 300        # 재구축 전 태그 빈도를 셀 때 읽는 최근 메모 수
+REBUILD_CLOCK_SKEW = 5      # 재구축 중 저장된 메모를 찾을 때 시작 시각에서 빼는 여유 (초)
+
+# "#강남", "#강남 2" (페이지) - 숫자만인 태그는 없음 ("#12345"는 메모)
+TAG_COMMAND_PATTERN = re.compile(r"^#(?=\S*[^\d\s])([^\s#]{1,30})(?:\s+(\d{1,3}))?$")
+
+# 메모 본문의 해시태그 ("파스타 맛집 #강남") - 공백 뒤에서만 (URL의 #fragment 제외)
+HASHTAG_PATTERN = re.compile(r"(?:^|(?<=\s))#([^\s#]{1,30})")
+HASHTAG_TRAILING = ".,!?;:)]}\"'…~"
+SHORT_ID_TAG = re.compile(r"^[0-9a-fA-F]{8}$")     # "#a448275d"는 메모 짧은 ID
+
+
+def normalize_tag(tag: str) -> str:
+    return (tag or "").strip().lstrip("#").strip()
+
+
+def unique_tags(tags: Optional[List[str]]) -> List[str]:
+    return [tag for tag in dict.fromkeys(normalize_tag(t) for t in tags or []) if tag]
+
+
+def extract_hashtags(content: str) -> List[str]:
+    """본문의 #태그 목록 (순서 유지, 중복/숫자만/짧은 ID 제외)"""
+    tags = []
+    for match in HASHTAG_PATTERN.finditer(content or ""):
+        tag = match.group(1).rstrip(HASHTAG_TRAILING)
+        if tag and not tag.isdigit() and not SHORT_ID_TAG.match(tag):
+            tags.append(tag)
+    return unique_tags(tags)
+
+
+def tag_key(user_id: str, tag: str) -> str:
+    return f"user:{user_id}:tag:{normalize_tag(tag)}"
+
+
+def tag_counts_key(user_id: str) -> str:
+    return f"user:{user_id}:tags"
+
+
+def tag_ready_key(user_id: str) -> str:
+    return f"user:{user_id}:tags:ready"
+
+
+def parse_tag_command(message: str) -> Optional[Tuple[str, int]]:
+    """"#강남 2" → ("강남", 2), 태그 명령이 아니면 None"""
+    match = TAG_COMMAND_PATTERN.match(message.strip())
+    if not match:
+        return None
+    return match.group(1), max(int(match.group(2) or 1), 1)
+
+
+def tag_index_commands(user_id: str, memo_id: str, tags: List[str], sign: int = 1) -> List[list]:
+    """저장(sign=1)/삭제(sign=-1) 파이프라인에 붙일 태그 인덱스 명령"""
+    commands = []
+    for tag in unique_tags(tags):
+        commands.append(["SADD" if sign > 0 else "SREM", tag_key(user_id, tag), memo_id])
+        commands.append(["HINCRBY", tag_counts_key(user_id), tag, sign])
+    return commands
+
+
+def tag_change_commands(user_id: str, memo_id: str, old_tags: List[str], new_tags: List[str]) -> List[list]:
+    """수정 파이프라인에 붙일 명령 (빠진 태그/새 태그만)"""
+    old, new = unique_tags(old_tags), unique_tags(new_tags)
+    return (
+        tag_index_commands(user_id, memo_id, [tag for tag in old if tag not in new], sign=-1)
+        + tag_index_commands(user_id, memo_id, [tag for tag in new if tag not in old])
+    )
+
+
+def tag_counts(result) -> List[Tuple[str, int]]:
+    """HGETALL 결과 → [(태그, 메모 수)] 많은 순 (0 이하 제외)"""
+    if isinstance(result, list):
+        result = dict(zip(result[0::2], result[1::2]))
+    counts = [(tag, int(count)) for tag, count in (result or {}).items() if int(count) > 0]
+    return sorted(counts, key=lambda item: (-item[1], item[0]))
+
+
+async def request_tag_rebuild(user_id: str) -> None:
+    """태그 인덱스 재구축 대기열에 등록 (크론이 처리)"""
+    from .redis_db import redis_command
+
+    await redis_command("SADD", TAG_REBUILD_QUEUE, user_id)
+
+
+async def get_tag_counts(user_id: str, limit: int = 20, scan: bool = True) -> List[Tuple[str, int]]:
+    """자주 쓴 태그 [(태그, 메모 수)] (많은 순, 재구축 전이면 최근 메모로 세고 대기열 등록)
+
+    scan=False: 빈도 해시만 (재구축 전이면 빈 목록 - 바로가기 버튼처럼 보조 표시용)
+    """
+    from .redis_db import redis_pipeline, get_recent_memos
+
+    ready, counts = await redis_pipeline([["GET", tag_ready_key(user_id)], ["HGETALL", tag_counts_key(user_id)]])
+    if not ready or isinstance(ready, Exception):
+        if not scan:
+            return []
+        _, memos = await asyncio.gather(
+            request_tag_rebuild(user_id),
+            get_recent_memos(user_id, limit=TAG_SCAN_LIMIT),
+        )
+        counts = Counter(tag for memo in memos for tag in unique_tags(memo.get("tags")))
+    return tag_counts(counts)[:limit]
+
+
+async def rebuild_tag_index(user_id: str) -> int:
+    """유저 메모 전체로 태그 SET/빈도 해시 재구축 (인덱스 도입 전 메모 반영, 크론에서 유저당 한 번)
+
+    1. 읽기 시작 시각을 기록하고 메모 전체를 읽어 태그별 memo_id 계산
+    2. DEL + SADD + HSET을 트랜잭션 1번으로 교체
+    3. 읽은 뒤 저장된 메모(ZRANGEBYSCORE 시작 시각~)는 2의 DEL에 SET/빈도가 지워졌을 수 있으므로
+       다시 추가하고 빈도를 SET 크기로 맞춤 (tag_add 스크립트)
+    4. 그 다음에 ready 설정 + 대기열에서 제거
+    Returns: 태그 수
+    """
+    from .redis_db import redis_command, redis_pipeline, redis_transaction
+    from .lua_scripts import run_script_batch
+
+    memos_key = f"user:{user_id}:memos"
+    started = time.time()
+    memo_ids = await redis_command("ZRANGE", memos_key, 0, -1) or []
+    members = {}
+    for offset in range(0, len(memo_ids), REBUILD_PAGE_SIZE):
+        page = memo_ids[offset:offset + REBUILD_PAGE_SIZE]
+        batch_data = await redis_command("MGET", *[f"memo:{user_id}:{mid}" for mid in page])
+        for memo_id, memo_data in zip(page, batch_data or []):
+            if memo_data:
+                for tag in unique_tags(json.loads(memo_data).get("tags")):
+                    members.setdefault(tag, []).append(memo_id)
+
+    commands = [["DEL", tag_counts_key(user_id)]]
+    for tag, ids in members.items():
+        commands.append(["DEL", tag_key(user_id, tag)])
+        commands.append(["SADD", tag_key(user_id, tag), *ids])
+        commands.append(["HSET", tag_counts_key(user_id), tag, len(ids)])
+    await redis_transaction(commands)
+
+    # 읽은 뒤 저장된 메모 (서버 간 시계 차이 여유 REBUILD_CLOCK_SKEW초)
+    read = set(memo_ids)
+    late_ids = [mid for mid in await redis_command(
+        "ZRANGEBYSCORE", memos_key, started - REBUILD_CLOCK_SKEW, "+inf"
+    ) or [] if mid not in read]
+    reapplied = 0      # 다시 맞춘 (메모, 태그) 수
+    if late_ids:
+        batch_data = await redis_command("MGET", *[f"memo:{user_id}:{mid}" for mid in late_ids]) or []
+        calls = [
+            ([tag_key(user_id, tag), tag_counts_key(user_id)], [memo_id, tag])
+            for memo_id, memo_data in zip(late_ids, batch_data) if memo_data
+            for tag in unique_tags(json.loads(memo_data).get("tags"))
+        ]
+        if calls:
+            results = await run_script_batch("tag_add", calls)
+            failed = [r for r in results if isinstance(r, Exception)]
+            if failed:
+                raise failed[0]
+            reapplied = len(calls)
+
+    await redis_pipeline([["SET", tag_ready_key(user_id), "1"], ["SREM", TAG_REBUILD_QUEUE, user_id]])
+    print(f"[Tags] Rebuilt {len(members)} tags from {len(memo_ids)} memos for {user_id[:8]}"
+          f" (late {len(late_ids)}, re-applied {reapplied})")
+    return len(members)
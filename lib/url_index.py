@@ -0,0 +1,139 @@
+"""
+유저별 URL 인덱스 (같은 링크 재저장 감지)
+
+- canonicalize_url(): 추적 파라미터 제거, youtu.be/모바일 호스트 통일 등
+- user:{user_id}:urls 해시: url_hash(정규화 URL) → 마지막으로 저장한 memo_id
+- 저장/삭제 파이프라인에 url_index_commands()/url_unindex_commands()를 덧붙여
+  추가 왕복 없이 인덱스 유지, 조회는 HMGET 1번 (find_saved_urls)
+"""
+import hashlib
+from typing import List
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+from .lua_scripts import script_command
+from .metadata import URL_PATTERN, extract_urls, extract_youtube_id
+
+# 같은 페이지를 가리키지만 공유 경로마다 붙는 추적 파라미터
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "igsh",
+    "mc_cid", "mc_eid", "si", "feature", "ref", "ref_src", "ref_url",
+    "spm", "share", "share_from", "sharer", "trk", "_ga", "from", "t_src",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# 모바일 호스트 접두어 (m.blog.naver.com → blog.naver.com)
+MOBILE_HOST_PREFIXES = ("www.", "m.", "mobile.", "mw.")
+
+# 같은 서비스의 다른 도메인
+HOST_ALIASES = {
+    "x.com": "twitter.com",
+    "youtube-nocookie.com": "youtube.com",
+}
+
+
+def _canonical_host(netloc: str) -> str:
+    host = netloc.lower().split("@")[-1]
+    if host.endswith(":80") or host.endswith(":443"):
+        host = host.rsplit(":", 1)[0]
+    for prefix in MOBILE_HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") >= 2:
+            host = host[len(prefix):]
+            break
+    return HOST_ALIASES.get(host, host)
+
+
+def canonicalize_url(url: str) -> str:
+    """재저장 판별용 정규화 URL (스킴 없음: host/path?정렬된 쿼리)
+
+    - http/https, www./m. 호스트, 끝 슬래시, #fragment 차이 무시
+    - utm_* 등 추적 파라미터 제거, 나머지 파라미터는 정렬
+    - YouTube는 영상 ID로 통일 (youtu.be, shorts, 시작 시간 t= 무시)
+    - 네이버 블로그 PostView.naver?blogId=&logNo= → /blogId/logNo
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except Exception:
+        return url.strip()
+    host = _canonical_host(parsed.netloc)
+
+    if host in ("youtu.be", "youtube.com"):
+        video_id = extract_youtube_id(url)
+        if video_id:
+            return f"youtube.com/watch?v={video_id}"
+
+    params = [
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    path = parsed.path.rstrip("/")
+
+    if host == "blog.naver.com" and path.lower() in ("/postview.naver", "/postview.nhn"):
+        query = dict(params)
+        if query.get("blogId") and query.get("logNo"):
+            return f"blog.naver.com/{query['blogId']}/{query['logNo']}"
+
+    canonical = host + path
+    if params:
+        canonical += "?" + urlencode(sorted(params))
+    return canonical
+
+
+def url_hash(url: str) -> str:
+    """인덱스 필드 (정규화 URL의 sha256 앞 16자리)"""
+    return hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()[:16]
+
+
+def url_index_key(user_id: str) -> str:
+    return f"user:{user_id}:urls"
+
+
+def is_link_only(content: str) -> bool:
+    """URL만 있는 메모인지 (URL을 빼면 남는 글자가 없음)"""
+    if not extract_urls(content):
+        return False
+    rest = URL_PATTERN.sub(" ", content)
+    return not rest.strip(" \t\r\n.,;:!?()\"'")
+
+
+def url_index_commands(user_id: str, memo_id: str, content: str) -> List[list]:
+    """메모 저장 파이프라인에 붙일 인덱스 명령
+
+    링크만 있는 메모는 항목을 덮어쓰고(HSET), 설명이 붙은 메모는 비어 있을 때만 등록(HSETNX)
+    → 재저장 감지 대상인 링크 전용 메모가 인덱스에 남음
+    """
+    hashes = list(dict.fromkeys(url_hash(url) for url in extract_urls(content)))
+    if not hashes:
+        return []
+    key = url_index_key(user_id)
+    if not is_link_only(content):
+        return [["HSETNX", key, field, memo_id] for field in hashes]
+    args = []
+    for field in hashes:
+        args += [field, memo_id]
+    return [["HSET", key] + args]
+
+
+def url_unindex_commands(user_id: str, memo_id: str, content: str) -> List[list]:
+    """메모 삭제 파이프라인에 붙일 인덱스 명령
+
+    항목이 이 메모를 가리킬 때만 지우는 비교 후 삭제 스크립트 (EVALSHA)
+    → 같은 URL을 더 최근 메모가 갖고 있으면 그 항목은 유지
+    """
+    hashes = list(dict.fromkeys(url_hash(url) for url in extract_urls(content)))
+    if not hashes:
+        return []
+    return [script_command("url_unindex", [url_index_key(user_id)], [memo_id, *hashes])]
+
+
+async def find_saved_urls(user_id: str, urls: list) -> dict:
+    """이미 저장한 URL → memo_id (HMGET 1번, 오류 시 빈 dict)"""
+    if not urls:
+        return {}
+    from .redis_db import redis_command
+    hashes = [url_hash(url) for url in urls]
+    try:
+        memo_ids = await redis_command("HMGET", url_index_key(user_id), *hashes)
+    except Exception as e:
+        print(f"[UrlIndex] Lookup error: {e}")
+        return {}
+    return {url: memo_id for url, memo_id in zip(urls, memo_ids or []) if memo_id}
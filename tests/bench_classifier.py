@@ -0,0 +1,43 @@
+"""
+fast_rule_classify 벤치마크 (기존 구현 vs 명령어 문법 테이블)
+
+실행: python tests/bench_classifier.py
+
+측정값 (메시지당, 실행마다 편차 있음):
+- 18.54us → 7.12us (약 2.6배)
+- 16.63us → 4.90us (약 3.4배)
+약 4배라고 적었던 d7c9bfb 커밋 메시지의 수치는 과장 - 약 2.5~3.5배로 정정
+"""
+import sys
+import os
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.classifier import fast_rule_classify
+from tests.legacy_rules import legacy_fast_rule_classify
+
+# 실제 발화 비율을 흉내낸 입력 (대부분 저장, 일부 명령)
+MESSAGES = [
+    "오늘 정리", "이번 주 정리", "맛집 정리", "검색 파스타", "삭제 a448275d-1234-5678-9abc-def012345678",
+    "#a448275d", "https://youtu.be/dQw4w9WgXcQ", "내일 3시 치과 예약",
+    "강남역 근처 파스타 맛집 가보기", "지워지지 않는 펜 사기", "AI: 회의록 정리",
+    "책 읽기 - 클린 코드 3장까지", "요약", "리마인더",
+]
+
+
+def bench(func, rounds: int = 20000) -> float:
+    """메시지당 평균 마이크로초"""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for message in MESSAGES:
+            func(message)
+    return (time.perf_counter() - started) / (rounds * len(MESSAGES)) * 1e6
+
+
+if __name__ == "__main__":
+    legacy = bench(legacy_fast_rule_classify)
+    current = bench(fast_rule_classify)
+    print(f"legacy : {legacy:.2f} us/msg")
+    print(f"grammar: {current:.2f} us/msg ({legacy / current:.1f}x)")
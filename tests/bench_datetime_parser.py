@@ -0,0 +1,38 @@
+"""
+리마인더 파싱 벤치마크 (기존 다중 정규식/부분 문자열 검사 vs 단일 스캔 토크나이저)
+
+실행: python tests/bench_datetime_parser.py
+"""
+import sys
+import os
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.datetime_parser import extract_reminder_info
+from tests.legacy_datetime import legacy_extract_reminder_info
+
+# 리마인더 발화 + 시간 표현 없는 일반 메모
+MESSAGES = [
+    "내일 병원 3시 예약", "다음주 금요일 회의", "모레 오후 2시 30분 미팅",
+    "이번주 토요일 약속", "3시까지 보고서 제출", "아침 9시 운동", "저녁 7시 저녁약속",
+    "11/3 세미나 발표 자료", "강남역 근처 파스타 맛집 가보기",
+    "책 읽기 - 클린 코드 3장까지", "https://youtu.be/dQw4w9WgXcQ",
+]
+
+
+def bench(func, rounds: int = 5000) -> float:
+    """메시지당 평균 마이크로초"""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for message in MESSAGES:
+            func(message)
+    return (time.perf_counter() - started) / (rounds * len(MESSAGES)) * 1e6
+
+
+if __name__ == "__main__":
+    legacy = bench(legacy_extract_reminder_info)
+    current = bench(extract_reminder_info)
+    print(f"legacy   : {legacy:.2f} us/msg")
+    print(f"tokenizer: {current:.2f} us/msg ({legacy / current:.1f}x)")
@@ -0,0 +1,61 @@
+"""
+규칙 분류 키워드 매칭 벤치마크 (기존 any() 루프 vs 1회 스캔 매처)
+
+기존 구현은 첫 매칭에서 멈추므로 점수화는 하지 않는다.
+매처는 텍스트 전체를 한 번만 훑으므로 긴 붙여넣기도 길이에 비례하는 비용
+(끝부분에만 있는 키워드도 매칭).
+실행: python tests/bench_keyword_matcher.py
+"""
+import sys
+import os
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.classifier import RULE_KEYWORDS, rank_rule_categories
+
+
+def legacy_first_match(content: str) -> str:
+    """기존 방식: 카테고리 순서대로 부분 문자열 검사, 첫 매칭 반환"""
+    content_lower = content.lower()
+    for category, kws in RULE_KEYWORDS.items():
+        if any(kw in content_lower for kw in kws):
+            return category
+    return "기타"
+
+
+def legacy_scored(content: str) -> list:
+    """기존 방식으로 전체 점수화 (키워드마다 str.count)"""
+    content_lower = content.lower()
+    scores = {}
+    for category, kws in RULE_KEYWORDS.items():
+        score = sum(content_lower.count(kw) for kw in kws)
+        if score:
+            scores[category] = score
+    return sorted(scores.items(), key=lambda x: -x[1])
+
+
+# 붙여넣은 긴 메모 (기사/회의록 흉내) - 매칭 키워드는 끝부분에만
+FILLER = "이번 분기 프로젝트 진행 상황을 공유드립니다. 세부 항목은 아래와 같습니다. Lorem ipsum dolor sit amet. "
+SAMPLES = {
+    "short (40자)": "성수동 파스타 맛집 주말에 가보기",
+    "paste (2KB)": FILLER * 20 + " 회의 후 맛집 예약",
+    "paste (20KB)": FILLER * 200 + " 회의 후 맛집 예약",
+}
+
+
+def bench(func, text: str) -> float:
+    """호출당 평균 마이크로초"""
+    rounds = max(10, 200000 // len(text))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func(text)
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+if __name__ == "__main__":
+    for name, text in SAMPLES.items():
+        print(f"{name:14} first-match {bench(legacy_first_match, text):9.1f} us | "
+              f"count-scored {bench(legacy_scored, text):9.1f} us | "
+              f"matcher-scored {bench(rank_rule_categories, text):9.1f} us")
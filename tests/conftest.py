@@ -0,0 +1,75 @@
+"""테스트 공용 fixture - Upstash REST 흉내 (fakeredis + lupa)
+
+redis_command/redis_pipeline/redis_transaction을 fakeredis로 바꿔 실제 명령과 Lua 스크립트를 실행한다.
+- 응답은 Upstash REST 형식 그대로 (redis-py 응답 변환 없음: WITHSCORES/ZSCAN은 [멤버, 점수 문자열, ...],
+  HGETALL은 [필드, 값, ...], SET ... GET은 이전 값)
+- 단일 명령 실패는 예외, 파이프라인/트랜잭션 실패는 그 자리에 Exception 객체
+- NOSCRIPT는 Upstash 에러 문자열로
+- server.redis: 검증/데이터 준비용 일반 클라이언트 (같은 데이터)
+"""
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+class FakeUpstash:
+    """Upstash REST 흉내 (실행한 명령은 calls에 기록)"""
+
+    def __init__(self, fakeredis):
+        shared = fakeredis.FakeServer()
+        self.redis = fakeredis.FakeRedis(server=shared, decode_responses=True)
+        self._raw = fakeredis.FakeRedis(server=shared, decode_responses=True, protocol=2)
+        self._raw.response_callbacks.clear()
+        self.calls = []
+
+    @property
+    def commands(self):
+        """실행한 명령 이름 목록"""
+        return [args[0] for args in self.calls]
+
+    def run(self, args):
+        from redis.exceptions import NoScriptError
+
+        self.calls.append(list(args))
+        try:
+            return self._raw.execute_command(*args)
+        except NoScriptError as e:
+            raise Exception(f"NOSCRIPT {e}")
+
+    async def command(self, *args):
+        return self.run(args)
+
+    async def pipeline(self, commands):
+        results = []
+        for command in commands:
+            try:
+                results.append(self.run(command))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def patch(self, monkeypatch, *modules):
+        """모듈들이 import한 redis_command/redis_pipeline/redis_transaction을 교체"""
+        for module in modules:
+            for name, fake in (("redis_command", self.command), ("redis_pipeline", self.pipeline),
+                               ("redis_transaction", self.pipeline)):
+                if hasattr(module, name):
+                    monkeypatch.setattr(module, name, fake)
+
+
+@pytest.fixture
+def upstash(monkeypatch):
+    """fakeredis로 동작하는 Upstash (redis_db, jobs, idempotency에 적용)"""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    import lib.redis_db as redis_db
+    import lib.jobs as jobs
+    import lib.idempotency as idempotency
+
+    server = FakeUpstash(fakeredis)
+    server.patch(monkeypatch, redis_db, jobs, idempotency)
+    return server
@@ -0,0 +1,171 @@
+"""
+기준 구현 보관 (테스트/벤치마크 비교용)
+lib/classifier.py 명령어 문법 도입 이전의 fast_rule_classify 원본
+"""
+
+
+def legacy_fast_rule_classify(message: str) -> dict | None:
+    """
+    빠른 규칙 기반 의도 분류 (AI 호출 없이 ~0ms)
+    명확한 명령어만 처리, 애매하면 None 반환하여 AI로 위임
+    """
+    msg = message.strip()
+    msg_lower = msg.lower()
+
+    # 정확 매칭 (가장 빠름)
+    EXACT_MATCHES = {
+        # 리마인더
+        "리마인더": {"intent": "reminder", "confidence": 1.0},
+        "알림": {"intent": "reminder", "confidence": 1.0},
+        "알림 목록": {"intent": "reminder", "confidence": 1.0},
+        # 통계
+        "통계": {"intent": "stats", "confidence": 1.0},
+        # 도움말/홈
+        "도움말": {"intent": "help", "confidence": 1.0},
+        "홈": {"intent": "help", "confidence": 1.0},
+        "사용법": {"intent": "help", "confidence": 1.0},
+        "?": {"intent": "help", "confidence": 1.0},
+        # AI 분류 저장 (사용자 요청 시에만 AI 사용)
+        "AI 분류": {"intent": "save_with_ai", "confidence": 1.0},
+        "ai 분류": {"intent": "save_with_ai", "confidence": 1.0},
+        "요약 저장": {"intent": "save_with_ai", "confidence": 1.0},
+        "분류 저장": {"intent": "save_with_ai", "confidence": 1.0},
+        # 기간별 정리
+        "오늘 정리": {"intent": "summary", "confidence": 1.0, "period": "today"},
+        "오늘정리": {"intent": "summary", "confidence": 1.0, "period": "today"},
+        "어제 정리": {"intent": "summary", "confidence": 1.0, "period": "yesterday"},
+        "이번주 정리": {"intent": "summary", "confidence": 1.0, "period": "week"},
+        "이번 주 정리": {"intent": "summary", "confidence": 1.0, "period": "week"},
+        "지난주 정리": {"intent": "summary", "confidence": 1.0, "period": "last_week"},
+        "지난 주 정리": {"intent": "summary", "confidence": 1.0, "period": "last_week"},
+        "이번달 정리": {"intent": "summary", "confidence": 1.0, "period": "month"},
+        "이번 달 정리": {"intent": "summary", "confidence": 1.0, "period": "month"},
+        "지난달 정리": {"intent": "summary", "confidence": 1.0, "period": "last_month"},
+        "전체 보여줘": {"intent": "summary", "confidence": 1.0, "period": "all"},
+        "전체보여줘": {"intent": "summary", "confidence": 1.0, "period": "all"},
+        # 요약 (AI 인사이트)
+        "오늘 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "today"},
+        "오늘요약": {"intent": "ai_summary", "confidence": 1.0, "period": "today"},
+        "어제 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "yesterday"},
+        "이번주 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "week"},
+        "이번 주 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "week"},
+        "지난주 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "last_week"},
+        "이번달 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "month"},
+        "지난달 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "last_month"},
+        "전체 요약": {"intent": "ai_summary", "confidence": 1.0, "period": "all"},
+        "요약": {"intent": "ai_summary", "confidence": 1.0, "period": "today"},
+        # 카테고리별 정리
+        "영상 정리": {"intent": "summary", "confidence": 1.0, "category": "영상"},
+        "음악 정리": {"intent": "summary", "confidence": 1.0, "category": "음악"},
+        "맛집 정리": {"intent": "summary", "confidence": 1.0, "category": "맛집"},
+        "쇼핑 정리": {"intent": "summary", "confidence": 1.0, "category": "쇼핑"},
+        "여행 정리": {"intent": "summary", "confidence": 1.0, "category": "여행"},
+        "할일 정리": {"intent": "summary", "confidence": 1.0, "category": "할일"},
+        "아이디어 정리": {"intent": "summary", "confidence": 1.0, "category": "아이디어"},
+        "학습 정리": {"intent": "summary", "confidence": 1.0, "category": "학습"},
+        "건강 정리": {"intent": "summary", "confidence": 1.0, "category": "건강"},
+        "읽을거리 정리": {"intent": "summary", "confidence": 1.0, "category": "읽을거리"},
+        "기타 정리": {"intent": "summary", "confidence": 1.0, "category": "기타"},
+        # 전체보기 (show_all=True)
+        "전체보기 today": {"intent": "summary", "confidence": 1.0, "period": "today", "show_all": True},
+        "전체보기 yesterday": {"intent": "summary", "confidence": 1.0, "period": "yesterday", "show_all": True},
+        "전체보기 week": {"intent": "summary", "confidence": 1.0, "period": "week", "show_all": True},
+        "전체보기 last_week": {"intent": "summary", "confidence": 1.0, "period": "last_week", "show_all": True},
+        "전체보기 month": {"intent": "summary", "confidence": 1.0, "period": "month", "show_all": True},
+        "전체보기 all": {"intent": "summary", "confidence": 1.0, "period": "all", "show_all": True},
+        "전체보기 영상": {"intent": "summary", "confidence": 1.0, "category": "영상", "show_all": True},
+        "전체보기 음악": {"intent": "summary", "confidence": 1.0, "category": "음악", "show_all": True},
+        "전체보기 맛집": {"intent": "summary", "confidence": 1.0, "category": "맛집", "show_all": True},
+        "전체보기 쇼핑": {"intent": "summary", "confidence": 1.0, "category": "쇼핑", "show_all": True},
+        "전체보기 여행": {"intent": "summary", "confidence": 1.0, "category": "여행", "show_all": True},
+        "전체보기 할일": {"intent": "summary", "confidence": 1.0, "category": "할일", "show_all": True},
+        "전체보기 아이디어": {"intent": "summary", "confidence": 1.0, "category": "아이디어", "show_all": True},
+        "전체보기 학습": {"intent": "summary", "confidence": 1.0, "category": "학습", "show_all": True},
+        "전체보기 건강": {"intent": "summary", "confidence": 1.0, "category": "건강", "show_all": True},
+        "전체보기 읽을거리": {"intent": "summary", "confidence": 1.0, "category": "읽을거리", "show_all": True},
+        "전체보기 기타": {"intent": "summary", "confidence": 1.0, "category": "기타", "show_all": True},
+        # 삭제 (기간별/카테고리별) - QuickReplies용
+        "메모 삭제": {"intent": "delete", "confidence": 1.0},  # 삭제 옵션 보여주기
+        "삭제": {"intent": "delete", "confidence": 1.0},  # 삭제 옵션 보여주기
+        "오늘 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "오늘"},
+        "오늘메모삭제": {"intent": "delete", "confidence": 1.0, "keyword": "오늘"},
+        "어제 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "어제"},
+        "어제메모삭제": {"intent": "delete", "confidence": 1.0, "keyword": "어제"},
+        "이번주 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "이번주"},
+        "이번 주 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "이번주"},
+        "지난주 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "지난주"},
+        "이번달 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "이번달"},
+        "전체 메모 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "전체"},
+        "전체메모삭제": {"intent": "delete", "confidence": 1.0, "keyword": "전체"},
+        # 카테고리별 삭제
+        "영상 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "영상"},
+        "음악 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "음악"},
+        "맛집 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "맛집"},
+        "쇼핑 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "쇼핑"},
+        "여행 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "여행"},
+        "할일 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "할일"},
+        "학습 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "학습"},
+        "기타 삭제": {"intent": "delete", "confidence": 1.0, "keyword": "기타"},
+    }
+
+    if msg in EXACT_MATCHES:
+        return EXACT_MATCHES[msg]
+
+    # 패턴 매칭 (검색/삭제)
+    # "검색 XXX" 또는 "XXX 검색"
+    if msg.startswith("검색 "):
+        keyword = msg[3:].strip()
+        if keyword:
+            return {"intent": "search", "confidence": 1.0, "keyword": keyword}
+    if msg.endswith(" 검색"):
+        keyword = msg[:-3].strip()
+        if keyword:
+            return {"intent": "search", "confidence": 1.0, "keyword": keyword}
+    if "찾아줘" in msg:
+        keyword = msg.replace("찾아줘", "").strip()
+        if keyword:
+            return {"intent": "search", "confidence": 0.9, "keyword": keyword}
+
+    # "삭제 XXX" 또는 "XXX 삭제" 또는 "XXX 지워"
+    # UUID 패턴이면 memo_id로 처리 (상세보기에서 삭제 버튼 클릭 시)
+    import re
+    uuid_pattern = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I)
+
+    if msg.startswith("삭제 "):
+        keyword = msg[3:].strip()
+        if keyword:
+            if uuid_pattern.match(keyword):
+                return {"intent": "delete", "confidence": 1.0, "memo_id": keyword}
+            return {"intent": "delete", "confidence": 1.0, "keyword": keyword}
+    if msg.endswith(" 삭제"):
+        keyword = msg[:-3].strip()
+        if keyword:
+            return {"intent": "delete", "confidence": 1.0, "keyword": keyword}
+    if "지워줘" in msg or "지워" in msg:
+        keyword = msg.replace("지워줘", "").replace("지워", "").strip()
+        if keyword:
+            return {"intent": "delete", "confidence": 0.9, "keyword": keyword}
+
+    # 상세 보기 패턴: "상세 {memo_id}" 또는 "#{short_id}"
+    if msg.startswith("상세 "):
+        memo_id = msg[3:].strip()
+        if memo_id:
+            return {"intent": "detail", "confidence": 1.0, "memo_id": memo_id}
+
+    # 짧은 ID 패턴: "#a448275d" (8자리)
+    if msg.startswith("#") and len(msg) == 9:
+        short_id = msg[1:]  # # 제거
+        if all(c in "0123456789abcdef" for c in short_id.lower()):
+            return {"intent": "detail", "confidence": 1.0, "short_id": short_id}
+
+    # URL은 무조건 저장 (AI 호출 불필요)
+    if msg_lower.startswith(("http://", "https://", "www.")):
+        return {"intent": "save", "confidence": 1.0, "reasoning": "URL 감지"}
+
+    # "AI:" 접두사 → AI 분류 저장 (사용자 명시적 요청)
+    if msg.startswith("AI:") or msg.startswith("ai:") or msg.startswith("AI ") or msg.startswith("ai "):
+        content = msg[3:].strip() if msg[2] == ":" else msg[2:].strip()
+        return {"intent": "save_with_ai", "confidence": 1.0, "content": content, "reasoning": "AI 분류 요청"}
+
+    # 그 외는 일반 저장 (원본 그대로)
+    return {"intent": "save", "confidence": 1.0, "reasoning": "기본 저장"}
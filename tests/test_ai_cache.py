@@ -0,0 +1,63 @@
+"""AI 응답 캐시 테스트 (Redis/OpenAI 없이 실행)"""
+import sys
+import os
+import asyncio
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.ai_cache as ai_cache
+import lib.classifier as classifier
+from lib.ai_cache import make_ai_cache_key, prompt_version, get_ai_cache_metrics
+
+
+def test_cache_key_normalization_and_versioning():
+    """공백/대소문자 차이는 같은 키, 프롬프트 버전/부가 입력이 다르면 다른 키"""
+    version = prompt_version("prompt", "model", 0.1)
+    key = make_ai_cache_key("category", version, "  강남  파스타 맛집 ")
+    assert key == make_ai_cache_key("category", version, "강남 파스타 맛집")
+    assert key.startswith(f"ai:category:{version}:")
+
+    assert key != make_ai_cache_key("category", prompt_version("prompt v2", "model", 0.1), "강남 파스타 맛집")
+    assert key != make_ai_cache_key("category", version, "강남 파스타 맛집", {"title": "x"})
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {
+            "choices": [{"message": {"content": "맛집"}}],
+            "usage": {"total_tokens": 120},
+        }
+
+
+class _FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def post(self, *args, **kwargs):
+        self.calls += 1
+        return _FakeResponse()
+
+
+def test_category_classification_uses_cache(monkeypatch):
+    """같은 메모 재분류 시 OpenAI 호출 없이 캐시 반환 + 절약 토큰 집계"""
+    fake_client = _FakeClient()
+    monkeypatch.setattr(classifier, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(classifier, "get_http_client", lambda name: fake_client)
+    monkeypatch.setattr(ai_cache, "_local_cache", ai_cache.OrderedDict())
+    monkeypatch.setattr(ai_cache, "_metrics", {})
+
+    async def run():
+        first = await classifier.classify_category_only("성수동 파스타집 가보기", use_ai=True)
+        second = await classifier.classify_category_only("성수동  파스타집 가보기", use_ai=True)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second == "맛집"
+    assert fake_client.calls == 1
+
+    metrics = get_ai_cache_metrics()["kinds"]["category"]
+    assert metrics["hits_local"] == 1 and metrics["misses"] == 1
+    assert metrics["saved_tokens"] == 120 and metrics["spent_tokens"] == 120
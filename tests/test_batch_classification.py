@@ -0,0 +1,89 @@
+"""배치 분류 / 재분류 헬퍼 테스트 (Redis/OpenAI 없이 실행)"""
+import sys
+import os
+import json
+import asyncio
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.ai_cache as ai_cache
+import lib.classifier as classifier
+from lib.redis_db import memo_update_commands
+from lib.jobs import needs_reclassification
+
+
+class _FakeClient:
+    def __init__(self, answer: dict):
+        self.answer = answer
+        self.prompts = []
+
+    async def post(self, url, headers=None, json=None, timeout=None):
+        self.prompts.append(json["messages"][0]["content"])
+        answer = self.answer
+
+        class Response:
+            status_code = 200
+
+            def json(self):
+                return {
+                    "choices": [{"message": {"content": _dumps(answer)}}],
+                    "usage": {"total_tokens": 300},
+                }
+
+        return Response()
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def test_batch_maps_numbers_back_to_memo_ids(monkeypatch):
+    """번호로 응답 → 메모 id 매핑, 잘못된 항목은 무시, 2회차는 캐시"""
+    fake_client = _FakeClient({"results": [
+        {"n": 1, "category": "맛집", "tags": ["파스타"]},
+        {"n": 2, "category": "학습", "tags": ["파이썬", "", "비동기"]},
+        {"n": 9, "category": "기타"},
+        {"n": "x"},
+    ]})
+    monkeypatch.setattr(classifier, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(classifier, "get_http_client", lambda name: fake_client)
+    monkeypatch.setattr(ai_cache, "_local_cache", ai_cache.OrderedDict())
+
+    items = [
+        {"id": "m1", "content": "성수동 파스타"},
+        {"id": "m2", "content": "파이썬 asyncio 강의", "title": "Async IO"},
+        {"id": "m3", "content": "응답에서 빠진 메모"},
+    ]
+    results, tokens = asyncio.run(classifier.classify_memos_batch(items))
+
+    assert results == {
+        "m1": {"category": "맛집", "tags": ["파스타"]},
+        "m2": {"category": "학습", "tags": ["파이썬", "비동기"]},
+    }
+    assert tokens == 300
+    assert "2: 파이썬 asyncio 강의 (제목: Async IO)" in fake_client.prompts[0]
+
+    results, tokens = asyncio.run(classifier.classify_memos_batch(items[:2]))
+    assert set(results) == {"m1", "m2"} and tokens == 0
+    assert len(fake_client.prompts) == 1
+
+
+def test_update_commands_move_category_index():
+    """카테고리가 바뀌면 SREM/SADD + 집계 이동, 같으면 메모/카드 SET만"""
+    memo = {"id": "m1", "category": "맛집", "tags": ["t"], "day": "2026-10-19"}
+    commands = memo_update_commands("u1", memo, "성수동")
+    assert [c[0] for c in commands[:3]] == ["SET", "SREM", "SADD"]
+    assert commands[1][1] == "user:u1:category:성수동" and commands[2][1] == "user:u1:category:맛집"
+    rollup = {(c[1].rsplit(":", 1)[-1], c[2], c[3]) for c in commands[3:] if c[0] == "HINCRBY"}
+    assert rollup == {
+        ("2026-10-19", "cat:성수동", -1), ("2026-10-19", "cat:맛집", 1),
+        ("2026-10", "cat:성수동", -1), ("2026-10", "cat:맛집", 1),
+    }
+
+    commands = memo_update_commands("u1", memo, "맛집")
+    assert [c[0] for c in commands] == ["SET", "SET"] and commands[1][1] == "card:u1:m1"
+
+    assert needs_reclassification({"tags": []})
+    assert not needs_reclassification({"tags": ["x"]})
+    assert not needs_reclassification({"tags": [], "reclassified_at": "2026-01-01"})
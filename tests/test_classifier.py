@@ -0,0 +1,68 @@
+"""빠른 규칙 분류 테스트 (AI 호출 없음)"""
+import sys
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.classifier import fast_rule_classify, COMMAND_TABLE
+from tests.legacy_rules import legacy_fast_rule_classify
+
+# 기존 구현과 결과가 같아야 하는 입력
+LEGACY_SAMPLES = [
+    "리마인더", "알림", "알림 목록", "통계", "도움말", "홈", "사용법", "?",
+    "AI 분류", "ai 분류", "요약 저장", "분류 저장",
+    "오늘 정리", "오늘정리", "어제 정리", "이번주 정리", "이번 주 정리", "지난주 정리",
+    "지난 주 정리", "이번달 정리", "이번 달 정리", "지난달 정리", "전체 보여줘", "전체보여줘",
+    "오늘 요약", "오늘요약", "어제 요약", "이번주 요약", "이번 주 요약", "지난주 요약",
+    "이번달 요약", "지난달 요약", "전체 요약", "요약",
+    "영상 정리", "음악 정리", "맛집 정리", "아이디어 정리", "읽을거리 정리", "기타 정리",
+    "전체보기 today", "전체보기 week", "전체보기 all", "전체보기 맛집", "전체보기 읽을거리",
+    "메모 삭제", "삭제", "오늘 메모 삭제", "오늘메모삭제", "이번 주 메모 삭제", "전체메모삭제",
+    "영상 삭제", "맛집 삭제", "기타 삭제",
+    "검색 파스타", "파스타 검색", "강남 맛집 찾아줘", "삭제 파스타", "파스타 삭제",
+    "삭제 a448275d-1234-5678-9abc-def012345678", "상세 a448275d-1234", "#a448275d", "#A448275D",
+    "맛집 지워줘", "맛집 지워",
+    "https://youtu.be/abc", "www.naver.com", "AI: 내일 회의 준비", "ai 파스타 레시피",
+    "그냥 메모", "#12345", "검색", "상세",
+]
+
+
+def test_matches_legacy_rules():
+    """기존 명령어는 결과 동일"""
+    for message in LEGACY_SAMPLES:
+        assert fast_rule_classify(message) == legacy_fast_rule_classify(message), message
+
+
+def test_spacing_and_suffix_variants():
+    """띄어쓰기/조사/어미 변형도 같은 명령으로 인식"""
+    expected = {"intent": "summary", "confidence": 1.0, "period": "week"}
+    for message in ["이번주정리", "이번 주 메모 정리", "이번주 정리해줘", "이번주 메모 정리 좀", "금주 정리"]:
+        assert fast_rule_classify(message) == expected, message
+
+    assert fast_rule_classify("지난 달 요약해줘")["period"] == "last_month"
+    assert fast_rule_classify("저번주 메모 삭제") == {"intent": "delete", "confidence": 1.0, "keyword": "지난주"}
+    assert fast_rule_classify("맛집을 정리해주세요") == {"intent": "summary", "confidence": 1.0, "category": "맛집"}
+    assert fast_rule_classify("리마인더 목록")["intent"] == "reminder"
+
+
+def test_period_and_category_combination():
+    """기간 × 카테고리 조합"""
+    result = fast_rule_classify("이번 주 맛집 정리")
+    assert result == {"intent": "summary", "confidence": 1.0, "period": "week", "category": "맛집"}
+
+    result = fast_rule_classify("전체보기 week 맛집")
+    assert result["period"] == "week" and result["category"] == "맛집" and result["show_all"] is True
+
+
+def test_trailing_delete_verb_only():
+    """'지워'는 문장 끝 동사일 때만 삭제 ('지워지지 않는 펜'은 저장)"""
+    assert fast_rule_classify("지워지지 않는 펜 사기")["intent"] == "save"
+    assert fast_rule_classify("유튜브 지워주세요") == {"intent": "delete", "confidence": 0.9, "keyword": "유튜브"}
+
+
+def test_results_are_copies():
+    """반환값을 수정해도 명령 테이블은 그대로"""
+    result = fast_rule_classify("오늘 정리")
+    result["period"] = "all"
+    assert COMMAND_TABLE["오늘정리"]["period"] == "today"
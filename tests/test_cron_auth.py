@@ -0,0 +1,47 @@
+"""Cron 엔드포인트 인증 테스트 (Authorization: Bearer $CRON_SECRET)"""
+import sys
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+import api.cron as cron
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(cron, "CRON_SECRET", "s3cret")
+
+    async def fake_reclassify(user_id=None, restart=False):
+        return {"user_id": user_id, "restart": restart}
+
+    monkeypatch.setattr(cron, "reclassify_backlog", fake_reclassify)
+    return TestClient(cron.app)
+
+
+def test_rejects_missing_or_wrong_secret(client):
+    """헤더가 없거나 틀리면 401, 작업은 실행하지 않음"""
+    assert client.get("/api/cron/reclassify?restart=1").status_code == 401
+    response = client.get("/api/cron/reclassify", headers={"Authorization": "Bearer nope"})
+    assert response.status_code == 401
+
+
+def test_accepts_cron_secret(client):
+    response = client.get("/api/cron/reclassify?user_id=u1", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert response.json()["user_id"] == "u1"
+
+
+def test_rejects_everything_without_configured_secret(client, monkeypatch):
+    """CRON_SECRET 미설정이면 빈 Bearer 헤더도 거부"""
+    monkeypatch.setattr(cron, "CRON_SECRET", "")
+    assert client.get("/api/cron/indexes", headers={"Authorization": "Bearer "}).status_code == 401
+
+
+def test_health_is_public(client):
+    assert client.get("/api/cron/health").status_code == 200
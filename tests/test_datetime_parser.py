@@ -0,0 +1,91 @@
+"""날짜/시간 토크나이저 테스트 (기존 구현과 퍼징 비교 + 의도한 수정)"""
+import sys
+import os
+import itertools
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import tests.legacy_datetime as legacy_datetime
+from lib.datetime_parser import extract_reminder_info, parse_datetime, parse_time, tokenize_datetime
+
+# 월요일 오전, 목요일 밤, 12월 말 (요일/지난 시각/연도 넘김 경계)
+NOW_CASES = [
+    datetime(2026, 10, 19, 10, 30),
+    datetime(2026, 10, 22, 22, 5),
+    datetime(2026, 12, 30, 8, 0),
+]
+
+DATE_PHRASES = [
+    "", "오늘", "내일", "모레", "글피", "이번주", "다음주", "다음 주", "이번달", "다음 달",
+    "월요일", "수요일", "일요일", "다음주 금요일", "이번주 토요일", "다음 주 월요일",
+    "3/15", "12/25", "2-30", "11-3", "1/40",
+]
+MERIDIEMS = ["", "오전", "오후", "아침", "저녁", "밤"]
+TIMES = ["", "3시", "12시", "9시", "10시 15분", "7:45", "15:30", "11시 5분"]
+SUFFIXES = ["", "까지", " 마감", " 전에"]
+# 요일 글자(월화수목금토일)나 오전/오후 단어가 없는 본문
+FILLERS = ["회의", "병원 예약", "보고서 제출", "친구 약속 잡기", "장보기 우유 사기"]
+
+
+def _fuzz_corpus():
+    for date, meridiem, time, suffix, filler in itertools.product(
+        DATE_PHRASES, MERIDIEMS, TIMES, SUFFIXES, FILLERS
+    ):
+        head = " ".join(part for part in (date, meridiem, time) if part)
+        yield f"{head}{suffix} {filler}"
+        yield f"{filler} {head}{suffix}"
+
+
+def _freeze_legacy_now(monkeypatch, now):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+
+    monkeypatch.setattr(legacy_datetime, "datetime", FrozenDatetime)
+
+
+def test_fuzz_matches_legacy(monkeypatch):
+    """기존 구현이 올바르게 처리하던 표현은 결과(시각/정리 문구)가 같음"""
+    corpus = list(_fuzz_corpus())
+    assert len(corpus) > 20000
+    for now in NOW_CASES:
+        _freeze_legacy_now(monkeypatch, now)
+        for text in corpus:
+            expected = legacy_datetime.legacy_extract_reminder_info(text)
+            actual = extract_reminder_info(text, now=now)
+            assert actual["reminder_at"] == expected["reminder_at"], (now, text)
+            assert actual["reminder_text"] == expected["reminder_text"], (now, text)
+            assert actual["has_time"] == expected["has_time"]
+
+
+def test_tokens_carry_kind_and_span():
+    """토큰은 (종류, 시작, 끝, 값), 원문 위치 그대로"""
+    text = "다음주 금요일 오후 3시 반까지 회의"
+    tokens = tokenize_datetime(text)
+    assert [token[0] for token in tokens] == ["week", "meridiem", "half_hour", "deadline"]
+    assert tokens[0][3] == ("다음", 4)
+    assert tokens[2][3] == (3, 30)
+    assert [text[start:end] for _, start, end, _ in tokens] == ["다음주 금요일", "오후", "3시 반", "까지"]
+
+
+def test_fixes_over_legacy():
+    """기존 구현의 오파싱 수정"""
+    now = NOW_CASES[0]
+    # "X월 X일"의 월/일을 요일로 읽지 않음
+    assert parse_datetime("12월 25일 크리스마스 파티", now=now) == datetime(2026, 12, 25, 9, 0)
+    # 단어 속 한 글자(영화/지금/일정)는 요일이 아님
+    assert parse_datetime("영화 보기", now=now) is None
+    assert parse_datetime("지금 일정 정리", now=now) is None
+    # 기간("3시간")은 시각이 아님, 시각 범위를 넘으면 무시 (기존: 예외)
+    assert parse_time("3시간 회의") is None
+    assert parse_time("25시 영화") is None
+    # "3시 반" 정리 시 "반"이 남지 않음
+    assert extract_reminder_info("3시 반 회의", now=now)["reminder_text"] == "회의"
+    # 전화번호/URL 속 숫자는 날짜가 아님
+    assert parse_datetime("010-1234-5678 연락", now=now) is None
+    info = extract_reminder_info("https://example.com/2024/10-3 내일 읽기", now=now)
+    assert info["reminder_at"] == datetime(2026, 10, 20, 9, 0)
+    assert info["reminder_text"] == "https://example.com/2024/10-3 읽기"
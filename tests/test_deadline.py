@@ -0,0 +1,74 @@
+"""요청 마감 시간 전파 테스트 (네트워크 없이 실행)"""
+import sys
+import os
+import asyncio
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.metadata as metadata
+from lib.deadline import request_deadline, start_deadline, reset_deadline, remaining, fit_timeout, has_time
+
+
+def test_no_deadline_keeps_defaults():
+    """마감 없으면(크론/백그라운드) 기본 타임아웃 그대로"""
+    assert remaining() is None
+    assert fit_timeout(10.0, reserve=1.0) == 10.0
+    assert has_time(100.0)
+
+
+def test_timeout_shrinks_to_fit():
+    """남은 시간 - reserve로 축소, 최소값 보장, 블록 종료 후 복원"""
+    with request_deadline(2.0):
+        assert 1.9 < remaining() <= 2.0
+        assert fit_timeout(10.0) <= 2.0
+        assert 0.9 < fit_timeout(10.0, reserve=1.0) <= 1.0
+        assert fit_timeout(1.0) == 1.0
+        assert fit_timeout(10.0, reserve=5.0, minimum=0.3) == 0.3
+        assert has_time(1.5) and not has_time(3.0)
+    assert remaining() is None
+
+    token = start_deadline(-1.0)
+    assert not has_time(0.0)
+    reset_deadline(token)
+    assert has_time(0.0)
+
+
+def test_deadline_propagates_into_tasks():
+    """asyncio 태스크(동시 URL 추출)에도 같은 마감 적용"""
+    async def child():
+        return remaining()
+
+    async def run():
+        with request_deadline(3.0):
+            return await asyncio.gather(asyncio.create_task(child()), child())
+
+    left = asyncio.run(run())
+    assert all(2.5 < value <= 3.0 for value in left)
+
+
+def test_metadata_skips_network_when_out_of_time(monkeypatch):
+    """마감 임박 시 소스 호출 없이 폴백, 헬스(백오프)에는 기록 안 함"""
+    calls = []
+
+    async def fake_health(domain):
+        return {}
+
+    async def fake_save(domain, state):
+        calls.append(("save", domain))
+
+    async def fake_oembed(url, timeout=8.0):
+        calls.append(("oembed", timeout))
+        return None
+
+    monkeypatch.setattr(metadata, "get_domain_health", fake_health)
+    monkeypatch.setattr(metadata, "save_domain_health", fake_save)
+    monkeypatch.setattr(metadata, "fetch_oembed_metadata", fake_oembed)
+
+    async def run():
+        with request_deadline(0.5):
+            return await metadata.extract_metadata("https://slow.example.com/post/1")
+
+    result = asyncio.run(run())
+    assert calls == []
+    assert result["url"] == "https://slow.example.com/post/1"
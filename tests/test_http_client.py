@@ -0,0 +1,47 @@
+"""공유 HTTP 클라이언트 레지스트리 테스트 (네트워크 없이 실행)"""
+import sys
+import os
+import asyncio
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.http_client import get_http_client, close_http_clients, get_http_metrics
+
+
+def test_client_reused_within_loop():
+    """같은 이벤트 루프 안에서는 같은 클라이언트(커넥션 풀) 재사용"""
+    async def main():
+        first = get_http_client("redis")
+        second = get_http_client("redis")
+        other = get_http_client("openai")
+        assert first is second
+        assert first is not other
+        await close_http_clients()
+        assert first.is_closed
+        return first
+
+    previous = asyncio.run(main())
+
+    # 새 이벤트 루프에서는 새 클라이언트 생성
+    async def again():
+        client = get_http_client("redis")
+        await close_http_clients()
+        return client
+
+    assert asyncio.run(again()) is not previous
+
+
+def test_metrics_shape():
+    """풀 사용률 메트릭 구조"""
+    async def main():
+        get_http_client("kakao")
+        metrics = get_http_metrics()
+        await close_http_clients()
+        return metrics
+
+    metrics = asyncio.run(main())
+    kakao = metrics["kakao"]
+    assert {"requests", "errors", "in_flight", "avg_latency_ms"} <= set(kakao)
+    assert kakao["pool"]["max"] == 10
+    assert 0.0 <= kakao["pool"]["utilization"] <= 1.0
@@ -0,0 +1,67 @@
+"""멱등 저장 테스트 (conftest의 fakeredis Upstash)"""
+import sys
+import os
+import asyncio
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.idempotency as idempotency
+import lib.memo_service as memo_service
+from lib.idempotency import idempotency_key
+
+
+def test_key_normalizes_whitespace_and_options():
+    """공백 차이는 같은 키, 사용자/저장 옵션이 다르면 다른 키"""
+    assert idempotency_key("u1", "성수동  파스타\n맛집") == idempotency_key("u1", " 성수동 파스타 맛집 ")
+    assert idempotency_key("u1", "메모") != idempotency_key("u2", "메모")
+    assert idempotency_key("u1", "메모", {"use_ai": True}) != idempotency_key("u1", "메모", {"use_ai": False})
+    assert idempotency_key("u1", "메모").startswith("idem:u1:")
+
+
+def test_retry_replays_first_result(upstash, monkeypatch):
+    """같은 발화 재전송은 저장을 다시 하지 않고 첫 결과 반환, 실패는 선점 해제"""
+    saved = []
+
+    async def fake_save(user_id, content, *args):
+        saved.append(content)
+        if content == "실패":
+            return {"success": False, "error": "x"}
+        return {"success": True, "memo_id": f"m{len(saved)}", "category": "기타"}
+
+    monkeypatch.setattr(memo_service, "_save_memo", fake_save)
+
+    async def run():
+        first = await memo_service.service_save_memo("u1", "파스타 맛집")
+        retry = await memo_service.service_save_memo("u1", "파스타  맛집")
+        other_user = await memo_service.service_save_memo("u2", "파스타 맛집")
+        await memo_service.service_save_memo("u1", "실패")
+        await memo_service.service_save_memo("u1", "실패")
+        return first, retry, other_user
+
+    first, retry, other_user = asyncio.run(run())
+    assert first["memo_id"] == retry["memo_id"] == "m1"
+    assert retry["replayed"] and "replayed" not in first
+    assert other_user["memo_id"] == "m2"
+    assert saved == ["파스타 맛집", "파스타 맛집", "실패", "실패"]
+
+
+def test_concurrent_duplicate_waits_for_pending(upstash, monkeypatch):
+    """첫 요청이 처리 중이면 기다렸다가 같은 결과 반환"""
+    monkeypatch.setattr(idempotency, "IDEMPOTENCY_POLL", 0.01)
+
+    async def slow_save(user_id, content, *args):
+        await asyncio.sleep(0.05)
+        return {"success": True, "memo_id": "m1"}
+
+    monkeypatch.setattr(memo_service, "_save_memo", slow_save)
+
+    async def run():
+        return await asyncio.gather(
+            memo_service.service_save_memo("u1", "연타"),
+            memo_service.service_save_memo("u1", "연타"),
+        )
+
+    first, second = asyncio.run(run())
+    assert first["memo_id"] == second["memo_id"] == "m1"
+    assert second.get("replayed")
@@ -0,0 +1,48 @@
+"""키워드 매처 / 규칙 분류 테스트"""
+import sys
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.keyword_matcher import build_keyword_matcher, match_keywords
+from lib.classifier import rule_based_classification, rank_rule_categories
+
+
+def test_scores_all_categories_with_evidence():
+    """모든 카테고리를 한 번에 점수화 + 근거 키워드 횟수"""
+    matcher = build_keyword_matcher({"A": ["abc", "x"], "B": ["x", "yz"]})
+    ranked = match_keywords(matcher, "ABC x yz yz")
+
+    assert [c["category"] for c in ranked] == ["B", "A"]
+    assert ranked[0] == {"category": "B", "score": 2.5, "evidence": {"x": 1, "yz": 2}}
+    assert ranked[1]["evidence"] == {"abc": 1, "x": 1}
+
+
+def test_single_syllable_keyword_does_not_inflate():
+    """한 글자 키워드는 여러 번 나와도 약하게, 긴 붙여넣기는 끝부분 키워드까지"""
+    matcher = build_keyword_matcher({"맛집": ["카페"], "읽을거리": ["글"]})
+    ranked = match_keywords(matcher, "카페 메뉴 글자 크기, 글씨체, 글쎄 어디였지")
+    assert ranked[0]["category"] == "맛집"
+    assert ranked[1] == {"category": "읽을거리", "score": 0.5, "evidence": {"글": 3}}
+
+    long_paste = match_keywords(matcher, "가" * 5000 + " 카페")
+    assert long_paste == [{"category": "맛집", "score": 1, "evidence": {"카페": 1}}]
+
+
+def test_longest_keyword_and_table_order_ties():
+    """같은 위치는 긴 키워드 우선, 동점은 테이블 순서"""
+    matcher = build_keyword_matcher({"영상": ["영상", "동영상"], "맛집": ["맛집"]})
+    ranked = match_keywords(matcher, "동영상 맛집")
+    assert ranked[0]["evidence"] == {"동영상": 1}
+    assert [c["category"] for c in ranked] == ["영상", "맛집"]
+
+
+def test_rule_classification_picks_best_category():
+    """첫 매칭이 아니라 최고점 카테고리 선택"""
+    content = "카페 리뷰 블로그 글 - 뉴스 기사 모음"
+    assert rule_based_classification(content)["category"] == "읽을거리"
+    assert rank_rule_categories(content)[1]["category"] == "맛집"
+
+    assert rule_based_classification("그냥 메모")["category"] == "기타"
+    assert rule_based_classification("https://youtu.be/x", {"type": "youtube", "title": "t"})["category"] == "영상"
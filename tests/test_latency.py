@@ -0,0 +1,53 @@
+"""스킬 응답 방식(동기/콜백) 선택 테스트 (네트워크 없이 실행)"""
+import sys
+import os
+import asyncio
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.latency as latency
+from lib.latency import latency_key, record_latency, predict_latency_ms, choose_response_mode
+
+
+def test_latency_keys():
+    """링크 저장/일괄 삭제는 별도 예측 단위"""
+    assert latency_key("save", {}, "그냥 메모") == "save"
+    assert latency_key("save", {}, "https://example.com/a 읽기") == "save:link"
+    assert latency_key("save_with_ai", {"content": "https://a.com"}, "AI: https://a.com") == "save_with_ai:link"
+    assert latency_key("delete", {"keyword": "맛집"}, "맛집 삭제") == "delete:bulk"
+    assert latency_key("delete", {"memo_id": "abc"}, "삭제 abc") == "delete"
+
+
+def test_callback_chosen_when_prediction_exceeds_budget(monkeypatch):
+    """예측 시간이 남은 시간보다 길면 콜백, 콜백 URL 없으면 항상 동기"""
+    monkeypatch.setattr(latency, "_latency_ewma", {})
+
+    async def run(key, elapsed, available=True):
+        return await choose_response_mode(key, "", elapsed, available)
+
+    assert asyncio.run(run("search", 0.1)) == "sync"
+    assert asyncio.run(run("ai_summary", 0.2)) == "callback"      # 기본 예상 4초 > 남은 3.8초
+    assert asyncio.run(run("ai_summary", 0.2, available=False)) == "sync"
+    assert asyncio.run(run("search", 3.5)) == "callback"          # 이미 시간을 많이 씀
+
+    for _ in range(10):
+        record_latency("ai_summary", 1200)
+    assert asyncio.run(run("ai_summary", 0.2)) == "sync"
+
+
+def test_link_prediction_uses_domain_health(monkeypatch):
+    """오프라인 추출 가능 링크는 0, 느린 도메인은 헬스 지연시간 반영"""
+    monkeypatch.setattr(latency, "_latency_ewma", {"save": 300, "save:link": 300})
+
+    async def fake_health(domain):
+        if domain == "slow.example.com":
+            return {"oembed": {"latency_ewma": 0.0, "skip_until": 10 ** 12}, "direct": {"latency_ewma": 4200.0}}
+        return {}
+
+    monkeypatch.setattr(latency, "get_domain_health", fake_health)
+
+    youtube = asyncio.run(predict_latency_ms("save:link", "https://youtu.be/dQw4w9WgXcQ"))
+    slow = asyncio.run(predict_latency_ms("save:link", "https://youtu.be/x https://slow.example.com/p"))
+    assert youtube == 300
+    assert slow == 300 + 4200.0
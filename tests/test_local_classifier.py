@@ -0,0 +1,188 @@
+"""로컬 카테고리 분류기 테스트 (Redis 없이 실행)"""
+import sys
+import os
+import time
+import asyncio
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.local_classifier as local_classifier
+from lib.local_classifier import (
+    extract_features,
+    new_model,
+    update_model,
+    model_from_hash,
+    model_commands,
+    predict_category,
+    classify_category_local,
+    learn_category,
+    is_learned,
+    merge_learning_commands,
+    prune_commands,
+    LOCAL_MODEL_GLOBAL_KEY,
+    LOCAL_MODEL_USER_PREFIX,
+)
+
+TRAINING = {
+    "맛집": ["성수동 파스타 맛집", "강남역 초밥 맛집 예약", "을지로 노포 맛집", "합정 카페 디저트 맛집", "연남동 라멘 맛집"],
+    "학습": ["파이썬 비동기 강의 정리", "리액트 훅 공부", "알고리즘 강의 듣기", "코딩 테스트 공부 계획", "SQL 인덱스 강의"],
+    "건강": ["하체 운동 루틴", "다이어트 식단 기록", "헬스장 등록", "러닝 5km 운동", "스트레칭 운동 루틴"],
+    "여행": ["제주 숙소 예약", "오사카 여행 일정", "부산 호텔 검색", "다낭 항공권 여행", "강릉 여행 숙소"],
+}
+
+
+def _trained_model() -> dict:
+    model = new_model()
+    for category, texts in TRAINING.items():
+        for text in texts:
+            update_model(model, extract_features(text), category)
+    return model
+
+
+def test_predict_ranks_categories():
+    """학습한 카테고리 중 가장 가까운 것이 1위"""
+    model = _trained_model()
+    ranked = predict_category(extract_features("홍대 파스타 맛집"), model)
+    assert ranked[0][0] == "맛집"
+    assert abs(sum(p for _, p in ranked) - 1.0) < 1e-9
+
+    assert predict_category(extract_features("하체 운동 기록"), model)[0][0] == "건강"
+
+
+def test_hash_roundtrip_matches_model():
+    """HINCRBY 명령 결과(HGETALL)로 복원한 모델 = 메모리 모델"""
+    features = extract_features("성수동 파스타 맛집")
+    commands = model_commands("nb:test", features, "맛집")
+    flat = []
+    for _, _, field, value in commands:
+        flat.extend([field, str(value)])
+
+    restored = model_from_hash(flat)
+    expected = new_model()
+    update_model(expected, features, "맛집")
+    assert restored == expected
+
+
+def test_user_model_overrides_global(monkeypatch):
+    """사용자 모델 가중치로 개인 카테고리 우선 + 학습 부족/저신뢰는 None"""
+    global_model = _trained_model()
+    user_model = new_model()
+    for text in ["건축사 층고 제한 규정", "건축사 시험 일정", "건축사 법규 정리"]:
+        update_model(user_model, extract_features(text), "건축사")
+
+    monkeypatch.setattr(local_classifier, "_model_cache", {
+        LOCAL_MODEL_GLOBAL_KEY: (time.time(), global_model),
+        f"{LOCAL_MODEL_USER_PREFIX}u1": (time.time(), user_model),
+        f"{LOCAL_MODEL_USER_PREFIX}u2": (time.time(), new_model()),
+    })
+
+    category, confidence = asyncio.run(classify_category_local("건축사 층고 계산", "u1"))
+    assert category == "건축사" and confidence >= local_classifier.CONFIDENCE_THRESHOLD
+
+    # 다른 사용자에게는 개인 카테고리 없음
+    assert asyncio.run(classify_category_local("건축사 층고 계산", "u2"))[0] != "건축사"
+
+    # 학습량 부족
+    monkeypatch.setattr(local_classifier, "MIN_TRAINING_DOCS", 1000)
+    assert asyncio.run(classify_category_local("성수동 파스타 맛집", "u1")) == (None, 0.0)
+
+
+def test_learn_updates_cached_models(monkeypatch):
+    """기본 카테고리는 전역+사용자, 사용자 정의 카테고리는 사용자 모델에만 학습"""
+    global_model, user_model = new_model(), new_model()
+    monkeypatch.setattr(local_classifier, "_model_cache", {
+        LOCAL_MODEL_GLOBAL_KEY: (time.time(), global_model),
+        f"{LOCAL_MODEL_USER_PREFIX}u1": (time.time(), user_model),
+    })
+
+    asyncio.run(learn_category("u1", "을지로 노포 맛집", "맛집"))
+    asyncio.run(learn_category("u1", "건축사 법규 정리", "건축사"))
+
+    assert global_model["docs"] == {"맛집": 1}
+    assert user_model["docs"] == {"맛집": 1, "건축사": 1}
+
+
+def test_learn_enqueues_once_and_merges_fields(monkeypatch):
+    """요청 경로는 대기열 RPUSH 1번, cron은 같은 필드 HINCRBY를 합쳐서 (취소와 상쇄되면 제외)"""
+    import lib.redis_db as redis_db
+
+    sent = []
+
+    async def redis_command(*args):
+        sent.append(args)
+
+    monkeypatch.setattr(redis_db, "redis_command", redis_command)
+    monkeypatch.setattr(local_classifier, "_model_cache", {})
+    asyncio.run(learn_category("u1", "을지로 노포 맛집 " * 50, "맛집"))
+    assert [args[:2] for args in sent] == [("RPUSH", local_classifier.LEARN_QUEUE_KEY)]
+
+    commands = (local_classifier.learning_commands("u1", "성수동 파스타 맛집", "맛집")
+                + local_classifier.learning_commands("u1", "성수동 파스타 맛집", "맛집")
+                + local_classifier.learning_commands("u1", "성수동 파스타 맛집", "맛집", weight=-1))
+    merged = merge_learning_commands(commands)
+    assert len(merged) == len(commands) // 3
+    assert ["HINCRBY", LOCAL_MODEL_GLOBAL_KEY, "d\t맛집", 1] in merged
+    assert merge_learning_commands(commands[:len(merged)] + commands[-len(merged):]) == []
+
+
+def test_only_explicit_or_ai_labels_are_learned():
+    """로컬 예측/첫 단어/규칙 폴백/"기타"는 학습하지 않음"""
+    assert is_learned("맛집", "explicit") and is_learned("맛집", "ai")
+    assert not is_learned("맛집", "local") and not is_learned("성수동", "rule")
+    assert not is_learned("기타", "explicit") and not is_learned("맛집", None)
+
+
+def test_prune_drops_rare_ngrams_and_adjusts_totals():
+    """상한을 넘으면 빈도 낮은 n-gram부터 지우고 카테고리 총 개수에서 뺌"""
+    flat = ["d\t맛집", "3", "t\t맛집", "20"]
+    for i, count in enumerate([1, 1, 2, 5, 11]):
+        flat += [f"f\t맛집\tg{i}", str(count)]
+
+    assert prune_commands("nb:user:u1", flat, max_fields=10) == []
+    commands = prune_commands("nb:user:u1", flat, max_fields=5)
+    assert commands == [
+        ["HDEL", "nb:user:u1", "f\t맛집\tg0", "f\t맛집\tg1", "f\t맛집\tg2"],
+        ["HINCRBY", "nb:user:u1", "t\t맛집", -4],
+    ]
+
+
+def test_save_uses_local_model_and_skips_llm(monkeypatch):
+    """요약 저장도 로컬 모델이 확신하면 LLM 분류 생략, 로컬 예측은 학습하지 않고 출처를 저장"""
+    import lib.memo_service as memo_service
+
+    saved, learned = {}, []
+
+    async def classify_category_local(content, user_id=None):
+        return "맛집", 0.95
+
+    async def analyze_memo(*args, **kwargs):
+        raise AssertionError("LLM should be skipped")
+
+    async def save_memo(**kwargs):
+        saved.update(kwargs)
+        return "m1"
+
+    async def learn(*args, **kwargs):
+        learned.append(args)
+
+    monkeypatch.setattr(memo_service, "classify_category_local", classify_category_local)
+    monkeypatch.setattr(memo_service, "analyze_memo", analyze_memo)
+    monkeypatch.setattr(memo_service, "save_memo", save_memo)
+    monkeypatch.setattr(memo_service, "learn_category", learn)
+
+    result = asyncio.run(memo_service._save_memo("u1", "성수동 파스타 맛집", None, "파스타", None, True, False))
+    assert result["category"] == "맛집" and saved["category_source"] == "local" and learned == []
+
+    asyncio.run(memo_service._save_memo("u1", "건축사 층고 규정", "건축사", None, None, False, False))
+    assert saved["category_source"] == "explicit" and learned == [("u1", "건축사 층고 규정", "건축사")]
+
+
+def test_classification_is_fast():
+    """네트워크 없이 1ms 이내 분류"""
+    model = _trained_model()
+    features = extract_features("주말에 성수동 파스타 맛집 가보기")
+    started = time.perf_counter()
+    for _ in range(200):
+        predict_category(features, model)
+    assert (time.perf_counter() - started) / 200 < 0.001
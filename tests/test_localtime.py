@@ -0,0 +1,133 @@
+"""유저 시간대 테스트 (달력 경계, 파싱/리마인더 점수가 UTC 런타임과 무관한지)"""
+import sys
+import os
+import json
+import asyncio
+from datetime import date, datetime, timezone
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.redis_db as redis_db
+from lib.localtime import calendar_bounds, user_timezone, to_local, current_timezone, get_zone, DEFAULT_TIMEZONE
+from lib.datetime_parser import extract_reminder_info, format_reminder_time
+
+
+def test_calendar_bounds_are_local_midnights():
+    """KST 자정 = 전날 15:00 UTC, 주 시작은 월요일, (시간대, 날짜)별 캐시"""
+    bounds = calendar_bounds("Asia/Seoul", date(2026, 10, 21))   # 수요일
+    as_utc = {key: datetime.fromtimestamp(value, timezone.utc) for key, value in bounds.items()}
+    assert as_utc["today"] == datetime(2026, 10, 20, 15, 0, tzinfo=timezone.utc)
+    assert as_utc["yesterday"] == datetime(2026, 10, 19, 15, 0, tzinfo=timezone.utc)
+    assert as_utc["week"] == datetime(2026, 10, 18, 15, 0, tzinfo=timezone.utc)
+    assert as_utc["month"] == datetime(2026, 9, 30, 15, 0, tzinfo=timezone.utc)
+
+    calendar_bounds.cache_clear()
+    calendar_bounds("Asia/Seoul", date(2026, 10, 21))
+    calendar_bounds("Asia/Seoul", date(2026, 10, 21))
+    assert calendar_bounds.cache_info().hits == 1
+
+    assert get_zone("Not/AZone").key == DEFAULT_TIMEZONE
+
+
+def test_parsing_follows_user_timezone():
+    """기본은 KST, 유저 시간대를 설정하면 그 시간대의 벽시계 시각"""
+    assert current_timezone() == "Asia/Seoul"
+    info = extract_reminder_info("내일 3시 치과")
+    assert info["reminder_at"].utcoffset().total_seconds() == 9 * 3600
+    assert (info["reminder_at"].hour, info["reminder_at"].minute) == (15, 0)
+
+    with user_timezone("America/New_York"):
+        info = extract_reminder_info("내일 3시 치과")
+        assert info["reminder_at"].tzinfo.key == "America/New_York"
+        assert info["reminder_at"].hour == 15
+        # 이전 데이터의 naive 시각은 유저 시간대 시각으로 표시
+        assert format_reminder_time(datetime(2030, 1, 2, 15, 0)) == "1월 2일 오후 3시"
+    assert current_timezone() == "Asia/Seoul"
+
+
+def test_reminder_score_and_reschedule_use_memo_timezone(monkeypatch):
+    """pending 점수는 실제 시각, 반복 다음 회차는 저장 당시 유저 시간대 (크론은 시간대 설정 없음)"""
+    store = {}
+    calls = []
+
+    async def fake_command(*args):
+        return store.get(args[1])
+
+    async def fake_transaction(commands):
+        calls.append(commands)
+        for command in commands:
+            if command[0] == "SET":
+                store[command[1]] = command[2]
+        return ["OK"] * len(commands)
+
+    monkeypatch.setattr(redis_db, "redis_command", fake_command)
+    monkeypatch.setattr(redis_db, "redis_transaction", fake_transaction)
+
+    async def run():
+        with user_timezone("America/New_York"):
+            info = extract_reminder_info("매일 아침 8시 약")
+            memo_id = await redis_db.save_memo(
+                "u1", "매일 아침 8시 약", "text", "할일", [], "약",
+                reminder_at=info["reminder_at"], recurrence=info["recurrence"],
+            )
+        await redis_db.mark_reminder_sent("u1", memo_id)
+        return info, memo_id
+
+    info, memo_id = asyncio.run(run())
+    score = next(command[2] for command in calls[0] if command[:2] == ["ZADD", "reminders:pending"])
+    assert score == info["reminder_at"].timestamp()
+
+    memo = json.loads(store[f"memo:u1:{memo_id}"])
+    assert memo["timezone"] == "America/New_York"
+    next_at = to_local(datetime.fromisoformat(memo["reminder_at"]), "America/New_York")
+    assert (next_at.hour, next_at.minute) == (8, 0)
+    assert calls[1][1][2] == next_at.timestamp()
+
+
+def test_timezone_command_grammar():
+    """"시간대"는 조회, "시간대 <IANA 이름>"만 변경 (대소문자 무시, 메모 문장은 저장)"""
+    from lib.classifier import fast_rule_classify
+    from lib.localtime import resolve_timezone
+
+    assert fast_rule_classify("시간대")["intent"] == "timezone"
+    assert fast_rule_classify("시간대 america/new_york")["timezone"] == "america/new_york"
+    assert fast_rule_classify("시간대 바꾸는 법")["intent"] == "save"
+    assert resolve_timezone("america/new_york") == "America/New_York"
+    assert resolve_timezone("Not/AZone") is None
+
+
+def test_set_timezone_reschedules_pending_reminders(upstash):
+    """시간대를 바꾸면 미발송 일정은 새 시간대의 같은 벽시계 시각으로, 다른 유저/발송한 일정은 그대로"""
+    from lib.memo_service import service_set_timezone
+
+    server = upstash.redis
+
+    async def run():
+        user = await redis_db.get_or_create_user("kakao1")
+        other = await redis_db.get_or_create_user("kakao2")
+        infos = {}
+        for owner in (user, other):
+            info = extract_reminder_info("내일 3시 치과")
+            infos[owner["id"]] = info
+            memo_id = await redis_db.save_memo(owner["id"], "내일 3시 치과", "text", "할일", [], "치과",
+                                               reminder_at=info["reminder_at"])
+            owner["memo_id"] = memo_id
+        result = await service_set_timezone(user, "america/new_york")
+        return user, other, infos, result
+
+    user, other, infos, result = asyncio.run(run())
+    assert result["success"] and result["timezone"] == "America/New_York" and result["rescheduled"] == 1
+    assert json.loads(server.get("user:kakao1"))["timezone"] == "America/New_York"
+
+    memo = json.loads(server.get(f"memo:{user['id']}:{user['memo_id']}"))
+    at = datetime.fromisoformat(memo["reminder_at"])
+    assert memo["timezone"] == "America/New_York" and at.tzinfo is not None
+    assert (at.hour, at.minute) == (15, 0) and at.utcoffset() != infos[user["id"]]["reminder_at"].utcoffset()
+    assert server.zscore("reminders:pending", f"{user['id']}:{user['memo_id']}") == at.timestamp()
+
+    # 다른 유저의 일정은 그대로
+    other_score = server.zscore("reminders:pending", f"{other['id']}:{other['memo_id']}")
+    assert other_score == infos[other["id"]]["reminder_at"].timestamp()
+
+    assert not asyncio.run(service_set_timezone(user, "Not/AZone"))["success"]
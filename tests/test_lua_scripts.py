@@ -0,0 +1,89 @@
+"""Lua 스크립트 테스트 (conftest의 fakeredis + lupa로 실제 스크립트 실행, EVALSHA/NOSCRIPT 재시도)"""
+import sys
+import os
+import json
+import asyncio
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.redis_db as redis_db
+
+
+def _add(server, memo_id, content, category, age, **fields):
+    created = time.time() - age
+    memo = {
+        "id": memo_id, "content": content, "summary": content[:10], "category": category,
+        "tags": fields.pop("tags", []), "created_at": f"2026-10-{19 - age // 86400:02d}T10:00:00",
+        "metadata": {"title": "x" * 500}, **fields,
+    }
+    server.redis.set(f"memo:u1:{memo_id}", json.dumps(memo, ensure_ascii=False))
+    server.redis.zadd("user:u1:memos", {memo_id: created})
+    server.redis.sadd(f"user:u1:category:{category}", memo_id)
+
+
+@pytest.fixture
+def server(upstash):
+    _add(upstash, "m1", "강남 파스타 맛집", "맛집", 0, tags=["강남"])
+    _add(upstash, "m2", "Pasta 레시피", "학습", 86400)
+    _add(upstash, "m3", "홍대 카페", "맛집", 2 * 86400, tags=["파스타"])
+    _add(upstash, "m4", "내일 3시 치과", "할일", 3 * 86400,
+         reminder_at="2026-10-20T15:00:00", reminder_sent=False)
+    _add(upstash, "m5", "지난 일정", "할일", 4 * 86400, reminder_at="2026-10-01T09:00:00", reminder_sent=True)
+    _add(upstash, "m6", "장보기", "할일", 5 * 86400)
+    upstash.redis.set("memo:u1:broken", "{not json")
+    upstash.redis.zadd("user:u1:memos", {"broken": time.time()})
+    return upstash
+
+
+def test_search_filters_inside_redis(server):
+    """매칭 메모만 받아 옴 (MGET 없음), 처음에만 SCRIPT LOAD, ASCII 대소문자 무시, 깨진 JSON 무시"""
+    async def run():
+        return (
+            await redis_db.search_memos("u1", "파스타", collapse=False),
+            await redis_db.search_memos("u1", "PASTA", limit=1),
+            await redis_db.search_memos("u1", "파스타", category="맛집", limit=1),
+        )
+
+    by_text, by_case, by_category = asyncio.run(run())
+    assert [m["id"] for m in by_text] == ["m1", "m3"]
+    assert [m["id"] for m in by_case] == ["m2"]
+    assert [m["id"] for m in by_category] == ["m1"]        # 카테고리 검색은 최신순
+    assert server.commands == ["EVALSHA", "SCRIPT", "EVALSHA", "EVALSHA", "EVALSHA"]
+
+
+def test_collapsed_search_pushes_bounded_limit(server):
+    """접기 검색도 매칭 수를 limit의 몇 배로 제한해 Redis 안에서 멈춤 (전체 매칭을 받아 오지 않음)"""
+    for i in range(30):
+        _add(server, f"d{i:02d}", f"문서 {i}번 {'가나다라마바사'[i % 7] * (i + 3)} 검토", "기타", 60 + i)
+
+    results = asyncio.run(redis_db.search_memos("u1", "검토", limit=3))
+    script = [args for args in server.calls if args[0] == "EVALSHA"][-1]
+    assert len(results) == 3
+    assert int(script[6]) == 3 * redis_db.SEARCH_COLLAPSE_OVERFETCH
+
+
+def test_reminder_memos_are_projected(server):
+    """리마인더 있는 할일 메모만, 목록에 필요한 필드만 (태그/메타데이터 제외)"""
+    rows = asyncio.run(redis_db.get_user_reminders("u1"))
+    assert [row["id"] for row in rows] == ["m4"]
+    assert "metadata" not in rows[0] and rows[0]["reminder_sent"] is False
+
+    rows = asyncio.run(redis_db.get_user_reminders("u1", include_sent=True))
+    assert [row["id"] for row in rows] == ["m5", "m4"]
+
+
+def test_period_category_filter_with_limit(server):
+    """기간 × 카테고리는 카테고리 소속만 최신순으로, LIMIT까지만"""
+    async def run():
+        return (
+            await redis_db.get_memos_by_period("u1", "최근 3일", category="맛집"),
+            await redis_db.get_memos_by_period("u1", "all", limit=1, category="맛집"),
+        )
+
+    recent, limited = asyncio.run(run())
+    assert [m["id"] for m in recent] == ["m1", "m3"]
+    assert [m["id"] for m in limited] == ["m1"]
@@ -0,0 +1,88 @@
+"""메모 카드 테스트 (저장/수정/삭제 시 카드 유지, 목록은 카드만 조회, 카드 없는 메모 보충)"""
+import sys
+import os
+import json
+import asyncio
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.memo_cards import memo_card, is_card
+
+
+def test_memo_card_keeps_display_fields_only():
+    """본문/메타데이터는 빼고 제목/썸네일만, 카드에 다시 적용해도 그대로"""
+    memo = {
+        "id": "m1", "content": "긴 본문 " * 200, "summary": "파스타 맛집", "category": "맛집",
+        "created_at": "2026-10-19T10:00:00", "url": "https://example.com",
+        "metadata": {"title": "강남 파스타", "image": "https://example.com/a.jpg", "description": "x" * 500},
+    }
+    card = memo_card(memo)
+    assert is_card(card) and "metadata" not in card
+    assert card["title"] == "강남 파스타" and card["thumbnail"] == "https://example.com/a.jpg"
+    assert memo_card(card) is card
+
+
+import lib.redis_db as redis_db
+
+
+@pytest.fixture
+def server(upstash):
+    return upstash
+
+
+def _mget_keys(server):
+    return [key for args in server.calls if args[0] == "MGET" for key in args[1:]]
+
+
+def test_lists_read_cards_and_backfill_legacy(server):
+    """목록은 카드만 MGET, 카드 없는 예전 메모는 본문으로 카드를 만들어 저장"""
+    legacy = {"id": "old", "content": "예전 메모 본문", "summary": "예전 메모", "category": "기타",
+              "created_at": "2026-10-18T09:00:00"}
+    server.redis.set("memo:u1:old", json.dumps(legacy, ensure_ascii=False))
+    server.redis.zadd("user:u1:memos", {"old": time.time() - 60})
+
+    async def run():
+        memo_id = await redis_db.save_memo("u1", "강남 파스타 맛집 다녀옴", "text", "맛집", [], "강남 파스타")
+        first = await redis_db.get_period_page("u1", "today", 10, cards=True)
+        server.calls.clear()
+        second = await redis_db.get_period_page("u1", "today", 10, cards=True)
+        return memo_id, first, second
+
+    memo_id, (first, total), (second, _) = asyncio.run(run())
+    assert [card["id"] for card in first] == [memo_id, "old"] and total == 2
+    assert all(is_card(card) for card in first)
+    assert server.redis.exists("card:u1:old")
+    assert _mget_keys(server) == [f"card:u1:{memo_id}", "card:u1:old"]
+    assert second == first
+
+
+def test_cards_follow_update_metadata_and_delete(server):
+    """요약/메타데이터 수정은 카드에 반영, 삭제하면 카드도 제거"""
+    async def run():
+        memo_id = await redis_db.save_memo("u1", "https://example.com 링크", "url", "링크", [], "링크")
+        await redis_db.update_memo("u1", memo_id, summary="새 요약")
+        await redis_db.update_memo_metadata("u1", memo_id, {"url": "https://example.com", "title": "예제",
+                                                             "image": "https://example.com/t.png"})
+        card = json.loads(server.redis.get(f"card:u1:{memo_id}"))
+        await redis_db.delete_memo("u1", memo_id)
+        return memo_id, card
+
+    memo_id, card = asyncio.run(run())
+    assert card["summary"] == "새 요약" and card["title"] == "예제" and card["thumbnail"] == "https://example.com/t.png"
+    assert not server.redis.exists(f"card:u1:{memo_id}")
+
+
+def test_search_cards_collapse_with_card_signature(server):
+    """검색 매칭은 본문으로, 결과는 카드 - 비슷한 메모 접기도 카드의 simhash로"""
+    async def run():
+        for content in ["강남역 파스타 맛집 추천 리스트", "강남역 파스타 맛집 추천 리스트!!", "홍대 파스타 집 후기 메모"]:
+            await redis_db.save_memo("u1", content, "text", "맛집", [], content[:10])
+        return await redis_db.search_memos("u1", "파스타", cards=True)
+
+    results = asyncio.run(run())
+    assert all(is_card(card) for card in results)
+    assert [card.get("similar_count", 0) for card in results] == [0, 1]
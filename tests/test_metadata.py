@@ -0,0 +1,169 @@
+"""메타데이터 모듈 테스트 (네트워크 없이 실행)"""
+import sys
+import os
+import asyncio
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.metadata as metadata_module
+from lib.metadata import (
+    derive_offline_metadata,
+    enrich_urls,
+    merge_link_metadata,
+    merge_refreshed_links,
+    get_health_domain,
+    record_source_result,
+    should_skip_source,
+    get_source_timeout,
+    DEFAULT_SOURCE_TIMEOUTS,
+    MIN_SOURCE_TIMEOUT,
+    BACKOFF_BASE,
+    HEALTH_DECAY_HALF_LIFE,
+)
+
+
+def test_health_domain():
+    """www. 제거 + 소문자"""
+    assert get_health_domain("https://WWW.Coupang.com/vp/products/1") == "coupang.com"
+    assert get_health_domain("https://m.blog.naver.com/abc") == "m.blog.naver.com"
+
+
+def test_backoff_after_repeated_failures():
+    """연속 실패 시 지수 백오프, 성공하면 초기화"""
+    state = {}
+    now = 1_000_000.0
+
+    record_source_result(state, "oembed", False, 8000, now=now)
+    assert not should_skip_source(state, "oembed", now=now)
+
+    record_source_result(state, "oembed", False, 8000, now=now)
+    assert should_skip_source(state, "oembed", now=now + 1)
+    assert not should_skip_source(state, "oembed", now=now + BACKOFF_BASE + 1)
+
+    record_source_result(state, "oembed", False, 8000, now=now + BACKOFF_BASE + 1)
+    assert should_skip_source(state, "oembed", now=now + BACKOFF_BASE * 2)
+
+    record_source_result(state, "oembed", True, 300, now=now + BACKOFF_BASE * 3)
+    assert state["oembed"]["streak"] == 0
+    assert not should_skip_source(state, "oembed", now=now + BACKOFF_BASE * 3)
+
+
+def test_skip_on_alternating_failures():
+    """성공/실패가 번갈아 나와도 실패율이 높으면 실패 직후 스킵, 실패율이 감쇠하면 재개"""
+    state = {}
+    now = 1_000_000.0
+    for i in range(6):
+        record_source_result(state, "oembed", i % 2 == 1, 8000, now=now + i)
+    record_source_result(state, "oembed", False, 8000, now=now + 6)
+
+    assert state["oembed"]["streak"] == 1
+    assert should_skip_source(state, "oembed", now=now + 7)
+    assert not should_skip_source(state, "oembed", now=now + 6 + BACKOFF_BASE)
+
+    # 성공 직후에는 재시도 허용
+    record_source_result(state, "oembed", True, 300, now=now + 7)
+    assert not should_skip_source(state, "oembed", now=now + 8)
+
+    # 오래 지나 실패율이 감쇠하면 한 번의 실패로는 스킵하지 않음
+    later = now + 3 * HEALTH_DECAY_HALF_LIFE
+    record_source_result(state, "oembed", False, 8000, now=later)
+    assert not should_skip_source(state, "oembed", now=later + 1)
+
+
+def test_adaptive_timeout_from_percentiles():
+    """샘플이 충분하면 p95 기반으로 타임아웃 축소"""
+    state = {}
+    assert get_source_timeout(state, "direct") == DEFAULT_SOURCE_TIMEOUTS["direct"]
+
+    for latency in [400, 500, 450, 600, 550, 480]:
+        record_source_result(state, "direct", True, latency)
+
+    timeout = get_source_timeout(state, "direct")
+    assert MIN_SOURCE_TIMEOUT <= timeout < DEFAULT_SOURCE_TIMEOUTS["direct"]
+
+
+def test_enrich_urls_keeps_order_and_deadline(monkeypatch):
+    """동시 추출: 입력 순서 유지, 중복 제거, 마감 초과 URL은 폴백"""
+    async def fake_extract(url):
+        if "slow" in url:
+            await asyncio.sleep(5)
+        return {"title": f"T:{url}", "url": url}
+
+    monkeypatch.setattr(metadata_module, "extract_metadata", fake_extract)
+
+    urls = ["https://a.com/1", "https://slow.com/2", "https://a.com/1", "https://b.com/3"]
+    results = asyncio.run(enrich_urls(urls, concurrency=2, deadline=0.2))
+
+    assert [r["url"] for r in results] == ["https://a.com/1", "https://slow.com/2", "https://b.com/3"]
+    assert results[0]["title"] == "T:https://a.com/1"
+    assert results[1]["title"] == "Slow.com"  # 폴백 (도메인명)
+
+
+def test_offline_metadata_registry():
+    """지원 플랫폼은 URL만으로 제목/썸네일/타입 생성"""
+    yt = derive_offline_metadata("https://youtu.be/dQw4w9WgXcQ?si=abc")
+    assert yt["type"] == "youtube" and yt["video_id"] == "dQw4w9WgXcQ"
+    assert yt["thumbnail"] == "https://i.ytimg.com/vi/dQw4w9WgXcQ/hqdefault.jpg"
+    assert yt["source"] == "offline"
+
+    sp = derive_offline_metadata("https://open.spotify.com/intl-ko/album/4aawyAB9vmqN3uQ7FjRGTy")
+    assert sp["spotify_type"] == "album" and sp["title"] == "Spotify 앨범"
+
+    gh = derive_offline_metadata("https://github.com/encode/httpx/issues/1")
+    assert gh["title"] == "encode/httpx" and "opengraph.githubassets.com" in gh["thumbnail"]
+
+    nb = derive_offline_metadata("https://blog.naver.com/PostView.naver?blogId=foo&logNo=2233")
+    assert nb["blog_id"] == "foo" and nb["post_id"] == "2233"
+    assert derive_offline_metadata("https://blog.naver.com/foo/2233")["post_id"] == "2233"
+
+    assert derive_offline_metadata("https://place.map.kakao.com/12345")["place_id"] == "12345"
+    assert derive_offline_metadata("https://map.naver.com/p/entry/place/1234567")["place_id"] == "1234567"
+
+    # 오프라인으로 알 수 없는 URL
+    assert derive_offline_metadata("https://naver.me/xYz") is None
+    assert derive_offline_metadata("https://example.com/post") is None
+
+
+def test_enrich_urls_offline_first_skips_network(monkeypatch):
+    """offline_first=True면 지원 플랫폼 URL은 네트워크 호출 없음"""
+    called = []
+
+    async def fake_extract(url):
+        called.append(url)
+        return {"title": "net", "url": url, "source": "direct"}
+
+    monkeypatch.setattr(metadata_module, "extract_metadata", fake_extract)
+
+    urls = ["https://www.youtube.com/watch?v=abc123", "https://example.com/a"]
+    results = asyncio.run(enrich_urls(urls, offline_first=True))
+
+    assert called == ["https://example.com/a"]
+    assert results[0]["source"] == "offline"
+    assert results[1]["source"] == "direct"
+
+
+def test_merge_refreshed_links_keeps_entry_on_fallback():
+    """일부 링크만 폴백이면 그 링크는 기존(오프라인) 항목 유지, 나머지만 새 정보로"""
+    old = merge_link_metadata([
+        {"url": "https://www.youtube.com/watch?v=abc123", "title": "오프라인 제목", "source": "offline"},
+        {"url": "https://blog.naver.com/foo/2233", "title": "foo 블로그", "source": "offline"},
+    ])
+    fresh = [
+        {"url": "https://www.youtube.com/watch?v=abc123", "title": "네트워크 제목", "source": "oembed"},
+        {"url": "https://blog.naver.com/foo/2233", "title": "blog.naver.com", "source": "fallback"},
+    ]
+    merged = merge_refreshed_links(old, fresh)
+    assert merged["title"] == "네트워크 제목"
+    assert [(link["title"], link["source"]) for link in merged["links"]] == [
+        ("네트워크 제목", "oembed"), ("foo 블로그", "offline")]
+
+    assert [link.get("refresh_attempts") for link in merged["links"]] == [None, 1]
+
+    # 다음 병합에도 링크별 횟수 유지, 성공하면 새 항목으로 초기화
+    again = merge_refreshed_links(merged, fresh)
+    assert again["links"][1]["refresh_attempts"] == 2
+
+    single = {"url": "https://example.com/a", "title": "기존", "source": "direct"}
+    kept = merge_refreshed_links(single, [{"url": "https://example.com/a", "source": "fallback"}])
+    assert kept == {**single, "refresh_attempts": 1}
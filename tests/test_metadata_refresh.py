@@ -0,0 +1,129 @@
+"""메타데이터 갱신 작업 테스트 (링크별 백오프, 같은 실행 재처리 없음, 비교 후 교체, 인덱스 백필)"""
+import sys
+import os
+import json
+import asyncio
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.redis_db import metadata_refresh_due, METADATA_RETRY_BASE, METADATA_RETRY_MAX, METADATA_MAX_AGE
+
+
+def test_refresh_due_backs_off_per_link():
+    """재시도 안 한 폴백/오프라인 링크가 있으면 바로, 아니면 가장 적게 시도한 링크 기준 지수 백오프"""
+    def metadata(*attempts):
+        links = [{"url": f"https://a.com/{i}", "source": "fallback", "refresh_attempts": n}
+                 for i, n in enumerate(attempts)]
+        return {**links[0], "links": links + [{"url": "https://ok.com", "source": "direct"}]}
+
+    assert metadata_refresh_due(metadata(0, 3), now=0) == 0
+    assert metadata_refresh_due(metadata(1), now=0) == METADATA_RETRY_BASE
+    assert metadata_refresh_due(metadata(3, 2), now=0) == METADATA_RETRY_BASE * 2
+    assert metadata_refresh_due(metadata(20), now=0) == METADATA_RETRY_MAX
+    assert metadata_refresh_due({"url": "https://ok.com", "source": "direct"}, now=0) == METADATA_MAX_AGE
+    assert metadata_refresh_due({"title": "링크 없음"}, now=0) is None
+
+
+import lib.redis_db as redis_db
+import lib.jobs as jobs
+from lib.metadata import get_fallback_metadata, merge_link_metadata
+
+GOOD = "https://www.youtube.com/watch?v=abc123"
+BROKEN = "https://www.coupang.com/vp/products/1"
+
+
+@pytest.fixture
+def server(upstash):
+    return upstash
+
+
+def _save_link_memo(server):
+    """좋은 링크(오프라인) + 폴백 링크 메모 → 바로 갱신 대상"""
+    metadata = merge_link_metadata([
+        {"url": GOOD, "title": "오프라인 제목", "source": "offline"},
+        get_fallback_metadata(BROKEN),
+    ])
+    return asyncio.run(redis_db.save_memo("u1", f"{GOOD} {BROKEN}", "url", "링크", [], "오프라인 제목",
+                                          metadata=metadata))
+
+
+def _fake_enrich(monkeypatch, calls, during=None):
+    async def enrich_urls(urls, **kwargs):
+        calls.append(list(urls))
+        if during:
+            await during()
+        return [{"url": GOOD, "title": "네트워크 제목", "source": "oembed"} if url == GOOD
+                else get_fallback_metadata(url) for url in urls]
+    monkeypatch.setattr(jobs, "enrich_urls", enrich_urls)
+
+
+def test_partial_failure_is_rescheduled_after_run(server, monkeypatch):
+    """한 링크만 폴백이어도 같은 실행에서 다시 집지 않고, 그 링크만 재시도 횟수 증가 → 백오프 후 재예약"""
+    memo_id = _save_link_memo(server)
+    calls = []
+    _fake_enrich(monkeypatch, calls)
+
+    started = time.time()
+    result = asyncio.run(jobs.refresh_stale_metadata())
+    assert result["batches"] == 1 and len(calls) == 1 and result["updated"] == 1
+
+    memo = json.loads(server.redis.get(f"memo:u1:{memo_id}"))
+    assert memo["summary"] == "네트워크 제목"
+    assert [(link["source"], link.get("refresh_attempts")) for link in memo["metadata"]["links"]] == [
+        ("oembed", None), ("fallback", 1)]
+    score = server.redis.zscore("metadata:refresh", f"u1:{memo_id}")
+    assert score >= started + METADATA_RETRY_BASE - 5
+
+    # 다음 실행: 아직 예정 전이라 추출 없음
+    assert asyncio.run(jobs.refresh_stale_metadata())["batches"] == 0 and len(calls) == 1
+
+
+def test_refresh_patches_only_metadata_and_skips_deleted(server, monkeypatch):
+    """추출 중 사용자가 바꾼 카테고리/요약은 유지, 추출 중 삭제된 메모는 되살리지 않음"""
+    edited = _save_link_memo(server)
+    deleted = _save_link_memo(server)
+
+    async def during():
+        await redis_db.update_memo("u1", edited, summary="내가 쓴 요약", category="영상")
+        await redis_db.delete_memo("u1", deleted)
+
+    _fake_enrich(monkeypatch, [], during)
+    result = asyncio.run(jobs.refresh_stale_metadata())
+
+    memo = json.loads(server.redis.get(f"memo:u1:{edited}"))
+    assert memo["category"] == "영상" and memo["summary"] == "내가 쓴 요약"
+    assert memo["metadata"]["title"] == "네트워크 제목"
+    assert json.loads(server.redis.get(f"card:u1:{edited}"))["title"] == "네트워크 제목"
+
+    assert result["removed"] == 1
+    assert not server.redis.exists(f"memo:u1:{deleted}") and not server.redis.exists(f"card:u1:{deleted}")
+    assert server.redis.zscore("metadata:refresh", f"u1:{deleted}") is None
+
+
+def test_backfill_schedules_existing_link_memos_once(server):
+    """인덱스 도입 전 링크 메모를 등록 (폴백은 바로, 정상은 30일 후), 이미 예약된 메모는 그대로"""
+    now = time.time()
+    rows = {
+        "fb": {"url": BROKEN, **get_fallback_metadata(BROKEN)},
+        "ok": {"url": GOOD, "title": "x", "source": "oembed"},
+        "text": {},
+        "kept": {"url": BROKEN, "source": "fallback"},
+    }
+    for memo_id, metadata in rows.items():
+        server.redis.set(f"memo:u1:{memo_id}", json.dumps({"id": memo_id, "content": "", "metadata": metadata}))
+        server.redis.zadd("user:u1:memos", {memo_id: now})
+    server.redis.zadd("metadata:refresh", {"u1:kept": now + 999})
+
+    result = asyncio.run(jobs.backfill_metadata_refresh())
+    assert result["done"] and result["users"] == 1 and result["scheduled"] == 2
+    assert server.redis.zscore("metadata:refresh", "u1:fb") <= time.time()
+    assert server.redis.zscore("metadata:refresh", "u1:ok") >= now + METADATA_MAX_AGE
+    assert server.redis.zscore("metadata:refresh", "u1:text") is None
+    assert server.redis.zscore("metadata:refresh", "u1:kept") == now + 999
+
+    # 완료 후 다시 실행해도 추가 작업 없음
+    assert asyncio.run(jobs.backfill_metadata_refresh())["scheduled"] == 2
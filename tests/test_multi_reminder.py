@@ -0,0 +1,87 @@
+"""한 메모 여러 리마인더 테스트 (일정 분리, 저장/발송/목록)"""
+import sys
+import os
+import json
+import asyncio
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.redis_db as redis_db
+from lib.datetime_parser import extract_reminders, extract_reminder_info
+
+NOW = datetime(2026, 10, 19, 10, 30)   # 월요일
+
+
+def test_extract_each_schedule_with_its_text():
+    """쉼표/줄바꿈으로 나눈 일정마다 시각과 내용, 시각만 있으면 앞 날짜 이어받음"""
+    reminders = extract_reminders("월요일 3시 치과, 수요일 7시 저녁약속", now=NOW)
+    assert [(r["reminder_at"], r["reminder_text"]) for r in reminders] == [
+        (datetime(2026, 10, 19, 15, 0), "치과"),
+        (datetime(2026, 10, 21, 19, 0), "약속"),
+    ]
+
+    reminders = extract_reminders("치과: 내일 3시, 5시 미용실\n매달 25일 월세", now=NOW)
+    assert [r["reminder_at"] for r in reminders] == [
+        datetime(2026, 10, 20, 15, 0), datetime(2026, 10, 20, 17, 0), datetime(2026, 10, 25, 9, 0),
+    ]
+    assert [r["reminder_text"] for r in reminders] == ["치과", "미용실", "월세"]
+    assert reminders[2]["recurrence"]["freq"] == "monthly"
+
+    reminders = extract_reminders("내일 3시 회의, 그리고 5시 미용실", now=NOW)
+    assert [(r["reminder_at"], r["reminder_text"]) for r in reminders] == [
+        (datetime(2026, 10, 20, 15, 0), "회의"),
+        (datetime(2026, 10, 20, 17, 0), "미용실"),
+    ]
+
+
+def test_single_schedule_matches_extract_reminder_info():
+    """일정이 하나면 설명 조각이 붙어도 기존 단일 추출과 같음, URL 안 쉼표는 구분자 아님"""
+    for text in ["내일 3시, 회의실 예약", "보고서 정리, 금요일까지", "읽기 https://a.com/x,y 내일"]:
+        assert extract_reminders(text, now=NOW) == [extract_reminder_info(text, now=NOW)]
+    assert extract_reminders("장보기, 빨래", now=NOW) == []
+
+
+def test_save_send_and_list(monkeypatch):
+    """일정마다 pending 항목 (트랜잭션 1번), 발송은 해당 일정만, 목록은 일정마다 한 줄"""
+    store = {}
+    calls = []
+
+    async def fake_command(*args):
+        assert args[0] == "GET"
+        return store.get(args[1])
+
+    async def fake_transaction(commands):
+        calls.append(commands)
+        for command in commands:
+            if command[0] == "SET":
+                store[command[1]] = command[2]
+        return ["OK"] * len(commands)
+
+    async def fake_reminder_memos(user_id, include_sent=False, limit=50):
+        return [json.loads(value) for value in store.values()]
+
+    monkeypatch.setattr(redis_db, "redis_command", fake_command)
+    monkeypatch.setattr(redis_db, "redis_transaction", fake_transaction)
+    monkeypatch.setattr(redis_db, "get_reminder_memos", fake_reminder_memos)
+
+    reminders = extract_reminders("월요일 3시 치과, 수요일 7시 저녁약속", now=NOW)
+
+    async def run():
+        memo_id = await redis_db.save_memo(
+            "u1", "월요일 3시 치과, 수요일 7시 저녁약속", "text", "할일", [], "치과 · 약속",
+            reminder_at=reminders[0]["reminder_at"], reminders=reminders,
+        )
+        await redis_db.mark_reminder_sent("u1", memo_id, 1)
+        return memo_id, await redis_db.get_user_reminders("u1")
+
+    memo_id, rows = asyncio.run(run())
+    pending = [command[3] for command in calls[0] if command[:2] == ["ZADD", "reminders:pending"]]
+    assert pending == [f"u1:{memo_id}", f"u1:{memo_id}:1"]
+    assert calls[1][1] == ["ZREM", "reminders:pending", f"u1:{memo_id}:1"]
+
+    memo = json.loads(store[f"memo:u1:{memo_id}"])
+    assert [entry["sent"] for entry in memo["reminders"]] == [False, True]
+    assert memo["reminder_sent"] is False
+    assert [(row["summary"], row["reminder_index"]) for row in rows] == [("치과", 0)]
@@ -0,0 +1,96 @@
+"""기간 엔진 테스트 (자연어 기간 → 달력 범위 → 점수 범위, LIMIT 푸시다운, 명령 분류)"""
+import sys
+import os
+import json
+import asyncio
+from datetime import date, datetime, timezone
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.redis_db as redis_db
+from lib.periods import parse_period, resolve_period, period_scores, score_range_args
+from lib.classifier import fast_rule_classify
+
+TODAY = date(2026, 10, 19)   # 월요일
+
+
+def _range(text, today=TODAY):
+    period = parse_period(text, today)
+    return period and (period["start"], period["end"])
+
+
+def test_parse_calendar_ranges():
+    """기본 키는 달력 기준, 자연어 기간은 띄어쓰기 무시"""
+    assert _range("week") == (date(2026, 10, 19), date(2026, 10, 19))
+    assert _range("지난 주") == (date(2026, 10, 12), date(2026, 10, 18))
+    assert _range("last_month") == (date(2026, 9, 1), date(2026, 9, 30))
+    assert _range("3월") == (date(2026, 3, 1), date(2026, 3, 31))
+    assert _range("12월") == (date(2025, 12, 1), date(2025, 12, 31))        # 미래 달은 작년
+    assert _range("2024년 2월") == (date(2024, 2, 1), date(2024, 2, 29))
+    assert _range("3월 5일") == (date(2026, 3, 5), date(2026, 3, 5))
+    assert _range("지난 금요일") == (date(2026, 10, 16), date(2026, 10, 16))
+    assert _range("지난 월요일") == (date(2026, 10, 12), date(2026, 10, 12))
+    assert _range("2주 전") == (date(2026, 10, 5), date(2026, 10, 11))
+    assert _range("3일전") == (date(2026, 10, 16), date(2026, 10, 16))
+    assert _range("1달 전", date(2026, 3, 31)) == (date(2026, 2, 1), date(2026, 2, 28))
+    assert _range("최근 10일") == (date(2026, 10, 10), date(2026, 10, 19))
+    assert _range("작년") == (date(2025, 1, 1), date(2025, 12, 31))
+
+    assert parse_period("지난 금요일", TODAY)["key"] == "지난금요일"
+    assert parse_period("이번 주", TODAY)["key"] == "week"
+    assert parse_period("2월 30일", TODAY) is None
+    assert parse_period("파스타", TODAY) is None
+    assert resolve_period("파스타", TODAY)["key"] == "week"
+
+
+def test_score_bounds_are_local_midnights():
+    """[시작 자정, 끝 다음날 자정) - 끝은 제외 구간으로 Redis에 전달"""
+    march = parse_period("3월", TODAY)
+    start, end = period_scores(march, "Asia/Seoul")
+    assert datetime.fromtimestamp(start, timezone.utc) == datetime(2026, 2, 28, 15, 0, tzinfo=timezone.utc)
+    assert datetime.fromtimestamp(end, timezone.utc) == datetime(2026, 3, 31, 15, 0, tzinfo=timezone.utc)
+    assert score_range_args(march, "Asia/Seoul") == (str(start), f"({end}")
+
+
+def test_period_queries_push_limit_to_redis(monkeypatch):
+    """정리 첫 화면은 ZCOUNT + LIMIT 조회를 파이프라인 1번, MGET은 가져온 ID만"""
+    commands = []
+    memos = {f"m{i}": {"id": f"m{i}", "summary": str(i)} for i in range(3)}
+
+    async def fake_command(*args):
+        commands.append(list(args))
+        if args[0] == "MGET":
+            return [json.dumps(memos[key.split(":")[-1]]) for key in args[1:]]
+        return list(memos)
+
+    async def fake_pipeline(batch):
+        commands.extend(batch)
+        return [25, ["m0", "m1"]]
+
+    monkeypatch.setattr(redis_db, "redis_command", fake_command)
+    monkeypatch.setattr(redis_db, "redis_pipeline", fake_pipeline)
+
+    async def run():
+        page = await redis_db.get_period_page("u1", "지난 금요일", 2)
+        everything = await redis_db.get_memos_by_period("u1", "3월")
+        return page, everything
+
+    (page, total), everything = asyncio.run(run())
+    assert [m["id"] for m in page] == ["m0", "m1"] and total == 25
+    zcount, zrange, mget, unlimited, _ = commands
+    assert zcount[0] == "ZCOUNT" and zrange[-3:] == ["LIMIT", 0, 2]
+    assert zrange[2].startswith("(") and zcount[2] == zrange[3]
+    assert mget == ["MGET", "memo:u1:m0", "memo:u1:m1"]
+    assert "LIMIT" not in unlimited and len(everything) == 3
+
+
+def test_custom_period_commands():
+    """명령 테이블에 없는 기간 표현도 정리/요약/전체보기 명령 (기간이 아니면 저장)"""
+    assert fast_rule_classify("3월 정리") == {"intent": "summary", "confidence": 1.0, "period": "3월"}
+    assert fast_rule_classify("지난 금요일 맛집 보여줘") == {
+        "intent": "summary", "confidence": 1.0, "period": "지난금요일", "category": "맛집"}
+    assert fast_rule_classify("2주 전 요약해줘")["period"] == "2주전"
+    assert fast_rule_classify("전체보기 3월")["show_all"] is True
+    assert fast_rule_classify("내일 3시 회의 정리")["intent"] == "save"
+    assert fast_rule_classify("3월 삭제") == {"intent": "delete", "confidence": 1.0, "keyword": "3월"}
@@ -0,0 +1,101 @@
+"""쿼리 플래너 테스트 (검색 문장 파싱, 인덱스 선택, fakeredis로 교집합/Lua 최종 페이지 실행)"""
+import sys
+import os
+import json
+import asyncio
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.query_planner import parse_query, is_structured, plan_query, query_memos, format_explain
+
+
+def test_parse_query():
+    """기간(여러 단어)/카테고리/태그를 떼고 나머지는 키워드"""
+    assert parse_query("지난주 맛집 강남") == {"period": "last_week", "category": "맛집", "tag": None, "keyword": "강남"}
+    assert parse_query("지난 금요일 #데이트 파스타 집") == {
+        "period": "지난금요일", "category": None, "tag": "데이트", "keyword": "파스타 집"}
+    assert parse_query("2025년 3월 5일 회의")["period"] == "2025년3월5일"
+    assert not is_structured(parse_query("맛집"))
+    assert not is_structured(parse_query("강남 파스타"))
+    assert is_structured(parse_query("맛집 강남"))
+
+
+def test_plan_picks_smallest_index():
+    """SET이 작으면 교집합, 시간 범위가 작으면 범위를 훑으며 소속 확인, 0이면 바로 빈 결과"""
+    def indexes(range_size, set_size):
+        return [{"index": "time", "key": "z", "kind": "range", "estimate": range_size},
+                {"index": "category:맛집", "key": "s", "kind": "set", "estimate": set_size}]
+
+    plan = plan_query(indexes(500, 8), ["keyword"])
+    assert plan["strategy"] == "intersect" and plan["intersect"] == ["s"] and plan["member_keys"] == []
+    plan = plan_query(indexes(3, 400), [])
+    assert plan["strategy"] == "range" and plan["member_keys"] == ["s"]
+    assert plan_query(indexes(0, 400), [])["strategy"] == "empty"
+
+
+DAY = 86400
+
+
+@pytest.fixture
+def server(upstash):
+    server = upstash
+    now = time.time()
+    rows = [
+        ("m1", "강남 파스타", "맛집", 0, ["데이트"]),
+        ("m2", "강남 카페", "맛집", 1, []),
+        ("m3", "홍대 라멘", "맛집", 1, []),
+        ("m4", "강남역 회의", "할일", 1, []),
+        ("m5", "강남 국밥", "맛집", 40, []),
+    ] + [(f"v{i}", f"영상 {i}", "영상", 2, []) for i in range(20)]
+    for memo_id, content, category, age, tags in rows:
+        memo = {"id": memo_id, "content": content, "summary": content, "category": category, "tags": tags}
+        server.redis.set(f"memo:u1:{memo_id}", json.dumps(memo, ensure_ascii=False))
+        server.redis.zadd("user:u1:memos", {memo_id: now - age * DAY - 60})
+        server.redis.sadd(f"user:u1:category:{category}", memo_id)
+    return server
+
+
+def test_intersect_then_filter_final_page(server):
+    """카테고리(5) < 기간(24): 임시 키 교집합(TTL) → Lua가 키워드 매칭 수와 페이지만 반환"""
+    result = asyncio.run(query_memos("u1", period="최근 7일", category="맛집", keyword="강남", limit=1, explain=True))
+    assert [m["id"] for m in result["memos"]] == ["m1"] and result["total"] == 2
+
+    report = result["explain"]
+    assert report["strategy"] == "intersect" and report["driver"] == "category:맛집"
+    assert 0 < server.redis.ttl(report["temp_key"]) <= 30
+    assert "MGET" not in server.commands
+    assert "intersect" in format_explain(report)
+
+    page = asyncio.run(query_memos("u1", period="최근 7일", category="맛집", keyword="강남", limit=1, offset=1))
+    assert [m["id"] for m in page["memos"]] == ["m2"]
+
+
+def test_range_driver_and_plain_page(server):
+    """기간이 더 좁으면 교집합 없이 범위에서 소속 확인, 남은 조건이 없으면 LIMIT 조회 + MGET"""
+    assert asyncio.run(query_memos("u1", category="음악", keyword="x", explain=True))["explain"]["strategy"] == "empty"
+
+    result = asyncio.run(query_memos("u1", period="최근 2일", category="할일", explain=True))
+    assert result["explain"]["strategy"] == "intersect" and [m["id"] for m in result["memos"]] == ["m4"]
+
+    server.calls.clear()
+    result = asyncio.run(query_memos("u1", period="오늘", category="영상", explain=True))
+    assert result["explain"]["strategy"] == "range" and result["explain"]["member_keys"] == ["user:u1:category:영상"]
+    assert result["total"] == 0 and "ZINTERSTORE" not in server.commands
+
+    result = asyncio.run(query_memos("u1", period="최근 7일", limit=3))
+    assert result["total"] == 24 and [m["id"] for m in result["memos"]][:1] == ["m1"]
+
+
+def test_service_search_routes_combined_filters(server):
+    """"지난주 맛집 강남"류 검색은 플래너, 키워드만이면 기존 검색"""
+    from lib.memo_service import service_search
+
+    result = asyncio.run(service_search("u1", "맛집 강남 #데이트"))
+    assert [m["id"] for m in result["memos"]] == ["m1"] and result["filters"]["tag"] == "데이트"
+
+    result = asyncio.run(service_search("u1", "라멘"))
+    assert "filters" not in result and [m["id"] for m in result["memos"]] == ["m3"]
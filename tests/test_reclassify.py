@@ -0,0 +1,94 @@
+"""백로그 재분류 작업 테스트 (같은 score 이어서 처리, 빠진 메모 재시도, 직접 지정 제외, 다음 바퀴, 페이지별 상태 저장)"""
+import sys
+import os
+import json
+import asyncio
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.jobs as jobs
+
+
+@pytest.fixture
+def server(upstash, monkeypatch):
+    monkeypatch.setattr(jobs, "RECLASSIFY_PAGE_SIZE", 2)
+    return upstash
+
+
+def _add(server, memo_id, score, **fields):
+    memo = {"id": memo_id, "content": f"{memo_id} 내용", "category": "첫단어", "tags": [], **fields}
+    server.redis.set(f"memo:u1:{memo_id}", json.dumps(memo, ensure_ascii=False))
+    server.redis.zadd("user:u1:memos", {memo_id: score})
+
+
+def _memo(server, memo_id):
+    return json.loads(server.redis.get(f"memo:u1:{memo_id}"))
+
+
+def _fake_classify(monkeypatch, calls, omit=()):
+    """omit: 첫 요청에서 응답에 빠뜨릴 메모"""
+    async def classify_memos_batch(items):
+        calls.append([item["id"] for item in items])
+        first = len(calls) == 1
+        return {item["id"]: {"category": "맛집", "tags": ["t"]}
+                for item in items if not (first and item["id"] in omit)}, 100
+    monkeypatch.setattr(jobs, "classify_memos_batch", classify_memos_batch)
+
+
+def test_ties_explicit_and_omitted_memos(server, monkeypatch):
+    """같은 score가 페이지 경계에 걸려도 빠짐없이, 직접 지정 카테고리는 건너뛰고, 응답에서 빠진 메모는 재시도"""
+    for memo_id in ["a1", "a2", "a3"]:
+        _add(server, memo_id, 100)
+    _add(server, "b1", 200, category="건축사", category_source="explicit")
+    _add(server, "b2", 200)
+    calls = []
+    _fake_classify(monkeypatch, calls, omit={"a2"})
+
+    result = asyncio.run(jobs.reclassify_backlog(user_id="u1"))
+    assert result["stopped"] == "done" and result["failed"] == 0
+    assert calls[0] == ["a1", "a2"] and calls[1][0] == "a2"
+    assert sorted(m for batch in calls for m in batch) == ["a1", "a2", "a2", "a3", "b2"]
+    for memo_id in ["a1", "a2", "a3", "b2"]:
+        memo = _memo(server, memo_id)
+        assert memo["category"] == "맛집" and memo["category_source"] == "ai"
+    assert _memo(server, "b1")["category"] == "건축사"
+
+
+def test_next_pass_picks_up_new_memos(server, monkeypatch):
+    """끝난 뒤에도 다음 실행은 새로 저장된 메모를 처리 (이전 바퀴 시작 이후만 훑음)"""
+    _add(server, "old", time.time() - 3600)
+    calls = []
+    _fake_classify(monkeypatch, calls)
+    assert asyncio.run(jobs.reclassify_backlog(user_id="u1"))["stopped"] == "done"
+
+    _add(server, "new", time.time())
+    result = asyncio.run(jobs.reclassify_backlog(user_id="u1"))
+    assert result["stopped"] == "done" and calls == [["old"], ["new"]]
+    assert result["scanned"] == 1
+
+
+def test_state_is_saved_per_page(server, monkeypatch):
+    """실행 중 중단돼도 반영한 페이지는 다음 실행에서 다시 분류하지 않음"""
+    for i in range(4):
+        _add(server, f"m{i}", 100 + i)
+    calls = []
+
+    async def classify_memos_batch(items):
+        calls.append([item["id"] for item in items])
+        if len(calls) == 2:
+            raise RuntimeError("crash")
+        return {item["id"]: {"category": "맛집", "tags": ["t"]} for item in items}, 100
+    monkeypatch.setattr(jobs, "classify_memos_batch", classify_memos_batch)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(jobs.reclassify_backlog(user_id="u1"))
+    progress = asyncio.run(jobs.get_reclassify_progress("u1"))
+    assert progress["last_id"] == "m1" and progress["updated"] == 2
+
+    _fake_classify(monkeypatch, calls)
+    asyncio.run(jobs.reclassify_backlog(user_id="u1"))
+    assert calls[2:] == [["m2"], ["m3"]]
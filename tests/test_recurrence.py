@@ -0,0 +1,124 @@
+"""반복 리마인더 테스트 (규칙 파싱, 다음 회차 계산, 발송 후 재등록)"""
+import sys
+import os
+import json
+import asyncio
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.redis_db as redis_db
+from lib.datetime_parser import (
+    extract_reminder_info, parse_recurrence, next_occurrence, format_recurrence, is_recurring_todo
+)
+
+NOW = datetime(2026, 10, 19, 10, 30)   # 월요일
+
+
+def test_parse_recurrence_rules():
+    """매일/매주/매달 규칙, 시각·요일·날짜가 없으면 반복 아님"""
+    assert parse_recurrence("매주 월요일 9시 회의", NOW) == {"freq": "weekly", "weekday": 0, "hour": 9, "minute": 0}
+    assert parse_recurrence("매일 아침 8시 약", NOW) == {"freq": "daily", "hour": 8, "minute": 0}
+    assert parse_recurrence("매달 25일 월세", NOW) == {"freq": "monthly", "day": 25, "hour": 9, "minute": 0}
+    assert parse_recurrence("매주 금 저녁 7시 반 운동", NOW)["weekday"] == 4
+    assert parse_recurrence("매월 1일 오후 2시 관리비", NOW) == {"freq": "monthly", "day": 1, "hour": 14, "minute": 0}
+    assert parse_recurrence("매일 운동하기", NOW) is None
+    assert parse_recurrence("내일 3시 회의", NOW) is None
+
+    info = extract_reminder_info("매주 월요일 9시 회의", now=NOW)
+    assert info["reminder_at"] == datetime(2026, 10, 26, 9, 0)   # 오늘 9시는 지남
+    assert info["reminder_text"] == "회의"
+    assert format_recurrence(info["recurrence"]) == "매주 월요일 오전 9시"
+
+
+def test_next_occurrence():
+    """다음 회차는 항상 after 이후, 없는 날짜는 말일"""
+    daily = {"freq": "daily", "hour": 8, "minute": 0}
+    assert next_occurrence(daily, datetime(2026, 10, 19, 7, 0)) == datetime(2026, 10, 19, 8, 0)
+    assert next_occurrence(daily, datetime(2026, 10, 19, 8, 0)) == datetime(2026, 10, 20, 8, 0)
+
+    weekly = {"freq": "weekly", "weekday": 4, "hour": 19, "minute": 30}
+    assert next_occurrence(weekly, NOW) == datetime(2026, 10, 23, 19, 30)
+    assert next_occurrence(weekly, datetime(2026, 10, 23, 19, 30)) == datetime(2026, 10, 30, 19, 30)
+
+    monthly = {"freq": "monthly", "day": 31, "hour": 9, "minute": 0}
+    assert next_occurrence(monthly, datetime(2026, 10, 31, 9, 0)) == datetime(2026, 11, 30, 9, 0)
+    assert next_occurrence(monthly, datetime(2027, 1, 31, 10, 0)) == datetime(2027, 2, 28, 9, 0)
+    assert next_occurrence(monthly, datetime(2026, 12, 31, 9, 0)) == datetime(2027, 1, 31, 9, 0)
+
+
+def test_mark_sent_reschedules_in_one_transaction(monkeypatch):
+    """반복 리마인더는 같은 pending 멤버의 score만 다음 회차로, 일회성은 제거"""
+    store = {
+        "memo:u1:m1": json.dumps({
+            "id": "m1", "reminder_at": "2026-10-19T09:00:00", "reminder_sent": False,
+            "recurrence": {"freq": "daily", "hour": 9, "minute": 0},
+        }),
+        "memo:u1:m2": json.dumps({"id": "m2", "reminder_at": "2026-10-19T09:00:00", "reminder_sent": False}),
+    }
+    transactions = []
+
+    async def fake_command(*args):
+        assert args[0] == "GET"
+        return store.get(args[1])
+
+    async def fake_transaction(commands):
+        transactions.append(commands)
+        for command in commands:
+            if command[0] == "SET":
+                store[command[1]] = command[2]
+        return ["OK"] * len(commands)
+
+    monkeypatch.setattr(redis_db, "redis_command", fake_command)
+    monkeypatch.setattr(redis_db, "redis_transaction", fake_transaction)
+
+    async def run():
+        await redis_db.mark_reminder_sent("u1", "m1")
+        await redis_db.mark_reminder_sent("u1", "m2")
+
+    asyncio.run(run())
+    recurring, one_shot = transactions
+    assert recurring[1][:2] == ["ZADD", "reminders:pending"] and recurring[1][3] == "u1:m1"
+    memo = json.loads(store["memo:u1:m1"])
+    assert memo["reminder_sent"] is False
+    assert datetime.fromisoformat(memo["reminder_at"]).timestamp() > datetime.now().timestamp()
+    assert recurring[1][2] == datetime.fromisoformat(memo["reminder_at"]).timestamp()
+
+    assert one_shot[1] == ["ZREM", "reminders:pending", "u1:m2"]
+    assert json.loads(store["memo:u1:m2"])["reminder_sent"] is True
+
+
+def test_recurring_phrase_alone_is_not_a_todo(monkeypatch):
+    """반복 표현만 있는 가게 정보는 할일/반복 리마인더로 바꾸지 않음 (시각 + 할일 단서 필요)"""
+    import lib.memo_service as memo_service
+
+    assert is_recurring_todo("매주 월요일 9시 회의")
+    assert not is_recurring_todo("강남 파스타집 매주 월요일 휴무")
+    assert not is_recurring_todo("매일 10시 오픈하는 빵집")
+
+    saved = []
+
+    async def save_memo(**kwargs):
+        saved.append(kwargs)
+        return "m1"
+
+    async def classify_category(content, use_ai=False, user_id=None):
+        return content.split()[0], "rule"
+
+    monkeypatch.setattr(memo_service, "save_memo", save_memo)
+    async def learn_category(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(memo_service, "classify_category", classify_category)
+    monkeypatch.setattr(memo_service, "learn_category", learn_category)
+
+    for content in ["강남 파스타집 매주 월요일 휴무", "매일 10시 오픈하는 빵집", "매주 월요일 9시 회의"]:
+        asyncio.run(memo_service._save_memo("u1", content, None, None, None, False, False))
+    assert [(m["category"], bool(m["recurrence"])) for m in saved] == [
+        ("강남", False), ("매일", False), ("할일", True),
+    ]
+
+    # 분류가 할일이면 시각 없는 반복도 리마인더
+    asyncio.run(memo_service._save_memo("u1", "매달 25일 월세", "할일", None, None, False, False))
+    assert saved[-1]["recurrence"]["day"] == 25
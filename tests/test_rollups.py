@@ -0,0 +1,112 @@
+"""일/월 집계 테스트 (증분 유지, 기간 키 선택, 재계산 전 스캔 응답, 크론 재계산이 전체 메모 계산과 같은지)"""
+import sys
+import os
+import json
+import asyncio
+from collections import Counter
+from datetime import date
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import lib.redis_db as redis_db
+import lib.rollups as rollups
+from lib.rollups import (
+    rollup_commands, rollup_change_commands, rollup_keys_for_range, period_day_range,
+    rollup_fields, merge_rollups, get_period_rollup,
+)
+
+TODAY = date(2026, 10, 19)
+
+
+def _memo(memo_id, day, category, url=None, tags=()):
+    return {"id": memo_id, "day": day, "category": category, "url": url, "tags": list(tags)}
+
+
+MEMOS = [
+    _memo("m1", "2026-10-19", "맛집", tags=["강남"]),
+    _memo("m2", "2026-10-18", "영상", url="https://youtu.be/x", tags=["강남", "요리"]),
+    _memo("m3", "2026-10-12", "맛집"),
+    _memo("m4", "2026-09-02", "할일"),
+    _memo("m5", "2025-11-30", "학습", url="https://a.com"),
+    _memo("m6", "2025-10-10", "기타"),      # 1년 밖
+]
+
+
+def test_increment_and_change_commands():
+    """저장/삭제는 상쇄, 수정은 바뀐 카테고리/태그만 일/월 해시에 반영"""
+    net = Counter()
+    for command in rollup_commands("u1", MEMOS[1]) + rollup_commands("u1", MEMOS[1], sign=-1):
+        if command[0] == "HINCRBY":
+            net[(command[1], command[2])] += command[3]
+    assert net and all(amount == 0 for amount in net.values())
+
+    old = MEMOS[0]
+    new = {**old, "category": "카페", "tags": ["강남", "디저트"]}
+    changed = {(c[2], c[3]) for c in rollup_change_commands("u1", old, new) if c[0] == "HINCRBY"}
+    assert changed == {("cat:맛집", -1), ("cat:카페", 1), ("tag:디저트", 1)}
+
+
+def test_period_keys_use_months_when_covered():
+    """전체(365일)는 달 12개 + 가장자리 날짜만, 오늘이 속한 달은 오늘까지면 월 해시, 지난달은 월 해시 1개"""
+    start, end = period_day_range("all", TODAY)
+    keys = rollup_keys_for_range("u1", start, end, TODAY)
+    months = [k for k in keys if ":month:" in k]
+    assert len(months) == 12 and months[-1].endswith("2026-10")
+    assert len(keys) - len(months) == 12          # 2025-10-20 ~ 2025-10-31
+    last_week = rollup_keys_for_range("u1", *period_day_range("last_week", TODAY), TODAY)
+    assert last_week == [f"user:u1:rollup:day:2026-10-{d}" for d in range(12, 19)]
+    last_month = rollup_keys_for_range("u1", *period_day_range("last_month", TODAY), TODAY)
+    assert last_month == ["user:u1:rollup:month:2026-09"]
+
+
+def test_rollup_matches_full_scan(upstash, monkeypatch):
+    """집계 이전 메모가 있으면 기간 메모로 응답하고 대기열 등록, 크론 재계산 후 증분 저장과 합쳐도 전체 메모 계산과 같음"""
+    import lib.jobs as jobs
+
+    for index, memo in enumerate(MEMOS):
+        upstash.redis.set(f"memo:u1:{memo['id']}", json.dumps(memo, ensure_ascii=False))
+        upstash.redis.zadd("user:u1:memos", {memo["id"]: index})
+
+    async def get_memos_by_period(user_id, period):
+        start, end = period_day_range(period, TODAY)
+        return [m for m in MEMOS if start <= date.fromisoformat(m["day"]) <= end]
+
+    monkeypatch.setattr(redis_db, "get_memos_by_period", get_memos_by_period)
+
+    class _Now:
+        def date(self):
+            return TODAY
+
+    monkeypatch.setattr(rollups, "local_now", lambda tz=None: _Now())
+
+    def expected(period):
+        start, end = period_day_range(period, TODAY)
+        return merge_rollups([
+            rollup_fields(m) for m in MEMOS if start <= date.fromisoformat(m["day"]) <= end
+        ])
+
+    async def run():
+        results = {"all_before": await get_period_rollup("u1", "all")}
+        results["queued"] = upstash.redis.smembers(rollups.ROLLUP_REBUILD_QUEUE)
+        results["job"] = await jobs.rebuild_pending_indexes()
+        added = _memo("m7", "2026-10-19", "맛집", tags=["강남"])
+        MEMOS.append(added)
+        await upstash.pipeline(rollup_commands("u1", added))
+        for period in ("today", "week", "last_week", "month", "all"):
+            results[period] = await get_period_rollup("u1", period)
+        MEMOS.pop()
+        return results
+
+    results = asyncio.run(run())
+    assert results["all_before"] == expected("all") and results["all_before"]["total"] == 5
+    assert results["queued"] == {"u1"} and results["job"]["rollups"]["rebuilt"] == 1
+    assert upstash.redis.get("user:u1:rollup:ready") == "1" and not upstash.redis.smembers(rollups.ROLLUP_REBUILD_QUEUE)
+    MEMOS.append(_memo("m7", "2026-10-19", "맛집", tags=["강남"]))
+    try:
+        for period in ("today", "week", "last_week", "month", "all"):
+            assert results[period] == expected(period), period
+    finally:
+        MEMOS.pop()
+    assert results["today"]["categories"] == {"맛집": 2}
+    assert results["all"]["tags"]["강남"] == 3
@@ -0,0 +1,125 @@
+"""비슷한 메모(SimHash) 테스트 (네트워크 없이 실행)"""
+import sys
+import os
+import random
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.simhash import (
+    simhash, hamming, signature_bands, group_similar, collapse_similar,
+    simhash_index_commands, SIMILAR_MAX_DISTANCE,
+)
+from lib.classifier import fast_rule_classify
+
+NEAR_DUPLICATES = [
+    ("강남역 맛집 리스트: 을지로 파스타, 신논현 라멘, 역삼 국밥", "강남역 맛집 리스트 - 을지로 파스타, 신논현 라멘, 역삼 국밥!"),
+    ("[Web발신] 내일 오후 3시 팀 회의 자료 준비해서 공유 부탁드립니다", "내일 오후 3시 팀 회의 자료 준비해서 공유 부탁드립니다"),
+    ("강남역 맛집 추천 받은 곳 정리", "강남역 맛집 추천받은 곳 정리함"),
+]
+DIFFERENT = [
+    ("강남역 맛집 추천 받은 곳 정리", "강남역 카페 추천 받은 곳 정리"),
+    ("파이썬 비동기 강의 듣기", "자바스크립트 비동기 강의 듣기"),
+    ("내일 장보기 우유 계란 두부", "내일 회의 자료 준비하기"),
+]
+
+
+def test_near_duplicates_within_threshold():
+    """문장부호/띄어쓰기/전달 머리말 차이는 가깝고, 주제만 같은 메모는 멂"""
+    for left, right in NEAR_DUPLICATES:
+        assert hamming(simhash(left), simhash(right)) <= SIMILAR_MAX_DISTANCE, (left, right)
+    for left, right in DIFFERENT:
+        assert hamming(simhash(left), simhash(right)) > SIMILAR_MAX_DISTANCE, (left, right)
+    assert simhash("우유") is None                      # 너무 짧으면 시그니처 없음
+    assert simhash("https://example.com/a") is None     # 링크만 있는 메모 제외
+
+
+def test_band_index_never_misses_within_threshold():
+    """거리 ≤ 임계값이면 최소 한 밴드가 같음 (비둘기집)"""
+    rng = random.Random(7)
+    for _ in range(500):
+        signature = rng.getrandbits(64)
+        flipped = signature
+        for bit in rng.sample(range(64), SIMILAR_MAX_DISTANCE):
+            flipped ^= 1 << bit
+        shared = [a == b for a, b in zip(signature_bands(signature), signature_bands(flipped))]
+        assert any(shared)
+
+    commands = simhash_index_commands("u1", "m1", NEAR_DUPLICATES[0][0])
+    assert len(commands) == 8 and all(c[0] == "SADD" and c[2].startswith("m1:") for c in commands)
+
+
+def test_group_and_collapse():
+    """비슷한 메모끼리 묶고, 접을 때는 먼저 나온 메모가 대표"""
+    memos = [
+        {"id": "a", "content": NEAR_DUPLICATES[0][0]},
+        {"id": "b", "content": "파이썬 비동기 강의 듣기"},
+        {"id": "c", "content": NEAR_DUPLICATES[0][1]},
+        {"id": "d", "content": "우유"},
+    ]
+    groups = group_similar(memos)
+    assert [[m["id"] for m in group] for group in groups] == [["a", "c"], ["b"], ["d"]]
+
+    collapsed = collapse_similar(memos)
+    assert [m["id"] for m in collapsed] == ["a", "b", "d"]
+    assert collapsed[0]["similar_count"] == 1 and "similar_count" not in memos[0]
+
+
+def test_similar_commands_need_memo_id():
+    """'비슷한'/'합치기'는 메모 ID가 있을 때만 명령 (일반 메모 보호)"""
+    memo_id = "478993e4-6f66-4a88-8208-48e630630c97"
+    assert fast_rule_classify("비슷한 메모")["intent"] == "similar"
+    assert fast_rule_classify(f"비슷한 {memo_id}")["memo_id"] == memo_id
+    assert fast_rule_classify("비슷한 #478993e4")["short_id"] == "478993e4"
+    assert fast_rule_classify(f"합치기 {memo_id}")["intent"] == "merge_similar"
+    assert fast_rule_classify("비슷한 느낌의 카페")["intent"] == "save"
+    assert fast_rule_classify("합치기 전에 확인")["intent"] == "save"
+
+
+def test_merge_by_short_id(upstash):
+    """"합치기 #짧은ID"도 기준 메모를 찾아 합침"""
+    import asyncio
+    import lib.redis_db as redis_db
+    from lib.memo_service import service_merge_similar
+
+    async def scenario():
+        left, right = NEAR_DUPLICATES[0]
+        keep = await redis_db.save_memo("u1", left, "text", "맛집", ["강남"], left[:10])
+        await redis_db.save_memo("u1", right, "text", "맛집", ["파스타"], right[:10])
+        short_id = fast_rule_classify(f"합치기 #{keep[:8]}")["short_id"]
+        return keep, await service_merge_similar("u1", short_id=short_id)
+
+    keep, result = asyncio.run(scenario())
+    assert result["success"] and result["memo_id"] == keep and result["merged_count"] == 1
+    assert sorted(result["tags"]) == ["강남", "파스타"]
+
+
+def test_group_cards_by_stored_signature():
+    """카드(본문 없음)는 저장된 시그니처로 묶음"""
+    from lib.memo_cards import memo_card
+
+    left, right = NEAR_DUPLICATES[0]
+    memos = [{"id": "a", "content": left}, {"id": "b", "content": DIFFERENT[1][0]}, {"id": "c", "content": right}]
+    cards = [memo_card(memo) for memo in memos]
+    assert all("content" not in card for card in cards)
+    assert [[card["id"] for card in group] for group in group_similar(cards)] == [["a", "c"], ["b"]]
+
+
+def test_backfill_indexes_legacy_memos(upstash):
+    """밴드 인덱스 도입 전 메모도 백필 후 비슷한 메모로 찾음"""
+    import asyncio
+    import json
+    import time
+    import lib.jobs as jobs
+    from lib.simhash import find_similar_ids
+
+    server = upstash.redis
+    left, right = NEAR_DUPLICATES[2]
+    for memo_id, content in [("old1", left), ("old2", right), ("short", "메모")]:
+        server.set(f"memo:u1:{memo_id}", json.dumps({"id": memo_id, "content": content}, ensure_ascii=False))
+        server.zadd("user:u1:memos", {memo_id: time.time()})
+
+    assert asyncio.run(find_similar_ids("u1", left, exclude_id="old1")) == []
+    result = asyncio.run(jobs.backfill_simhash_index())
+    assert result["done"] and result["memos"] == 3 and result["added"] > 0
+    assert [memo_id for memo_id, _ in asyncio.run(find_similar_ids("u1", left, exclude_id="old1"))] == ["old2"]
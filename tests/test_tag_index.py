@@ -0,0 +1,135 @@
+"""태그 인덱스 테스트 (저장/수정/삭제 시 SET·빈도 일관성, 재구축 전 스캔 응답과 크론 재구축, #태그 명령, 페이지네이션)"""
+import sys
+import os
+import json
+import asyncio
+import time
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.tag_index import parse_tag_command, tag_change_commands, tag_counts, extract_hashtags
+
+
+def test_parse_tag_command():
+    """"#태그 [페이지]"만 태그 명령 (숫자만/메모 내용이 붙으면 아님)"""
+    assert parse_tag_command("#강남") == ("강남", 1)
+    assert parse_tag_command("#강남 2") == ("강남", 2)
+    assert parse_tag_command("#12345") is None
+    assert parse_tag_command("#일기 오늘은 맑음") is None
+
+
+def test_extract_hashtags():
+    """공백 뒤 #태그만 (URL #fragment/숫자만/짧은 ID 제외), 끝 문장부호 제거, 중복 제거"""
+    assert extract_hashtags("파스타 맛집 #강남") == ["강남"]
+    assert extract_hashtags("#데이트 #강남, 좋았다 #강남 #12345 #a448275d https://a.com/#frag") == ["데이트", "강남"]
+
+
+def test_tag_change_commands_only_touch_diff():
+    """수정 시 빠진 태그는 SREM/-1, 새 태그는 SADD/+1, 그대로인 태그는 명령 없음"""
+    commands = tag_change_commands("u1", "m1", ["강남", "#데이트"], ["데이트", "파스타"])
+    assert commands == [
+        ["SREM", "user:u1:tag:강남", "m1"], ["HINCRBY", "user:u1:tags", "강남", -1],
+        ["SADD", "user:u1:tag:파스타", "m1"], ["HINCRBY", "user:u1:tags", "파스타", 1],
+    ]
+    assert tag_counts(["a", "1", "b", "3", "c", "0"]) == [("b", 3), ("a", 1)]
+
+
+import lib.redis_db as redis_db
+import lib.jobs as jobs
+from lib.tag_index import get_tag_counts, rebuild_tag_index, TAG_REBUILD_QUEUE
+
+
+@pytest.fixture
+def server(upstash):
+    return upstash
+
+
+def _add_legacy(server, memo_id, tags, age):
+    """인덱스 도입 전 메모 (태그 SET/빈도 없음)"""
+    memo = {"id": memo_id, "content": memo_id, "summary": memo_id, "category": "기타", "tags": tags}
+    server.redis.set(f"memo:u1:{memo_id}", json.dumps(memo, ensure_ascii=False))
+    server.redis.zadd("user:u1:memos", {memo_id: time.time() - age})
+
+
+def test_rebuild_then_save_update_delete_stay_consistent(server):
+    """재구축 전 조회는 최근 메모로 세고 대기열 등록, 크론 재구축 후 저장/수정/삭제가 SET과 빈도를 함께 갱신"""
+    _add_legacy(server, "old1", ["강남", "데이트"], 100)
+    _add_legacy(server, "old2", ["강남"], 50)
+
+    async def run():
+        assert await get_tag_counts("u1", scan=False) == []
+        assert not server.redis.smembers(TAG_REBUILD_QUEUE)
+        counts = await get_tag_counts("u1")
+        assert server.redis.smembers(TAG_REBUILD_QUEUE) == {"u1"}
+        assert not server.redis.exists("user:u1:tag:강남")
+        assert (await jobs.rebuild_pending_indexes())["tags"]["rebuilt"] == 1
+        assert not server.redis.smembers(TAG_REBUILD_QUEUE)
+        memo_id = await redis_db.save_memo("u1", "성수 카페", "text", "맛집", ["강남", "카페"], "성수 카페")
+        await redis_db.update_memo("u1", memo_id, tags=["성수", "카페"])
+        await redis_db.delete_memo("u1", "old2")
+        return counts, memo_id, await get_tag_counts("u1")
+
+    before, memo_id, after = asyncio.run(run())
+    assert before == [("강남", 2), ("데이트", 1)]
+    assert after == [("강남", 1), ("데이트", 1), ("성수", 1), ("카페", 1)]
+    assert server.redis.smembers("user:u1:tag:강남") == {"old1"}
+    assert server.redis.smembers("user:u1:tag:카페") == {memo_id}
+
+
+def test_rebuild_keeps_memo_saved_during_rebuild(server, monkeypatch):
+    """재구축이 메모를 읽은 뒤 교체하기 전에 저장된 메모도 인덱스에 남음 (빈도는 한 번만)"""
+    _add_legacy(server, "old1", ["강남"], 100)
+    saved = {}
+
+    async def racing_transaction(commands):
+        if commands[0] == ["DEL", "user:u1:tags"] and not saved:
+            saved["id"] = await redis_db.save_memo("u1", "성수 카페", "text", "맛집", ["강남", "카페"], "성수 카페")
+        return await server.pipeline(commands)
+
+    monkeypatch.setattr(redis_db, "redis_transaction", racing_transaction)
+    asyncio.run(rebuild_tag_index("u1"))
+    assert server.redis.smembers("user:u1:tag:강남") == {"old1", saved["id"]}
+    assert server.redis.smembers("user:u1:tag:카페") == {saved["id"]}
+    assert asyncio.run(get_tag_counts("u1")) == [("강남", 2), ("카페", 1)]
+
+
+def test_list_by_tag_paginates(server):
+    """태그 목록은 최신순 offset/limit 페이지, total은 태그 전체 수 (재구축 전 스캔/재구축 후 인덱스 결과가 같음)"""
+    from lib.memo_service import service_list_by_tag
+
+    for i in range(12):
+        _add_legacy(server, f"m{i:02d}", ["강남"] if i % 2 == 0 else ["홍대"], age=i * 60)
+
+    scanned = asyncio.run(service_list_by_tag("u1", "#강남", limit=4))
+    asyncio.run(jobs.rebuild_pending_indexes())
+    first = asyncio.run(service_list_by_tag("u1", "#강남", limit=4))
+    assert first["tag"] == "강남" and first["total"] == 6 and scanned == first
+    assert [m["id"] for m in first["memos"]] == ["m00", "m02", "m04", "m06"]
+
+    last = asyncio.run(service_list_by_tag("u1", "강남", limit=4, offset=4))
+    assert [m["id"] for m in last["memos"]] == ["m08", "m10"] and last["count"] == 2
+
+
+def test_hashtags_are_saved_and_scan_matches_tags_only(server, monkeypatch):
+    """본문 #태그는 저장 시 태그로, 재구축 전 스캔은 tags 배열만 봄 (본문에 단어만 있는 메모 제외) → 재구축 후와 같은 결과"""
+    import lib.memo_service as memo_service
+    from lib.memo_service import service_list_by_tag
+
+    async def classify_category(content, use_ai=False, user_id=None):
+        return "맛집", "rule"
+    monkeypatch.setattr(memo_service, "classify_category", classify_category)
+
+    _add_legacy(server, "old", [], 100)
+    server.redis.set("memo:u1:old", json.dumps({"id": "old", "content": "강남 약속", "summary": "강남 약속",
+                                                 "category": "기타", "tags": []}, ensure_ascii=False))
+    saved = asyncio.run(memo_service._save_memo("u1", "파스타 맛집 #강남", None, None, None, False, True))
+    assert saved["tags"] == ["강남"]
+
+    before = asyncio.run(service_list_by_tag("u1", "강남"))
+    asyncio.run(jobs.rebuild_pending_indexes())
+    after = asyncio.run(service_list_by_tag("u1", "강남"))
+    assert before["total"] == after["total"] == 1
+    assert [m["id"] for m in before["memos"]] == [m["id"] for m in after["memos"]] == [saved["memo_id"]]
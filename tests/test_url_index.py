@@ -0,0 +1,99 @@
+"""URL 정규화 / 재저장 인덱스 테스트 (네트워크 없이 실행)"""
+import sys
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from lib.url_index import canonicalize_url, url_hash, is_link_only, url_index_commands, url_unindex_commands
+
+
+def test_canonicalize_same_page_variants():
+    """추적 파라미터/모바일 호스트/youtu.be/끝 슬래시 차이는 같은 URL"""
+    same = [
+        ("https://youtu.be/dQw4w9WgXcQ?si=abc", "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=30"),
+        ("https://m.youtube.com/shorts/dQw4w9WgXcQ", "http://youtube.com/watch?v=dQw4w9WgXcQ"),
+        ("https://m.blog.naver.com/foo/223456", "https://blog.naver.com/PostView.naver?blogId=foo&logNo=223456"),
+        ("https://example.com/a/?utm_source=kakao&b=2&a=1#top", "http://www.example.com/a?a=1&b=2"),
+        ("https://x.com/user/status/1?s=20", "https://twitter.com/user/status/1?s=20"),
+    ]
+    for left, right in same:
+        assert canonicalize_url(left) == canonicalize_url(right), (left, right)
+        assert url_hash(left) == url_hash(right)
+
+
+def test_canonicalize_keeps_meaningful_differences():
+    """경로 대소문자/의미 있는 파라미터는 유지"""
+    assert canonicalize_url("https://example.com/Post/1") != canonicalize_url("https://example.com/post/1")
+    assert canonicalize_url("https://shop.com/item?id=1") != canonicalize_url("https://shop.com/item?id=2")
+    assert canonicalize_url("https://m.com/x") == "m.com/x"   # 2단계 도메인은 접두어로 보지 않음
+
+
+def test_index_commands():
+    """링크 전용 메모는 HSET, 설명 붙은 메모는 HSETNX, 삭제는 HDEL"""
+    assert is_link_only("https://a.com/1  https://b.com/2 ")
+    assert not is_link_only("읽어보기 https://a.com/1")
+    assert not is_link_only("링크 없음")
+
+    link_only = url_index_commands("u1", "m1", "https://a.com/1 https://a.com/1?utm_source=x")
+    assert link_only == [["HSET", "user:u1:urls", url_hash("https://a.com/1"), "m1"]]
+
+    mixed = url_index_commands("u1", "m2", "읽어보기 https://a.com/1")
+    assert mixed == [["HSETNX", "user:u1:urls", url_hash("https://a.com/1"), "m2"]]
+
+    assert url_index_commands("u1", "m3", "텍스트 메모") == []
+    unindex = url_unindex_commands("u1", "m1", "https://a.com/1 https://a.com/1/")
+    assert unindex[0][0] == "EVALSHA" and unindex[0][2:] == [1, "user:u1:urls", "m1", url_hash("https://a.com/1")]
+    assert url_unindex_commands("u1", "m3", "텍스트 메모") == []
+
+
+def test_delete_keeps_newer_owner(upstash):
+    """먼저 저장한 메모를 지워도 같은 URL을 차지한 최근 메모의 항목은 유지 (스크립트 미로드 상태에서도)"""
+    import asyncio
+    import lib.redis_db as redis_db
+
+    server = upstash.redis
+
+    async def scenario():
+        old = await redis_db.save_memo("u1", "https://a.com/1", "url", "링크", [], "a")
+        new = await redis_db.save_memo("u1", "https://a.com/1?utm_source=x", "url", "링크", [], "a")
+        await redis_db.delete_memo("u1", old)
+        kept = server.hget("user:u1:urls", url_hash("https://a.com/1"))
+        await redis_db.delete_memo("u1", new)
+        return new, kept
+
+    new, kept = asyncio.run(scenario())
+    assert kept == new
+    assert not server.exists("user:u1:urls")
+
+
+def test_bump_keeps_concurrent_edit_and_score(upstash, monkeypatch):
+    """재저장은 읽은 뒤 바뀐 카테고리를 덮어쓰지 않고, 목록 score/집계 날짜도 그대로"""
+    import asyncio
+    import json
+    import lib.redis_db as redis_db
+
+    server = upstash.redis
+    original_command = upstash.command
+
+    async def command_with_edit(*args):
+        result = await original_command(*args)
+        if args[0] == "GET" and args[1].startswith("memo:u1:"):
+            # bump_memo가 읽은 직후 다른 요청이 카테고리 수정
+            memo = json.loads(server.get(args[1]))
+            memo["category"] = "쇼핑"
+            server.set(args[1], json.dumps(memo, ensure_ascii=False))
+        return result
+
+    async def scenario():
+        memo_id = await redis_db.save_memo("u1", "https://a.com/1", "url", "링크", [], "a")
+        score = server.zscore("user:u1:memos", memo_id)
+        monkeypatch.setattr(redis_db, "redis_command", command_with_edit)
+        bumped = await redis_db.bump_memo("u1", memo_id)
+        return memo_id, score, bumped
+
+    memo_id, score, bumped = asyncio.run(scenario())
+    stored = json.loads(server.get(f"memo:u1:{memo_id}"))
+    assert bumped["save_count"] == stored["save_count"] == 2
+    assert stored["category"] == "쇼핑"
+    assert server.zscore("user:u1:memos", memo_id) == score